@@ -7,7 +7,7 @@ Provides type-safe configuration with validation and default values.
 
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import Field, validator
 from pydantic_settings import BaseSettings
@@ -39,6 +39,40 @@ class LLMConfig(BaseSettings):
     max_tokens: int = Field(default=4000, description="Maximum tokens per request")
     temperature: float = Field(default=0.1, description="LLM temperature")
     
+    # Provider Health Settings
+    health_check_interval_seconds: float = Field(default=30.0, description="Background provider health check interval")
+    health_cache_ttl_seconds: float = Field(default=90.0, description="Age after which cached provider health is refreshed")
+    circuit_failure_threshold: int = Field(default=3, description="Consecutive failures before a provider circuit opens")
+    circuit_recovery_seconds: float = Field(default=60.0, description="Time before an open provider circuit is retried")
+    latency_ewma_alpha: float = Field(default=0.3, description="Smoothing factor for provider latency EWMA")
+    
+    # Response Cache Settings
+    cache_enabled: bool = Field(default=True, description="Cache LLM responses across runs")
+    cache_path: Optional[Path] = Field(default=None, description="Response cache database (defaults to data_path)")
+    cache_ttl_seconds: float = Field(default=7 * 24 * 3600, description="Cached response lifetime in seconds")
+    cache_max_entries: int = Field(default=10000, description="Maximum number of cached responses")
+    
+    # Concurrency and Rate Limit Settings
+    dispatcher_max_concurrency: int = Field(default=8, description="Maximum concurrent per-scene LLM calls")
+    default_requests_per_minute: float = Field(default=60, description="Request limit for providers without explicit limits (0 = unlimited)")
+    default_tokens_per_minute: float = Field(default=100000, description="Token limit for providers without explicit limits (0 = unlimited)")
+    provider_rate_limits: Dict[str, Dict[str, float]] = Field(
+        default={
+            "ollama": {"requests_per_minute": 0, "tokens_per_minute": 0},
+            "openai": {"requests_per_minute": 500, "tokens_per_minute": 80000},
+            "anthropic": {"requests_per_minute": 50, "tokens_per_minute": 40000},
+            "google": {"requests_per_minute": 60, "tokens_per_minute": 120000},
+        },
+        description="Per-provider requests_per_minute / tokens_per_minute limits",
+    )
+    
+    # Request Hedging Settings
+    hedge_enabled: bool = Field(default=False, description="Send slow requests to a second provider as well")
+    hedge_percentile: float = Field(default=0.9, description="Primary latency percentile after which to hedge")
+    hedge_min_samples: int = Field(default=5, description="Latency samples needed before the percentile is used")
+    hedge_default_delay_seconds: float = Field(default=10.0, description="Hedge delay while latency samples are insufficient")
+    hedge_budget_ratio: float = Field(default=0.1, description="Maximum fraction of requests that may be hedged")
+    
     class Config:
         env_prefix = "RASO_"
 
@@ -50,11 +84,21 @@ class AnimationConfig(BaseSettings):
     fps: int = Field(default=30, description="Frames per second")
     quality: str = Field(default="high", description="Animation quality")
     manim_quality: str = Field(default="production_quality", description="Manim quality setting")
+    manim_warm_workers: bool = Field(default=True, description="Render Manim scenes in long-lived worker processes")
+    manim_worker_max_renders: int = Field(default=50, description="Renders before a Manim worker is recycled")
+    manim_worker_max_memory_mb: int = Field(default=2048, description="Memory in MB before a Manim worker is recycled")
+    remotion_concurrency: Optional[int] = Field(default=None, description="Remotion render concurrency per scene (None uses Remotion's default)")
     
     # Template Configuration
     template_safety_level: str = Field(default="safe", description="Template safety level")
     max_scene_duration: int = Field(default=300, description="Maximum scene duration in seconds")
     
+    # Rendering Concurrency
+    render_workers: Dict[str, int] = Field(
+        default_factory=lambda: {"manim": 2, "motion-canvas": 2, "remotion": 2},
+        description="Concurrent render workers per animation framework"
+    )
+    
     class Config:
         env_prefix = "RASO_ANIMATION_"
     
@@ -135,6 +179,43 @@ class SystemConfig(BaseSettings):
     max_storage_gb: int = Field(default=50, description="Maximum storage in GB")
     cleanup_interval_hours: int = Field(default=24, description="Cleanup interval in hours")
     
+    # Execution Mode
+    execution_mode: str = Field(default="barrier", description="Workflow mode: 'barrier' (stage graph) or 'streaming' (per-scene dataflow)")
+    streaming_stage_concurrency: Dict[str, int] = Field(
+        default_factory=lambda: {"tts": 2, "mux": 2},
+        description="Scenes per stage in streaming mode (render defaults to the total render workers)"
+    )
+    
+    # Workflow Checkpoints
+    checkpoint_enabled: bool = Field(default=True, description="Persist workflow state after every node")
+    checkpoint_path: Optional[Path] = Field(default=None, description="Checkpoint database (defaults to data_path)")
+    checkpoint_inline_limit_kb: int = Field(default=64, description="Strings larger than this are stored as shared blobs")
+
+    # Job Queue
+    job_queue_backend: str = Field(default="sqlite", description="Job queue backend")
+    job_queue_path: Optional[Path] = Field(default=None, description="Job queue database (defaults to data_path)")
+    job_visibility_timeout_seconds: int = Field(default=300, description="Lease of a claimed job without a worker heartbeat")
+    tenant_max_concurrent_jobs: int = Field(default=2, description="Running jobs allowed per tenant")
+    tenant_job_limits: Dict[str, int] = Field(default_factory=dict, description="Per-tenant running job limits")
+    embedded_worker: bool = Field(default=False, description="Run a job worker inside the API process (development)")
+
+    # Job Progress Events
+    progress_poll_interval_seconds: float = Field(default=0.25, description="How often each API process polls the job event log")
+    progress_min_interval_seconds: float = Field(default=0.5, description="Minimum seconds between progress events of a job")
+    progress_keepalive_seconds: float = Field(default=15.0, description="Keep-alive interval of idle event streams")
+    job_event_retention_seconds: float = Field(default=3600.0, description="How long a finished job's events stay replayable with Last-Event-ID")
+
+    # Resource Governor
+    resource_cpu_slots: Optional[int] = Field(default=None, description="CPU slots shared by all jobs (defaults to the CPU count)")
+    resource_memory_mb: Optional[int] = Field(default=None, description="Memory budget shared by all jobs (defaults to 75% of RAM)")
+    resource_api_quotas: Dict[str, int] = Field(
+        default_factory=lambda: {"llm": 8, "tts": 4},
+        description="Concurrent external calls allowed per API across all jobs"
+    )
+
+    # Tracing
+    job_tracing: bool = Field(default=True, description="Record a span trace per job (Chrome trace JSON under data/traces)")
+
     class Config:
         env_prefix = "RASO_"
 
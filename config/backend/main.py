@@ -9,14 +9,15 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI, Header, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 from config.backend.config import get_config
 from config.backend.models.paper import PaperInput
-from graph.master_workflow import RASOMasterWorkflow
+from config.backend.services.job_queue import DEFAULT_TENANT, JobQueue, get_job_queue
+from config.backend.services.progress_hub import ProgressHub, format_sse, get_progress_hub
 
 
 # Configuration
@@ -38,14 +39,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory job storage (would use Redis/database in production)
-jobs: Dict[str, Dict] = {}
+# Durable job queue, opened on startup; jobs are processed by config.backend.worker
+# processes. Its methods block on SQLite, so handlers call them in a thread.
+job_queue: Optional[JobQueue] = None
+
+# Pushes job events from the queue's event log to SSE and WebSocket clients
+progress_hub: Optional[ProgressHub] = None
 
 
 class JobRequest(BaseModel):
     """Job submission request."""
     paper_input: PaperInput
     options: Optional[Dict] = None
+    priority: int = 0
+    tenant: str = DEFAULT_TENANT
+    deadline: Optional[datetime] = None  # Degrade quality rather than finish late
+
+
+class RebuildRequest(BaseModel):
+    """Edits to a completed job."""
+    scenes: Dict[str, Dict] = {}
+    options: Dict = {}
+    dry_run: bool = False
 
 
 class JobResponse(BaseModel):
@@ -61,6 +76,8 @@ class JobStatus(BaseModel):
     status: str
     progress: float
     current_agent: Optional[str] = None
+    tenant: str = DEFAULT_TENANT
+    priority: int = 0
     created_at: datetime
     updated_at: datetime
     error_message: Optional[str] = None
@@ -79,35 +96,54 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now()}
 
 
+@app.on_event("startup")
+async def open_job_queue():
+    """Open the job queue and the progress hub that streams its events."""
+    global job_queue, progress_hub
+    job_queue = await asyncio.to_thread(get_job_queue)
+    progress_hub = get_progress_hub()
+
+
+@app.on_event("startup")
+async def start_embedded_worker():
+    """Run a worker inside the API process when configured (development)."""
+    if config.system.embedded_worker:
+        from config.backend.worker import JobWorker
+        app.state.worker = JobWorker(job_queue)
+        app.state.worker_task = asyncio.create_task(app.state.worker.run())
+
+
+@app.on_event("shutdown")
+async def stop_progress_hub():
+    """Close open event streams."""
+    await progress_hub.stop()
+
+
 @app.post("/api/jobs", response_model=JobResponse)
-async def submit_job(job_request: JobRequest, background_tasks: BackgroundTasks):
+async def submit_job(job_request: JobRequest):
     """Submit a new video generation job."""
     import uuid
     
     job_id = str(uuid.uuid4())
     
-    # Create job record
-    job_data = {
-        "job_id": job_id,
-        "status": "queued",
-        "progress": 0.0,
-        "current_agent": None,
-        "created_at": datetime.now(),
-        "updated_at": datetime.now(),
-        "paper_input": job_request.paper_input.dict(),
-        "options": job_request.options or {},
-        "error_message": None,
-        "result": None,
-    }
-    
-    jobs[job_id] = job_data
+    options = dict(job_request.options or {})
+    if job_request.deadline:
+        options["deadline"] = job_request.deadline.isoformat()
     
-    # Start processing in background
-    background_tasks.add_task(process_job, job_id)
+    job_data = await asyncio.to_thread(
+        job_queue.enqueue,
+        job_id,
+        {
+            "paper_input": job_request.paper_input.dict(),
+            "options": options,
+        },
+        priority=job_request.priority,
+        tenant=job_request.tenant,
+    )
     
     return JobResponse(
         job_id=job_id,
-        status="queued",
+        status=job_data["status"],
         created_at=job_data["created_at"],
     )
 
@@ -115,32 +151,158 @@ async def submit_job(job_request: JobRequest, background_tasks: BackgroundTasks)
 @app.get("/api/jobs/{job_id}", response_model=JobStatus)
 async def get_job_status(job_id: str):
     """Get job status."""
-    if job_id not in jobs:
+    job_data = await asyncio.to_thread(job_queue.get, job_id)
+    if job_data is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job_data = jobs[job_id]
-    
     return JobStatus(**job_data)
 
 
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+):
+    """
+    Stream a job's progress, stage, scene and status events as Server-Sent Events.
+    
+    Reconnecting clients resume after the ``Last-Event-ID`` header (or the
+    ``last_event_id`` query parameter); the stream ends when the job completes or fails.
+    """
+    if await asyncio.to_thread(job_queue.get, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    resume_after = last_event_id
+    if resume_after is None and last_event_id_header and last_event_id_header.isdigit():
+        resume_after = int(last_event_id_header)
+    subscription = progress_hub.subscribe(job_id, resume_after or 0)
+    
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            while not subscription.done:
+                event = await subscription.get(timeout=config.system.progress_keepalive_seconds)
+                yield format_sse(event) if event else ": keep-alive\n\n"
+        finally:
+            subscription.close()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.websocket("/api/jobs/{job_id}/ws")
+async def job_events_websocket(websocket: WebSocket, job_id: str, last_event_id: int = 0):
+    """Push a job's events over a WebSocket, as JSON messages with id, event and data."""
+    await websocket.accept()
+    if await asyncio.to_thread(job_queue.get, job_id) is None:
+        await websocket.close(code=4404, reason="Job not found")
+        return
+    
+    subscription = progress_hub.subscribe(job_id, last_event_id)
+    try:
+        while not subscription.done:
+            event = await subscription.get(timeout=config.system.progress_keepalive_seconds)
+            if event:
+                await websocket.send_json({"id": event["id"], "event": event["event"], "data": event["data"]})
+            else:
+                await websocket.send_json({"event": "keep-alive"})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+
+
 @app.get("/api/jobs")
-async def list_jobs():
-    """List all jobs."""
-    return {"jobs": list(jobs.values())}
+async def list_jobs(offset: int = 0, limit: int = 50, status: Optional[str] = None, tenant: Optional[str] = None):
+    """List jobs, newest first, one page at a time."""
+    limit = max(1, min(limit, 200))
+    page, total = await asyncio.to_thread(job_queue.list, offset=max(0, offset), limit=limit, status=status, tenant=tenant)
+    return {"jobs": page, "total": total, "offset": offset, "limit": limit}
+
+
+@app.get("/api/queue/metrics")
+async def queue_metrics():
+    """Queue depth and wait-time metrics."""
+    return await asyncio.to_thread(job_queue.metrics)
+
+
+@app.get("/api/resources/metrics")
+async def resource_metrics():
+    """Utilization and wait metrics of this process's resource governor."""
+    from core.resource_governor import get_resource_governor
+    return get_resource_governor().metrics()
+
+
+@app.post("/api/jobs/{job_id}/rebuild")
+async def rebuild_job(job_id: str, rebuild_request: RebuildRequest):
+    """Rebuild a completed job with edits, regenerating only the affected assets."""
+    import uuid
+    from core.regeneration import get_regeneration_service
+    
+    source = await asyncio.to_thread(job_queue.get, job_id)
+    if source is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    edits = {"scenes": rebuild_request.scenes, "options": rebuild_request.options}
+    try:
+        plan = get_regeneration_service().plan(job_id, edits)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if rebuild_request.dry_run:
+        return {"dry_run": True, "plan": plan.to_dict()}
+    
+    rebuild_id = str(uuid.uuid4())
+    job_data = await asyncio.to_thread(
+        job_queue.enqueue,
+        rebuild_id,
+        {
+            "paper_input": source["paper_input"],
+            "options": {**source["options"], "rebuild": {"source_job_id": job_id, "edits": edits}},
+        },
+        priority=source["priority"],
+        tenant=source["tenant"],
+    )
+    
+    return {
+        "job_id": rebuild_id,
+        "status": job_data["status"],
+        "created_at": job_data["created_at"],
+        "plan": plan.to_dict(),
+    }
+
+
+@app.get("/api/jobs/{job_id}/trace")
+async def download_trace(job_id: str):
+    """Download a job's span trace (Chrome trace JSON; open in chrome://tracing or Perfetto)."""
+    from core.tracing import trace_path
+    
+    if await asyncio.to_thread(job_queue.get, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    path = trace_path(job_id)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Trace not found")
+    
+    return FileResponse(path, media_type="application/json", filename=f"trace_{job_id[:8]}.json")
 
 
 @app.get("/api/jobs/{job_id}/download")
 async def download_video(job_id: str):
     """Download generated video."""
-    if job_id not in jobs:
+    job_data = await asyncio.to_thread(job_queue.get, job_id)
+    if job_data is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job_data = jobs[job_id]
-    
     if job_data["status"] != "completed":
         raise HTTPException(status_code=400, detail="Job not completed")
     
-    if not job_data.get("result", {}).get("video", {}).get("file_path"):
+    if not (job_data.get("result") or {}).get("video", {}).get("file_path"):
         raise HTTPException(status_code=404, detail="Video file not found")
     
     video_path = job_data["result"]["video"]["file_path"]
@@ -178,68 +340,6 @@ async def download_video(job_id: str):
     )
 
 
-async def process_job(job_id: str):
-    """Process a job in the background."""
-    try:
-        job_data = jobs[job_id]
-        job_data["status"] = "processing"
-        job_data["updated_at"] = datetime.now()
-        
-        # Create workflow
-        workflow = RASOMasterWorkflow()
-        
-        # Initialize state with proper object conversion
-        paper_input_data = job_data["paper_input"]
-        paper_input = PaperInput(**paper_input_data)
-        
-        initial_state = {
-            "paper_input": paper_input,
-            "options": job_data.get("options", {}),
-            "job_id": job_id,
-        }
-        
-        # Execute workflow with progress tracking
-        final_state = {}
-        async for state in workflow.execute_with_progress(initial_state):
-            final_state = state
-            # Update job progress
-            job_data["current_agent"] = state.get("current_agent")
-            job_data["progress"] = state.get("progress", 0.0)
-            job_data["updated_at"] = datetime.now()
-        
-        if final_state.get("status") == "failed":
-            # Job failed
-            job_data["status"] = "failed"
-            job_data["error_message"] = final_state.get("error")
-            # Log detailed error for debugging
-            import traceback
-            print(f"❌ Job {job_id} failed: {final_state.get('error')}")
-            if "traceback" in final_state:
-                print(f"Traceback: {final_state.get('traceback')}")
-        else:
-            # Job completed successfully
-            job_data["status"] = "completed"
-            job_data["progress"] = 100.0
-            job_data["result"] = {
-                "video": final_state.get("video"),
-                "metadata": final_state.get("metadata"),
-                "youtube_url": final_state.get("youtube_url"),
-            }
-        
-        job_data["updated_at"] = datetime.now()
-        
-    except Exception as e:
-        # Unexpected error - log full traceback
-        import traceback
-        error_traceback = traceback.format_exc()
-        print(f"❌ Unexpected error in job {job_id}:")
-        print(error_traceback)
-        
-        job_data["status"] = "failed"
-        job_data["error_message"] = f"{str(e)}\n\nTraceback:\n{error_traceback}"
-        job_data["updated_at"] = datetime.now()
-
-
 if __name__ == "__main__":
     import uvicorn
     
@@ -5,10 +5,12 @@ Pydantic models for type-safe data handling throughout the RASO platform.
 All models include proper validation, serialization, and JSON schema generation.
 """
 
+from .blobs import BlobRef, loading_payloads, trusted_refs
 from .paper import (
     PaperInput,
     PaperInputType,
     PaperContent,
+    PaperDigest,
     Section,
     Equation,
     Figure,
@@ -64,6 +66,7 @@ __all__ = [
     "PaperInput",
     "PaperInputType",
     "PaperContent", 
+    "PaperDigest",
     "Section",
     "Equation",
     "Figure",
@@ -105,4 +108,8 @@ __all__ = [
     "ErrorSeverity",
     "AgentError",
     "ProcessingOptions",
+    # Blob References
+    "BlobRef",
+    "loading_payloads",
+    "trusted_refs",
 ]
\ No newline at end of file
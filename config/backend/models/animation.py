@@ -81,6 +81,7 @@ class SceneMetadata(BaseModel):
     render_start_time: Optional[datetime] = Field(default=None, description="Render start timestamp")
     render_end_time: Optional[datetime] = Field(default=None, description="Render completion timestamp")
     render_duration: Optional[float] = Field(default=None, description="Render time in seconds")
+    predicted_render_duration: Optional[float] = Field(default=None, description="Render time predicted by the scheduler in seconds")
     
     # Technical details
     framework_version: Optional[str] = Field(default=None, description="Animation framework version")
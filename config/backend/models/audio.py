@@ -6,12 +6,14 @@ for the video production pipeline.
 """
 
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from pathlib import Path
 from datetime import datetime
 
 from pydantic import BaseModel, Field, validator
 
+from .blobs import BlobRef, PayloadModel, check_ref
+
 
 class AudioFormat(str, Enum):
     """Supported audio formats."""
@@ -102,7 +104,7 @@ class AudioProcessingSettings(BaseModel):
         return v
 
 
-class AudioScene(BaseModel):
+class AudioScene(PayloadModel):
     """Audio for a single scene."""
     
     scene_id: str = Field(..., description="Reference to scene ID")
@@ -120,7 +122,7 @@ class AudioScene(BaseModel):
     processing_settings: AudioProcessingSettings = Field(default_factory=AudioProcessingSettings, description="Processing settings used")
     
     # Timing information
-    timing_markers: List[Dict[str, Any]] = Field(default_factory=list, description="Word-level timing markers")
+    timing_markers: Union[List[Dict[str, Any]], BlobRef] = Field(default_factory=list, description="Word-level timing markers")
     
     # Quality metrics
     generation_time: Optional[float] = Field(default=None, description="Time taken to generate audio")
@@ -139,6 +141,11 @@ class AudioScene(BaseModel):
         
         return v
     
+    @validator("timing_markers")
+    def validate_timing_markers(cls, v):
+        """Only the workflow may reference stored timing markers."""
+        return check_ref(v)
+    
     @validator("transcript")
     def validate_transcript(cls, v):
         """Validate transcript."""
@@ -177,7 +184,10 @@ class AudioScene(BaseModel):
             "end_time": end_time,
             "duration": end_time - start_time
         }
-        self.timing_markers.append(marker)
+        # A referenced marker list is loaded and kept inline from here on
+        markers = self.timing_markers
+        markers.append(marker)
+        self.timing_markers = markers
     
     def get_timing_at_position(self, position: float) -> Optional[Dict[str, Any]]:
         """Get timing marker at specific position."""
@@ -0,0 +1,160 @@
+"""
+Typed references to payloads kept outside the workflow state.
+
+Only the workflow creates references (``RASOMasterState.compact``) and reads
+them back (checkpoint restore), inside ``trusted_refs()``; models filled from
+API input reject them, so a client cannot point a payload at an arbitrary
+blob or path. Models with payload fields derive from ``PayloadModel``, which
+loads a referenced payload when the field is read while ``loading_payloads``
+has bound a store. Only fields whose type admits ``BlobRef`` are wrapped;
+reading any other attribute costs the same as on a plain model.
+"""
+
+import json
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional, Tuple, get_args
+
+from pydantic import BaseModel, Field, validator
+
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+# Set while the workflow parses states it wrote itself
+_trusted_refs: ContextVar[bool] = ContextVar("trusted_refs", default=False)
+
+# Store that PayloadModel fields are loaded from on access
+_payload_store: ContextVar[Optional[Any]] = ContextVar("payload_store", default=None)
+
+
+class BlobRef(BaseModel):
+    """Reference to a payload in the content-addressed blob store."""
+
+    digest: str = Field(..., description="SHA-256 of the stored bytes")
+    size: int = Field(..., ge=0, description="Stored size in bytes")
+    kind: str = Field(..., description="Payload type: text, bytes or json")
+    
+    @validator("digest")
+    def validate_digest(cls, v):
+        """Digests name files in the blob store, so only SHA-256 hex is allowed."""
+        if not DIGEST_PATTERN.fullmatch(v):
+            raise ValueError("Blob digest must be a SHA-256 hex digest")
+        return v
+
+    @classmethod
+    def put(cls, value: Any, store: Any) -> "BlobRef":
+        """
+        Store a payload and reference it.
+
+        Args:
+            value: String, bytes or JSON-able value
+            store: Blob store with ``put(bytes) -> digest``
+
+        Returns:
+            Reference to the stored payload
+        """
+        kind, data = encode_payload(value)
+        return cls(digest=store.put(data), size=len(data), kind=kind)
+
+    def load(self, store: Any) -> Any:
+        """Load the referenced payload, as the type it was stored from."""
+        data = store.get(self.digest)
+        if self.kind == "text":
+            return data.decode("utf-8")
+        if self.kind == "json":
+            return json.loads(data)
+        return data
+
+
+class PayloadField:
+    """
+    Descriptor for a payload field that loads a ``BlobRef`` value when read.
+    
+    The value stays in the instance ``__dict__``, where pydantic assigns,
+    copies and serializes it, so serialized states keep their references.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __get__(self, owner: Optional[BaseModel], owner_type: Any = None) -> Any:
+        if owner is None:
+            return self
+        value = owner.__dict__[self.name]
+        # An exact type check; isinstance goes through pydantic's slower metaclass hook
+        if type(value) is BlobRef:
+            store = _payload_store.get()
+            if store is not None:
+                return value.load(store)
+        return value
+    
+    def __set__(self, owner: BaseModel, value: Any) -> None:
+        # BaseModel.__setattr__ validates and stores field values itself
+        owner.__dict__[self.name] = value
+
+
+def _admits_ref(annotation: Any) -> bool:
+    """Whether a field type is, or is a union containing, ``BlobRef``."""
+    return annotation is BlobRef or any(_admits_ref(arg) for arg in get_args(annotation))
+
+
+class PayloadModel(BaseModel):
+    """Model whose payload fields may hold ``BlobRef`` references, loaded when read."""
+    
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        for name, field in cls.model_fields.items():
+            if _admits_ref(field.annotation):
+                setattr(cls, name, PayloadField(name))
+
+
+@contextmanager
+def trusted_refs() -> Iterator[None]:
+    """Accept ``BlobRef`` payloads while parsing states the workflow wrote."""
+    token = _trusted_refs.set(True)
+    try:
+        yield
+    finally:
+        _trusted_refs.reset(token)
+
+
+@contextmanager
+def loading_payloads(store: Any) -> Iterator[None]:
+    """Load referenced payloads from ``store`` when ``PayloadModel`` fields are read."""
+    token = _payload_store.set(store)
+    try:
+        yield
+    finally:
+        _payload_store.reset(token)
+
+
+def check_ref(value: Any) -> Any:
+    """
+    Validator helper for payload fields: references are only accepted in trusted parsing.
+    
+    Raises:
+        ValueError: If ``value`` is a reference from outside the workflow
+    """
+    if isinstance(value, BlobRef) and not _trusted_refs.get():
+        raise ValueError("Blob references are not accepted as input")
+    return value
+
+
+def raw_payload(owner: BaseModel, field: str) -> Any:
+    """A payload field's stored value, without loading a reference."""
+    return owner.__dict__[field]
+
+
+def encode_payload(value: Any) -> Tuple[str, bytes]:
+    """The blob kind and bytes of a payload."""
+    if isinstance(value, str):
+        return "text", value.encode("utf-8")
+    if isinstance(value, (bytes, bytearray)):
+        return "bytes", bytes(value)
+    return "json", json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+
+
+def resolve(value: Any, store: Any) -> Any:
+    """A payload field's value, loading it from the store if it is a reference."""
+    return value.load(store) if isinstance(value, BlobRef) else value
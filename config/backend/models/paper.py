@@ -5,13 +5,17 @@ Models for paper input, content extraction, and structured representation
 of research papers including sections, equations, figures, and references.
 """
 
+import hashlib
+import json
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from pathlib import Path
 
 from pydantic import BaseModel, Field, validator, HttpUrl
 
+from .blobs import BlobRef, PayloadModel, check_ref
+
 
 class PaperInputType(str, Enum):
     """Types of paper input supported by RASO."""
@@ -20,16 +24,19 @@ class PaperInputType(str, Enum):
     PDF = "pdf"
 
 
-class PaperInput(BaseModel):
+class PaperInput(PayloadModel):
     """Input specification for a research paper."""
     
     type: PaperInputType = Field(..., description="Type of paper input")
-    content: str = Field(..., description="Paper content (title, URL, or base64 PDF)")
+    content: Union[str, BlobRef] = Field(..., description="Paper content (title, URL, or base64 PDF)")
     options: Optional[Dict[str, Any]] = Field(default=None, description="Processing options")
     
     @validator("content")
     def validate_content(cls, v, values):
         """Validate content based on input type."""
+        if isinstance(v, BlobRef):
+            return check_ref(v)  # Validated before it was moved to the blob store
+        
         input_type = values.get("type")
         
         if input_type == PaperInputType.TITLE:
@@ -66,12 +73,12 @@ class PaperInput(BaseModel):
         }
 
 
-class Section(BaseModel):
+class Section(PayloadModel):
     """A section within a research paper."""
     
     id: str = Field(..., description="Unique section identifier")
     title: str = Field(..., description="Section title")
-    content: str = Field(..., description="Section text content")
+    content: Union[str, BlobRef] = Field(..., description="Section text content")
     level: int = Field(..., ge=1, le=6, description="Section hierarchy level")
     equations: List[str] = Field(default_factory=list, description="Equation IDs in this section")
     figures: List[str] = Field(default_factory=list, description="Figure IDs in this section")
@@ -86,6 +93,8 @@ class Section(BaseModel):
     @validator("content")
     def validate_content(cls, v):
         """Validate section content."""
+        if isinstance(v, BlobRef):
+            return check_ref(v)
         if len(v.strip()) < 10:
             raise ValueError("Section content must be at least 10 characters")
         return v.strip()
@@ -121,12 +130,12 @@ class FigureType(str, Enum):
     TABLE = "table"
 
 
-class Figure(BaseModel):
+class Figure(PayloadModel):
     """A figure within a research paper."""
     
     id: str = Field(..., description="Unique figure identifier")
     caption: str = Field(..., description="Figure caption")
-    image_data: Optional[bytes] = Field(default=None, description="Binary image data")
+    image_data: Optional[Union[bytes, BlobRef]] = Field(default=None, description="Binary image data")
     image_path: Optional[Path] = Field(default=None, description="Path to image file")
     section_id: str = Field(..., description="ID of the containing section")
     type: FigureType = Field(default=FigureType.DIAGRAM, description="Type of figure")
@@ -138,6 +147,11 @@ class Figure(BaseModel):
             raise ValueError("Figure caption must be at least 5 characters")
         return v.strip()
     
+    @validator("image_data")
+    def validate_image_data(cls, v):
+        """Only the workflow may reference stored image data."""
+        return check_ref(v)
+    
     class Config:
         arbitrary_types_allowed = True
 
@@ -253,6 +267,18 @@ class PaperContent(BaseModel):
             total_words += len(section.content.split())
         return total_words
     
+    def content_hash(self) -> str:
+        """Hash of the paper text, used to key derived artifacts such as digests and indexes."""
+        material = json.dumps(
+            {
+                "title": self.title,
+                "abstract": self.abstract,
+                "sections": [[s.id, s.title, s.content] for s in self.sections],
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+    
     class Config:
         schema_extra = {
             "example": {
@@ -283,4 +309,65 @@ class PaperContent(BaseModel):
                 "arxiv_id": "1706.03762",
                 "keywords": ["attention", "transformer", "neural networks"]
             }
-        }
\ No newline at end of file
+        }
+
+
+class PaperDigest(BaseModel):
+    """Compact structured digest of a paper, used in place of the full text in prompts."""
+    
+    paper_hash: str = Field(..., description="Hash of the paper content the digest was built from")
+    title: str = Field(..., description="Paper title")
+    overview: str = Field(..., description="Short overview of the whole paper")
+    problem: str = Field(default="", description="Problem statement and motivation")
+    method: str = Field(default="", description="Approach and key techniques")
+    results: str = Field(default="", description="Main findings")
+    limitations: str = Field(default="", description="Limitations and open questions")
+    contributions: List[str] = Field(default_factory=list, description="Key contributions")
+    key_terms: List[str] = Field(default_factory=list, description="Important terms and concepts")
+    section_summaries: Dict[str, str] = Field(default_factory=dict, description="Summary per section title")
+    
+    # Condensation metrics
+    original_tokens: int = Field(default=0, description="Estimated tokens of the full paper text")
+    digest_tokens: int = Field(default=0, description="Estimated tokens of the digest prompt text")
+    created_at: datetime = Field(default_factory=datetime.now, description="Digest creation timestamp")
+    
+    @property
+    def token_reduction(self) -> float:
+        """Fraction of prompt tokens saved by using the digest instead of the full text."""
+        if not self.original_tokens:
+            return 0.0
+        return max(0.0, 1.0 - self.digest_tokens / self.original_tokens)
+    
+    def to_prompt_text(self, include_sections: bool = True) -> str:
+        """
+        Render the digest as compact prompt context.
+        
+        Args:
+            include_sections: Whether to append the per-section summaries
+            
+        Returns:
+            Plain-text digest
+        """
+        parts = [f"Title: {self.title}", f"Overview: {self.overview}"]
+        
+        for label, value in [
+            ("Problem", self.problem),
+            ("Method", self.method),
+            ("Results", self.results),
+            ("Limitations", self.limitations),
+        ]:
+            if value:
+                parts.append(f"{label}: {value}")
+        
+        if self.contributions:
+            parts.append("Contributions:\n" + "\n".join(f"- {c}" for c in self.contributions))
+        
+        if self.key_terms:
+            parts.append("Key terms: " + ", ".join(self.key_terms))
+        
+        if include_sections and self.section_summaries:
+            parts.append("Sections:\n" + "\n".join(
+                f"- {title}: {summary}" for title, summary in self.section_summaries.items()
+            ))
+        
+        return "\n\n".join(parts)
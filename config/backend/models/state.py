@@ -5,14 +5,16 @@ Models for LangGraph workflow state, agent errors, and processing options
 for coordinated multi-agent video generation.
 """
 
+from contextvars import ContextVar
 from enum import Enum
-from typing import List, Optional, Dict, Any, Union
+from typing import Annotated, Callable, List, Optional, Dict, Any, Union
 from datetime import datetime
 from uuid import uuid4
 
 from pydantic import BaseModel, Field, validator
 
-from .paper import PaperInput, PaperContent
+from .blobs import BlobRef, encode_payload, raw_payload, resolve
+from .paper import PaperInput, PaperContent, PaperDigest
 from .understanding import PaperUnderstanding
 from .script import NarrationScript
 from .visual import VisualPlan
@@ -125,6 +127,8 @@ class ProcessingOptions(BaseModel):
     prefer_manim: bool = Field(default=False, description="Prefer Manim for all animations")
     animation_style: str = Field(default="modern", description="Animation style preference")
     color_scheme: str = Field(default="default", description="Color scheme preference")
+    cinematic_effects: bool = Field(default=True, description="Run the cinematic enhancement pass during composition")
+    tts_engine: Optional[str] = Field(default=None, description="TTS engine for narration (defaults to the agent's choice)")
     
     # YouTube settings
     auto_upload: bool = Field(default=False, description="Automatically upload to YouTube")
@@ -135,6 +139,10 @@ class ProcessingOptions(BaseModel):
     parallel_processing: bool = Field(default=True, description="Enable parallel processing")
     max_retries: int = Field(default=3, ge=0, le=10, description="Maximum retry attempts")
     timeout_minutes: int = Field(default=60, ge=5, le=300, description="Processing timeout")
+    deadline: Optional[datetime] = Field(
+        default=None,
+        description="Wall-clock deadline; quality is degraded to meet it instead of timing out",
+    )
     
     @validator("target_duration")
     def validate_target_duration(cls, v):
@@ -144,6 +152,25 @@ class ProcessingOptions(BaseModel):
         return v
 
 
+# Share of overall progress per workflow step
+STEP_WEIGHTS = {
+    WorkflowStatus.INGESTING: 0.1,
+    WorkflowStatus.UNDERSTANDING: 0.15,
+    WorkflowStatus.SCRIPTING: 0.15,
+    WorkflowStatus.PLANNING: 0.1,
+    WorkflowStatus.ANIMATING: 0.3,
+    WorkflowStatus.AUDIO_PROCESSING: 0.1,
+    WorkflowStatus.VIDEO_COMPOSING: 0.05,
+    WorkflowStatus.METADATA_GENERATING: 0.03,
+    WorkflowStatus.UPLOADING: 0.02,
+}
+
+# Called with the progress after every update of the running job (set by the job worker)
+progress_listener: ContextVar[Optional[Callable[["ProcessingProgress"], None]]] = ContextVar(
+    "progress_listener", default=None
+)
+
+
 class ProcessingProgress(BaseModel):
     """Progress tracking for the video generation process."""
     
@@ -171,21 +198,31 @@ class ProcessingProgress(BaseModel):
         self.last_update = datetime.now()
         
         # Update overall progress based on step weights
-        step_weights = {
-            WorkflowStatus.INGESTING: 0.1,
-            WorkflowStatus.UNDERSTANDING: 0.15,
-            WorkflowStatus.SCRIPTING: 0.15,
-            WorkflowStatus.PLANNING: 0.1,
-            WorkflowStatus.ANIMATING: 0.3,
-            WorkflowStatus.AUDIO_PROCESSING: 0.1,
-            WorkflowStatus.VIDEO_COMPOSING: 0.05,
-            WorkflowStatus.METADATA_GENERATING: 0.03,
-            WorkflowStatus.UPLOADING: 0.02,
-        }
-        
-        completed_weight = sum(step_weights.get(s, 0) for s in self.completed_steps)
-        current_weight = step_weights.get(step, 0) * progress
+        completed_weight = sum(STEP_WEIGHTS.get(s, 0) for s in self.completed_steps)
+        current_weight = STEP_WEIGHTS.get(step, 0) * progress
         self.overall_progress = min(1.0, completed_weight + current_weight)
+        
+        listener = progress_listener.get()
+        if listener is not None:
+            listener(self)
+    
+    def update_scene(self, scene_id: str, stage: str, status: str, step_progress: Optional[float] = None) -> None:
+        """
+        Record a scene's status in one production stage (e.g. render or tts).
+        
+        Args:
+            scene_id: Scene identifier
+            stage: Per-scene production stage
+            status: Status of the scene in that stage
+            step_progress: New progress of the current step, if it changed
+        """
+        scenes = self.detailed_status.setdefault("scenes", {})
+        scenes.setdefault(scene_id, {})[stage] = status
+        self.update_progress(
+            self.current_step,
+            self.step_progress if step_progress is None else step_progress,
+            f"Scene {scene_id}: {stage} {status}",
+        )
     
     def complete_step(self, step: WorkflowStatus) -> None:
         """Mark a step as completed."""
@@ -205,6 +242,95 @@ class ProcessingProgress(BaseModel):
         return self.current_step in [WorkflowStatus.COMPLETED, WorkflowStatus.FAILED, WorkflowStatus.CANCELLED]
 
 
+# LangGraph reducers for the fields both parallel branches (animation and
+# narration) write. Sequential nodes pass the full previous value plus their
+# changes, so each reducer must treat "right contains left" as a no-op merge.
+
+def merge_errors(left: List[AgentError], right: List[AgentError]) -> List[AgentError]:
+    """Union of two error lists, keeping order and dropping duplicates."""
+    merged = list(left or [])
+    seen = {(e.agent_type, e.error_code, e.message, e.timestamp) for e in merged}
+    for error in right or []:
+        key = (error.agent_type, error.error_code, error.message, error.timestamp)
+        if key not in seen:
+            seen.add(key)
+            merged.append(error)
+    return merged
+
+
+def merge_progress(left: ProcessingProgress, right: ProcessingProgress) -> ProcessingProgress:
+    """Keep the most recent progress update, with the completed steps of both."""
+    if left is None or right is None:
+        return right if left is None else left
+    
+    newer, older = (right, left) if right.last_update >= left.last_update else (left, right)
+    merged = newer.copy(deep=True)
+    for step in older.completed_steps:
+        if step not in merged.completed_steps:
+            merged.completed_steps.append(step)
+    
+    completed_weight = sum(STEP_WEIGHTS.get(s, 0) for s in merged.completed_steps)
+    merged.overall_progress = min(1.0, max(left.overall_progress, right.overall_progress, completed_weight))
+    return merged
+
+
+def merge_degradations(left: List[Dict[str, Any]], right: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Union of two lists of degradation decisions, keeping order and dropping duplicates."""
+    merged = list(left or [])
+    seen = {(d["setting"], d["to"], d["decided_at"]) for d in merged}
+    for decision in right or []:
+        key = (decision["setting"], decision["to"], decision["decided_at"])
+        if key not in seen:
+            seen.add(key)
+            merged.append(decision)
+    return merged
+
+
+# Large payloads moved to the blob store by RASOMasterState.compact, as
+# (path to the owning models, field); a list on the path applies to every item
+PAYLOAD_FIELDS = (
+    ("paper_input", "content"),
+    ("paper_content.sections", "content"),
+    ("paper_content.figures", "image_data"),
+    ("audio.scenes", "timing_markers"),
+)
+
+# Payloads up to this size stay inline; a reference costs about 150 bytes
+INLINE_PAYLOAD_LIMIT = 1024
+
+
+def _map_payload(owner: Any, path: List[str], field: str, transform: Any) -> Any:
+    """
+    Apply ``transform`` to a payload field below ``owner``, copy-on-write.
+    
+    Only the models on the way to a changed payload are copied; everything
+    else stays shared with the original.
+    """
+    if owner is None:
+        return owner
+    if isinstance(owner, list):
+        items = [_map_payload(item, path, field, transform) for item in owner]
+        return owner if all(new is old for new, old in zip(items, owner)) else items
+    if not path:
+        value = raw_payload(owner, field)
+        new_value = transform(value)
+        return owner if new_value is value else owner.copy(update={field: new_value})
+    
+    child = getattr(owner, path[0])
+    new_child = _map_payload(child, path[1:], field, transform)
+    return owner if new_child is child else owner.copy(update={path[0]: new_child})
+
+
+def latest_value(left: Any, right: Any) -> Any:
+    """Take the most recent write."""
+    return right if right is not None else left
+
+
+def latest_timestamp(left: datetime, right: datetime) -> datetime:
+    """Take the later of two timestamps."""
+    return max(left, right) if left and right else (right or left)
+
+
 class RASOMasterState(BaseModel):
     """Master state for the RASO LangGraph workflow."""
     
@@ -217,6 +343,7 @@ class RASOMasterState(BaseModel):
     
     # Processing state
     paper_content: Optional[PaperContent] = Field(default=None, description="Extracted paper content")
+    paper_digest: Optional[PaperDigest] = Field(default=None, description="Condensed paper digest for prompts")
     understanding: Optional[PaperUnderstanding] = Field(default=None, description="AI understanding of paper")
     script: Optional[NarrationScript] = Field(default=None, description="Generated narration script")
     visual_plan: Optional[VisualPlan] = Field(default=None, description="Visual planning for animations")
@@ -226,18 +353,62 @@ class RASOMasterState(BaseModel):
     metadata: Optional[VideoMetadata] = Field(default=None, description="Video metadata")
     
     # Workflow control
-    current_agent: Optional[AgentType] = Field(default=None, description="Currently executing agent")
-    progress: ProcessingProgress = Field(default_factory=ProcessingProgress, description="Processing progress")
-    errors: List[AgentError] = Field(default_factory=list, description="Accumulated errors")
+    # (annotated with reducers so the parallel animation and narration branches can both write them)
+    current_agent: Annotated[Optional[AgentType], latest_value] = Field(default=None, description="Currently executing agent")
+    progress: Annotated[ProcessingProgress, merge_progress] = Field(default_factory=ProcessingProgress, description="Processing progress")
+    errors: Annotated[List[AgentError], merge_errors] = Field(default_factory=list, description="Accumulated errors")
+    degradations: Annotated[List[Dict[str, Any]], merge_degradations] = Field(
+        default_factory=list, description="Quality degradations made to meet the deadline"
+    )
     
     # State metadata
     created_at: datetime = Field(default_factory=datetime.now, description="State creation timestamp")
-    updated_at: datetime = Field(default_factory=datetime.now, description="Last state update")
+    updated_at: Annotated[datetime, latest_timestamp] = Field(default_factory=datetime.now, description="Last state update")
     
     def update_timestamp(self) -> None:
         """Update the last modified timestamp."""
         self.updated_at = datetime.now()
     
+    def _map_payloads(self, transform: Any) -> "RASOMasterState":
+        state = self
+        for path, field in PAYLOAD_FIELDS:
+            state = _map_payload(state, path.split("."), field, transform)
+        return state
+    
+    def compact(self, store: Any, inline_limit: int = INLINE_PAYLOAD_LIMIT) -> "RASOMasterState":
+        """
+        Move large payloads (see ``PAYLOAD_FIELDS``) to the blob store.
+        
+        Args:
+            store: Blob store with ``put(bytes) -> digest``
+            inline_limit: Payloads up to this many bytes stay in the state
+            
+        Returns:
+            A state holding ``BlobRef`` references instead of the payloads;
+            this state itself if nothing needed moving
+        """
+        def to_ref(value: Any) -> Any:
+            if value is None or isinstance(value, BlobRef):
+                return value
+            kind, data = encode_payload(value)
+            if len(data) <= inline_limit:
+                return value
+            return BlobRef(digest=store.put(data), size=len(data), kind=kind)
+        
+        return self._map_payloads(to_ref)
+    
+    def hydrate(self, store: Any) -> "RASOMasterState":
+        """
+        Load the payloads referenced by a compacted state.
+        
+        Args:
+            store: Blob store with ``get(digest) -> bytes``
+            
+        Returns:
+            A state with every payload inline; this state itself if it holds no references
+        """
+        return self._map_payloads(lambda value: resolve(value, store))
+    
     def add_error(self, agent_type: AgentType, error_code: str, message: str, 
                   severity: ErrorSeverity = ErrorSeverity.ERROR, **kwargs) -> AgentError:
         """Add an error to the state."""
@@ -300,6 +471,9 @@ class RASOMasterState(BaseModel):
             summary["video_duration"] = self.video.duration
             summary["video_size_mb"] = self.video.file_size_mb
         
+        if self.degradations:
+            summary["degradations"] = self.degradations
+        
         return summary
     
     class Config:
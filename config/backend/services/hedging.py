@@ -0,0 +1,113 @@
+"""
+Request hedging policy for the RASO LLM service.
+
+A hedged request is sent to the primary provider first. If the primary has
+not answered within its observed tail latency, the same request goes to a
+second provider and whichever finishes first wins. Hedges are capped to a
+fraction of all requests so that duplicate spend stays bounded.
+"""
+
+from typing import Any, Dict, Sequence
+
+
+class HedgingPolicy:
+    """Decides when to hedge and tracks hedge budget and outcomes."""
+
+    def __init__(
+        self,
+        percentile: float = 0.9,
+        min_samples: int = 5,
+        default_delay: float = 10.0,
+        min_delay: float = 0.05,
+        budget_ratio: float = 0.1,
+        burst: int = 1,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            percentile: Latency percentile of the primary after which to hedge
+            min_samples: Latency samples required before the percentile is trusted
+            default_delay: Hedge delay in seconds while samples are insufficient
+            min_delay: Lower bound for the hedge delay in seconds
+            budget_ratio: Maximum fraction of requests that may be hedged
+            burst: Hedges allowed beyond the ratio, so that the first slow
+                requests can be hedged at all
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.budget_ratio = budget_ratio
+        self.burst = burst
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.primary_wins = 0
+        self.budget_denied = 0
+
+    def hedge_delay(self, latencies: Sequence[float]) -> float:
+        """
+        Get how long to wait for the primary before hedging.
+
+        Args:
+            latencies: Recent successful latencies of the primary provider
+
+        Returns:
+            Delay in seconds
+        """
+        if len(latencies) < self.min_samples:
+            return self.default_delay
+
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[index])
+
+    def record_request(self) -> None:
+        """Count a request eligible for hedging."""
+        self.requests += 1
+
+    def try_acquire(self) -> bool:
+        """
+        Reserve budget for one hedge.
+
+        Returns:
+            True if the hedge may be sent
+        """
+        if self.hedges + 1 > self.budget_ratio * self.requests + self.burst:
+            self.budget_denied += 1
+            return False
+
+        self.hedges += 1
+        return True
+
+    def record_winner(self, hedge_won: bool) -> None:
+        """
+        Record which request of a hedged pair finished first.
+
+        Args:
+            hedge_won: True if the hedge beat the primary
+        """
+        if hedge_won:
+            self.hedge_wins += 1
+        else:
+            self.primary_wins += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hedging metrics.
+
+        Returns:
+            Request and hedge counts, hedge rate, win counts and hedge win rate
+        """
+        decided = self.hedge_wins + self.primary_wins
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "primary_wins": self.primary_wins,
+            "hedge_win_rate": self.hedge_wins / decided if decided else 0.0,
+            "budget_denied": self.budget_denied,
+        }
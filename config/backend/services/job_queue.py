@@ -0,0 +1,546 @@
+"""
+Durable job queue for the RASO backend.
+
+Jobs are stored in SQLite so they survive API restarts, and are processed by
+separate worker processes (see ``config.backend.worker``) instead of inside
+the API process. Workers claim jobs by priority, subject to a per-tenant
+concurrency cap, and hold a lease (visibility timeout) that they renew with
+heartbeats. If a worker dies, its lease expires and the job is requeued
+automatically, up to a maximum number of attempts.
+
+Every job also has an append-only event log (status changes, and progress
+published by its worker) that API processes stream to clients, see
+``config.backend.services.progress_hub``. A finished job's events are kept
+for a retention window, so clients can still reconnect with ``Last-Event-ID``,
+and then deleted.
+
+``JobQueue`` is the backend interface; another store (e.g. Redis) can be
+plugged in by implementing it.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+QUEUED = "queued"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+DEFAULT_TENANT = "default"
+
+# Event types in the job event log
+STATUS_EVENT = "status"
+
+
+class JobQueue(ABC):
+    """Durable job store and work queue."""
+
+    @abstractmethod
+    def enqueue(
+        self,
+        job_id: str,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        tenant: str = DEFAULT_TENANT,
+    ) -> Dict[str, Any]:
+        """Add a job; higher priorities are claimed first."""
+
+    @abstractmethod
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Lease the next runnable job to a worker, or None if there is none."""
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend a worker's lease; False if the worker no longer holds the job."""
+
+    @abstractmethod
+    def update_progress(self, job_id: str, worker_id: str, progress: float, current_agent: Optional[str]) -> None:
+        """Record progress of a running job."""
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> None:
+        """Mark a job completed with its result."""
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error_message: str) -> None:
+        """Mark a job failed."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job."""
+
+    @abstractmethod
+    def list(
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        status: Optional[str] = None,
+        tenant: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """A page of jobs, newest first, and the total matching count."""
+
+    @abstractmethod
+    def requeue_expired(self) -> int:
+        """Requeue (or fail) jobs whose worker lease expired."""
+
+    @abstractmethod
+    def publish(self, job_id: str, event: str, data: Dict[str, Any]) -> int:
+        """Append an event to a job's event log and return its id."""
+
+    @abstractmethod
+    def events(self, job_id: Optional[str] = None, after_id: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """Events after an id, oldest first, of one job or of all jobs."""
+
+    @abstractmethod
+    def last_event_id(self) -> int:
+        """Id of the newest event of any job, 0 if there is none."""
+
+    @abstractmethod
+    def prune_events(self) -> int:
+        """Delete the events of jobs that finished before the retention window."""
+
+    @abstractmethod
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, running jobs and wait times."""
+
+
+class SQLiteJobQueue(JobQueue):
+    """SQLite-backed job queue with leases, priorities and per-tenant caps."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 3,
+        tenant_max_concurrent: int = 2,
+        tenant_limits: Optional[Dict[str, int]] = None,
+        event_retention: float = 3600.0,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            db_path: SQLite database file
+            visibility_timeout: Seconds a claimed job stays leased without a heartbeat
+            max_attempts: Claims before a job whose workers keep dying is failed
+            tenant_max_concurrent: Running jobs allowed per tenant
+            tenant_limits: Per-tenant overrides of ``tenant_max_concurrent``
+            event_retention: Seconds a finished job's events stay replayable
+        """
+        self.db_path = Path(db_path)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.tenant_max_concurrent = tenant_max_concurrent
+        self.tenant_limits = tenant_limits or {}
+        self.event_retention = event_retention
+        self._pruned_before = 0.0  # Jobs finished before this were pruned by this process
+
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; claims use explicit IMMEDIATE transactions across processes
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                tenant TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                current_agent TEXT,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error_message TEXT,
+                worker_id TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, priority DESC, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at DESC)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs(finished_at)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                event TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events(job_id, id)")
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a row to the job dict served by the API."""
+        payload = json.loads(row["payload"])
+        return {
+            "job_id": row["job_id"],
+            "tenant": row["tenant"],
+            "priority": row["priority"],
+            "status": row["status"],
+            "progress": row["progress"],
+            "current_agent": row["current_agent"],
+            "paper_input": payload.get("paper_input"),
+            "options": payload.get("options", {}),
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error_message": row["error_message"],
+            "worker_id": row["worker_id"],
+            "attempts": row["attempts"],
+            "created_at": datetime.fromtimestamp(row["created_at"]),
+            "updated_at": datetime.fromtimestamp(row["updated_at"]),
+            "started_at": datetime.fromtimestamp(row["started_at"]) if row["started_at"] else None,
+            "finished_at": datetime.fromtimestamp(row["finished_at"]) if row["finished_at"] else None,
+        }
+
+    def enqueue(
+        self,
+        job_id: str,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        tenant: str = DEFAULT_TENANT,
+    ) -> Dict[str, Any]:
+        """
+        Add a job to the queue.
+
+        Args:
+            job_id: Job identifier
+            payload: Paper input and options, as JSON-serializable data
+            priority: Higher values are claimed first
+            tenant: Tenant the job counts against for concurrency caps
+
+        Returns:
+            The stored job
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, tenant, priority, status, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, tenant, priority, QUEUED, json.dumps(payload, default=str), now, now),
+            )
+            self._record(job_id, STATUS_EVENT, {"status": QUEUED}, now)
+        return self.get(job_id)
+
+    def _tenant_limit(self, tenant: str) -> int:
+        return self.tenant_limits.get(tenant, self.tenant_max_concurrent)
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Lease the highest-priority, oldest queued job whose tenant is under its cap.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            The claimed job, or None if nothing is runnable
+        """
+        self.requeue_expired()
+        self.prune_events()
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                running = dict(self._conn.execute(
+                    "SELECT tenant, COUNT(*) FROM jobs WHERE status = ? GROUP BY tenant", (PROCESSING,)
+                ).fetchall())
+                blocked = [tenant for tenant, count in running.items() if count >= self._tenant_limit(tenant)]
+
+                query = "SELECT job_id FROM jobs WHERE status = ?"
+                params: List[Any] = [QUEUED]
+                if blocked:
+                    query += f" AND tenant NOT IN ({','.join('?' * len(blocked))})"
+                    params.extend(blocked)
+                query += " ORDER BY priority DESC, created_at LIMIT 1"
+
+                row = self._conn.execute(query, params).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, worker_id = ?, lease_expires = ?, attempts = attempts + 1, "
+                    "started_at = COALESCE(started_at, ?), updated_at = ? WHERE job_id = ?",
+                    (PROCESSING, worker_id, now + self.visibility_timeout, now, now, row["job_id"]),
+                )
+                self._record(row["job_id"], STATUS_EVENT, {"status": PROCESSING}, now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return self.get(row["job_id"])
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease of a job the worker still holds."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (now + self.visibility_timeout, now, job_id, worker_id, PROCESSING),
+            )
+        return cursor.rowcount == 1
+
+    def update_progress(self, job_id: str, worker_id: str, progress: float, current_agent: Optional[str]) -> None:
+        """Record progress; also renews the lease."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET progress = ?, current_agent = ?, lease_expires = ?, updated_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (progress, current_agent, now + self.visibility_timeout, now, job_id, worker_id, PROCESSING),
+            )
+
+    def _finish(self, job_id: str, worker_id: str, status: str, event: Dict[str, Any], **fields: Any) -> None:
+        now = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            finished = self._conn.execute(
+                f"UPDATE jobs SET status = ?, {assignments}, lease_expires = NULL, finished_at = ?, updated_at = ? "
+                "WHERE job_id = ? AND worker_id = ?",
+                (status, *fields.values(), now, now, job_id, worker_id),
+            ).rowcount
+            if finished:
+                self._record(job_id, STATUS_EVENT, {"status": status, **event}, now)
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> None:
+        """Mark a job completed with its result."""
+        self._finish(
+            job_id, worker_id, COMPLETED, {"progress": 100.0},
+            progress=100.0, result=json.dumps(result, default=str),
+        )
+
+    def fail(self, job_id: str, worker_id: str, error_message: str) -> None:
+        """Mark a job failed."""
+        self._finish(job_id, worker_id, FAILED, {"error": error_message}, error_message=error_message)
+
+    def _record(self, job_id: str, event: str, data: Dict[str, Any], now: float) -> int:
+        """Append an event; the caller holds the lock."""
+        return self._conn.execute(
+            "INSERT INTO job_events (job_id, event, data, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, event, json.dumps(data, default=str), now),
+        ).lastrowid
+
+    def publish(self, job_id: str, event: str, data: Dict[str, Any]) -> int:
+        """
+        Append an event to a job's event log.
+
+        Args:
+            job_id: Job identifier
+            event: Event type, e.g. ``progress``, ``stage`` or ``scene``
+            data: JSON-serializable event data
+
+        Returns:
+            Event id; ids increase across all jobs in commit order
+        """
+        with self._lock:
+            return self._record(job_id, event, data, time.time())
+
+    def events(self, job_id: Optional[str] = None, after_id: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Events after an id, oldest first.
+
+        Args:
+            job_id: Only events of this job (default: all jobs)
+            after_id: Return events with a larger id
+            limit: Maximum number of events
+
+        Returns:
+            Events with their id, job id, type, data and creation time
+        """
+        query = "SELECT * FROM job_events WHERE id > ?"
+        params: List[Any] = [after_id]
+        if job_id is not None:
+            query += " AND job_id = ?"
+            params.append(job_id)
+        query += " ORDER BY id LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {
+                "id": row["id"],
+                "job_id": row["job_id"],
+                "event": row["event"],
+                "data": json.loads(row["data"]),
+                "created_at": row["created_at"],
+            }
+            for row in rows
+        ]
+
+    def last_event_id(self) -> int:
+        """Id of the newest event of any job."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM job_events").fetchone()[0]
+
+    def prune_events(self) -> int:
+        """
+        Delete the events of jobs that finished more than ``event_retention`` ago.
+
+        Only jobs finished since the previous prune are visited, so this is
+        cheap enough to run on every claim.
+
+        Returns:
+            Number of events deleted
+        """
+        cutoff = time.time() - self.event_retention
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM job_events WHERE job_id IN "
+                "(SELECT job_id FROM jobs WHERE finished_at >= ? AND finished_at < ? AND status IN (?, ?))",
+                (self._pruned_before, cutoff, COMPLETED, FAILED),
+            ).rowcount
+            self._pruned_before = cutoff
+        return deleted
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def list(
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        status: Optional[str] = None,
+        tenant: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        A page of jobs, newest first.
+
+        Args:
+            offset: Jobs to skip
+            limit: Page size
+            status: Only jobs with this status
+            tenant: Only jobs of this tenant
+
+        Returns:
+            Jobs on the page and the total number of matching jobs
+        """
+        conditions, params = [], []
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if tenant:
+            conditions.append("tenant = ?")
+            params.append(tenant)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT * FROM jobs{where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [self._to_job(row) for row in rows], total
+
+    def requeue_expired(self) -> int:
+        """
+        Requeue jobs whose worker stopped heartbeating.
+
+        Jobs that already used ``max_attempts`` claims are failed instead, so
+        a job that crashes every worker cannot loop forever.
+
+        Returns:
+            Number of jobs requeued or failed
+        """
+        now = time.time()
+        error_message = "Worker lease expired too many times"
+        with self._lock:
+            failed = self._conn.execute(
+                "UPDATE jobs SET status = ?, error_message = ?, worker_id = NULL, lease_expires = NULL, "
+                "finished_at = ?, updated_at = ? WHERE status = ? AND lease_expires < ? AND attempts >= ? "
+                "RETURNING job_id",
+                (FAILED, error_message, now, now, PROCESSING, now, self.max_attempts),
+            ).fetchall()
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires < ? RETURNING job_id",
+                (QUEUED, now, PROCESSING, now),
+            ).fetchall()
+            for row in failed:
+                self._record(row["job_id"], STATUS_EVENT, {"status": FAILED, "error": error_message}, now)
+            for row in requeued:
+                self._record(row["job_id"], STATUS_EVENT, {"status": QUEUED, "requeued": True}, now)
+        return len(failed) + len(requeued)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Queue depth and wait-time metrics.
+
+        Returns:
+            Jobs per status, running jobs per tenant, the age of the oldest
+            queued job and the mean wait of recently started jobs
+        """
+        now = time.time()
+        with self._lock:
+            by_status = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            running = dict(self._conn.execute(
+                "SELECT tenant, COUNT(*) FROM jobs WHERE status = ? GROUP BY tenant", (PROCESSING,)
+            ).fetchall())
+            oldest = self._conn.execute(
+                "SELECT MIN(created_at) FROM jobs WHERE status = ?", (QUEUED,)
+            ).fetchone()[0]
+            mean_wait = self._conn.execute(
+                "SELECT AVG(started_at - created_at) FROM "
+                "(SELECT started_at, created_at FROM jobs WHERE started_at IS NOT NULL ORDER BY started_at DESC LIMIT 100)"
+            ).fetchone()[0]
+
+        return {
+            "queue_depth": by_status.get(QUEUED, 0),
+            "jobs_by_status": by_status,
+            "running_by_tenant": running,
+            "oldest_queued_wait_seconds": now - oldest if oldest else 0.0,
+            "mean_wait_seconds": mean_wait or 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get the global job queue configured for this process.
+
+    Raises:
+        ValueError: If the configured backend is not supported
+    """
+    global _job_queue
+    if _job_queue is None:
+        from config.backend.config import get_config
+        config = get_config()
+        if config.system.job_queue_backend != "sqlite":
+            raise ValueError(f"Unsupported job queue backend: {config.system.job_queue_backend}")
+        _job_queue = SQLiteJobQueue(
+            db_path=config.system.job_queue_path or (Path(config.data_path) / "jobs.sqlite3"),
+            visibility_timeout=config.system.job_visibility_timeout_seconds,
+            max_attempts=config.system.retry_attempts,
+            tenant_max_concurrent=config.system.tenant_max_concurrent_jobs,
+            tenant_limits=config.system.tenant_job_limits,
+            event_retention=config.system.job_event_retention_seconds,
+        )
+    return _job_queue
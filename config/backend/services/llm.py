@@ -9,6 +9,7 @@ import asyncio
 import json
 import time
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import Any, Dict, List, Optional, Union, AsyncGenerator
 from datetime import datetime, timedelta
 from enum import Enum
@@ -21,6 +22,12 @@ from pydantic import BaseModel, Field
 from config.backend.config import get_config
 from agents.retry import retry, RetryConfig
 from agents.logging import AgentLogger
+from config.backend.services.provider_health import ProviderHealthMonitor
+from config.backend.services.llm_cache import LLMResponseCache, get_llm_cache
+from config.backend.services.llm_dispatcher import estimate_tokens, get_llm_dispatcher
+from config.backend.services.stream_parser import parse_scene_stream
+from config.backend.services.hedging import HedgingPolicy
+from core.tracing import span
 
 
 class LLMProvider(str, Enum):
@@ -50,6 +57,9 @@ class LLMResponse(BaseModel):
     # Quality metrics
     confidence_score: Optional[float] = Field(default=None, ge=0.0, le=1.0, description="Confidence score")
     
+    # Caching
+    cached: bool = Field(default=False, description="Whether the response was served from cache")
+    
     @property
     def tokens_per_second(self) -> Optional[float]:
         """Calculate tokens per second generation rate."""
@@ -110,6 +120,22 @@ class BaseLLMProvider(ABC):
         """
         pass
     
+    async def generate_stream(self, request: LLMRequest) -> AsyncGenerator[str, None]:
+        """
+        Generate text as a stream of chunks.
+        
+        Providers without native streaming yield the complete response as a
+        single chunk.
+        
+        Args:
+            request: LLM request parameters
+            
+        Yields:
+            Generated text chunks in order
+        """
+        response = await self.generate(request)
+        yield response.content
+    
     @abstractmethod
     async def is_available(self) -> bool:
         """
@@ -219,6 +245,56 @@ class OllamaProvider(BaseLLMProvider):
         except aiohttp.ClientError as e:
             raise RuntimeError(f"Ollama connection error: {str(e)}")
     
+    async def generate_stream(self, request: LLMRequest) -> AsyncGenerator[str, None]:
+        """Stream text from Ollama as newline-delimited JSON chunks."""
+        self._validate_request(request)
+        
+        session = await self._create_session()
+        
+        payload = {
+            "model": request.model or self.default_model,
+            "prompt": request.prompt,
+            "stream": True,
+            "options": {
+                "temperature": request.temperature or self.config.llm.temperature,
+            }
+        }
+        
+        if request.max_tokens:
+            payload["options"]["num_predict"] = request.max_tokens
+        
+        if request.system_prompt:
+            payload["system"] = request.system_prompt
+        
+        if request.stop_sequences:
+            payload["options"]["stop"] = request.stop_sequences
+        
+        try:
+            url = f"{self.config.llm.ollama_url}/api/generate"
+            
+            async with session.post(url, json=payload) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise RuntimeError(f"Ollama API error {response.status}: {error_text}")
+                
+                async for line in response.content:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise RuntimeError(f"Ollama stream error: {data['error']}")
+                    
+                    if data.get("response"):
+                        yield data["response"]
+                    
+                    if data.get("done"):
+                        break
+                
+        except aiohttp.ClientError as e:
+            raise RuntimeError(f"Ollama connection error: {str(e)}")
+    
     async def is_available(self) -> bool:
         """Check if Ollama is available."""
         try:
@@ -539,6 +615,62 @@ class GoogleProvider(BaseLLMProvider):
         except aiohttp.ClientError as e:
             raise RuntimeError(f"Google API connection error: {str(e)}")
     
+    async def generate_stream(self, request: LLMRequest) -> AsyncGenerator[str, None]:
+        """Stream text from Google Gemini using server-sent events."""
+        self._validate_request(request)
+        
+        if not self.config.llm.google_api_key:
+            raise ValueError("Google API key not configured")
+        
+        session = await self._create_session()
+        
+        model = request.model or self.default_model
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent"
+        
+        payload = {
+            "contents": [
+                {
+                    "parts": [
+                        {"text": request.prompt}
+                    ]
+                }
+            ],
+            "generationConfig": {
+                "temperature": request.temperature or self.config.llm.temperature,
+            }
+        }
+        
+        if request.max_tokens:
+            payload["generationConfig"]["maxOutputTokens"] = request.max_tokens
+        
+        if request.stop_sequences:
+            payload["generationConfig"]["stopSequences"] = request.stop_sequences
+        
+        params = {
+            "key": self.config.llm.google_api_key,
+            "alt": "sse",
+        }
+        
+        try:
+            async with session.post(url, json=payload, headers={"Content-Type": "application/json"}, params=params) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise RuntimeError(f"Google API error {response.status}: {error_text}")
+                
+                async for line in response.content:
+                    line = line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    
+                    result = json.loads(line[len("data:"):])
+                    for candidate in result.get("candidates", [])[:1]:
+                        for part in candidate.get("content", {}).get("parts", []):
+                            if part.get("text"):
+                                yield part["text"]
+                
+        except aiohttp.ClientError as e:
+            raise RuntimeError(f"Google API connection error: {str(e)}")
+    
     async def is_available(self) -> bool:
         """Check if Google Gemini is available."""
         if not self.config.llm.google_api_key:
@@ -607,12 +739,47 @@ class LLMService:
             LLMProvider.ANTHROPIC,
             LLMProvider.GOOGLE,
         ]
+        
+        # Provider availability is checked in the background, never per request
+        self.health_monitor = ProviderHealthMonitor(
+            health_checks={
+                provider_type: provider.is_available
+                for provider_type, provider in self.providers.items()
+            },
+            check_interval=self.config.llm.health_check_interval_seconds,
+            cache_ttl=self.config.llm.health_cache_ttl_seconds,
+            failure_threshold=self.config.llm.circuit_failure_threshold,
+            recovery_timeout=self.config.llm.circuit_recovery_seconds,
+            ewma_alpha=self.config.llm.latency_ewma_alpha,
+        )
+        
+        # Persistent prompt/response cache (None when disabled)
+        self.cache = get_llm_cache()
+        
+        # Shared per-provider rate limits and concurrent fan-out
+        self.dispatcher = get_llm_dispatcher()
+        
+        # Tail-latency hedging across providers (opt-in)
+        self.hedging = HedgingPolicy(
+            percentile=self.config.llm.hedge_percentile,
+            min_samples=self.config.llm.hedge_min_samples,
+            default_delay=self.config.llm.hedge_default_delay_seconds,
+            budget_ratio=self.config.llm.hedge_budget_ratio,
+        )
+        
+        # Recent streaming latencies in seconds
+        self.stream_metrics: Dict[str, deque] = {
+            "time_to_first_chunk": deque(maxlen=100),
+            "time_to_first_scene": deque(maxlen=100),
+        }
     
     async def generate(
         self, 
         prompt: str, 
         model: Optional[str] = None,
         provider: Optional[LLMProvider] = None,
+        use_cache: bool = True,
+        hedge: Optional[bool] = None,
         **kwargs
     ) -> LLMResponse:
         """
@@ -622,6 +789,10 @@ class LLMService:
             prompt: Input prompt
             model: Specific model to use
             provider: Specific provider to use
+            use_cache: Serve and store responses in the persistent cache; disable
+                for creative sampling where repeated calls should differ
+            hedge: Race a second provider if the first is slower than its
+                observed tail latency; defaults to the ``hedge_enabled`` setting
             **kwargs: Additional parameters
             
         Returns:
@@ -633,23 +804,60 @@ class LLMService:
             **kwargs
         )
         
+        # Reruns of the same prompt are answered locally
+        if use_cache and self.cache:
+            cached = await self._get_cached_response(request, [provider] if provider else self.provider_priority)
+            if cached:
+                return cached
+        
+        await self.health_monitor.start()
+        
         # If specific provider requested, use it
         if provider:
-            return await self._generate_with_provider(provider, request)
+            response = await self._generate_with_provider(provider, request)
+            if use_cache:
+                await self._cache_response(request, response)
+            return response
         
-        # Otherwise, try providers in priority order
+        # Otherwise, try healthy providers, fastest observed first
         last_error = None
+        attempted: set = set()
+        ordered = self.health_monitor.order(self.provider_priority)
+        
+        if self.config.llm.hedge_enabled if hedge is None else hedge:
+            healthy = [provider_type for provider_type in ordered if self.health_monitor.is_healthy(provider_type)]
+            if len(healthy) >= 2:
+                try:
+                    response = await self._generate_hedged(request, healthy[0], healthy[1], attempted)
+                    if use_cache:
+                        await self._cache_response(request, response)
+                    
+                    self.logger.info(
+                        f"Successfully generated text using {response.provider}",
+                        model=response.model,
+                        tokens=response.total_tokens,
+                        response_time=response.response_time,
+                    )
+                    
+                    return response
+                except Exception as e:
+                    last_error = e
+                    self.logger.warning(f"Hedged generation failed: {str(e)}", exception=e)
         
-        for provider_type in self.provider_priority:
+        for provider_type in ordered:
+            if provider_type in attempted:
+                continue
+            
             try:
-                # Check if provider is available
-                provider_instance = self.providers[provider_type]
-                if not await provider_instance.is_available():
-                    self.logger.debug(f"Provider {provider_type} not available, skipping")
+                # Check cached provider health (no network round trip)
+                if not self.health_monitor.is_healthy(provider_type):
+                    self.logger.debug(f"Provider {provider_type} not healthy, skipping")
                     continue
                 
                 # Try generation
                 response = await self._generate_with_provider(provider_type, request)
+                if use_cache:
+                    await self._cache_response(request, response)
                 
                 self.logger.info(
                     f"Successfully generated text using {provider_type}",
@@ -671,32 +879,395 @@ class LLMService:
         # All providers failed
         raise RuntimeError(f"All LLM providers failed. Last error: {str(last_error)}")
     
+    def _cache_key(self, provider_type: LLMProvider, request: LLMRequest) -> str:
+        """Build the response cache key for a request on a given provider."""
+        model = request.model or self.providers[provider_type].default_model
+        params = {
+            "system_prompt": request.system_prompt,
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature,
+            "stop_sequences": request.stop_sequences,
+        }
+        return LLMResponseCache.make_key(provider_type.value, model, request.prompt, params)
+    
+    async def _get_cached_response(
+        self,
+        request: LLMRequest,
+        provider_types: List[LLMProvider],
+    ) -> Optional[LLMResponse]:
+        """Return the first cached response among the given providers."""
+        start_time = time.time()
+        
+        for provider_type in provider_types:
+            try:
+                with span("llm_cache.get", "cache", provider=provider_type.value) as lookup:
+                    payload = await self.cache.aget(self._cache_key(provider_type, request))
+                    if lookup:
+                        lookup.args["hit"] = payload is not None
+            except Exception as e:
+                self.logger.warning("LLM cache lookup failed", exception=e)
+                return None
+            
+            if payload:
+                payload["cached"] = True
+                payload["response_time"] = time.time() - start_time
+                self.logger.debug(f"LLM cache hit for {provider_type}", model=payload.get("model"))
+                return LLMResponse(**payload)
+        
+        return None
+    
+    async def _cache_response(self, request: LLMRequest, response: LLMResponse) -> None:
+        """Store a successful response in the persistent cache."""
+        if not self.cache or not response.content.strip():
+            return
+        
+        try:
+            await self.cache.aset(
+                self._cache_key(response.provider, request),
+                provider=response.provider.value,
+                model=response.model,
+                payload=json.loads(response.json()),
+                total_tokens=response.total_tokens,
+                response_time=response.response_time,
+            )
+        except Exception as e:
+            self.logger.warning("Failed to store LLM response in cache", exception=e)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get response cache metrics.
+        
+        Returns:
+            Hit rate and saved token statistics, or empty dict if caching is disabled
+        """
+        return self.cache.stats() if self.cache else {}
+    
     async def _generate_with_provider(
         self, 
         provider_type: LLMProvider, 
         request: LLMRequest
     ) -> LLMResponse:
-        """Generate text with specific provider."""
+        """Generate text with specific provider, recording health outcomes."""
         provider = self.providers[provider_type]
         
-        # Use provider's default model if none specified
+        # Use provider's default model if none specified, without leaking it
+        # into the shared request used for fallback providers
         if not request.model:
-            request.model = provider.default_model
+            request = request.copy(update={"model": provider.default_model})
         
-        return await provider.generate(request)
+        # Wait for the provider's requests/min and tokens/min budget
+        limiter = self.dispatcher.limiter(provider_type.value)
+        estimated = estimate_tokens((request.system_prompt or "") + request.prompt) + (
+            request.max_tokens or self.config.llm.max_tokens
+        )
+        await limiter.acquire(estimated)
+        
+        start_time = time.time()
+        try:
+            with span(f"llm.{provider_type.value}", "llm", model=request.model) as call:
+                response = await provider.generate(request)
+                if call:
+                    call.args["total_tokens"] = response.total_tokens
+        except ValueError:
+            # Invalid request or missing configuration, not a provider outage
+            raise
+        except Exception:
+            self.health_monitor.record_failure(provider_type)
+            raise
+        
+        self.health_monitor.record_success(provider_type, time.time() - start_time)
+        limiter.record_usage(estimated, response.total_tokens)
+        return response
+    
+    async def _generate_hedged(
+        self,
+        request: LLMRequest,
+        primary: LLMProvider,
+        backup: LLMProvider,
+        attempted: set,
+    ) -> LLMResponse:
+        """
+        Generate with the primary provider, hedging to the backup if it is slow.
+        
+        The backup receives the same request once the primary has exceeded its
+        observed tail latency and the hedge budget allows it. The first
+        successful response wins and the other request is cancelled.
+        
+        Args:
+            request: LLM request
+            primary: Preferred provider
+            backup: Provider raced against a slow primary
+            attempted: Updated with every provider a request was sent to
+            
+        Returns:
+            First successful response
+        """
+        self.hedging.record_request()
+        
+        attempted.add(primary)
+        primary_task = asyncio.ensure_future(self._generate_with_provider(primary, request))
+        
+        delay = self.hedging.hedge_delay(self.health_monitor.latency_samples(primary))
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done or not self.hedging.try_acquire():
+            return await primary_task
+        
+        self.logger.debug(f"Primary {primary} slower than {delay:.2f}s, hedging to {backup}")
+        attempted.add(backup)
+        hedge_task = asyncio.ensure_future(self._generate_with_provider(backup, request))
+        
+        pending = {primary_task, hedge_task}
+        last_error: Optional[BaseException] = None
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.hedging.record_winner(hedge_won=task is hedge_task)
+                        return task.result()
+                    last_error = task.exception()
+        finally:
+            # Cancel the loser (or both, if the caller was cancelled)
+            for task in (primary_task, hedge_task):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(primary_task, hedge_task, return_exceptions=True)
+        
+        raise last_error
+    
+    def get_hedging_stats(self) -> Dict[str, Any]:
+        """
+        Get request hedging metrics.
+        
+        Returns:
+            Hedge counts, budget denials and how often hedges win
+        """
+        return self.hedging.stats()
+    
+    async def generate_many(
+        self,
+        prompts: List[str],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> List[Union[LLMResponse, Exception]]:
+        """
+        Generate responses for independent prompts concurrently.
+        
+        Prompts are dispatched together under the per-provider rate limits,
+        so a batch of per-scene prompts takes roughly one LLM latency rather
+        than one per prompt. Each prompt is retried individually.
+        
+        Args:
+            prompts: Prompts to generate, e.g. one per scene
+            max_concurrency: Maximum in-flight requests
+            return_exceptions: Return a prompt's exception in its slot instead of raising
+            **kwargs: Parameters passed to ``generate``
+            
+        Returns:
+            Responses in the same order as ``prompts``
+        """
+        async def generate_one(prompt: str) -> LLMResponse:
+            return await self.generate(prompt, **kwargs)
+        
+        return await self.dispatcher.map(
+            generate_one,
+            prompts,
+            max_concurrency=max_concurrency,
+            return_exceptions=return_exceptions,
+        )
+    
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        provider: Optional[LLMProvider] = None,
+        use_cache: bool = True,
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """
+        Generate text as a stream of chunks using the best available provider.
+        
+        Falls back to the next provider only if the failing one has not yet
+        produced any output. The complete text is cached like ``generate``.
+        
+        Args:
+            prompt: Input prompt
+            model: Specific model to use
+            provider: Specific provider to use
+            use_cache: Serve and store responses in the persistent cache
+            **kwargs: Additional parameters
+            
+        Yields:
+            Generated text chunks in order
+        """
+        request = LLMRequest(
+            prompt=prompt,
+            model=model,
+            **kwargs
+        )
+        
+        if use_cache and self.cache:
+            cached = await self._get_cached_response(request, [provider] if provider else self.provider_priority)
+            if cached:
+                yield cached.content
+                return
+        
+        await self.health_monitor.start()
+        
+        candidates = [provider] if provider else [
+            provider_type
+            for provider_type in self.health_monitor.order(self.provider_priority)
+            if self.health_monitor.is_healthy(provider_type)
+        ]
+        
+        last_error = None
+        
+        for provider_type in candidates:
+            start_time = time.time()
+            parts: List[str] = []
+            
+            try:
+                async for chunk in self._stream_with_provider(provider_type, request):
+                    parts.append(chunk)
+                    yield chunk
+            except Exception as e:
+                # Output already sent downstream cannot be retracted
+                if parts or provider:
+                    raise
+                last_error = e
+                self.logger.warning(
+                    f"Provider {provider_type} failed to stream: {str(e)}",
+                    exception=e
+                )
+                continue
+            
+            response = LLMResponse(
+                content="".join(parts),
+                model=request.model or self.providers[provider_type].default_model,
+                provider=provider_type,
+                response_time=time.time() - start_time,
+            )
+            if use_cache:
+                await self._cache_response(request, response)
+            
+            self.logger.info(
+                f"Successfully streamed text using {provider_type}",
+                model=response.model,
+                chunks=len(parts),
+                response_time=response.response_time,
+            )
+            return
+        
+        raise RuntimeError(f"All LLM providers failed. Last error: {str(last_error)}")
+    
+    async def generate_scenes_stream(
+        self,
+        prompt: str,
+        array_key: str = "scenes",
+        **kwargs
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Stream scene objects from a script prompt as soon as each is complete.
+        
+        Downstream stages can start on the first scene while later scenes are
+        still being generated. Time to first scene is recorded in
+        ``stream_metrics``.
+        
+        Args:
+            prompt: Script prompt asking for a JSON document with a scene array
+            array_key: Key of the scene array in the JSON document
+            **kwargs: Parameters passed to ``generate_stream``
+            
+        Yields:
+            Scene dicts in document order
+        """
+        metrics: Dict[str, Any] = {}
+        first_scene = True
+        
+        async for scene in parse_scene_stream(self.generate_stream(prompt, **kwargs), array_key, metrics):
+            if first_scene:
+                first_scene = False
+                self.stream_metrics["time_to_first_scene"].append(metrics["time_to_first_scene"])
+                self.logger.info(
+                    "First scene streamed",
+                    time_to_first_scene=metrics["time_to_first_scene"],
+                )
+            yield scene
+    
+    async def _stream_with_provider(
+        self,
+        provider_type: LLMProvider,
+        request: LLMRequest
+    ) -> AsyncGenerator[str, None]:
+        """Stream text with specific provider, recording health outcomes."""
+        provider = self.providers[provider_type]
+        
+        if not request.model:
+            request = request.copy(update={"model": provider.default_model})
+        
+        limiter = self.dispatcher.limiter(provider_type.value)
+        estimated = estimate_tokens((request.system_prompt or "") + request.prompt) + (
+            request.max_tokens or self.config.llm.max_tokens
+        )
+        await limiter.acquire(estimated)
+        
+        start_time = time.time()
+        first_chunk = True
+        try:
+            async for chunk in provider.generate_stream(request):
+                if first_chunk:
+                    self.stream_metrics["time_to_first_chunk"].append(time.time() - start_time)
+                    first_chunk = False
+                yield chunk
+        except ValueError:
+            raise
+        except Exception:
+            self.health_monitor.record_failure(provider_type)
+            raise
+        
+        self.health_monitor.record_success(provider_type, time.time() - start_time)
+    
+    def get_stream_metrics(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Get streaming latency metrics.
+        
+        Returns:
+            Sample count, last, mean and median for time to first chunk and
+            time to first scene
+        """
+        metrics = {}
+        for name, samples in self.stream_metrics.items():
+            ordered = sorted(samples)
+            metrics[name] = {
+                "count": len(ordered),
+                "last": samples[-1] if samples else None,
+                "mean": sum(ordered) / len(ordered) if ordered else None,
+                "p50": ordered[len(ordered) // 2] if ordered else None,
+            }
+        return metrics
     
     async def get_available_providers(self) -> List[LLMProvider]:
         """Get list of available providers."""
-        available = []
+        await self.health_monitor.check_all()
         
-        for provider_type, provider in self.providers.items():
-            try:
-                if await provider.is_available():
-                    available.append(provider_type)
-            except Exception:
-                pass
+        return [
+            provider_type for provider_type in self.providers
+            if self.health_monitor.is_healthy(provider_type)
+        ]
+    
+    def get_provider_health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get cached health, circuit state and latency for each provider.
         
-        return available
+        Returns:
+            Mapping of provider name to health information
+        """
+        return {
+            provider_type.value: health
+            for provider_type, health in self.health_monitor.snapshot().items()
+        }
     
     async def get_provider_models(self, provider: LLMProvider) -> List[str]:
         """Get available models for a provider."""
@@ -726,18 +1297,37 @@ class LLMService:
         # Schema validation if provided
         if schema:
             try:
-                import jsonschema
-                # Try to parse response as JSON if schema provided
                 content_json = json.loads(response.content)
-                jsonschema.validate(content_json, schema)
-                return True
-            except (json.JSONDecodeError, jsonschema.ValidationError):
+            except json.JSONDecodeError:
                 return False
+            return self.validate_json(content_json, schema)
         
         return True
     
+    @staticmethod
+    def validate_json(data: Any, schema: Dict[str, Any]) -> bool:
+        """
+        Validate already-parsed JSON data against a schema.
+        
+        Args:
+            data: Parsed JSON value, e.g. one entry of a batched response
+            schema: JSON schema
+            
+        Returns:
+            True if valid
+        """
+        import jsonschema
+        
+        try:
+            jsonschema.validate(data, schema)
+            return True
+        except jsonschema.ValidationError:
+            return False
+    
     async def cleanup(self) -> None:
         """Clean up resources."""
+        await self.health_monitor.stop()
+        
         for provider in self.providers.values():
             try:
                 await provider._close_session()
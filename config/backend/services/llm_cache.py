@@ -0,0 +1,255 @@
+"""
+Persistent prompt/response cache for the RASO LLM integrations.
+
+Stores generated text in SQLite keyed by a hash of provider, model, prompt
+and generation parameters, so reruns of the same paper skip repeated LLM
+calls. Entries expire after a TTL and the least recently used entries are
+evicted once the cache exceeds its size limit.
+
+Lookups only read the database: access times of hits are kept in memory and
+written in one batch before the next eviction pass. Async callers use
+``aget``/``aset``, which run the SQLite I/O in a worker thread.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class LLMResponseCache:
+    """SQLite-backed LLM response cache with TTL and LRU size eviction."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 10000,
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            db_path: SQLite database file
+            ttl_seconds: Age after which entries expire
+            max_entries: Maximum number of cached responses
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}  # Access times not yet written
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                total_tokens INTEGER NOT NULL DEFAULT 0,
+                response_time REAL NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache(last_access)")
+        self._conn.commit()
+
+        # Metrics for this process
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build a cache key for a generation request.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            prompt: Full prompt text
+            params: Generation parameters that affect the output
+
+        Returns:
+            Hex digest identifying the request
+        """
+        material = json.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "prompt": prompt,
+                "params": params or {},
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from ``make_key``
+
+        Returns:
+            Cached payload or None on a miss or expired entry
+        """
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, total_tokens, response_time, created_at FROM llm_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None or now - row[3] > self.ttl_seconds:
+                # Expired entries are deleted by the next eviction pass
+                self.misses += 1
+                return None
+
+            self._touched[key] = now
+            self.hits += 1
+            self.saved_tokens += row[1]
+            self.saved_seconds += row[2]
+
+        return json.loads(row[0])
+
+    def set(
+        self,
+        key: str,
+        provider: str,
+        model: str,
+        payload: Dict[str, Any],
+        total_tokens: Optional[int] = None,
+        response_time: float = 0.0,
+    ) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key from ``make_key``
+            provider: Provider name
+            model: Model name
+            payload: JSON-serializable response data
+            total_tokens: Tokens consumed by the original request
+            response_time: Latency of the original request in seconds
+        """
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_cache
+                    (key, provider, model, payload, total_tokens, response_time, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, provider, model, json.dumps(payload, default=str),
+                 total_tokens or 0, response_time, now, now),
+            )
+            self._touched.pop(key, None)
+            self._flush_touches_locked()
+            self._evict_locked(now)
+            self._conn.commit()
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response without blocking the event loop."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, provider: str, model: str, payload: Dict[str, Any], **kwargs: Any) -> None:
+        """Store a response without blocking the event loop."""
+        await asyncio.to_thread(self.set, key, provider, model, payload, **kwargs)
+
+    def _flush_touches_locked(self) -> None:
+        """Write the batched access times of cache hits; caller holds the lock."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE llm_cache SET last_access = ? WHERE key = ?",
+                [(last_access, key) for key, last_access in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict_locked(self, now: float) -> None:
+        """Remove expired entries and trim to ``max_entries``; caller holds the lock."""
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (overflow,),
+            )
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Hit/miss counts, hit rate, saved tokens and seconds, and entry count
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_tokens": self.saved_tokens,
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+    def close(self) -> None:
+        """Write pending access times and close the database connection."""
+        with self._lock:
+            self._flush_touches_locked()
+            self._conn.commit()
+            self._conn.close()
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the global response cache.
+
+    Returns:
+        Cache instance, or None if caching is disabled in configuration
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        from config.backend.config import get_config
+        config = get_config()
+        if not config.llm.cache_enabled:
+            return None
+        _llm_cache = LLMResponseCache(
+            db_path=config.llm.cache_path or (Path(config.data_path) / "llm_cache.sqlite3"),
+            ttl_seconds=config.llm.cache_ttl_seconds,
+            max_entries=config.llm.cache_max_entries,
+        )
+    return _llm_cache
@@ -0,0 +1,293 @@
+"""
+Concurrent LLM call dispatcher for the RASO platform.
+
+Fans independent per-scene LLM calls out concurrently instead of awaiting
+them one after another. Calls are bounded by a concurrency limit and by
+per-provider token buckets for requests per minute and tokens per minute,
+results keep the order of their inputs, and each item is retried on its own
+so that one failing scene does not restart the whole batch.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from agents.retry import RetryConfig, retry_with_config
+from core.resource_governor import ResourceGovernor, get_resource_governor, work_cost
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the token count of a prompt.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Estimated number of tokens (about four characters per token)
+    """
+    return max(1, len(text or "") // 4)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            per_minute: Bucket capacity and refill rate per minute; 0 disables limiting
+        """
+        self.per_minute = per_minute
+        self.capacity = float(per_minute)
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        """Check if the bucket never blocks."""
+        return self.per_minute <= 0
+
+    def _refill(self) -> None:
+        """Add tokens accrued since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.per_minute / 60.0)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """
+        Take ``amount`` tokens, waiting until the bucket has refilled enough.
+
+        Tokens are reserved immediately and the balance may go negative, so
+        waiters are served in arrival order without holding a lock while
+        they sleep. Requests larger than the bucket are clamped to its
+        capacity so they cannot block forever.
+
+        Args:
+            amount: Number of tokens to take
+        """
+        if self.unlimited:
+            return
+
+        amount = min(float(amount), self.capacity)
+        self._refill()
+        self._tokens -= amount
+        if self._tokens >= 0:
+            return
+
+        try:
+            await asyncio.sleep(-self._tokens * 60.0 / self.per_minute)
+        except asyncio.CancelledError:
+            # Give the reservation back to the callers queued behind us
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+            raise
+
+    def adjust(self, amount: float) -> None:
+        """
+        Take (or return, if negative) tokens without waiting.
+
+        Used to correct an estimate once the actual usage is known. The
+        balance may go negative, which delays subsequent callers.
+
+        Args:
+            amount: Number of tokens to take
+        """
+        if self.unlimited:
+            return
+
+        self._refill()
+        self._tokens = max(-self.capacity, min(self.capacity, self._tokens - amount))
+
+
+class ProviderRateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one provider."""
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget per minute; 0 disables the limit
+            tokens_per_minute: Token budget per minute; 0 disables the limit
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    async def acquire(self, estimated_tokens: int = 0) -> None:
+        """
+        Wait for one request slot and the estimated token budget.
+
+        Args:
+            estimated_tokens: Expected prompt plus completion tokens
+        """
+        await self.requests.acquire(1)
+        if estimated_tokens:
+            await self.tokens.acquire(estimated_tokens)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """
+        Correct the token budget with the usage reported by the provider.
+
+        Args:
+            estimated_tokens: Tokens taken in ``acquire``
+            actual_tokens: Tokens actually consumed, if known
+        """
+        if actual_tokens is not None:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+
+class LLMDispatcher:
+    """Bounded, rate-limited, order-preserving fan-out of LLM calls."""
+
+    def __init__(
+        self,
+        rate_limits: Optional[Dict[str, Dict[str, float]]] = None,
+        default_requests_per_minute: float = 0,
+        default_tokens_per_minute: float = 0,
+        max_concurrency: int = 8,
+        retry_config: Optional[RetryConfig] = None,
+        governor: Optional[ResourceGovernor] = None,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            rate_limits: Per-provider limits, e.g.
+                ``{"openai": {"requests_per_minute": 500, "tokens_per_minute": 80000}}``
+            default_requests_per_minute: Request limit for providers not listed
+            default_tokens_per_minute: Token limit for providers not listed
+            max_concurrency: Default maximum number of in-flight calls per ``map``
+            retry_config: Retry behavior for individual items
+            governor: Resource governor whose ``llm`` quota bounds in-flight
+                calls across all jobs of the process
+        """
+        self.rate_limits = rate_limits or {}
+        self.default_requests_per_minute = default_requests_per_minute
+        self.default_tokens_per_minute = default_tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.retry_config = retry_config or RetryConfig(max_attempts=2, base_delay=1.0, max_delay=10.0)
+        self.governor = governor
+
+        self._limiters: Dict[str, ProviderRateLimiter] = {}
+
+    def limiter(self, provider: str) -> ProviderRateLimiter:
+        """
+        Get the rate limiter for a provider.
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            Limiter shared by all callers of that provider
+        """
+        if provider not in self._limiters:
+            limits = self.rate_limits.get(provider, {})
+            self._limiters[provider] = ProviderRateLimiter(
+                requests_per_minute=limits.get("requests_per_minute", self.default_requests_per_minute),
+                tokens_per_minute=limits.get("tokens_per_minute", self.default_tokens_per_minute),
+            )
+        return self._limiters[provider]
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[R]],
+        *args,
+        provider: Optional[str] = None,
+        estimated_tokens: int = 0,
+        **kwargs,
+    ) -> R:
+        """
+        Run one LLM call under the provider's rate limit with retries.
+
+        Every attempt, including retries, takes from the rate limit.
+
+        Args:
+            func: Async function performing the call
+            *args: Function arguments
+            provider: Provider to rate limit against; None if ``func`` is
+                rate limited elsewhere (e.g. by ``LLMService``)
+            estimated_tokens: Expected tokens for the tokens-per-minute limit
+            **kwargs: Function keyword arguments
+
+        Returns:
+            Function result
+        """
+        async def attempt():
+            if provider is not None:
+                await self.limiter(provider).acquire(estimated_tokens)
+            if self.governor is None:
+                return await func(*args, **kwargs)
+            async with self.governor.acquire(**work_cost("llm")):
+                return await func(*args, **kwargs)
+
+        return await retry_with_config(attempt, self.retry_config)
+
+    async def map(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Iterable[T],
+        provider: Optional[str] = None,
+        estimate: Optional[Callable[[T], int]] = None,
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Apply an async LLM call to every item concurrently.
+
+        Args:
+            func: Async function called once per item
+            items: Inputs, e.g. scenes
+            provider: Provider to rate limit against (see ``call``)
+            estimate: Function estimating the tokens needed for an item
+            max_concurrency: Maximum in-flight calls (defaults to the dispatcher setting)
+            return_exceptions: Return an item's exception in its slot instead of
+                raising it once all items have finished
+
+        Returns:
+            Results in the same order as ``items``
+        """
+        items = list(items)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.max_concurrency))
+
+        async def run(item: T) -> R:
+            async with semaphore:
+                return await self.call(
+                    func,
+                    item,
+                    provider=provider,
+                    estimated_tokens=estimate(item) if estimate else 0,
+                )
+
+        results = await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+        return results
+
+
+_llm_dispatcher: Optional[LLMDispatcher] = None
+
+
+def get_llm_dispatcher() -> LLMDispatcher:
+    """Get the global LLM dispatcher."""
+    global _llm_dispatcher
+    if _llm_dispatcher is None:
+        from config.backend.config import get_config
+        config = get_config()
+        _llm_dispatcher = LLMDispatcher(
+            rate_limits=config.llm.provider_rate_limits,
+            default_requests_per_minute=config.llm.default_requests_per_minute,
+            default_tokens_per_minute=config.llm.default_tokens_per_minute,
+            max_concurrency=config.llm.dispatcher_max_concurrency,
+            governor=get_resource_governor(),
+        )
+    return _llm_dispatcher
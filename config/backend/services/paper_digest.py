@@ -0,0 +1,271 @@
+"""
+Map-reduce paper condensation for the RASO platform.
+
+Long papers are summarized section by section in parallel (map) and the
+section summaries are merged into one structured ``PaperDigest`` (reduce).
+Digests are cached per paper hash so that the understanding prompts reuse
+the same compact context instead of re-sending the full paper text. Digests
+degraded by a failed LLM call (extractive section summaries, or a reduce
+step that fell back to the abstract) are returned but not cached, so the
+next run retries the LLM instead of reusing the fallback.
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.backend.config import get_config
+from config.backend.models.paper import PaperContent, PaperDigest
+from config.backend.services.llm import llm_service
+from config.backend.services.llm_dispatcher import estimate_tokens
+from agents.logging import AgentLogger
+
+
+class DigestPrompts:
+    """Prompt templates for paper condensation."""
+
+    SECTION_SUMMARY = """
+    Summarize this section of the research paper "{title}" for a video script writer.
+
+    Section: {section_title}
+    {section_text}
+
+    Write 3-5 dense sentences covering the key ideas, methods, numbers and
+    conclusions of this section. Keep technical terms. Do not add commentary.
+    """
+
+    DIGEST_REDUCE = """
+    Merge these section summaries of the research paper "{title}" into a structured digest.
+
+    Abstract: {abstract}
+
+    Section summaries:
+    {summaries}
+
+    Format as JSON:
+    {{
+        "overview": "2-3 sentence overview of the whole paper",
+        "problem": "problem statement and motivation",
+        "method": "approach and key techniques",
+        "results": "main findings with key numbers",
+        "limitations": "limitations and open questions",
+        "contributions": ["contribution 1", "contribution 2"],
+        "key_terms": ["term 1", "term 2"]
+    }}
+    """
+
+
+class PaperCondenser:
+    """Builds and caches map-reduce digests of research papers."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        chunk_chars: int = 6000,
+        summary_max_tokens: int = 300,
+        digest_max_tokens: int = 1200,
+    ):
+        """
+        Initialize the condenser.
+
+        Args:
+            cache_dir: Directory for cached digests (defaults to data_path/digests)
+            chunk_chars: Maximum characters of section text per map prompt
+            summary_max_tokens: Token limit for each section summary
+            digest_max_tokens: Token limit for the reduce step
+        """
+        self.config = get_config()
+        self.cache_dir = Path(cache_dir or Path(self.config.data_path) / "digests")
+        self.chunk_chars = chunk_chars
+        self.summary_max_tokens = summary_max_tokens
+        self.digest_max_tokens = digest_max_tokens
+        self.prompts = DigestPrompts()
+        self.logger = AgentLogger(None)
+
+        self._memory: Dict[str, PaperDigest] = {}
+        self.last_metrics: Dict[str, Any] = {}
+
+    async def condense(self, paper_content: PaperContent, use_cache: bool = True) -> PaperDigest:
+        """
+        Get the digest for a paper, building it if not cached.
+
+        Args:
+            paper_content: Paper content to condense
+            use_cache: Whether to read and write the digest cache
+
+        Returns:
+            Structured paper digest
+        """
+        paper_hash = paper_content.content_hash()
+
+        if use_cache:
+            cached = self._load(paper_hash)
+            if cached:
+                self.logger.debug("Paper digest cache hit", paper_hash=paper_hash[:12])
+                return cached
+
+        start_time = time.time()
+        section_summaries, failed_sections = await self._map_sections(paper_content)
+        map_seconds = time.time() - start_time
+
+        digest, reduced = await self._reduce(paper_content, paper_hash, section_summaries)
+        total_seconds = time.time() - start_time
+        complete = reduced and not failed_sections
+
+        self.last_metrics = {
+            "sections": len(section_summaries),
+            "original_tokens": digest.original_tokens,
+            "digest_tokens": digest.digest_tokens,
+            "token_reduction": round(digest.token_reduction, 3),
+            "map_seconds": round(map_seconds, 3),
+            "reduce_seconds": round(total_seconds - map_seconds, 3),
+            "total_seconds": round(total_seconds, 3),
+            "failed_sections": failed_sections,
+            "complete": complete,
+        }
+        self.logger.info("Paper condensed", **self.last_metrics)
+
+        if use_cache and complete:
+            self._save(digest)
+
+        return digest
+
+    def _chunks(self, paper_content: PaperContent) -> List[Tuple[str, str]]:
+        """Split sections into (section title, text) chunks that fit one map prompt."""
+        chunks = []
+        for section in paper_content.sections:
+            text = section.content
+            for start in range(0, len(text), self.chunk_chars):
+                chunks.append((section.title, text[start:start + self.chunk_chars]))
+        return chunks
+
+    async def _map_sections(self, paper_content: PaperContent) -> Tuple[Dict[str, str], int]:
+        """Summarize all section chunks concurrently; returns the summaries and the failed chunk count."""
+        chunks = self._chunks(paper_content)
+        prompts = [
+            self.prompts.SECTION_SUMMARY.format(
+                title=paper_content.title,
+                section_title=section_title,
+                section_text=text,
+            )
+            for section_title, text in chunks
+        ]
+
+        responses = await llm_service.generate_many(
+            prompts,
+            return_exceptions=True,
+            temperature=0.1,
+            max_tokens=self.summary_max_tokens,
+        )
+
+        summaries: Dict[str, str] = {}
+        failures = 0
+        for (section_title, text), response in zip(chunks, responses):
+            if isinstance(response, Exception) or not response.content.strip():
+                failures += 1
+                summary = self._extractive_summary(text)
+            else:
+                summary = " ".join(response.content.split())
+
+            summaries[section_title] = f"{summaries[section_title]} {summary}" if section_title in summaries else summary
+
+        if failures:
+            self.logger.warning(f"{failures}/{len(chunks)} section summaries fell back to extractive summaries")
+
+        return summaries, failures
+
+    async def _reduce(
+        self,
+        paper_content: PaperContent,
+        paper_hash: str,
+        section_summaries: Dict[str, str],
+    ) -> Tuple[PaperDigest, bool]:
+        """Merge section summaries into a structured digest; the flag is False if the LLM step failed."""
+        summaries_text = "\n".join(f"- {title}: {summary}" for title, summary in section_summaries.items())
+        prompt = self.prompts.DIGEST_REDUCE.format(
+            title=paper_content.title,
+            abstract=paper_content.abstract,
+            summaries=summaries_text,
+        )
+
+        data: Dict[str, Any] = {}
+        try:
+            response = await llm_service.generate(
+                prompt=prompt,
+                temperature=0.1,
+                max_tokens=self.digest_max_tokens,
+            )
+            match = re.search(r"\{.*\}", response.content, re.DOTALL)
+            if match:
+                data = json.loads(match.group())
+        except Exception as e:
+            self.logger.warning(f"Digest reduce step failed, using section summaries: {str(e)}")
+
+        digest = PaperDigest(
+            paper_hash=paper_hash,
+            title=paper_content.title,
+            overview=data.get("overview") or paper_content.abstract,
+            problem=data.get("problem", ""),
+            method=data.get("method", ""),
+            results=data.get("results", ""),
+            limitations=data.get("limitations", ""),
+            contributions=[str(c) for c in data.get("contributions", [])],
+            key_terms=[str(t) for t in data.get("key_terms", [])] or list(paper_content.keywords),
+            section_summaries=section_summaries,
+            original_tokens=estimate_tokens(
+                paper_content.abstract + "".join(s.content for s in paper_content.sections)
+            ),
+        )
+        digest.digest_tokens = estimate_tokens(digest.to_prompt_text())
+        return digest, bool(data)
+
+    @staticmethod
+    def _extractive_summary(text: str, max_sentences: int = 3) -> str:
+        """Fallback summary made of the leading sentences of a chunk."""
+        sentences = re.split(r"(?<=[.!?])\s+", " ".join(text.split()))
+        return " ".join(sentences[:max_sentences])
+
+    def _path(self, paper_hash: str) -> Path:
+        """Cache file for a paper hash."""
+        return self.cache_dir / f"{paper_hash}.json"
+
+    def _load(self, paper_hash: str) -> Optional[PaperDigest]:
+        """Load a cached digest from memory or disk."""
+        if paper_hash in self._memory:
+            return self._memory[paper_hash]
+
+        path = self._path(paper_hash)
+        if not path.exists():
+            return None
+
+        try:
+            digest = PaperDigest.parse_file(path)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable digest cache {path}: {str(e)}")
+            return None
+
+        self._memory[paper_hash] = digest
+        return digest
+
+    def _save(self, digest: PaperDigest) -> None:
+        """Store a digest in memory and on disk."""
+        self._memory[digest.paper_hash] = digest
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._path(digest.paper_hash).write_text(digest.json(), encoding="utf-8")
+        except OSError as e:
+            self.logger.warning(f"Failed to write digest cache: {str(e)}")
+
+
+_paper_condenser: Optional[PaperCondenser] = None
+
+
+def get_paper_condenser() -> PaperCondenser:
+    """Get the global paper condenser."""
+    global _paper_condenser
+    if _paper_condenser is None:
+        _paper_condenser = PaperCondenser()
+    return _paper_condenser
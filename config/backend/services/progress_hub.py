@@ -0,0 +1,388 @@
+"""
+Push-based job progress for the RASO API.
+
+Workers publish progress, stage changes and per-scene status of the job
+they run to the job queue's event log (``ProgressPublisher``, fed from
+``ProcessingProgress.update_progress``), alongside the status changes the
+queue records itself. Each API process runs one ``ProgressHub`` that polls
+the log for all jobs and fans new events out to its subscribers, which the
+SSE and WebSocket endpoints stream to clients, so one database query per
+poll interval serves any number of open dashboards.
+
+Progress updates are coalesced twice: publishers write at most one progress
+event per interval, and a subscriber that falls behind keeps only the newest
+progress event and the newest status of each scene. Stage and status events
+are never dropped. Because the log is durable, a client resumes from the
+last event id it saw (the SSE ``Last-Event-ID`` header), and a subscriber
+that overflows its buffer is resynchronized from the log instead of losing
+events.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from config.backend.models.state import ProcessingProgress, progress_listener
+from config.backend.services.job_queue import COMPLETED, FAILED, STATUS_EVENT, JobQueue
+
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_EVENT = "progress"
+STAGE_EVENT = "stage"
+SCENE_EVENT = "scene"
+
+TERMINAL_STATUSES = (COMPLETED, FAILED)
+
+
+def is_terminal(event: Dict[str, Any]) -> bool:
+    """Whether an event ends the job's stream."""
+    return event["event"] == STATUS_EVENT and event["data"].get("status") in TERMINAL_STATUSES
+
+
+def coalesce_key(event: Dict[str, Any]) -> Any:
+    """Events with the same key supersede each other; other events are kept."""
+    if event["event"] == PROGRESS_EVENT:
+        return PROGRESS_EVENT
+    if event["event"] == SCENE_EVENT:
+        return (SCENE_EVENT, event["data"].get("scene_id"))
+    return event["id"]
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode an event as a Server-Sent Events message."""
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+
+class ProgressPublisher:
+    """Publishes the progress of one running job to the job queue's event log."""
+
+    def __init__(self, queue: JobQueue, job_id: str, min_interval: float = 0.5):
+        """
+        Initialize the publisher.
+
+        Args:
+            queue: Job queue holding the event log
+            job_id: Job whose progress is published
+            min_interval: Minimum seconds between progress events; stage and
+                scene changes are published immediately
+        """
+        self.queue = queue
+        self.job_id = job_id
+        self.min_interval = min_interval
+
+        self._started = time.monotonic()
+        self._stage: Optional[str] = None
+        self._scenes: Dict[str, Any] = {}
+        self._last_progress_at: Optional[float] = None
+        self._pending: Optional[Dict[str, Any]] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def _eta_seconds(self, progress: float, estimated_completion: Optional[datetime] = None) -> Optional[float]:
+        """Seconds until the job completes, from the estimate or the progress rate so far."""
+        if estimated_completion is not None:
+            return max(0.0, (estimated_completion - datetime.now()).total_seconds())
+        if not 0.0 < progress < 100.0:
+            return None
+        elapsed = time.monotonic() - self._started
+        return round(elapsed * (100.0 - progress) / progress, 1)
+
+    def report(
+        self,
+        stage: Optional[str],
+        progress: float,
+        message: Optional[str] = None,
+        estimated_completion: Optional[datetime] = None,
+        **extra: Any,
+    ) -> None:
+        """
+        Report the job's progress.
+
+        Args:
+            stage: Current workflow stage
+            progress: Overall progress in percent
+            message: Status message
+            estimated_completion: Expected completion time, if known
+            **extra: Additional progress fields
+        """
+        if stage is not None and stage != self._stage:
+            self.flush()
+            self._stage = stage
+            self.queue.publish(self.job_id, STAGE_EVENT, {"stage": stage, "message": message})
+
+        self._pending = {
+            "progress": round(progress, 1),
+            "stage": self._stage,
+            "message": message,
+            "eta_seconds": self._eta_seconds(progress, estimated_completion),
+            **extra,
+        }
+
+        now = time.monotonic()
+        if self._last_progress_at is None or now - self._last_progress_at >= self.min_interval:
+            self.flush()
+        else:
+            self._schedule_flush(self.min_interval - (now - self._last_progress_at))
+
+    def _schedule_flush(self, delay: float) -> None:
+        """Publish a held-back progress event once the interval has passed."""
+        if self._flush_handle is not None:
+            return
+        try:
+            self._flush_handle = asyncio.get_running_loop().call_later(delay, self.flush)
+        except RuntimeError:
+            # No running event loop; the next report or flush() publishes it
+            pass
+
+    def update(self, progress: ProcessingProgress) -> None:
+        """Report a ``ProcessingProgress`` update, including per-scene status changes."""
+        scenes = progress.detailed_status.get("scenes") or {}
+        for scene_id, stages in scenes.items():
+            if self._scenes.get(scene_id) != stages:
+                self._scenes[scene_id] = dict(stages)
+                self.queue.publish(self.job_id, SCENE_EVENT, {"scene_id": scene_id, "stages": stages})
+
+        self.report(
+            progress.current_step.value,
+            progress.overall_progress * 100.0,
+            message=progress.current_message,
+            estimated_completion=progress.estimated_completion,
+            step_progress=round(progress.step_progress, 3),
+        )
+
+    def flush(self) -> None:
+        """Publish the held-back progress event, if any."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending is not None:
+            self.queue.publish(self.job_id, PROGRESS_EVENT, self._pending)
+            self._pending = None
+            self._last_progress_at = time.monotonic()
+
+    @contextmanager
+    def listen(
+        self, on_update: Optional[Callable[[ProcessingProgress], None]] = None
+    ) -> Iterator["ProgressPublisher"]:
+        """
+        Publish every ``ProcessingProgress.update_progress`` of this context.
+
+        Args:
+            on_update: Also called with every update, after it is published
+        """
+        def listener(progress: ProcessingProgress) -> None:
+            self.update(progress)
+            if on_update is not None:
+                on_update(progress)
+
+        token = progress_listener.set(listener)
+        try:
+            yield self
+        finally:
+            progress_listener.reset(token)
+            self.flush()
+
+
+class Subscription:
+    """A client's stream of one job's events."""
+
+    def __init__(self, hub: "ProgressHub", job_id: str, last_event_id: int, max_pending: int):
+        self.hub = hub
+        self.job_id = job_id
+        self.last_event_id = last_event_id
+        self.max_pending = max_pending
+        self.done = False
+
+        self._buffer: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._buffered_id = last_event_id  # Newest event buffered or delivered
+        self._wakeup = asyncio.Event()
+        self._resync = True  # Replay the log after last_event_id before live events
+
+    def _add(self, event: Dict[str, Any]) -> None:
+        key = coalesce_key(event)
+        self._buffer.pop(key, None)
+        self._buffer[key] = event
+        self._buffered_id = event["id"]
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        """Buffer a live event, superseding an older event with the same key."""
+        if self._resync or event["id"] <= self._buffered_id:
+            # Covered by a replay of the log
+            self._wakeup.set()
+            return
+
+        self._add(event)
+        if len(self._buffer) > self.max_pending:
+            # Too far behind: drop the buffer and catch up from the log
+            self._buffer.clear()
+            self._resync = True
+        self._wakeup.set()
+
+    def _replay(self) -> None:
+        """Load the events after ``last_event_id`` from the log, coalesced."""
+        self._resync = False
+        self._buffer.clear()
+        self._buffered_id = after_id = self.last_event_id
+        while True:
+            page = self.hub.queue.events(self.job_id, after_id=after_id, limit=1000)
+            for event in page:
+                self._add(event)
+            if len(page) < 1000:
+                break
+            after_id = page[-1]["id"]
+
+        if not self._buffer and self.hub.is_finished(self.job_id):
+            # Resumed after the last event of a finished job
+            self.done = True
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Seconds to wait before returning None (for keep-alives)
+
+        Returns:
+            The next event, or None on timeout or once the stream is done
+        """
+        while not self.done:
+            if self._resync:
+                self._replay()
+            if self._buffer:
+                _, event = self._buffer.popitem(last=False)
+                self.last_event_id = event["id"]
+                if is_terminal(event):
+                    self.close()
+                return event
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return None
+
+    def close(self) -> None:
+        """Stop receiving events."""
+        self.done = True
+        self._wakeup.set()
+        self.hub.unsubscribe(self)
+
+
+class ProgressHub:
+    """Fans job events from the queue's event log out to subscribers in this process."""
+
+    def __init__(self, queue: JobQueue, poll_interval: float = 0.25, max_pending: int = 256):
+        """
+        Initialize the hub.
+
+        Args:
+            queue: Job queue holding the event log
+            poll_interval: Seconds between polls of the log while anyone is subscribed
+            max_pending: Buffered events per subscriber before it is resynchronized from the log
+        """
+        self.queue = queue
+        self.poll_interval = poll_interval
+        self.max_pending = max_pending
+
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._cursor = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        """Open subscriptions in this process."""
+        return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    def subscribe(self, job_id: str, last_event_id: int = 0) -> Subscription:
+        """
+        Subscribe to a job's events.
+
+        Args:
+            job_id: Job to follow
+            last_event_id: Resume after this event (0 replays the whole log)
+
+        Returns:
+            Subscription; close it when the client goes away
+        """
+        if self._task is None or self._task.done():
+            self._cursor = self.queue.last_event_id()
+            self._task = asyncio.ensure_future(self._run())
+
+        subscription = Subscription(self, job_id, last_event_id, self.max_pending)
+        self._subscribers.setdefault(job_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription."""
+        subscriptions = self._subscribers.get(subscription.job_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscribers[subscription.job_id]
+
+    def is_finished(self, job_id: str) -> bool:
+        """Whether a job has completed or failed."""
+        job = self.queue.get(job_id)
+        return job is not None and job["status"] in TERMINAL_STATUSES
+
+    def poll(self) -> int:
+        """
+        Dispatch the events published since the last poll.
+
+        Returns:
+            Number of new events
+        """
+        return self._dispatch(self.queue.events(after_id=self._cursor, limit=1000))
+
+    def _dispatch(self, events: List[Dict[str, Any]]) -> int:
+        """Offer events to their job's subscribers and advance the cursor."""
+        for event in events:
+            for subscription in list(self._subscribers.get(event["job_id"], ())):
+                subscription.offer(event)
+        if events:
+            self._cursor = events[-1]["id"]
+        return len(events)
+
+    async def _run(self) -> None:
+        """Poll the log while anyone is subscribed."""
+        while self._subscribers:
+            try:
+                # A full page means more are waiting; poll again right away
+                events = await asyncio.to_thread(self.queue.events, after_id=self._cursor, limit=1000)
+                if self._dispatch(events) >= 1000:
+                    continue
+            except Exception as e:
+                logger.warning(f"Polling job events failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def stop(self) -> None:
+        """Close all subscriptions and stop polling."""
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in list(subscriptions):
+                subscription.close()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+_progress_hub: Optional[ProgressHub] = None
+
+
+def get_progress_hub() -> ProgressHub:
+    """Get the progress hub of this API process."""
+    global _progress_hub
+    if _progress_hub is None:
+        from config.backend.config import get_config
+        from config.backend.services.job_queue import get_job_queue
+        _progress_hub = ProgressHub(
+            get_job_queue(),
+            poll_interval=get_config().system.progress_poll_interval_seconds,
+        )
+    return _progress_hub
@@ -0,0 +1,262 @@
+"""
+Provider health monitoring for the RASO LLM service.
+
+Keeps provider availability, circuit breaker state and latency statistics
+off the request path: availability is refreshed by a background task and
+cached with a TTL, failures feed per-provider circuit breakers, and observed
+latencies are smoothed into an EWMA used to order providers.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from agents.retry import CircuitBreaker, CircuitBreakerState
+
+
+class ProviderHealth:
+    """Cached health information for a single provider."""
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        """
+        Initialize provider health.
+
+        Args:
+            failure_threshold: Consecutive failures before the circuit opens
+            recovery_timeout: Seconds before an open circuit is retried
+        """
+        self.available: Optional[bool] = None  # None until first health check
+        self.checked_at: Optional[float] = None
+        self.latency_ewma: Optional[float] = None
+        self.latencies: deque = deque(maxlen=100)
+        self.successes = 0
+        self.failures = 0
+        self.breaker = CircuitBreaker(
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+        )
+
+    def is_stale(self, ttl_seconds: float) -> bool:
+        """Check if the cached availability is missing or older than the TTL."""
+        return self.checked_at is None or (time.monotonic() - self.checked_at) > ttl_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize health information for metrics and status endpoints."""
+        return {
+            "available": self.available,
+            "checked_seconds_ago": (
+                round(time.monotonic() - self.checked_at, 1) if self.checked_at is not None else None
+            ),
+            "circuit_state": self.breaker.state.value,
+            "latency_ewma": self.latency_ewma,
+            "successes": self.successes,
+            "failures": self.failures,
+        }
+
+
+class ProviderHealthMonitor:
+    """Background health monitor with TTL caching and circuit breaking."""
+
+    def __init__(
+        self,
+        health_checks: Dict[Hashable, Callable[[], Awaitable[bool]]],
+        check_interval: float = 30.0,
+        cache_ttl: float = 90.0,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 60.0,
+        ewma_alpha: float = 0.3,
+    ):
+        """
+        Initialize the health monitor.
+
+        Args:
+            health_checks: Mapping of provider key to async availability check
+            check_interval: Seconds between background health check rounds
+            cache_ttl: Age after which cached availability is refreshed
+            failure_threshold: Consecutive failures before a circuit opens
+            recovery_timeout: Seconds before an open circuit is retried
+            ewma_alpha: Weight of the newest latency sample in the EWMA
+        """
+        self.health_checks = health_checks
+        self.check_interval = check_interval
+        self.cache_ttl = cache_ttl
+        self.ewma_alpha = ewma_alpha
+
+        self.health: Dict[Hashable, ProviderHealth] = {
+            key: ProviderHealth(failure_threshold, recovery_timeout)
+            for key in health_checks
+        }
+
+        self._task: Optional[asyncio.Task] = None
+        self._initial_check: Optional[asyncio.Task] = None
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+    async def start(self) -> None:
+        """
+        Start background monitoring if not already running.
+
+        The first call waits for one round of health checks so that callers
+        never route requests based on unknown availability.
+        """
+        if self._task is None or self._task.done():
+            self._initial_check = asyncio.ensure_future(self.check_all())
+            self._task = asyncio.ensure_future(self._run())
+
+        if self._initial_check is not None and not self._initial_check.done():
+            await asyncio.shield(self._initial_check)
+
+    async def stop(self) -> None:
+        """Stop background monitoring."""
+        tasks = [task for task in [self._task, self._initial_check, *self._refreshing.values()] if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._initial_check = None
+        self._refreshing.clear()
+
+    async def _run(self) -> None:
+        """Periodically refresh provider availability."""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_all()
+
+    async def check_all(self) -> None:
+        """Run all provider health checks concurrently."""
+        await asyncio.gather(
+            *(self.check(key) for key in self.health_checks),
+            return_exceptions=True,
+        )
+
+    async def check(self, key: Hashable) -> bool:
+        """
+        Run the health check for one provider and cache the result.
+
+        Args:
+            key: Provider key
+
+        Returns:
+            Provider availability
+        """
+        try:
+            available = bool(await self.health_checks[key]())
+        except Exception:
+            available = False
+
+        health = self.health[key]
+        health.available = available
+        health.checked_at = time.monotonic()
+        return available
+
+    def is_healthy(self, key: Hashable) -> bool:
+        """
+        Check provider health from cache without any I/O.
+
+        Stale entries still answer from cache but schedule a background refresh.
+
+        Args:
+            key: Provider key
+
+        Returns:
+            True if the provider was last seen available and its circuit allows requests
+        """
+        health = self.health[key]
+
+        if health.is_stale(self.cache_ttl):
+            self._schedule_refresh(key)
+
+        # Unknown availability is treated optimistically; the circuit breaker
+        # takes over if the provider turns out to be down
+        return health.available is not False and health.breaker.allow_request()
+
+    def _schedule_refresh(self, key: Hashable) -> None:
+        """Refresh one provider in the background if not already refreshing."""
+        pending = self._refreshing.get(key)
+        if pending is not None and not pending.done():
+            return
+
+        try:
+            self._refreshing[key] = asyncio.ensure_future(self.check(key))
+        except RuntimeError:
+            # No running event loop; the next monitor round will refresh it
+            pass
+
+    def record_success(self, key: Hashable, latency: float) -> None:
+        """
+        Record a successful request.
+
+        Args:
+            key: Provider key
+            latency: Request latency in seconds
+        """
+        health = self.health[key]
+        health.successes += 1
+        health.available = True
+        health.breaker.record_success()
+
+        health.latencies.append(latency)
+
+        if health.latency_ewma is None:
+            health.latency_ewma = latency
+        else:
+            health.latency_ewma = self.ewma_alpha * latency + (1 - self.ewma_alpha) * health.latency_ewma
+
+    def record_failure(self, key: Hashable) -> None:
+        """
+        Record a failed request.
+
+        Args:
+            key: Provider key
+        """
+        health = self.health[key]
+        health.failures += 1
+        health.breaker.record_failure()
+
+        if health.breaker.state == CircuitBreakerState.OPEN:
+            # Re-check availability now, so that once the recovery timeout has
+            # passed the provider is only retried if its health check succeeded
+            self._schedule_refresh(key)
+
+    def latency_samples(self, key: Hashable) -> List[float]:
+        """
+        Get recent successful request latencies.
+
+        Args:
+            key: Provider key
+
+        Returns:
+            Up to the last 100 latencies in seconds, oldest first
+        """
+        health = self.health.get(key)
+        return list(health.latencies) if health else []
+
+    def order(self, priority: List[Hashable]) -> List[Hashable]:
+        """
+        Order providers by observed latency, keeping static priority as tie-breaker.
+
+        Only providers with latency samples are reordered, among the positions
+        they hold in the configured priority. Providers without samples keep
+        their configured position, so an untested provider is neither preferred
+        over nor pushed behind the measured ones.
+
+        Args:
+            priority: Configured provider priority
+
+        Returns:
+            Providers in priority order, with measured ones sorted by latency EWMA
+        """
+        def latency(key: Hashable) -> Optional[float]:
+            return self.health[key].latency_ewma if key in self.health else None
+
+        measured_slots = [index for index, key in enumerate(priority) if latency(key) is not None]
+        by_latency = sorted(measured_slots, key=lambda index: (latency(priority[index]), index))
+
+        ordered = list(priority)
+        for slot, index in zip(measured_slots, by_latency):
+            ordered[slot] = priority[index]
+        return ordered
+
+    def snapshot(self) -> Dict[Hashable, Dict[str, Any]]:
+        """Get health information for all providers."""
+        return {key: health.to_dict() for key, health in self.health.items()}
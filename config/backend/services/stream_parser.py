@@ -0,0 +1,160 @@
+"""
+Incremental scene parsing for streamed LLM script responses.
+
+Script prompts ask the model for a JSON document with a ``scenes`` array.
+Instead of waiting for the full document, ``IncrementalSceneParser`` scans
+chunks as they arrive and emits each scene object as soon as its closing
+brace has been received, so downstream stages can start on the first scene
+while later scenes are still being generated.
+"""
+
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+
+class IncrementalSceneParser:
+    """Emit complete scene objects from a partially received JSON document."""
+
+    def __init__(self, array_key: str = "scenes"):
+        """
+        Initialize the parser.
+
+        Args:
+            array_key: Key of the array whose object items are scenes. A bare
+                top-level array is also treated as the scene array.
+        """
+        self.array_key = array_key
+
+        self._buffer = ""
+        self._pos = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+
+        # Open containers: (bracket, is_scene_array, scene_start)
+        self._stack: List[List[Any]] = []
+        self.scenes_emitted = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consume a chunk of the response.
+
+        Args:
+            chunk: Next piece of streamed text
+
+        Returns:
+            Scene objects completed by this chunk, in document order
+        """
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+
+        for index in range(self._pos, len(buffer)):
+            char = buffer[index]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = buffer[self._string_start + 1:index]
+                continue
+
+            if char == '"':
+                if self._stack:
+                    self._in_string = True
+                    self._string_start = index
+            elif char == ":":
+                self._current_key = self._last_string
+            elif char in "{[":
+                self._open(char, index)
+            elif char in "}]" and self._stack:
+                scene = self._close(index)
+                if scene is not None:
+                    completed.append(scene)
+
+        self._pos = len(buffer)
+        self.scenes_emitted += len(completed)
+        return completed
+
+    def _open(self, char: str, index: int) -> None:
+        """Push a container, noting scene arrays and scene objects."""
+        parent = self._stack[-1] if self._stack else None
+
+        if char == "[":
+            if parent is None:
+                is_scene_array = True
+            else:
+                is_scene_array = parent[0] == "{" and self._current_key == self.array_key
+            self._stack.append(["[", is_scene_array, None])
+        else:
+            scene_start = index if parent is not None and parent[0] == "[" and parent[1] else None
+            self._stack.append(["{", False, scene_start])
+
+        self._current_key = None
+
+    def _close(self, index: int) -> Optional[Dict[str, Any]]:
+        """Pop a container and return it if it completes a scene."""
+        _, _, scene_start = self._stack.pop()
+        self._current_key = None
+
+        if scene_start is None:
+            return None
+
+        try:
+            scene = json.loads(self._buffer[scene_start:index + 1])
+        except ValueError:
+            # Malformed scene; the full-document parse decides what to do with it
+            return None
+
+        return scene if isinstance(scene, dict) else None
+
+    @property
+    def text(self) -> str:
+        """Full text received so far."""
+        return self._buffer
+
+
+async def parse_scene_stream(
+    chunks: AsyncIterator[str],
+    array_key: str = "scenes",
+    metrics: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Turn a stream of text chunks into a stream of scene objects.
+
+    Args:
+        chunks: Streamed response text
+        array_key: Key of the scene array in the JSON document
+        metrics: Optional dict updated with ``time_to_first_chunk``,
+            ``time_to_first_scene``, ``total_time``, ``scene_count`` and the
+            full response ``text`` once the stream ends
+
+    Yields:
+        Scene dicts, each as soon as it is complete
+    """
+    parser = IncrementalSceneParser(array_key)
+    start_time = time.time()
+    if metrics is not None:
+        metrics.update({"time_to_first_chunk": None, "time_to_first_scene": None})
+
+    async for chunk in chunks:
+        if metrics is not None and metrics["time_to_first_chunk"] is None:
+            metrics["time_to_first_chunk"] = time.time() - start_time
+
+        for scene in parser.feed(chunk):
+            if metrics is not None and metrics["time_to_first_scene"] is None:
+                metrics["time_to_first_scene"] = time.time() - start_time
+            yield scene
+
+    if metrics is not None:
+        metrics.update({
+            "total_time": time.time() - start_time,
+            "scene_count": parser.scenes_emitted,
+            "text": parser.text,
+        })
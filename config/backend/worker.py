@@ -0,0 +1,234 @@
+"""
+RASO Platform job worker.
+
+Claims jobs from the durable job queue and runs the video generation
+workflow for them, outside the API process. Run a worker with:
+
+    python -m config.backend.worker --jobs 4
+
+A worker process runs up to ``--jobs`` jobs at once, and they share the
+process's resource governor (CPU slots, memory budget and API quotas). The
+governor does not coordinate across processes, so run one worker process per
+machine and raise ``--jobs`` rather than ``--processes``; several processes on
+one machine each assume the whole machine is theirs.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import traceback
+import uuid
+from typing import Any, Dict, Optional, Set
+
+from config.backend.config import get_config
+from config.backend.models.paper import PaperInput
+from config.backend.models.state import ProcessingProgress, RASOMasterState, WorkflowStatus
+from config.backend.services.job_queue import JobQueue, get_job_queue
+from config.backend.services.progress_hub import ProgressPublisher
+from core.resource_governor import job_scope
+from core.tracing import STAGE, Tracer, span, trace_path
+
+
+class JobWorker:
+    """Runs queued jobs, several at a time under one resource governor, while keeping their leases alive."""
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: float = 2.0,
+        concurrency: int = 1,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            queue: Job queue to claim from (defaults to the configured queue)
+            worker_id: Identifier recorded on claimed jobs
+            poll_interval: Seconds to wait when the queue has nothing runnable
+            concurrency: Jobs to run at once in this process
+        """
+        self.queue = queue or get_job_queue()
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.poll_interval = poll_interval
+        self.concurrency = max(1, concurrency)
+        self.heartbeat_interval = max(1.0, get_config().system.job_visibility_timeout_seconds / 3)
+        self._stopping = False
+
+    def stop(self) -> None:
+        """Stop after the running jobs."""
+        self._stopping = True
+
+    async def run(self) -> None:
+        """Claim and process jobs until stopped, keeping up to ``concurrency`` running."""
+        running: Set[asyncio.Task] = set()
+        try:
+            while not self._stopping:
+                if len(running) < self.concurrency:
+                    job = await asyncio.to_thread(self.queue.claim, self.worker_id)
+                    if job is not None:
+                        running.add(asyncio.create_task(self.process_job(job)))
+                        continue
+                if running:
+                    # Wake up when a job finishes, or poll again for new jobs
+                    _, running = await asyncio.wait(
+                        running,
+                        timeout=None if len(running) >= self.concurrency else self.poll_interval,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                else:
+                    await asyncio.sleep(self.poll_interval)
+            if running:
+                await asyncio.wait(running)
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def _heartbeat(self, job_id: str, run: "asyncio.Task") -> bool:
+        """Keep the job's lease alive; cancel the run and return True once the lease is lost."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if not await asyncio.to_thread(self.queue.heartbeat, job_id, self.worker_id):
+                print(f"⚠️ Worker {self.worker_id} lost the lease on job {job_id}, cancelling it")
+                run.cancel()
+                return True
+
+    async def process_job(self, job: Dict[str, Any]) -> None:
+        """
+        Run the workflow for a claimed job and record the outcome.
+
+        If the lease is lost (e.g. the worker stalled and the job was handed
+        to another worker), the run is cancelled and no outcome is recorded,
+        so two workers never produce the same job.
+        """
+        job_id = job["job_id"]
+        run = asyncio.create_task(self._run_job(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, run))
+        try:
+            await run
+        except asyncio.CancelledError:
+            lease_lost = heartbeat.done() and not heartbeat.cancelled() and heartbeat.result()
+            if not lease_lost:
+                raise
+        finally:
+            heartbeat.cancel()
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        """Run a claimed job and record its result or failure."""
+        from core.workflow import WorkflowOrchestrator
+
+        job_id = job["job_id"]
+        tracer = Tracer(job_id)
+        try:
+            rebuild = job.get("options", {}).get("rebuild")
+            if rebuild:
+                with tracer.activate(), span("rebuild", STAGE):
+                    result = await self._rebuild(rebuild, job_id)
+                self.queue.complete(job_id, self.worker_id, {**result, "trace": self._export_trace(tracer)})
+                return
+
+            orchestrator = WorkflowOrchestrator()
+
+            def record_progress(progress: ProcessingProgress) -> None:
+                self.queue.update_progress(
+                    job_id, self.worker_id, round(progress.overall_progress * 100.0, 1), progress.current_step.value
+                )
+
+            # The workflow's progress updates are pushed to event stream subscribers
+            publisher = ProgressPublisher(self.queue, job_id, get_config().system.progress_min_interval_seconds)
+            # job_scope shares this process's resource governor fairly with its other jobs
+            with tracer.activate(), job_scope(job_id), publisher.listen(on_update=record_progress):
+                # A job requeued after its worker died resumes from its checkpoints
+                final_state = await orchestrator.resume_workflow(job_id)
+                if final_state is None:
+                    final_state = await orchestrator.execute_workflow(RASOMasterState(
+                        job_id=job_id,
+                        paper_input=PaperInput(**job["paper_input"]),
+                        options=job.get("options", {}),
+                    ))
+            trace = self._export_trace(tracer)
+
+            if final_state.progress.current_step == WorkflowStatus.FAILED or final_state.has_critical_errors():
+                error = "; ".join(e.message for e in final_state.get_critical_errors()) or "Workflow failed"
+                print(f"❌ Job {job_id} failed: {error}")
+                self.queue.fail(job_id, self.worker_id, error)
+            else:
+                self.queue.complete(job_id, self.worker_id, {
+                    "video": final_state.video.dict() if final_state.video else None,
+                    "metadata": final_state.metadata.dict() if final_state.metadata else None,
+                    "degradations": final_state.degradations,
+                    "trace": trace,
+                })
+
+        except Exception as e:
+            # Unexpected error - log full traceback
+            error_traceback = traceback.format_exc()
+            print(f"❌ Unexpected error in job {job_id}:")
+            print(error_traceback)
+            self.queue.fail(job_id, self.worker_id, f"{str(e)}\n\nTraceback:\n{error_traceback}")
+
+    @staticmethod
+    def _export_trace(tracer: Tracer) -> Optional[Dict[str, Any]]:
+        """Write the job's Chrome trace and summarize it for the job result."""
+        if not get_config().system.job_tracing:
+            return None
+        path = tracer.export(trace_path(tracer.job_id))
+        return {**tracer.summary(), "path": str(path)}
+
+    async def _rebuild(self, rebuild: Dict[str, Any], job_id: str) -> Dict[str, Any]:
+        """Regenerate the assets of a completed job affected by an edit, as the rebuild job ``job_id``."""
+        from core.regeneration import get_regeneration_service
+
+        state, plan = await get_regeneration_service().rebuild(
+            rebuild["source_job_id"], rebuild["edits"], rebuild_id=job_id
+        )
+        return {
+            "video": state.video.dict() if state.video else None,
+            "metadata": state.metadata.dict() if state.metadata else None,
+            "rebuild": plan.to_dict(),
+        }
+
+
+def run_worker(jobs: int = 1) -> None:
+    """Run a worker in this process."""
+    asyncio.run(JobWorker(concurrency=jobs).run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RASO job worker")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=get_config().system.max_concurrent_jobs,
+        help="Jobs each worker process runs at once, under one resource governor",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Worker processes to start (each has its own resource governor; use one per machine)",
+    )
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_worker(args.jobs)
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(args.jobs,), daemon=False)
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
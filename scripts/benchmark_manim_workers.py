@@ -0,0 +1,154 @@
+"""
+Manim Render Overhead Benchmark for RASO Platform
+
+Compares per-scene wall time of short Manim scenes rendered with one
+``manim`` CLI process per scene against the warm worker pool used by
+ManimAgent. Short scenes make the fixed per-process cost (interpreter
+startup, Manim/Cairo/LaTeX imports, font loading) visible.
+
+Usage:
+    python scripts/benchmark_manim_workers.py --scenes 10 --quality low_quality
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "raso"))
+
+from agents.manim_workers import ManimWorkerPool
+
+
+SHORT_SCENE = '''
+from manim import *
+
+
+class ShortScene(Scene):
+    def construct(self):
+        square = Square(color=BLUE)
+        self.play(Create(square), run_time={run_time})
+'''
+
+CLI_QUALITY_FLAGS = {
+    "low_quality": "l",
+    "medium_quality": "m",
+    "high_quality": "h",
+    "production_quality": "p",
+    "fourk_quality": "k",
+}
+
+RESOLUTIONS = {
+    "low_quality": "854x480",
+    "medium_quality": "1280x720",
+    "high_quality": "1920x1080",
+    "production_quality": "2560x1440",
+    "fourk_quality": "3840x2160",
+}
+
+
+def summarize(times: List[float]) -> Dict[str, float]:
+    """Summary statistics of per-scene wall times."""
+    return {
+        "mean": statistics.mean(times),
+        "median": statistics.median(times),
+        "min": min(times),
+        "max": max(times),
+        "total": sum(times),
+    }
+
+
+def bench_cli(code: str, scenes: int, quality: str, work_dir: Path) -> List[float]:
+    """Render scenes one CLI process at a time."""
+    scene_file = work_dir / "short_scene.py"
+    scene_file.write_text(code)
+
+    times = []
+    for i in range(scenes):
+        start = time.perf_counter()
+        subprocess.run(
+            [
+                "manim", "render", str(scene_file), "ShortScene",
+                "-q", CLI_QUALITY_FLAGS[quality],
+                "--disable_caching",
+                "--progress_bar", "none",
+                "--media_dir", str(work_dir / "cli_media"),
+                "-o", f"cli_{i}.mp4",
+            ],
+            cwd=work_dir,
+            capture_output=True,
+            check=True,
+        )
+        times.append(time.perf_counter() - start)
+    return times
+
+
+async def bench_workers(code: str, scenes: int, quality: str, work_dir: Path) -> Dict[str, object]:
+    """Render scenes one at a time through a single warm worker."""
+    pool = ManimWorkerPool(size=1, max_renders_per_worker=scenes + 1)
+
+    # Pay the one-off startup outside the timed loop, but report it
+    start = time.perf_counter()
+    await pool.render(code, str(work_dir / "warmup.mp4"), str(work_dir), quality, RESOLUTIONS[quality])
+    startup = time.perf_counter() - start
+
+    times = []
+    for i in range(scenes):
+        start = time.perf_counter()
+        reply = await pool.render(
+            code, str(work_dir / f"worker_{i}.mp4"), str(work_dir), quality, RESOLUTIONS[quality]
+        )
+        if not reply.get("success"):
+            raise RuntimeError(reply.get("error"))
+        times.append(time.perf_counter() - start)
+
+    await pool.shutdown()
+    return {"startup": startup, "times": times}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Manim CLI vs warm worker rendering")
+    parser.add_argument("--scenes", type=int, default=10, help="Number of scenes per mode")
+    parser.add_argument("--run-time", type=float, default=0.5, help="Animation length per scene in seconds")
+    parser.add_argument("--quality", default="low_quality", choices=sorted(CLI_QUALITY_FLAGS))
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    code = SHORT_SCENE.format(run_time=args.run_time)
+
+    with tempfile.TemporaryDirectory(prefix="raso_manim_bench_") as tmp:
+        work_dir = Path(tmp)
+        cli = summarize(bench_cli(code, args.scenes, args.quality, work_dir))
+        workers = asyncio.run(bench_workers(code, args.scenes, args.quality, work_dir))
+
+    warm = summarize(workers["times"])
+    results = {
+        "scenes": args.scenes,
+        "quality": args.quality,
+        "scene_run_time": args.run_time,
+        "cli": cli,
+        "warm_worker": warm,
+        "worker_startup": workers["startup"],
+        "per_scene_overhead_saved": cli["mean"] - warm["mean"],
+        "speedup": cli["mean"] / warm["mean"] if warm["mean"] else None,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.scenes} scenes, {args.run_time}s animation, {args.quality}")
+    print(f"  CLI per scene:          mean {cli['mean']:.2f}s  median {cli['median']:.2f}s")
+    print(f"  Warm worker per scene:  mean {warm['mean']:.2f}s  median {warm['median']:.2f}s")
+    print(f"  Worker startup (once):  {workers['startup']:.2f}s")
+    print(f"  Overhead saved/scene:   {results['per_scene_overhead_saved']:.2f}s ({results['speedup']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Workflow State Compaction Benchmark for RASO Platform
+
+Compares the serialized size of a ``RASOMasterState`` and the cost of one
+workflow transition (the deep copy LangGraph makes plus the JSON document a
+checkpoint or stream event writes) with every payload inline against the
+compacted state, where paper text, figure images and timing markers are
+``BlobRef`` references into the blob store.
+
+Usage:
+    python scripts/benchmark_state_compaction.py --sections 40 --figures 10 --scenes 20
+"""
+
+import argparse
+import base64
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.backend.models import (
+    AudioAssets,
+    AudioScene,
+    Figure,
+    PaperContent,
+    PaperInput,
+    PaperInputType,
+    RASOMasterState,
+    Section,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "raso"))
+
+from core.blob_store import BlobStore
+
+
+def build_state(sections: int, figures: int, scenes: int, pdf_kb: int) -> RASOMasterState:
+    """A state the size of a long paper after the audio stage."""
+    return RASOMasterState(
+        job_id="benchmark",
+        paper_input=PaperInput(
+            type=PaperInputType.PDF,
+            content=base64.b64encode(os.urandom(pdf_kb * 1024)).decode(),
+        ),
+        paper_content=PaperContent(
+            title="A Benchmark Paper on Workflow State",
+            authors=["RASO"],
+            abstract="A synthetic abstract long enough to pass validation of the paper content model.",
+            sections=[
+                Section(
+                    id=f"section_{i}",
+                    title=f"Section {i}",
+                    content=" ".join(f"token{n}" for n in range(1500)),
+                    level=1,
+                )
+                for i in range(sections)
+            ],
+            figures=[
+                Figure(
+                    id=f"figure_{i}",
+                    caption=f"Figure {i} of the benchmark",
+                    # Encoded so the inline state can be serialized to JSON at all
+                    image_data=base64.b64encode(os.urandom(96 * 1024)),
+                    section_id="section_0",
+                )
+                for i in range(figures)
+            ],
+        ),
+        audio=AudioAssets(
+            scenes=[
+                AudioScene(
+                    scene_id=f"scene_{i}",
+                    file_path=f"scene_{i}.wav",
+                    duration=45.0,
+                    transcript="Narration of the benchmark scene.",
+                    timing_markers=[
+                        {"word": f"w{n}", "start_time": n * 0.3, "end_time": n * 0.3 + 0.25, "duration": 0.25}
+                        for n in range(150)
+                    ],
+                )
+                for i in range(scenes)
+            ],
+            total_duration=45.0 * scenes,
+        ),
+    )
+
+
+def time_ms(operation: Callable[[], object], repeats: int) -> Dict[str, float]:
+    """Median and mean wall time of an operation in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        operation()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median": statistics.median(times), "mean": statistics.mean(times)}
+
+
+def transition(state: RASOMasterState) -> str:
+    """What one workflow step does with the state: copy it, then serialize it."""
+    return state.copy(deep=True).json()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark inline vs compacted workflow state")
+    parser.add_argument("--sections", type=int, default=40, help="Paper sections")
+    parser.add_argument("--figures", type=int, default=10, help="Figures with image data")
+    parser.add_argument("--scenes", type=int, default=20, help="Audio scenes with timing markers")
+    parser.add_argument("--pdf-kb", type=int, default=2048, help="Size of the uploaded PDF in KB")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed repetitions per measurement")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    state = build_state(args.sections, args.figures, args.scenes, args.pdf_kb)
+
+    with tempfile.TemporaryDirectory(prefix="raso_state_bench_") as tmp:
+        store = BlobStore(Path(tmp))
+        compact = state.compact(store)
+
+        # First compaction writes the blobs; later ones only hash and find them stored
+        compact_cost = time_ms(lambda: state.compact(store), args.repeats)
+        hydrate_cost = time_ms(lambda: compact.hydrate(store), args.repeats)
+        inline_transition = time_ms(lambda: transition(state), args.repeats)
+        compact_transition = time_ms(lambda: transition(compact), args.repeats)
+
+    inline_bytes = len(state.json())
+    compact_bytes = len(compact.json())
+    results = {
+        "sections": args.sections,
+        "figures": args.figures,
+        "scenes": args.scenes,
+        "pdf_kb": args.pdf_kb,
+        "inline": {"bytes": inline_bytes, "transition_ms": inline_transition},
+        "compact": {"bytes": compact_bytes, "transition_ms": compact_transition},
+        "compact_ms": compact_cost,
+        "hydrate_ms": hydrate_cost,
+        "size_reduction": 1 - compact_bytes / inline_bytes,
+        "transition_speedup": (
+            inline_transition["median"] / compact_transition["median"] if compact_transition["median"] else None
+        ),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.sections} sections, {args.figures} figures, {args.scenes} scenes, {args.pdf_kb} KB PDF")
+    print(f"  Inline state:       {inline_bytes / 1024:9.1f} KB  transition {inline_transition['median']:.2f} ms")
+    print(f"  Compact state:      {compact_bytes / 1024:9.1f} KB  transition {compact_transition['median']:.2f} ms")
+    print(f"  Size reduction:     {results['size_reduction']:.1%}")
+    print(f"  Transition speedup: {results['transition_speedup']:.1f}x")
+    print(f"  Compact (stored):   {compact_cost['median']:.2f} ms  hydrate {hydrate_cost['median']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
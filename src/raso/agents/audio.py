@@ -16,6 +16,8 @@ from config.backend.models.script import NarrationScript, Scene, TimingMarker
 from config.backend.models.animation import AnimationAssets, RenderedScene
 from config.backend.models.audio import AudioAssets, AudioScene
 from agents.retry import retry
+from core.resource_governor import current_job, get_resource_governor, work_cost
+from core.tracing import span
 from scripts.utils.ai_model_manager import ai_model_manager
 
 
@@ -738,18 +740,23 @@ class AudioAgent(BaseAgent):
     async def _generate_scene_audio(self, scene: Scene, target_duration: float) -> Optional[AudioScene]:
         """Generate audio for a single scene using production TTS."""
         try:
-            # Create output directory
-            audio_dir = Path(self.config.temp_path) / "audio" / scene.id
+            # Create output directory; per job, so jobs and rebuilds never share a scene's file
+            audio_dir = Path(self.config.temp_path) / "audio" / current_job.get() / scene.id
             audio_dir.mkdir(parents=True, exist_ok=True)
             
             audio_path = str(audio_dir / f"{scene.id}.wav")
             
-            if self._tts_available and hasattr(self, '_tts_model'):
-                # Use real TTS
-                await self._generate_tts_audio(scene.narration, audio_path, target_duration)
-            else:
-                # Use fallback method (system TTS or simple audio generation)
-                await self._generate_fallback_audio(scene.narration, audio_path, target_duration)
+            # TTS models are CPU and memory heavy; share them across jobs
+            async with get_resource_governor().acquire(**work_cost("tts")):
+                with span("tts.synthesize", "tts", scene_id=scene.id, engine=self.preferred_tts):
+                    # A fast engine (e.g. chosen to meet a deadline) skips the neural model
+                    neural_engine = self.tts_engines.get(self.preferred_tts, {}).get('quality') == 'high'
+                    if neural_engine and self._tts_available and hasattr(self, '_tts_model'):
+                        # Use real TTS
+                        await self._generate_tts_audio(scene.narration, audio_path, target_duration)
+                    else:
+                        # Use fallback method (system TTS or simple audio generation)
+                        await self._generate_fallback_audio(scene.narration, audio_path, target_duration)
             
             # Verify audio file was created
             if not Path(audio_path).exists():
@@ -1071,7 +1078,7 @@ class AudioAgent(BaseAgent):
     def _create_fallback_audio(self, scene: Scene, target_duration: float) -> AudioScene:
         """Create fallback audio scene when TTS fails."""
         # Use proper temp path instead of /tmp/ for Windows compatibility
-        fallback_dir = Path(self.config.temp_path) / "audio" / "fallback"
+        fallback_dir = Path(self.config.temp_path) / "audio" / "fallback" / current_job.get()
         fallback_dir.mkdir(parents=True, exist_ok=True)
         fallback_path = fallback_dir / f"fallback_audio_{scene.id}.wav"
         
@@ -1179,6 +1186,9 @@ class AudioAgent(BaseAgent):
         """
         self.validate_input(state)
         
+        if state.options.tts_engine:
+            self.preferred_tts = state.options.tts_engine
+        
         try:
             script = state.script
             
@@ -1200,7 +1210,7 @@ class AudioAgent(BaseAgent):
             
             # Validate generated audio
             validation_results = []
-            for scene in audio_assets.scenes:
+            for i, scene in enumerate(audio_assets.scenes):
                 validation = simple_generator.validate_audio_file(scene.file_path)
                 validation_results.append(validation)
                 
@@ -1208,6 +1218,11 @@ class AudioAgent(BaseAgent):
                     self.logger.warning(f"Audio validation failed for scene {scene.scene_id}: {validation['errors']}")
                 elif validation["warnings"]:
                     self.logger.info(f"Audio validation warnings for scene {scene.scene_id}: {validation['warnings']}")
+                
+                state.progress.update_scene(
+                    scene.scene_id, "tts", "done" if validation["valid"] else "failed",
+                    step_progress=(i + 1) / len(audio_assets.scenes),
+                )
             
             # Update state
             state.audio = audio_assets
@@ -10,8 +10,11 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional, Type
 from datetime import datetime
 
-from config.backend.models import RASOMasterState, AgentError, AgentType, ErrorSeverity
+from config.backend.models import RASOMasterState, AgentError, AgentType, ErrorSeverity, loading_payloads
 from config.backend.config import get_config
+from core.blob_store import get_blob_store
+from core.resource_governor import current_job
+from core.tracing import span
 
 
 class AgentExecutionError(Exception):
@@ -165,6 +168,8 @@ class BaseAgent(ABC):
         Returns:
             Updated workflow state
         """
+        # Attribute governed resources used by this agent to the job
+        job_token = current_job.set(state.job_id)
         try:
             # Update current agent in state
             state.current_agent = self.agent_type
@@ -173,11 +178,14 @@ class BaseAgent(ABC):
             # Log execution start
             self.log_progress(f"Starting {self.name} execution", state)
             
-            # Validate input
-            self.validate_input(state)
-            
-            # Execute agent logic
-            updated_state = await self.execute(state)
+            # The workflow passes references to large payloads; each is loaded when the agent reads it
+            with loading_payloads(get_blob_store()):
+                # Validate input
+                self.validate_input(state)
+                
+                # Execute agent logic
+                with span(self.name, "agent", agent_type=self.agent_type.value):
+                    updated_state = await self.execute(state)
             
             # Log successful completion
             self.log_progress(f"Completed {self.name} execution", state)
@@ -193,6 +201,9 @@ class BaseAgent(ABC):
                 raise
             
             return error_state
+        
+        finally:
+            current_job.reset(job_token)
     
     def get_retry_delay(self, attempt: int) -> float:
         """
@@ -26,6 +26,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'config',
 
 from models.script import Scene
 from utils.quality_presets import QualityPresetManager, QualityLevel
+from config.backend.services.llm_dispatcher import estimate_tokens, get_llm_dispatcher
+from core.resource_governor import get_resource_governor, work_cost
 
 # Import new cinematic models
 try:
@@ -190,51 +192,75 @@ class CinematicVideoGenerator:
         
         print(f"[CINEMATIC] Set {len(descriptions)} custom visual descriptions")
     
-    async def generate_ai_visual_descriptions(self, scenes: List[Scene]) -> Dict[str, str]:
-        """Generate AI-powered visual descriptions for scenes."""
+    async def generate_ai_visual_descriptions(self, scenes: List[Scene], passage_index=None) -> Dict[str, str]:
+        """
+        Generate AI-powered visual descriptions for scenes.
+        
+        If a ``PassageIndex`` for the paper is given, each scene's content is
+        extended with the paper passages most relevant to it.
+        """
         if not self.gemini_client or not self.ui_settings:
             print("[CINEMATIC] AI visual descriptions not available")
             return {}
         
         descriptions = {}
+        cinematic_settings = self.ui_settings.to_dict()
         
-        try:
-            for i, scene in enumerate(scenes):
-                scene_id = f"scene_{i}"
-                
-                # Determine scene type
-                scene_type = self._determine_scene_type(scene, i, len(scenes))
-                
-                # Generate visual description using Gemini
-                result = await self.gemini_client.generate_detailed_visual_description(
-                    scene_content=scene.content,
-                    scene_type=scene_type,
-                    cinematic_settings=self.ui_settings.to_dict(),
-                    target_audience="intermediate"
+        async def describe(indexed_scene: Tuple[int, Scene]) -> Optional[Dict[str, Any]]:
+            i, scene = indexed_scene
+            
+            scene_content = scene.content
+            if passage_index is not None:
+                passages = await asyncio.to_thread(
+                    passage_index.context_for, f"{scene.title} {scene.content}", 3, 1500
                 )
-                
-                if result and "description" in result:
-                    descriptions[scene_id] = result["description"]
-                    
-                    # Store full visual description model
-                    if VisualDescriptionModel:
-                        self.visual_descriptions[scene_id] = VisualDescriptionModel(
-                            scene_id=scene_id,
-                            content=scene.content,
-                            description=result["description"],
-                            generated_by="gemini",
-                            cinematic_settings=self.ui_settings.to_dict(),
-                            scene_analysis=result.get("scene_analysis", {}),
-                            suggestions=result.get("suggestions", []),
-                            confidence=result.get("confidence", 0.8),
-                            created_at="",
-                            updated_at=""
-                        )
-                
-                print(f"[CINEMATIC] Generated AI description for {scene_id}")
+                if passages:
+                    scene_content = f"{scene_content}\n\nRelevant paper passages:\n{passages}"
+            
+            # Generate visual description using Gemini
+            return await self.gemini_client.generate_detailed_visual_description(
+                scene_content=scene_content,
+                scene_type=self._determine_scene_type(scene, i, len(scenes)),
+                cinematic_settings=cinematic_settings,
+                target_audience="intermediate"
+            )
         
-        except Exception as e:
-            print(f"[CINEMATIC] Error generating AI descriptions: {e}")
+        # All scenes are described concurrently under the Google rate limit;
+        # a failed scene is retried on its own and never discards the others
+        results = await get_llm_dispatcher().map(
+            describe,
+            list(enumerate(scenes)),
+            provider="google",
+            estimate=lambda indexed_scene: estimate_tokens(indexed_scene[1].content) + 1024,
+            return_exceptions=True,
+        )
+        
+        for i, (scene, result) in enumerate(zip(scenes, results)):
+            scene_id = f"scene_{i}"
+            
+            if isinstance(result, Exception):
+                print(f"[CINEMATIC] Error generating AI description for {scene_id}: {result}")
+                continue
+            
+            if result and "description" in result:
+                descriptions[scene_id] = result["description"]
+                
+                # Store full visual description model
+                if VisualDescriptionModel:
+                    self.visual_descriptions[scene_id] = VisualDescriptionModel(
+                        scene_id=scene_id,
+                        content=scene.content,
+                        description=result["description"],
+                        generated_by="gemini",
+                        cinematic_settings=cinematic_settings,
+                        scene_analysis=result.get("scene_analysis", {}),
+                        suggestions=result.get("suggestions", []),
+                        confidence=result.get("confidence", 0.8),
+                        created_at="",
+                        updated_at=""
+                    )
+            
+            print(f"[CINEMATIC] Generated AI description for {scene_id}")
         
         return descriptions
     
@@ -290,9 +316,15 @@ class CinematicVideoGenerator:
         video_files: List[str], 
         audio_files: List[str],
         output_path: str,
-        custom_visual_descriptions: Optional[Dict[str, str]] = None
+        custom_visual_descriptions: Optional[Dict[str, str]] = None,
+        passage_index=None
     ) -> bool:
-        """Generate cinematic video with all production features."""
+        """
+        Generate cinematic video with all production features.
+        
+        ``passage_index`` (a ``PassageIndex`` of the paper) grounds the AI
+        visual descriptions in the passages relevant to each scene.
+        """
         try:
             print(f"[CINEMATIC] Starting cinematic video generation...")
             print(f"[CINEMATIC] Scenes: {len(scenes)}, Videos: {len(video_files)}, Audio: {len(audio_files)}")
@@ -303,7 +335,7 @@ class CinematicVideoGenerator:
             
             # Generate AI visual descriptions if enabled and no custom descriptions
             elif self.gemini_client and not custom_visual_descriptions:
-                ai_descriptions = await self.generate_ai_visual_descriptions(scenes)
+                ai_descriptions = await self.generate_ai_visual_descriptions(scenes, passage_index)
                 if ai_descriptions:
                     await self.set_visual_descriptions(ai_descriptions)
             
@@ -1130,13 +1162,14 @@ class CinematicVideoGenerator:
                 str(output_file)
             ]
             
-            result = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await result.communicate()
+            async with get_resource_governor().acquire(**work_cost("ffmpeg", self.encoding_params.resolution)):
+                result = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await result.communicate()
             
             if result.returncode == 0 and output_file.exists():
                 return str(output_file)
@@ -1275,13 +1308,14 @@ class CinematicVideoGenerator:
                 str(output_file)
             ]
             
-            result = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await result.communicate()
+            async with get_resource_governor().acquire(**work_cost("ffmpeg", self.encoding_params.resolution)):
+                result = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await result.communicate()
             
             if result.returncode == 0 and output_file.exists():
                 return str(output_file)
@@ -1410,13 +1444,14 @@ class CinematicVideoGenerator:
                 str(output_file)
             ]
             
-            result = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await result.communicate()
+            async with get_resource_governor().acquire(**work_cost("ffmpeg", self.encoding_params.resolution)):
+                result = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await result.communicate()
             
             if result.returncode == 0 and output_file.exists():
                 return str(output_file)
@@ -1576,13 +1611,14 @@ class CinematicVideoGenerator:
                 str(output_file)
             ]
             
-            result = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await result.communicate()
+            async with get_resource_governor().acquire(**work_cost("ffmpeg", self.encoding_params.resolution)):
+                result = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await result.communicate()
             
             if result.returncode == 0 and output_file.exists():
                 print(f"[CINEMATIC] ✅ Created segment {scene_index}: {output_file.stat().st_size} bytes")
@@ -1658,13 +1694,14 @@ class CinematicVideoGenerator:
                     output_path
                 ]
             
-            result = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await result.communicate()
+            async with get_resource_governor().acquire(**work_cost("ffmpeg", self.encoding_params.resolution)):
+                result = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await result.communicate()
             
             if result.returncode == 0 and Path(output_path).exists():
                 file_size = Path(output_path).stat().st_size
@@ -9,7 +9,8 @@ import re
 import asyncio
 import aiohttp
 import fitz  # PyMuPDF
-from typing import List, Optional, Dict, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple, AsyncIterator, Iterable
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import urlparse, urljoin
@@ -31,9 +32,61 @@ from config.backend.models import (
 from agents.base import BaseAgent, register_agent, AgentExecutionError
 from agents.retry import retry
 from agents.logging import AgentLogger
+from agents.title_index import TitleIndex, get_title_index, title_similarity
+from agents.passage_index import get_passage_index
 from config.backend.config import get_config
 
 
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+# arXiv recommends keeping id_list queries modest in size
+ARXIV_METADATA_BATCH_SIZE = 50
+
+# New-style (2301.01234v2) and old-style (hep-th/9901001v1) arXiv identifiers
+ARXIV_ID_PATTERN = re.compile(r"^(\d{4}\.\d{4,5}|[a-z][a-z\-]*(\.[A-Z]{2})?/\d{7})(v\d+)?$")
+
+_worker_agent: Optional["IngestAgent"] = None
+
+
+def _parse_pdf_in_worker(pdf_data: bytes) -> PaperContent:
+    """
+    Parse PDF data inside a process pool worker.
+    
+    The agent instance is created lazily once per worker process so that
+    configuration and logger setup are not repeated for every paper; it never
+    touches the title index, which is only loaded on first use.
+    
+    Args:
+        pdf_data: PDF file data
+        
+    Returns:
+        Extracted paper content
+    """
+    global _worker_agent
+    if _worker_agent is None:
+        _worker_agent = IngestAgent(AgentType.INGEST)
+    return _worker_agent._parse_pdf_sync(pdf_data)
+
+
+def normalize_arxiv_ref(ref: str) -> Optional[str]:
+    """
+    The arXiv ID of an arXiv URL or bare ID.
+    
+    Args:
+        ref: arXiv abs/pdf URL or bare arXiv ID
+        
+    Returns:
+        arXiv ID, or None if the reference is not a valid arXiv identifier
+    """
+    ref = ref.strip()
+    match = re.search(r"arxiv\.org/(?:abs/|pdf/)?([^?#]+)", ref, re.IGNORECASE)
+    arxiv_id = match.group(1) if match else ref
+    if arxiv_id.endswith(".pdf"):
+        arxiv_id = arxiv_id[:-4]
+    return arxiv_id if ARXIV_ID_PATTERN.match(arxiv_id) else None
+
+
 @register_agent(AgentType.INGEST)
 class IngestAgent(BaseAgent):
     """Agent responsible for paper ingestion from various sources."""
@@ -43,6 +96,15 @@ class IngestAgent(BaseAgent):
         super().__init__(agent_type)
         self.logger = AgentLogger(agent_type)
         self.session: Optional[aiohttp.ClientSession] = None
+        self.bulk_failures: Dict[str, str] = {}
+        self._title_index: Optional[TitleIndex] = None
+    
+    @property
+    def title_index(self) -> TitleIndex:
+        """Local title index, loaded on first use (PDF parse workers never need it)."""
+        if self._title_index is None:
+            self._title_index = get_title_index()
+        return self._title_index
     
     @property
     def name(self) -> str:
@@ -87,6 +149,13 @@ class IngestAgent(BaseAgent):
                 
                 # Update state
                 state.paper_content = paper_content
+                self.title_index.save()
+                
+                # Embed passages once so scene prompts can retrieve relevant context
+                try:
+                    await asyncio.to_thread(get_passage_index, paper_content)
+                except Exception as e:
+                    self.logger.warning("Passage index build failed", exception=e)
                 
                 self.logger.info(
                     "Paper ingestion completed successfully",
@@ -131,6 +200,100 @@ class IngestAgent(BaseAgent):
             await self.session.close()
             self.session = None
     
+    async def ingest_bulk(
+        self,
+        arxiv_refs: Iterable[str],
+        max_concurrent_downloads: int = 8,
+        max_parse_workers: Optional[int] = None,
+    ) -> AsyncIterator[PaperContent]:
+        """
+        Ingest many arXiv papers in one call, streaming results as they finish.
+        
+        Metadata is fetched with batched ``id_list`` queries, PDFs are downloaded
+        concurrently within a bounded pool and parsed in a process pool. Papers
+        are yielded in completion order, so downstream jobs can start as soon as
+        each paper is ready. Papers that fail are logged and recorded in
+        ``self.bulk_failures`` instead of aborting the whole batch.
+        
+        Args:
+            arxiv_refs: arXiv URLs or bare arXiv IDs
+            max_concurrent_downloads: Maximum number of simultaneous PDF downloads
+            max_parse_workers: Number of PDF parsing processes (defaults to CPU count)
+            
+        Yields:
+            Extracted paper content, enhanced with arXiv metadata
+        """
+        self.bulk_failures = {}
+        
+        arxiv_ids: List[str] = []
+        for ref in arxiv_refs:
+            arxiv_id = normalize_arxiv_ref(ref)
+            if not arxiv_id:
+                self.bulk_failures[ref] = "Invalid arXiv reference"
+                continue
+            if arxiv_id not in arxiv_ids:
+                arxiv_ids.append(arxiv_id)
+        
+        if not arxiv_ids:
+            return
+        
+        with self.logger.operation("bulk_paper_ingestion", papers=len(arxiv_ids)):
+            await self._create_session()
+            download_slots = asyncio.Semaphore(max_concurrent_downloads)
+            loop = asyncio.get_running_loop()
+            parse_pool = ProcessPoolExecutor(max_workers=max_parse_workers)
+            
+            try:
+                metadata = await self._get_arxiv_metadata_batch(arxiv_ids)
+                
+                async def ingest_one(
+                    arxiv_id: str,
+                ) -> Tuple[str, Optional[PaperContent], Optional[Exception]]:
+                    try:
+                        async with download_slots:
+                            pdf_data = await self._download_pdf(f"https://arxiv.org/pdf/{arxiv_id}.pdf")
+                        
+                        paper_content = await loop.run_in_executor(
+                            parse_pool, _parse_pdf_in_worker, pdf_data
+                        )
+                        self._apply_arxiv_metadata(paper_content, arxiv_id, metadata.get(arxiv_id))
+                        self._validate_paper_content(paper_content)
+                        return arxiv_id, paper_content, None
+                    except Exception as e:
+                        return arxiv_id, None, e
+                
+                tasks = [asyncio.ensure_future(ingest_one(arxiv_id)) for arxiv_id in arxiv_ids]
+                
+                try:
+                    for next_done in asyncio.as_completed(tasks):
+                        arxiv_id, paper_content, error = await next_done
+                        if error is not None:
+                            self.bulk_failures[arxiv_id] = str(error)
+                            self.logger.error(
+                                "Bulk ingestion failed for paper",
+                                exception=error,
+                                arxiv_id=arxiv_id,
+                            )
+                            continue
+                        yield paper_content
+                finally:
+                    # Consumer stopped early or was cancelled
+                    for task in tasks:
+                        if not task.done():
+                            task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                # Never block the event loop on parses nobody is waiting for
+                parse_pool.shutdown(wait=False, cancel_futures=True)
+                await self._close_session()
+            
+            self.title_index.save()
+            self.logger.info(
+                "Bulk ingestion completed",
+                requested=len(arxiv_ids),
+                failed=len(self.bulk_failures),
+            )
+    
     @retry(max_attempts=3, base_delay=1.0)
     async def _ingest_from_title(self, title: str) -> PaperContent:
         """
@@ -155,10 +318,36 @@ class IngestAgent(BaseAgent):
         # Download and parse the found paper
         return await self._ingest_from_arxiv(arxiv_url)
     
-    @retry(max_attempts=3, base_delay=1.0)
     async def _search_arxiv_by_title(self, title: str) -> Optional[str]:
         """
-        Search arXiv for a paper by title.
+        Find a paper's arXiv URL by title.
+        
+        The local title index is queried first; the arXiv API is only used
+        on a miss, and network hits are added to the index for next time.
+        
+        Args:
+            title: Paper title to search for
+            
+        Returns:
+            arXiv URL if found, None otherwise
+        """
+        match = self.title_index.best_match(title)
+        if match:
+            arxiv_id, matched_title, similarity = match
+            self.logger.info(
+                "Found paper in local title index",
+                arxiv_id=arxiv_id,
+                matched_title=matched_title,
+                similarity=similarity,
+            )
+            return f"https://arxiv.org/abs/{arxiv_id}"
+        
+        return await self._search_arxiv_api_by_title(title)
+    
+    @retry(max_attempts=3, base_delay=1.0)
+    async def _search_arxiv_api_by_title(self, title: str) -> Optional[str]:
+        """
+        Search the arXiv API for a paper by title.
         
         Args:
             title: Paper title to search for
@@ -171,7 +360,7 @@ class IngestAgent(BaseAgent):
         search_query = re.sub(r'\s+', ' ', search_query)
         
         # arXiv API search URL
-        search_url = f"http://export.arxiv.org/api/query?search_query=ti:\"{search_query}\"&max_results=5"
+        search_url = f"{ARXIV_API_URL}?search_query=ti:\"{search_query}\"&max_results=5"
         
         try:
             async with self.session.get(search_url) as response:
@@ -186,21 +375,31 @@ class IngestAgent(BaseAgent):
                 root = ET.fromstring(content)
                 
                 # Find entries
-                entries = root.findall('.//{http://www.w3.org/2005/Atom}entry')
+                entries = root.findall(f'.//{ATOM_NS}entry')
+                
+                # Rank candidates instead of taking the first acceptable one
+                best_id = None
+                best_similarity = 0.0
                 
                 for entry in entries:
-                    # Get title and check similarity
-                    entry_title = entry.find('.//{http://www.w3.org/2005/Atom}title')
-                    if entry_title is not None:
-                        entry_title_text = entry_title.text.strip()
-                        
-                        # Simple similarity check
-                        if self._titles_similar(title, entry_title_text):
-                            # Get arXiv ID
-                            id_elem = entry.find('.//{http://www.w3.org/2005/Atom}id')
-                            if id_elem is not None:
-                                arxiv_id = id_elem.text.split('/')[-1]
-                                return f"https://arxiv.org/abs/{arxiv_id}"
+                    entry_title = entry.find(f'.//{ATOM_NS}title')
+                    id_elem = entry.find(f'.//{ATOM_NS}id')
+                    if entry_title is None or id_elem is None:
+                        continue
+                    
+                    entry_title_text = ' '.join(entry_title.text.split())
+                    arxiv_id = self._strip_arxiv_version(id_elem.text.split('/')[-1])
+                    self.title_index.add(arxiv_id, entry_title_text)
+                    
+                    similarity = title_similarity(title, entry_title_text)
+                    if self._titles_similar(title, entry_title_text) and similarity > best_similarity:
+                        best_id = arxiv_id
+                        best_similarity = similarity
+                
+                self.title_index.save()
+                
+                if best_id:
+                    return f"https://arxiv.org/abs/{best_id}"
                 
                 return None
                 
@@ -210,7 +409,10 @@ class IngestAgent(BaseAgent):
     
     def _titles_similar(self, title1: str, title2: str, threshold: float = 0.7) -> bool:
         """
-        Check if two titles are similar using simple word overlap.
+        Check if two titles are similar.
+        
+        Compares character trigrams of the normalized titles, which tolerates
+        differences in punctuation, casing and LaTeX markup.
         
         Args:
             title1: First title
@@ -220,19 +422,7 @@ class IngestAgent(BaseAgent):
         Returns:
             True if titles are similar enough
         """
-        # Normalize titles
-        words1 = set(re.findall(r'\w+', title1.lower()))
-        words2 = set(re.findall(r'\w+', title2.lower()))
-        
-        # Calculate Jaccard similarity
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        
-        if union == 0:
-            return False
-        
-        similarity = intersection / union
-        return similarity >= threshold
+        return title_similarity(title1, title2) >= threshold
     
     @retry(max_attempts=3, base_delay=1.0)
     async def _ingest_from_arxiv(self, arxiv_url: str) -> PaperContent:
@@ -266,23 +456,42 @@ class IngestAgent(BaseAgent):
         paper_content = await self._parse_pdf_content(pdf_data)
         
         # Enhance with arXiv metadata
-        if metadata:
-            paper_content.title = metadata.get('title', paper_content.title)
-            paper_content.authors = metadata.get('authors', paper_content.authors)
-            paper_content.abstract = metadata.get('abstract', paper_content.abstract)
-            paper_content.arxiv_id = arxiv_id
-            
-            # Parse publication date
-            if 'published' in metadata:
-                try:
-                    paper_content.publication_date = datetime.fromisoformat(
-                        metadata['published'].replace('Z', '+00:00')
-                    )
-                except ValueError:
-                    pass
+        self._apply_arxiv_metadata(paper_content, arxiv_id, metadata)
         
         return paper_content
     
+    def _apply_arxiv_metadata(
+        self,
+        paper_content: PaperContent,
+        arxiv_id: str,
+        metadata: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Enhance parsed paper content with arXiv API metadata.
+        
+        Args:
+            paper_content: Paper content extracted from the PDF
+            arxiv_id: arXiv paper ID
+            metadata: Metadata from the arXiv API, if available
+        """
+        if not metadata:
+            return
+        
+        paper_content.title = metadata.get('title', paper_content.title)
+        paper_content.authors = metadata.get('authors', paper_content.authors)
+        paper_content.abstract = metadata.get('abstract', paper_content.abstract)
+        paper_content.arxiv_id = arxiv_id
+        self.title_index.add(self._strip_arxiv_version(arxiv_id), paper_content.title)
+        
+        # Parse publication date
+        if 'published' in metadata:
+            try:
+                paper_content.publication_date = datetime.fromisoformat(
+                    metadata['published'].replace('Z', '+00:00')
+                )
+            except ValueError:
+                pass
+    
     def _extract_arxiv_id(self, url: str) -> Optional[str]:
         """
         Extract arXiv ID from URL.
@@ -322,7 +531,7 @@ class IngestAgent(BaseAgent):
         Returns:
             Paper metadata dictionary
         """
-        api_url = f"http://export.arxiv.org/api/query?id_list={arxiv_id}"
+        api_url = f"{ARXIV_API_URL}?id_list={arxiv_id}"
         
         try:
             async with self.session.get(api_url) as response:
@@ -335,41 +544,129 @@ class IngestAgent(BaseAgent):
                 import xml.etree.ElementTree as ET
                 root = ET.fromstring(content)
                 
-                entry = root.find('.//{http://www.w3.org/2005/Atom}entry')
+                entry = root.find(f'.//{ATOM_NS}entry')
                 if entry is None:
                     return None
                 
-                metadata = {}
-                
-                # Extract title
-                title_elem = entry.find('.//{http://www.w3.org/2005/Atom}title')
-                if title_elem is not None:
-                    metadata['title'] = title_elem.text.strip()
-                
-                # Extract authors
-                authors = []
-                for author in entry.findall('.//{http://www.w3.org/2005/Atom}author'):
-                    name_elem = author.find('.//{http://www.w3.org/2005/Atom}name')
-                    if name_elem is not None:
-                        authors.append(name_elem.text.strip())
-                metadata['authors'] = authors
-                
-                # Extract abstract
-                summary_elem = entry.find('.//{http://www.w3.org/2005/Atom}summary')
-                if summary_elem is not None:
-                    metadata['abstract'] = summary_elem.text.strip()
-                
-                # Extract publication date
-                published_elem = entry.find('.//{http://www.w3.org/2005/Atom}published')
-                if published_elem is not None:
-                    metadata['published'] = published_elem.text.strip()
-                
-                return metadata
+                return self._parse_arxiv_entry(entry)
                 
         except Exception as e:
             self.logger.warning("Failed to get arXiv metadata", exception=e)
             return None
     
+    async def _get_arxiv_metadata_batch(self, arxiv_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get metadata for many papers using batched ``id_list`` queries.
+        
+        Args:
+            arxiv_ids: arXiv paper IDs
+            
+        Returns:
+            Mapping of requested arXiv ID to metadata dictionary. Papers whose
+            metadata could not be fetched are omitted.
+        """
+        metadata: Dict[str, Dict[str, Any]] = {}
+        
+        for start in range(0, len(arxiv_ids), ARXIV_METADATA_BATCH_SIZE):
+            batch = arxiv_ids[start:start + ARXIV_METADATA_BATCH_SIZE]
+            try:
+                metadata.update(await self._fetch_arxiv_metadata_batch(batch))
+            except Exception as e:
+                self.logger.warning(
+                    "Failed to get arXiv metadata batch",
+                    exception=e,
+                    batch_size=len(batch),
+                )
+        
+        return metadata
+    
+    @retry(max_attempts=3, base_delay=1.0)
+    async def _fetch_arxiv_metadata_batch(self, arxiv_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch metadata for a single batch of arXiv IDs.
+        
+        Args:
+            arxiv_ids: arXiv paper IDs (at most ``ARXIV_METADATA_BATCH_SIZE``)
+            
+        Returns:
+            Mapping of requested arXiv ID to metadata dictionary
+        """
+        params = {
+            "id_list": ",".join(arxiv_ids),
+            "max_results": str(len(arxiv_ids)),
+        }
+        
+        async with self.session.get(ARXIV_API_URL, params=params) as response:
+            if response.status != 200:
+                raise AgentExecutionError(
+                    f"arXiv metadata query failed: HTTP {response.status}",
+                    "ARXIV_METADATA_FAILED"
+                )
+            
+            content = await response.text()
+        
+        import xml.etree.ElementTree as ET
+        root = ET.fromstring(content)
+        
+        # Entries carry a versioned ID (e.g. 1706.03762v7); match them back to
+        # the IDs as requested, with or without an explicit version
+        requested = {self._strip_arxiv_version(arxiv_id): arxiv_id for arxiv_id in arxiv_ids}
+        requested.update({arxiv_id: arxiv_id for arxiv_id in arxiv_ids})
+        
+        metadata: Dict[str, Dict[str, Any]] = {}
+        for entry in root.findall(f'.//{ATOM_NS}entry'):
+            id_elem = entry.find(f'.//{ATOM_NS}id')
+            if id_elem is None or not id_elem.text:
+                continue
+            
+            entry_id = id_elem.text.strip().split('/abs/')[-1]
+            requested_id = requested.get(entry_id) or requested.get(self._strip_arxiv_version(entry_id))
+            if requested_id:
+                metadata[requested_id] = self._parse_arxiv_entry(entry)
+        
+        return metadata
+    
+    def _strip_arxiv_version(self, arxiv_id: str) -> str:
+        """Remove a trailing version suffix (``v2``) from an arXiv ID."""
+        return re.sub(r'v\d+$', '', arxiv_id)
+    
+    def _parse_arxiv_entry(self, entry) -> Dict[str, Any]:
+        """
+        Extract metadata fields from an arXiv Atom entry.
+        
+        Args:
+            entry: Atom ``entry`` XML element
+            
+        Returns:
+            Paper metadata dictionary
+        """
+        metadata = {}
+        
+        # Extract title
+        title_elem = entry.find(f'.//{ATOM_NS}title')
+        if title_elem is not None:
+            metadata['title'] = title_elem.text.strip()
+        
+        # Extract authors
+        authors = []
+        for author in entry.findall(f'.//{ATOM_NS}author'):
+            name_elem = author.find(f'.//{ATOM_NS}name')
+            if name_elem is not None:
+                authors.append(name_elem.text.strip())
+        metadata['authors'] = authors
+        
+        # Extract abstract
+        summary_elem = entry.find(f'.//{ATOM_NS}summary')
+        if summary_elem is not None:
+            metadata['abstract'] = summary_elem.text.strip()
+        
+        # Extract publication date
+        published_elem = entry.find(f'.//{ATOM_NS}published')
+        if published_elem is not None:
+            metadata['published'] = published_elem.text.strip()
+        
+        return metadata
+    
     @retry(max_attempts=3, base_delay=2.0)
     async def _download_pdf(self, pdf_url: str) -> bytes:
         """
@@ -443,6 +740,21 @@ class IngestAgent(BaseAgent):
         """
         Parse PDF content to extract structured information.
         
+        Args:
+            pdf_data: PDF file data
+            
+        Returns:
+            Extracted paper content
+        """
+        return self._parse_pdf_sync(pdf_data)
+    
+    def _parse_pdf_sync(self, pdf_data: bytes) -> PaperContent:
+        """
+        Parse PDF content synchronously.
+        
+        Kept free of event-loop dependencies so it can run in a process pool
+        worker during bulk ingestion.
+        
         Args:
             pdf_data: PDF file data
             
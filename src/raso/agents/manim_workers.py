@@ -0,0 +1,375 @@
+"""
+Warm Manim render workers for the RASO platform.
+
+Rendering each scene with the ``manim`` CLI pays interpreter startup, the
+Manim/Cairo/LaTeX imports and font loading every time, which dominates
+short scenes. This module keeps a small pool of long-lived worker processes
+that import Manim once and then render scene code sent over a pipe. Workers
+are recycled after a fixed number of renders or when their memory grows past
+a limit, so leaks in Manim or scene code cannot accumulate.
+
+The worker side only uses the standard library and Manim, so it stays cheap
+to import in the child process.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+import traceback
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional
+
+
+SCENE_MODULE = "raso_scene"
+
+
+def _rss_mb() -> float:
+    """Resident memory of the current process in MB."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+
+    try:
+        import resource
+        # Peak RSS; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return 0.0
+
+
+def _render_job(job: Dict[str, Any]) -> str:
+    """
+    Render one scene in the current process.
+
+    Args:
+        job: Scene code, output path, working directory, quality and resolution
+
+    Returns:
+        Path of the rendered video
+    """
+    from manim import Scene, tempconfig
+
+    namespace: Dict[str, Any] = {"__name__": SCENE_MODULE}
+    exec(compile(job["code"], "scene.py", "exec"), namespace)
+
+    scene_classes = [
+        obj for obj in namespace.values()
+        if isinstance(obj, type) and issubclass(obj, Scene) and obj.__module__ == SCENE_MODULE
+    ]
+    if not scene_classes:
+        raise ValueError("Scene code does not define a Scene subclass")
+
+    width, height = (int(value) for value in job["resolution"].split("x"))
+    work_dir = job["work_dir"]
+    previous_cwd = os.getcwd()
+    os.chdir(work_dir)
+
+    try:
+        with tempconfig({
+            "quality": job["quality"],
+            "pixel_width": width,
+            "pixel_height": height,
+            "media_dir": os.path.join(work_dir, "media"),
+            "disable_caching": True,
+            "progress_bar": "none",
+            "verbosity": "ERROR",
+        }):
+            scene = scene_classes[-1]()
+            scene.render()
+            movie_path = str(scene.renderer.file_writer.movie_file_path)
+    finally:
+        os.chdir(previous_cwd)
+
+    os.makedirs(os.path.dirname(os.path.abspath(job["output_path"])), exist_ok=True)
+    shutil.move(movie_path, job["output_path"])
+    return job["output_path"]
+
+
+def _worker_main(conn: Connection) -> None:
+    """Worker process loop: import Manim once, then render jobs until told to stop."""
+    try:
+        import manim  # noqa: F401  (warm the import and font caches)
+        conn.send({"ready": True, "rss_mb": _rss_mb()})
+    except Exception as e:
+        conn.send({"ready": False, "error": f"Failed to import manim: {e}"})
+        return
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+
+        if job is None:
+            return
+
+        start_time = time.time()
+        try:
+            output_path = _render_job(job)
+            reply = {"success": True, "output_path": output_path}
+        except Exception as e:
+            reply = {"success": False, "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+
+        reply["render_time"] = time.time() - start_time
+        reply["rss_mb"] = _rss_mb()
+        conn.send(reply)
+
+
+class ManimWorkerError(Exception):
+    """Raised when a Manim worker cannot start or dies mid-render."""
+    pass
+
+
+class ManimWorker:
+    """One long-lived Manim process, driven synchronously over a pipe."""
+
+    def __init__(self, startup_timeout: float = 120.0):
+        """
+        Start the worker process and wait until Manim is imported.
+
+        Args:
+            startup_timeout: Seconds to wait for the worker to become ready
+
+        Raises:
+            ManimWorkerError: If the worker fails to start
+        """
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+        self.renders = 0
+        self.rss_mb = 0.0
+
+        try:
+            if not self._conn.poll(startup_timeout):
+                self.kill()
+                raise ManimWorkerError(f"Manim worker did not start within {startup_timeout}s")
+            ready = self._conn.recv()
+        except (EOFError, OSError) as e:
+            self.kill()
+            raise ManimWorkerError(f"Manim worker exited during startup: {e}")
+
+        if not ready.get("ready"):
+            self.kill()
+            raise ManimWorkerError(ready.get("error", "Manim worker failed to start"))
+        self.rss_mb = ready.get("rss_mb", 0.0)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def render(self, job: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Render a job, blocking until the worker replies.
+
+        Args:
+            job: Render job for ``_render_job``
+            timeout: Seconds to wait before killing the worker
+
+        Returns:
+            Worker reply with ``success``, ``output_path`` or ``error``, and timings
+
+        Raises:
+            ManimWorkerError: If the worker times out or dies
+        """
+        try:
+            self._conn.send(job)
+            if not self._conn.poll(timeout):
+                self.kill()
+                raise ManimWorkerError(f"Render timed out after {timeout} seconds")
+            reply = self._conn.recv()
+        except (EOFError, OSError) as e:
+            self.kill()
+            raise ManimWorkerError(f"Manim worker died: {e}")
+
+        self.renders += 1
+        self.rss_mb = reply.get("rss_mb", self.rss_mb)
+        return reply
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ask the worker to exit, killing it if it does not."""
+        try:
+            self._conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+        self._conn.close()
+
+    def kill(self) -> None:
+        """Terminate the worker immediately."""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1.0)
+
+
+class ManimWorkerPool:
+    """Pool of warm Manim workers with recycling."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_renders_per_worker: int = 50,
+        max_memory_mb: float = 2048,
+        startup_timeout: float = 120.0,
+    ):
+        """
+        Initialize the pool. Workers are started lazily on first use.
+
+        Args:
+            size: Maximum number of worker processes
+            max_renders_per_worker: Renders after which a worker is replaced
+            max_memory_mb: Resident memory after which a worker is replaced
+            startup_timeout: Seconds to wait for a new worker to import Manim
+        """
+        self.size = max(1, size)
+        self.max_renders_per_worker = max_renders_per_worker
+        self.max_memory_mb = max_memory_mb
+        self.startup_timeout = startup_timeout
+
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: List[ManimWorker] = []
+        self.unavailable_reason: Optional[str] = None
+
+        self.stats = {"renders": 0, "failures": 0, "workers_started": 0, "workers_recycled": 0}
+
+    async def _acquire(self) -> ManimWorker:
+        """Take a pool slot and return an idle worker, starting one if none is idle."""
+        if self.unavailable_reason:
+            raise ManimWorkerError(self.unavailable_reason)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive:
+                    return worker
+                worker.stop()
+
+            try:
+                worker = await asyncio.to_thread(ManimWorker, self.startup_timeout)
+            except ManimWorkerError as e:
+                # Manim is not importable here; stop trying on every scene
+                self.unavailable_reason = str(e)
+                raise
+            self.stats["workers_started"] += 1
+            return worker
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, worker: ManimWorker) -> None:
+        """Return a worker to the pool, or retire it if it should be recycled."""
+        recycle = (
+            not worker.alive
+            or worker.renders >= self.max_renders_per_worker
+            or worker.rss_mb >= self.max_memory_mb
+        )
+
+        if recycle:
+            worker.stop()
+            self.stats["workers_recycled"] += 1
+        else:
+            self._idle.append(worker)
+
+        self._slots.release()
+
+    def _release_after_render(self, worker: ManimWorker, render_task: "asyncio.Future") -> None:
+        """Release a worker whose render was abandoned, once its render thread has returned."""
+        if not render_task.cancelled():
+            render_task.exception()
+        self.stats["failures"] += 1
+        self._release(worker)
+
+    async def render(
+        self,
+        code: str,
+        output_path: str,
+        work_dir: str,
+        quality: str,
+        resolution: str,
+        timeout: float = 300.0,
+    ) -> Dict[str, Any]:
+        """
+        Render scene code in a warm worker.
+
+        Args:
+            code: Manim scene source
+            output_path: Destination video path
+            work_dir: Working directory for the render (e.g. a sandbox)
+            quality: Manim quality name, e.g. ``production_quality``
+            resolution: Resolution as ``WIDTHxHEIGHT``
+            timeout: Seconds before the worker is killed
+
+        Returns:
+            Worker reply with ``success``, ``output_path`` or ``error``, and timings
+
+        Raises:
+            ManimWorkerError: If no worker could be started or the worker died
+        """
+        job = {
+            "code": code,
+            "output_path": output_path,
+            "work_dir": work_dir,
+            "quality": quality,
+            "resolution": resolution,
+        }
+
+        worker = await self._acquire()
+        render_task = asyncio.ensure_future(asyncio.to_thread(worker.render, job, timeout))
+        try:
+            reply = await asyncio.shield(render_task)
+        except asyncio.CancelledError:
+            # The render thread still owns the worker's pipe: kill the worker so the
+            # thread returns, and only give the slot back once it has
+            worker.kill()
+            render_task.add_done_callback(lambda _: self._release_after_render(worker, render_task))
+            raise
+        except ManimWorkerError:
+            self.stats["failures"] += 1
+            self._release(worker)
+            raise
+        except BaseException:
+            self._release(worker)
+            raise
+
+        self._release(worker)
+
+        self.stats["renders"] += 1
+        if not reply.get("success"):
+            self.stats["failures"] += 1
+        return reply
+
+    async def shutdown(self) -> None:
+        """Stop all idle workers."""
+        while self._idle:
+            await asyncio.to_thread(self._idle.pop().stop)
+
+
+_manim_worker_pool: Optional[ManimWorkerPool] = None
+
+
+def get_manim_worker_pool() -> ManimWorkerPool:
+    """Get the global Manim worker pool, sized from the animation config."""
+    global _manim_worker_pool
+    if _manim_worker_pool is None:
+        from config.backend.config import get_config
+        animation = get_config().animation
+        _manim_worker_pool = ManimWorkerPool(
+            size=animation.render_workers.get("manim", 2),
+            max_renders_per_worker=animation.manim_worker_max_renders,
+            max_memory_mb=animation.manim_worker_max_memory_mb,
+        )
+    return _manim_worker_pool
@@ -5,11 +5,12 @@ Generates YouTube-optimized metadata including titles, descriptions, tags, and c
 """
 
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 from agents.base import BaseAgent
 from config.backend.models import AgentType
 from config.backend.models.state import RASOMasterState
+from config.backend.models.paper import PaperDigest
 from config.backend.models.understanding import PaperUnderstanding
 from config.backend.models.video import VideoAsset, VideoMetadata
 from config.backend.services.llm import llm_service
@@ -46,10 +47,15 @@ class MetadataAgent(BaseAgent):
             if len(title) > 60:
                 title = title[:57] + "..."
             
+            # The digest's overview summarizes the whole paper, not just its problem statement
+            summary = (
+                state.paper_digest.overview if state.paper_digest
+                else "This video breaks down the key concepts, contributions, and insights from this research."
+            )
             description = f"""
             An educational explanation of the research paper: {paper_content.title}
             
-            This video breaks down the key concepts, contributions, and insights from this research.
+            {summary}
             
             Problem: {understanding.problem}
             
@@ -63,6 +69,9 @@ class MetadataAgent(BaseAgent):
                 "research", "education", "science", "AI", "machine learning",
                 "paper explanation", "academic", "tutorial", "deep learning"
             ]
+            if state.paper_digest:
+                # The paper's own key terms are the most specific search keywords
+                tags = [term for term in state.paper_digest.key_terms if len(term) <= 30][:6] + tags
             
             # Create metadata
             metadata = VideoMetadata(
@@ -92,7 +101,9 @@ class MetadataAgent(BaseAgent):
         if not state.video:
             raise ValueError("Video not found in state")
     
-    async def _generate_title(self, understanding: PaperUnderstanding, paper_content: Dict) -> str:
+    async def _generate_title(
+        self, understanding: PaperUnderstanding, paper_content: Dict, digest: Optional[PaperDigest] = None
+    ) -> str:
         """Generate SEO-optimized title."""
         paper_title = paper_content.get("title", "Research Paper")
         
@@ -102,6 +113,7 @@ class MetadataAgent(BaseAgent):
         Paper Title: {paper_title}
         Main Problem: {understanding.problem}
         Key Contributions: {understanding.contributions[:2]}
+        Paper Summary: {digest.overview if digest else "None"}
         
         Requirements:
         - 60 characters or less
@@ -126,7 +138,9 @@ class MetadataAgent(BaseAgent):
         
         return title
     
-    async def _generate_description(self, understanding: PaperUnderstanding, paper_content: Dict) -> str:
+    async def _generate_description(
+        self, understanding: PaperUnderstanding, paper_content: Dict, digest: Optional[PaperDigest] = None
+    ) -> str:
         """Generate comprehensive description."""
         paper_title = paper_content.get("title", "Research Paper")
         authors = paper_content.get("authors", [])
@@ -139,6 +153,9 @@ class MetadataAgent(BaseAgent):
         Problem: {understanding.problem}
         Contributions: {understanding.contributions}
         
+        Paper Digest:
+        {digest.to_prompt_text(include_sections=False) if digest else "None"}
+        
         Include:
         - Brief summary (2-3 sentences)
         - Key findings
@@ -156,7 +173,9 @@ class MetadataAgent(BaseAgent):
         
         return response.content.strip()
     
-    async def _generate_tags(self, understanding: PaperUnderstanding, paper_content: Dict) -> List[str]:
+    async def _generate_tags(
+        self, understanding: PaperUnderstanding, paper_content: Dict, digest: Optional[PaperDigest] = None
+    ) -> List[str]:
         """Generate relevant tags."""
         paper_title = paper_content.get("title", "")
         
@@ -166,6 +185,7 @@ class MetadataAgent(BaseAgent):
         Paper: {paper_title}
         Problem: {understanding.problem}
         Contributions: {understanding.contributions[:3]}
+        Key Terms: {", ".join(digest.key_terms) if digest else "None"}
         
         Generate 10-15 relevant tags including:
         - Research domain keywords
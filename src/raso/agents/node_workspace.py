@@ -0,0 +1,573 @@
+"""
+Shared Node workspaces and render server for Remotion and Motion Canvas.
+
+Instead of writing a fresh ``package.json`` into a throwaway sandbox and
+running ``npm install`` for every scene, each framework gets one persistent
+workspace whose directory name is derived from a hash of its dependencies.
+Dependencies are installed once per version and reused across scenes and
+jobs. Scenes are written into the workspace as separate source files under
+a per-job directory, so concurrent jobs never overwrite each other's scenes.
+
+For Remotion, every scene is registered as its own composition in a per-job
+entry point. All of a job's compositions are registered before its first
+render, so a long-running Node render server bundles each job once, keeps
+the bundles of several jobs live, and renders scenes on request. It is driven by one JSON object
+per line over stdin/stdout, so any process speaking that protocol (e.g. a
+local stand-in in tests) can take its place.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+
+logger = logging.getLogger(__name__)
+
+
+REMOTION_PACKAGE = {
+    "name": "raso-remotion",
+    "version": "1.0.0",
+    "private": True,
+    "dependencies": {
+        "remotion": "^4.0.0",
+        "@remotion/bundler": "^4.0.0",
+        "@remotion/renderer": "^4.0.0",
+        "@remotion/cli": "^4.0.0",
+        "react": "^18.2.0",
+        "react-dom": "^18.2.0",
+    },
+    "devDependencies": {
+        "@types/react": "^18.0.0",
+        "typescript": "^5.0.0",
+    },
+}
+
+MOTION_CANVAS_PACKAGE = {
+    "name": "raso-motion-canvas",
+    "version": "1.0.0",
+    "private": True,
+    "type": "module",
+    "dependencies": {
+        "@motion-canvas/core": "^3.12.0",
+        "@motion-canvas/2d": "^3.12.0",
+        "@motion-canvas/ffmpeg": "^3.12.0",
+    },
+}
+
+# Bundles each entry point once per bundle version and renders compositions
+# on request. Every job has its own entry point, and the most recently used
+# bundles stay live, so concurrent jobs do not evict each other's bundle.
+REMOTION_RENDER_SERVER = """
+import {bundle} from '@remotion/bundler';
+import {renderMedia, selectComposition} from '@remotion/renderer';
+import path from 'node:path';
+import readline from 'node:readline';
+
+const MAX_BUNDLES = %(max_bundles)d;
+const bundles = new Map();
+
+function getBundle(entry, version) {
+  let cached = bundles.get(entry);
+  if (!cached || cached.version !== version) {
+    cached = {version, serveUrl: bundle({entryPoint: path.resolve(entry)})};
+  }
+  // Re-insert so the Map stays in least-recently-used order
+  bundles.delete(entry);
+  bundles.set(entry, cached);
+  while (bundles.size > MAX_BUNDLES) {
+    bundles.delete(bundles.keys().next().value);
+  }
+  return cached.serveUrl;
+}
+
+async function handle(job) {
+  const serveUrl = await getBundle(job.entry, job.bundle_version);
+  const composition = await selectComposition({serveUrl, id: job.composition, inputProps: {}});
+  await renderMedia({
+    composition,
+    serveUrl,
+    codec: 'h264',
+    outputLocation: job.output,
+    inputProps: {},
+    concurrency: job.concurrency ?? null,
+    overwrite: true,
+  });
+}
+
+const rl = readline.createInterface({input: process.stdin});
+rl.on('line', (line) => {
+  const job = JSON.parse(line);
+  handle(job)
+    .then(() => process.stdout.write(JSON.stringify({id: job.id, ok: true}) + '\\n'))
+    .catch((err) => process.stdout.write(JSON.stringify({id: job.id, ok: false, error: String(err && err.stack || err)}) + '\\n'));
+});
+"""
+
+
+def composition_id(scene_id: str) -> str:
+    """Remotion composition IDs may only contain letters, digits and hyphens."""
+    return re.sub(r"[^a-zA-Z0-9-]", "-", scene_id) or "scene"
+
+
+def job_dir(job_id: str) -> str:
+    """Workspace directory holding one job's scene sources."""
+    return f"jobs/{composition_id(job_id)}"
+
+
+class NodeWorkspace:
+    """A persistent Node project whose dependencies are installed once per version."""
+
+    def __init__(
+        self,
+        name: str,
+        package_json: Dict[str, Any],
+        root: Path,
+        install_command: Optional[Sequence[str]] = None,
+        install_timeout: float = 600.0,
+    ):
+        """
+        Initialize the workspace.
+
+        Args:
+            name: Workspace name, e.g. ``remotion``
+            package_json: package.json contents; its hash versions the workspace
+            root: Directory holding all workspaces
+            install_command: Dependency install command (defaults to npm install)
+            install_timeout: Seconds allowed for the install
+        """
+        self.name = name
+        self.package_json = package_json
+        self.version = hashlib.sha256(json.dumps(package_json, sort_keys=True).encode()).hexdigest()[:12]
+        self.path = Path(root) / f"{name}-{self.version}"
+        self.install_command = list(install_command or ["npm", "install", "--no-audit", "--no-fund"])
+        self.install_timeout = install_timeout
+
+        self._installed = False
+        self._install_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def _marker(self) -> Path:
+        return self.path / ".raso-installed"
+
+    async def ensure_installed(self) -> None:
+        """
+        Install dependencies unless this workspace version is already installed.
+
+        Raises:
+            RuntimeError: If the install command fails
+        """
+        if self._installed:
+            return
+
+        if self._install_lock is None:
+            self._install_lock = asyncio.Lock()
+
+        async with self._install_lock:
+            if self._installed:
+                return
+
+            if self._marker.exists() and self._marker.read_text().strip() == self.version:
+                self._installed = True
+                return
+
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.write_file("package.json", json.dumps(self.package_json, indent=2))
+
+            logger.info(f"Installing {self.name} workspace dependencies in {self.path}")
+            process = await asyncio.create_subprocess_exec(
+                *self.install_command,
+                cwd=str(self.path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(), timeout=self.install_timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise RuntimeError(f"{self.name} dependency install timed out after {self.install_timeout}s")
+
+            if process.returncode != 0:
+                raise RuntimeError(f"{self.name} dependency install failed: {stderr.decode(errors='replace')}")
+
+            self._marker.write_text(self.version)
+            self._installed = True
+
+    def write_file(self, relative_path: str, content: str) -> Path:
+        """
+        Atomically write a file inside the workspace.
+
+        Args:
+            relative_path: Path relative to the workspace root
+            content: File contents
+
+        Returns:
+            Absolute path of the written file
+        """
+        path = self.path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+    def remove_dir(self, relative_path: str) -> None:
+        """Delete a directory inside the workspace, if it exists."""
+        shutil.rmtree(self.path / relative_path, ignore_errors=True)
+
+
+class RemotionProject:
+    """Registers one job's scenes as compositions of its own entry point in a shared workspace."""
+
+    def __init__(self, workspace: NodeWorkspace, job_id: str):
+        """
+        Initialize the project.
+
+        Args:
+            workspace: Installed Remotion workspace
+            job_id: Job whose scenes this project holds
+        """
+        self.workspace = workspace
+        self.job_id = job_id
+        self.directory = f"src/{job_dir(job_id)}"
+        self.entry = f"{self.directory}/index.ts"
+        self._compositions: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def bundle_version(self) -> str:
+        """Hash of the registered compositions; changes whenever a rebundle is needed."""
+        digest = hashlib.sha256(json.dumps(self._compositions, sort_keys=True).encode())
+        return digest.hexdigest()[:12]
+
+    def add_composition(
+        self,
+        scene_id: str,
+        component_code: str,
+        duration: float,
+        fps: int = 30,
+        width: int = 1920,
+        height: int = 1080,
+        write_root: bool = True,
+    ) -> str:
+        """
+        Write a scene component and register it as a composition.
+
+        Re-registering an unchanged scene leaves the bundle version as it is.
+
+        Args:
+            scene_id: Scene identifier
+            component_code: TSX exporting the scene component
+            duration: Scene duration in seconds
+            fps: Frame rate
+            width: Frame width
+            height: Frame height
+            write_root: Whether to regenerate the root now (batch registrations write it once)
+
+        Returns:
+            Composition ID to render
+        """
+        comp_id = composition_id(scene_id)
+        spec = {
+            "code_hash": hashlib.sha256(component_code.encode()).hexdigest()[:12],
+            "frames": max(1, round(duration * fps)),
+            "fps": fps,
+            "width": width,
+            "height": height,
+        }
+        if self._compositions.get(comp_id) == spec:
+            return comp_id
+
+        self.workspace.write_file(f"{self.directory}/scenes/{comp_id}.tsx", component_code)
+        self._compositions[comp_id] = spec
+        if write_root:
+            self._write_root()
+        return comp_id
+
+    def add_compositions(self, scenes: Sequence[Dict[str, Any]], **options: Any) -> None:
+        """
+        Register several scenes and regenerate the root once.
+
+        Args:
+            scenes: Dicts with ``scene_id``, ``component_code`` and ``duration``
+            **options: ``fps``, ``width`` and ``height`` shared by the scenes
+        """
+        for scene in scenes:
+            self.add_composition(
+                scene["scene_id"], scene["component_code"], scene["duration"], write_root=False, **options
+            )
+        self._write_root()
+
+    def _write_root(self) -> None:
+        """Regenerate the root listing every registered composition."""
+        imports = []
+        compositions = []
+        for index, (comp_id, spec) in enumerate(sorted(self._compositions.items())):
+            imports.append(f"import * as Scene{index} from './scenes/{comp_id}';")
+            compositions.append(
+                f"            <Composition id=\"{comp_id}\" component={{pick(Scene{index})}} "
+                f"durationInFrames={{{spec['frames']}}} fps={{{spec['fps']}}} "
+                f"width={{{spec['width']}}} height={{{spec['height']}}} />"
+            )
+
+        root = "\n".join([
+            "import React from 'react';",
+            "import {Composition} from 'remotion';",
+            *imports,
+            "",
+            "// Scene modules export their component by name or as default",
+            "const pick = (m: any) => m.default ?? Object.values(m)[0];",
+            "",
+            "export const RemotionRoot: React.FC = () => {",
+            "    return (",
+            "        <>",
+            *compositions,
+            "        </>",
+            "    );",
+            "};",
+            "",
+        ])
+        self.workspace.write_file(f"{self.directory}/Root.tsx", root)
+        self.workspace.write_file(
+            self.entry,
+            "import {registerRoot} from 'remotion';\nimport {RemotionRoot} from './Root';\n\nregisterRoot(RemotionRoot);\n",
+        )
+
+
+class RenderServer:
+    """A long-running render process speaking JSON lines over stdin/stdout."""
+
+    def __init__(self, command: Sequence[str], cwd: Path):
+        """
+        Initialize the server. The process starts on the first request.
+
+        Args:
+            command: Command starting the server
+            cwd: Working directory (the workspace)
+        """
+        self.command = list(command)
+        self.cwd = Path(cwd)
+
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._start_lock: Optional[asyncio.Lock] = None
+        self.restarts = 0
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def _ensure_started(self) -> None:
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+
+        async with self._start_lock:
+            if self.running:
+                return
+            if self._process is not None:
+                self.restarts += 1
+
+            self._process = await asyncio.create_subprocess_exec(
+                *self.command,
+                cwd=str(self.cwd),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            self._reader = asyncio.create_task(self._read_replies(self._process))
+
+    async def _read_replies(self, process: asyncio.subprocess.Process) -> None:
+        """Resolve pending requests as replies arrive; fail them all if the server exits."""
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+            try:
+                reply = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            future = self._pending.pop(reply.get("id"), None)
+            if future and not future.done():
+                future.set_result(reply)
+
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Render server exited"))
+        self._pending.clear()
+
+    async def request(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Send a job and wait for its reply.
+
+        Args:
+            payload: Job fields; an ``id`` is added
+            timeout: Seconds to wait for the reply
+
+        Returns:
+            Reply with ``ok`` and optionally ``error``
+        """
+        await self._ensure_started()
+
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        self._process.stdin.write((json.dumps({**payload, "id": request_id}) + "\n").encode())
+        await self._process.stdin.drain()
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def stop(self) -> None:
+        """Stop the server process."""
+        if self.running:
+            self._process.stdin.close()
+            try:
+                await asyncio.wait_for(self._process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                self._process.kill()
+                await self._process.wait()
+        if self._reader:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+class RemotionRenderService:
+    """Renders Remotion scenes through a shared workspace and render server."""
+
+    SERVER_SCRIPT = "render-server.mjs"
+
+    def __init__(
+        self,
+        workspace: NodeWorkspace,
+        server_command: Optional[Sequence[str]] = None,
+        concurrency: Optional[int] = None,
+        max_bundles: int = 4,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            workspace: Remotion workspace
+            server_command: Render server command (defaults to the bundled Node server)
+            concurrency: Remotion ``concurrency`` option (None uses Remotion's default)
+            max_bundles: Job bundles the render server keeps live at once
+        """
+        self.workspace = workspace
+        self.concurrency = concurrency
+        self.max_bundles = max(1, max_bundles)
+        self.server = RenderServer(server_command or ["node", self.SERVER_SCRIPT], workspace.path)
+        self._projects: Dict[str, RemotionProject] = {}
+
+    def project(self, job_id: str) -> RemotionProject:
+        """Get the composition project for a job."""
+        if job_id not in self._projects:
+            self._projects[job_id] = RemotionProject(self.workspace, job_id)
+        return self._projects[job_id]
+
+    async def prepare(
+        self,
+        job_id: str,
+        scenes: Sequence[Dict[str, Any]],
+        fps: int = 30,
+        width: int = 1920,
+        height: int = 1080,
+    ) -> None:
+        """
+        Register all of a job's scenes before its first render, so the job is bundled once.
+
+        Args:
+            job_id: Job identifier
+            scenes: Dicts with ``scene_id``, ``component_code`` and ``duration``
+            fps: Frame rate
+            width: Frame width
+            height: Frame height
+        """
+        await self.workspace.ensure_installed()
+        self.project(job_id).add_compositions(scenes, fps=fps, width=width, height=height)
+
+    def release(self, job_id: str) -> None:
+        """Forget a finished job's compositions and delete its scene sources."""
+        project = self._projects.pop(job_id, None)
+        if project:
+            self.workspace.remove_dir(project.directory)
+
+    async def render(
+        self,
+        scene_id: str,
+        component_code: str,
+        duration: float,
+        output_path: str,
+        timeout: float,
+        fps: int = 30,
+        width: int = 1920,
+        height: int = 1080,
+        job_id: str = "default",
+    ) -> Dict[str, Any]:
+        """
+        Render one scene as a composition of its job's entry point.
+
+        Returns:
+            Server reply with ``ok`` and optionally ``error``
+        """
+        await self.workspace.ensure_installed()
+        self.workspace.write_file(self.SERVER_SCRIPT, REMOTION_RENDER_SERVER % {"max_bundles": self.max_bundles})
+
+        project = self.project(job_id)
+        comp_id = project.add_composition(scene_id, component_code, duration, fps, width, height)
+        return await self.server.request(
+            {
+                "entry": project.entry,
+                "bundle_version": project.bundle_version,
+                "composition": comp_id,
+                "output": str(Path(output_path).resolve()),
+                "concurrency": self.concurrency,
+            },
+            timeout=timeout,
+        )
+
+
+_workspaces: Dict[str, NodeWorkspace] = {}
+_remotion_service: Optional[RemotionRenderService] = None
+
+
+def _workspace_root() -> Path:
+    from config.backend.config import get_config
+    return Path(get_config().data_path) / "node_workspaces"
+
+
+def get_node_workspace(name: str) -> NodeWorkspace:
+    """
+    Get the shared workspace for a framework.
+
+    Args:
+        name: ``remotion`` or ``motion-canvas``
+
+    Returns:
+        Shared workspace
+    """
+    if name not in _workspaces:
+        package_json = REMOTION_PACKAGE if name == "remotion" else MOTION_CANVAS_PACKAGE
+        _workspaces[name] = NodeWorkspace(name, package_json, _workspace_root())
+    return _workspaces[name]
+
+
+def get_remotion_render_service() -> RemotionRenderService:
+    """Get the global Remotion render service."""
+    global _remotion_service
+    if _remotion_service is None:
+        from config.backend.config import get_config
+        _remotion_service = RemotionRenderService(
+            get_node_workspace("remotion"),
+            concurrency=get_config().animation.remotion_concurrency,
+        )
+    return _remotion_service
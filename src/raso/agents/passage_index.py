@@ -0,0 +1,365 @@
+"""
+Per-paper passage embedding index for scene-level prompts.
+
+Paper sections are chunked into overlapping passages and embedded once at
+ingest, either with a local sentence-transformers model or, if that is not
+installed, with hashed TF-IDF vectors. Embeddings are stored as a single
+contiguous float32 matrix of unit vectors, so top-k cosine search is one
+matrix-vector product. The matrix is persisted as ``.npy`` and memory-mapped
+on load, so repeated jobs for the same paper do not re-embed.
+"""
+
+import hashlib
+import json
+import math
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.backend.models.paper import PaperContent
+
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+DEFAULT_SENTENCE_MODEL = "all-MiniLM-L6-v2"
+
+
+def chunk_passages(
+    paper_content: PaperContent,
+    max_words: int = 120,
+    overlap_words: int = 30,
+) -> List[Dict[str, str]]:
+    """
+    Split paper sections into overlapping passages.
+
+    Args:
+        paper_content: Paper content
+        max_words: Maximum words per passage
+        overlap_words: Words shared between consecutive passages of a section
+
+    Returns:
+        Passages as dicts with ``section`` and ``text``
+    """
+    step = max(1, max_words - overlap_words)
+    passages = [{"section": "Abstract", "text": paper_content.abstract}]
+
+    for section in paper_content.sections:
+        words = section.content.split()
+        for start in range(0, max(1, len(words) - overlap_words), step):
+            text = " ".join(words[start:start + max_words])
+            if text:
+                passages.append({"section": section.title, "text": text})
+
+    return passages
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase word tokens plus word bigrams."""
+    words = _TOKEN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length in place, leaving zero rows untouched."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+class HashedTfidfEmbedder:
+    """TF-IDF over hashed unigram and bigram features; needs no model download."""
+
+    name = "hashed-tfidf"
+
+    def __init__(self, dim: int = 1024, idf: Optional[np.ndarray] = None):
+        """
+        Initialize the embedder.
+
+        Args:
+            dim: Number of hash buckets (embedding dimension)
+            idf: Inverse document frequencies from ``fit``, if already known
+        """
+        self.dim = dim
+        self.idf = idf if idf is not None else np.ones(dim, dtype=np.float32)
+
+    def _bucket(self, token: str) -> int:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") % self.dim
+
+    def _counts(self, text: str) -> Counter:
+        return Counter(self._bucket(token) for token in _tokenize(text))
+
+    def fit(self, texts: Sequence[str]) -> "HashedTfidfEmbedder":
+        """
+        Compute inverse document frequencies over the passages of one paper.
+
+        Args:
+            texts: Passage texts
+
+        Returns:
+            This embedder
+        """
+        document_frequency = np.zeros(self.dim, dtype=np.float32)
+        for text in texts:
+            for bucket in self._counts(text):
+                document_frequency[bucket] += 1
+
+        self.idf = np.log((1 + len(texts)) / (1 + document_frequency)).astype(np.float32) + 1.0
+        return self
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts as unit-length TF-IDF vectors.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 matrix of shape (len(texts), dim)
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for bucket, count in self._counts(text).items():
+                matrix[row, bucket] = 1.0 + math.log(count)
+
+        matrix *= self.idf
+        return _normalize_rows(matrix)
+
+    def state(self) -> Dict[str, Any]:
+        """Embedder settings needed to embed queries against a saved index."""
+        return {"name": self.name, "dim": self.dim}
+
+
+class SentenceTransformerEmbedder:
+    """Local CPU sentence-transformers model."""
+
+    name = "sentence-transformers"
+
+    _models: Dict[str, Any] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, model_name: str = DEFAULT_SENTENCE_MODEL):
+        """
+        Initialize the embedder, loading the model once per process.
+
+        Args:
+            model_name: sentence-transformers model name
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        with self._lock:
+            if model_name not in self._models:
+                self._models[model_name] = SentenceTransformer(model_name, device="cpu")
+        self.model = self._models[model_name]
+
+    def fit(self, texts: Sequence[str]) -> "SentenceTransformerEmbedder":
+        """No fitting needed; present for interface parity with the TF-IDF embedder."""
+        return self
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts with the model.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 matrix of unit vectors, one row per text
+        """
+        vectors = self.model.encode(list(texts), batch_size=32, show_progress_bar=False)
+        return _normalize_rows(np.ascontiguousarray(vectors, dtype=np.float32))
+
+    def state(self) -> Dict[str, Any]:
+        """Embedder settings needed to embed queries against a saved index."""
+        return {"name": self.name, "model_name": self.model_name}
+
+
+def create_embedder(prefer_model: bool = True):
+    """
+    Create the best available embedder.
+
+    Args:
+        prefer_model: Use a local sentence-transformers model if installed
+
+    Returns:
+        Sentence-transformers embedder, or hashed TF-IDF fallback
+    """
+    if prefer_model:
+        try:
+            return SentenceTransformerEmbedder()
+        except Exception:
+            # Not installed or model unavailable offline
+            pass
+    return HashedTfidfEmbedder()
+
+
+class PassageIndex:
+    """Top-k cosine search over the embedded passages of one paper."""
+
+    def __init__(self, passages: List[Dict[str, str]], matrix: np.ndarray, embedder):
+        """
+        Initialize the index.
+
+        Args:
+            passages: Passage dicts, one per matrix row
+            matrix: float32 matrix of unit-length passage embeddings
+            embedder: Embedder used for the passages, reused for queries
+        """
+        self.passages = passages
+        self.matrix = matrix
+        self.embedder = embedder
+
+    @classmethod
+    def build(cls, paper_content: PaperContent, embedder=None) -> "PassageIndex":
+        """
+        Chunk and embed a paper.
+
+        Args:
+            paper_content: Paper content
+            embedder: Embedder to use (defaults to ``create_embedder()``)
+
+        Returns:
+            New passage index
+        """
+        passages = chunk_passages(paper_content)
+        texts = [passage["text"] for passage in passages]
+
+        embedder = embedder or create_embedder()
+        matrix = embedder.fit(texts).embed(texts)
+        return cls(passages, np.ascontiguousarray(matrix, dtype=np.float32), embedder)
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[Dict[str, str], float]]:
+        """
+        Find the passages most similar to a query.
+
+        Args:
+            query: Query text, e.g. a scene title and its concepts
+            k: Number of passages to return
+
+        Returns:
+            (passage, cosine similarity) pairs, best first
+        """
+        if not self.passages or not query.strip():
+            return []
+
+        query_vector = self.embedder.embed([query])[0]
+        scores = self.matrix @ query_vector
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.passages[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def context_for(self, query: str, k: int = 4, max_chars: int = 2500) -> str:
+        """
+        Format the most relevant passages for inclusion in a prompt.
+
+        Args:
+            query: Query text
+            k: Maximum number of passages
+            max_chars: Maximum length of the returned text
+
+        Returns:
+            Passages as "[section] text" lines, or an empty string if none match
+        """
+        lines = []
+        length = 0
+        for passage, _ in self.search(query, k):
+            line = f"[{passage['section']}] {passage['text']}"
+            if length + len(line) > max_chars:
+                break
+            lines.append(line)
+            length += len(line) + 1
+        return "\n".join(lines)
+
+    def save(self, directory: Path) -> None:
+        """
+        Persist the index.
+
+        Args:
+            directory: Target directory (created if needed)
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        np.save(directory / "matrix.npy", np.ascontiguousarray(self.matrix, dtype=np.float32))
+        if isinstance(self.embedder, HashedTfidfEmbedder):
+            np.save(directory / "idf.npy", self.embedder.idf)
+
+        with open(directory / "passages.json", "w", encoding="utf-8") as f:
+            json.dump({"embedder": self.embedder.state(), "passages": self.passages}, f)
+
+    @classmethod
+    def load(cls, directory: Path) -> "PassageIndex":
+        """
+        Load a persisted index with the embedding matrix memory-mapped.
+
+        Args:
+            directory: Directory written by ``save``
+
+        Returns:
+            Loaded passage index
+        """
+        directory = Path(directory)
+        with open(directory / "passages.json", "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        state = data["embedder"]
+        if state["name"] == HashedTfidfEmbedder.name:
+            embedder = HashedTfidfEmbedder(dim=state["dim"], idf=np.load(directory / "idf.npy"))
+        else:
+            embedder = SentenceTransformerEmbedder(state["model_name"])
+
+        matrix = np.load(directory / "matrix.npy", mmap_mode="r")
+        return cls(data["passages"], matrix, embedder)
+
+
+_passage_indexes: Dict[str, PassageIndex] = {}
+_passage_index_lock = threading.Lock()
+
+
+def get_passage_index(paper_content: PaperContent) -> PassageIndex:
+    """
+    Get the passage index for a paper, loading or building it as needed.
+
+    Indexes are stored under the configured data path, keyed by the hash of
+    the paper text.
+
+    Args:
+        paper_content: Paper content
+
+    Returns:
+        Passage index for the paper
+    """
+    paper_hash = paper_content.content_hash()
+
+    with _passage_index_lock:
+        if paper_hash in _passage_indexes:
+            return _passage_indexes[paper_hash]
+
+        from config.backend.config import get_config
+        directory = Path(get_config().data_path) / "passage_index" / paper_hash
+
+        index = None
+        if (directory / "matrix.npy").exists():
+            try:
+                index = PassageIndex.load(directory)
+            except Exception:
+                # Corrupt or incompatible index; rebuild below
+                index = None
+
+        if index is None:
+            index = PassageIndex.build(paper_content)
+            index.save(directory)
+
+        _passage_indexes[paper_hash] = index
+        return index
@@ -0,0 +1,272 @@
+"""
+Cost-model-driven scene render scheduling for the RASO platform.
+
+Scenes range from short title cards to long equation derivations, so
+rendering them in script order can leave one worker grinding through the
+longest scene long after the others are idle. The scheduler predicts each
+scene's render time from its framework, template and duration, and each
+framework's workers pull the longest expected scene first (LPT scheduling),
+which keeps the makespan close to optimal.
+
+The model is ``render_time = overhead + rate * duration`` per framework, with
+the rate refined per template from observed render times
+(``SceneMetadata.render_duration``) and persisted between runs.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Render seconds per second of video, before any observations
+DEFAULT_RATES = {"manim": 4.0, "motion-canvas": 2.0, "remotion": 1.5}
+DEFAULT_RATE = 3.0
+
+# Fixed per-scene cost (process start, bundling, encoding setup)
+DEFAULT_OVERHEAD = {"manim": 5.0, "motion-canvas": 8.0, "remotion": 4.0}
+
+
+def _framework_name(framework: Any) -> str:
+    return getattr(framework, "value", framework)
+
+
+class RenderCostModel:
+    """Predicts scene render times and learns from observed ones."""
+
+    def __init__(self, path: Optional[Path] = None, smoothing: float = 0.3):
+        """
+        Initialize the model, loading saved rates if present.
+
+        Args:
+            path: JSON file the learned rates are persisted to
+            smoothing: Weight of a new observation once a rate has several samples
+        """
+        self.path = Path(path) if path else None
+        self.smoothing = smoothing
+        self.rates: Dict[str, Dict[str, float]] = {}
+
+        if self.path and self.path.exists():
+            try:
+                self.rates = json.loads(self.path.read_text())
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable render cost model {self.path}: {e}")
+
+    @staticmethod
+    def _key(framework: str, template_id: Optional[str] = None) -> str:
+        return f"{framework}/{template_id}" if template_id else framework
+
+    def rate(self, framework: Any, template_id: Optional[str] = None) -> float:
+        """Learned rate for the template, else for the framework, else the prior."""
+        framework = _framework_name(framework)
+        for key in (self._key(framework, template_id), self._key(framework)):
+            if key in self.rates:
+                return self.rates[key]["rate"]
+        return DEFAULT_RATES.get(framework, DEFAULT_RATE)
+
+    def predict(self, framework: Any, template_id: Optional[str], duration: float) -> float:
+        """
+        Predict a scene's render time.
+
+        Args:
+            framework: Animation framework
+            template_id: Template used for the scene
+            duration: Scene duration in seconds
+
+        Returns:
+            Expected render time in seconds
+        """
+        framework = _framework_name(framework)
+        return DEFAULT_OVERHEAD.get(framework, 0.0) + self.rate(framework, template_id) * max(duration, 0.0)
+
+    def observe(self, framework: Any, template_id: Optional[str], duration: float, render_time: float) -> None:
+        """
+        Refine the model with an observed render time.
+
+        The first observations replace the prior almost entirely; later ones
+        are blended in with an exponential moving average.
+        """
+        framework = _framework_name(framework)
+        observed_rate = max(render_time - DEFAULT_OVERHEAD.get(framework, 0.0), 0.0) / max(duration, 1.0)
+
+        keys = [self._key(framework)]
+        if template_id:
+            keys.append(self._key(framework, template_id))
+
+        for key in keys:
+            entry = self.rates.setdefault(key, {"rate": observed_rate, "samples": 0})
+            alpha = max(self.smoothing, 1.0 / (entry["samples"] + 1))
+            entry["rate"] = (1 - alpha) * entry["rate"] + alpha * observed_rate
+            entry["samples"] += 1
+
+    def observe_scene(self, rendered_scene: Any) -> bool:
+        """
+        Learn from a rendered scene's metadata.
+
+        Returns:
+            Whether the scene carried a usable render time
+        """
+        metadata = rendered_scene.metadata
+        if metadata.error_message or not metadata.render_duration:
+            return False
+        self.observe(rendered_scene.framework, metadata.template_id, rendered_scene.duration, metadata.render_duration)
+        return True
+
+    def save(self) -> None:
+        """Persist the learned rates."""
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.rates, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class RenderJob:
+    """A scene plan with its predicted and observed render times."""
+
+    scene_plan: Any
+    framework: str
+    predicted: float
+    actual: Optional[float] = None
+    result: Any = None
+
+    @property
+    def scene_id(self) -> str:
+        return self.scene_plan.scene_id
+
+
+def predicted_makespan(predictions: List[float], workers: int) -> float:
+    """Makespan of LPT-assigning the predicted times to identical workers."""
+    loads = [0.0] * max(1, workers)
+    for predicted in sorted(predictions, reverse=True):
+        heapq.heapreplace(loads, loads[0] + predicted)
+    return max(loads)
+
+
+@dataclass
+class RenderScheduler:
+    """Dispatches scenes longest-expected-first across per-framework worker pools."""
+
+    cost_model: RenderCostModel
+    workers: Dict[str, int] = field(default_factory=dict)
+
+    def plan(self, scene_plans: List[Any]) -> Dict[str, List[RenderJob]]:
+        """
+        Build per-framework queues ordered by descending predicted cost.
+
+        Args:
+            scene_plans: Scene plans to render
+
+        Returns:
+            Jobs per framework, longest expected first
+        """
+        queues: Dict[str, List[RenderJob]] = {}
+        for scene_plan in scene_plans:
+            framework = _framework_name(scene_plan.framework)
+            predicted = self.cost_model.predict(framework, scene_plan.template_id, scene_plan.duration)
+            queues.setdefault(framework, []).append(RenderJob(scene_plan, framework, predicted))
+
+        for jobs in queues.values():
+            jobs.sort(key=lambda job: job.predicted, reverse=True)
+        return queues
+
+    async def run(
+        self,
+        scene_plans: List[Any],
+        render: Callable[[Any], Awaitable[Any]],
+        on_complete: Optional[Callable[[RenderJob, int, int], None]] = None,
+    ) -> List[RenderJob]:
+        """
+        Render all scenes and refine the cost model as each one finishes.
+
+        Args:
+            scene_plans: Scene plans to render
+            render: Renders one scene plan, returning a RenderedScene
+            on_complete: Called with each finished job and the progress counts
+
+        Returns:
+            Jobs in scene plan order, with results and timings
+        """
+        queues = self.plan(scene_plans)
+        total = len(scene_plans)
+        completed = 0
+
+        async def worker(queue: List[RenderJob]) -> None:
+            nonlocal completed
+            while queue:
+                job = queue.pop(0)
+                job.result = await render(job.scene_plan)
+
+                metadata = getattr(job.result, "metadata", None)
+                if metadata is not None:
+                    metadata.predicted_render_duration = job.predicted
+                    job.actual = metadata.render_duration
+                    self.cost_model.observe_scene(job.result)
+
+                completed += 1
+                if on_complete:
+                    on_complete(job, completed, total)
+
+        jobs_by_scene = {job.scene_id: job for jobs in queues.values() for job in jobs}
+        await asyncio.gather(*[
+            worker(queue)
+            for framework, queue in queues.items()
+            for _ in range(max(1, self.workers.get(framework, 1)))
+        ])
+
+        return [jobs_by_scene[scene_plan.scene_id] for scene_plan in scene_plans]
+
+    def report(self, jobs: List[RenderJob]) -> Dict[str, Any]:
+        """
+        Predicted versus actual timings per job and per framework queue.
+
+        Args:
+            jobs: Finished jobs from ``run``
+
+        Returns:
+            Per-job timings and predicted makespan per framework
+        """
+        by_framework: Dict[str, List[float]] = {}
+        for job in jobs:
+            by_framework.setdefault(job.framework, []).append(job.predicted)
+
+        observed = [job for job in jobs if job.actual is not None]
+        return {
+            "jobs": [
+                {
+                    "scene_id": job.scene_id,
+                    "framework": job.framework,
+                    "template_id": job.scene_plan.template_id,
+                    "predicted": round(job.predicted, 2),
+                    "actual": round(job.actual, 2) if job.actual is not None else None,
+                }
+                for job in jobs
+            ],
+            "predicted_makespan": {
+                framework: predicted_makespan(predictions, self.workers.get(framework, 1))
+                for framework, predictions in by_framework.items()
+            },
+            "mean_absolute_error": (
+                sum(abs(job.actual - job.predicted) for job in observed) / len(observed) if observed else None
+            ),
+        }
+
+
+_render_cost_model: Optional[RenderCostModel] = None
+
+
+def get_render_cost_model() -> RenderCostModel:
+    """Get the global render cost model, persisted under the data path."""
+    global _render_cost_model
+    if _render_cost_model is None:
+        from config.backend.config import get_config
+        _render_cost_model = RenderCostModel(Path(get_config().data_path) / "render_cost_model.json")
+    return _render_cost_model
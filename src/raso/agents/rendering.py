@@ -10,6 +10,7 @@ import asyncio
 import subprocess
 import tempfile
 import shutil
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 from abc import ABC, abstractmethod
@@ -17,13 +18,18 @@ from datetime import datetime, timedelta
 
 from pydantic import BaseModel, Field
 
-from agents.base import BaseAgent
+from agents.base import BaseAgent, register_agent
 from config.backend.models import AgentType, RASOMasterState
 from config.backend.models.visual import VisualPlan, ScenePlan
-from config.backend.models.animation import AnimationAssets, RenderedScene, SceneMetadata, VideoResolution
-from animation.templates import template_engine, TemplateFramework
+from config.backend.models.animation import AnimationAssets, RenderedScene, RenderStatus, SceneMetadata, VideoResolution
+from core.templates import template_engine, TemplateFramework
+from agents.manim_workers import ManimWorkerError, get_manim_worker_pool
+from agents.node_workspace import composition_id, get_node_workspace, get_remotion_render_service, job_dir
+from agents.render_scheduler import RenderJob, RenderScheduler, get_render_cost_model
 from agents.retry import retry
 from config.backend.config import get_config
+from core.resource_governor import current_job, get_resource_governor, work_cost
+from core.tracing import span
 
 
 class RenderingError(Exception):
@@ -84,6 +90,19 @@ class BaseRenderingAgent(BaseAgent, ABC):
         """
         pass
     
+    async def prepare_scenes(self, scene_plans: List[ScenePlan]) -> None:
+        """
+        Prepare all of the current job's scenes for this framework before the first render.
+        
+        Args:
+            scene_plans: Scenes this agent will render
+        """
+        pass
+    
+    async def release_scenes(self) -> None:
+        """Clean up per-job render state once the current job's scenes are rendered."""
+        pass
+    
     async def _create_scene_placeholder(self, scene_plan: ScenePlan, output_path: str) -> bool:
         """Create a proper placeholder video for a scene."""
         try:
@@ -177,7 +196,7 @@ class BaseRenderingAgent(BaseAgent, ABC):
             
             for scene_plan in my_scenes:
                 # Create output directory
-                output_dir = Path(self.config.temp_path) / "renders" / scene_plan.scene_id
+                output_dir = Path(self.config.temp_path) / "renders" / current_job.get() / scene_plan.scene_id
                 output_dir.mkdir(parents=True, exist_ok=True)
                 output_path = str(output_dir / f"{scene_plan.scene_id}.mp4")
                 
@@ -205,7 +224,7 @@ class BaseRenderingAgent(BaseAgent, ABC):
                 else:
                     self.logger.warning(f"Failed to create placeholder for scene {scene_plan.scene_id}")
                     # Create fallback rendered scene with proper temp path
-                    fallback_path = Path(self.config.temp_path) / "fallback" / f"fallback_{scene_plan.scene_id}.mp4"
+                    fallback_path = Path(self.config.temp_path) / "fallback" / current_job.get() / f"fallback_{scene_plan.scene_id}.mp4"
                     fallback_path.parent.mkdir(parents=True, exist_ok=True)
                     rendered_scene = RenderedScene(
                         scene_id=scene_plan.scene_id,
@@ -257,8 +276,8 @@ class BaseRenderingAgent(BaseAgent, ABC):
         Returns:
             Rendering result
         """
-        # Create output path
-        output_dir = Path(self.config.temp_path) / "renders" / scene_plan.scene_id
+        # Create output path; per job, so jobs and rebuilds never share a scene's file
+        output_dir = Path(self.config.temp_path) / "renders" / current_job.get() / scene_plan.scene_id
         output_dir.mkdir(parents=True, exist_ok=True)
         output_path = str(output_dir / f"{scene_plan.scene_id}.mp4")
         
@@ -276,11 +295,11 @@ class BaseRenderingAgent(BaseAgent, ABC):
         
         # Try fallback template
         fallback_template_id = template_engine.get_fallback_template(self.framework)
-        if fallback_template_id and fallback_template_id != scene_plan.template:
+        if fallback_template_id and fallback_template_id != scene_plan.template_id:
             fallback_plan = ScenePlan(
                 scene_id=scene_plan.scene_id,
                 framework=scene_plan.framework,
-                template=fallback_template_id,
+                template_id=fallback_template_id,
                 parameters=scene_plan.parameters,
                 duration=scene_plan.duration,
             )
@@ -322,19 +341,22 @@ class BaseRenderingAgent(BaseAgent, ABC):
         timeout = timeout or self.timeout_seconds
         
         try:
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                cwd=cwd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=timeout
-            )
-            
-            return process.returncode, stdout.decode(), stderr.decode()
+            with span(f"subprocess.{os.path.basename(command[0])}", "subprocess", cwd=cwd) as command_span:
+                process = await asyncio.create_subprocess_exec(
+                    *command,
+                    cwd=cwd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                if command_span:
+                    command_span.args["pid"] = process.pid
+                
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(),
+                    timeout=timeout
+                )
+                
+                return process.returncode, stdout.decode(), stderr.decode()
             
         except asyncio.TimeoutError:
             if process:
@@ -425,7 +447,7 @@ class ManimAgent(BaseRenderingAgent):
         try:
             # Generate animation code
             code = template_engine.generate_animation_code(
-                template_id=scene_plan.template,
+                template_id=scene_plan.template_id,
                 parameters=scene_plan.parameters,
             )
             
@@ -434,10 +456,17 @@ class ManimAgent(BaseRenderingAgent):
             with open(code_file, 'w') as f:
                 f.write(code)
             
-            # Prepare manim command
             quality = self.config.animation.manim_quality
             resolution = self.config.animation.resolution
             
+            if self.config.animation.manim_warm_workers:
+                result = await self._render_with_worker(
+                    scene_plan, code, output_path, sandbox_dir, quality, resolution, start_time
+                )
+                if result:
+                    return result
+            
+            # Prepare manim command
             command = [
                 "manim",
                 code_file,
@@ -482,6 +511,62 @@ class ManimAgent(BaseRenderingAgent):
             self.cleanup_sandbox(sandbox_dir)
 
 
+    async def _render_with_worker(
+        self,
+        scene_plan: ScenePlan,
+        code: str,
+        output_path: str,
+        sandbox_dir: str,
+        quality: str,
+        resolution: str,
+        start_time: datetime,
+    ) -> Optional[RenderingResult]:
+        """
+        Render in a warm Manim worker instead of a fresh CLI process.
+        
+        Returns:
+            Rendering result, or None if no worker is available and the CLI
+            path should be used instead
+        """
+        pool = get_manim_worker_pool()
+        try:
+            with span("manim.worker_render", "subprocess", scene_id=scene_plan.scene_id):
+                reply = await pool.render(
+                    code=code,
+                    output_path=output_path,
+                    work_dir=sandbox_dir,
+                    quality=quality,
+                    resolution=resolution,
+                    timeout=self.timeout_seconds,
+                )
+        except ManimWorkerError as e:
+            if pool.unavailable_reason:
+                self.logger.warning(f"Warm Manim workers unavailable, using CLI: {e}")
+                return None
+            reply = {"success": False, "error": str(e)}
+        
+        render_time = (datetime.now() - start_time).total_seconds()
+        
+        if reply.get("success") and os.path.exists(output_path):
+            return RenderingResult(
+                success=True,
+                output_path=output_path,
+                duration=scene_plan.duration,
+                resolution=resolution,
+                file_size=os.path.getsize(output_path),
+                render_time=render_time,
+            )
+        
+        return RenderingResult(
+            success=False,
+            duration=scene_plan.duration,
+            resolution=resolution,
+            render_time=render_time,
+            error_message=f"Manim failed: {reply.get('error')}",
+            logs=[reply.get("traceback", "")],
+        )
+
+
 class MotionCanvasAgent(BaseRenderingAgent):
     """Agent for rendering Motion Canvas animations."""
     
@@ -523,115 +608,91 @@ class MotionCanvasAgent(BaseRenderingAgent):
         output_path: str,
         **kwargs
     ) -> RenderingResult:
-        """Render Motion Canvas scene."""
+        """Render Motion Canvas scene in the shared, pre-installed workspace."""
         start_time = datetime.now()
         
-        # Create sandbox
-        sandbox_dir = self.create_sandbox_environment()
-        
         try:
-            # Generate animation code
-            code = template_engine.generate_animation_code(
-                template_id=scene_plan.template,
-                parameters=scene_plan.parameters,
+            # Dependencies are installed once per workspace version, not per scene
+            workspace = get_node_workspace("motion-canvas")
+            await workspace.ensure_installed()
+        except RuntimeError as e:
+            return RenderingResult(
+                success=False,
+                duration=scene_plan.duration,
+                resolution=self.config.animation.resolution,
+                render_time=0.0,
+                error_message=str(e),
             )
-            
-            # Create Motion Canvas project structure
-            project_dir = os.path.join(sandbox_dir, "project")
-            os.makedirs(project_dir, exist_ok=True)
-            
-            # Write package.json
-            package_json = {
-                "name": "raso-motion-canvas",
-                "version": "1.0.0",
-                "type": "module",
-                "dependencies": {
-                    "@motion-canvas/core": "^3.12.0",
-                    "@motion-canvas/2d": "^3.12.0",
-                    "@motion-canvas/ffmpeg": "^3.12.0"
-                }
-            }
-            
-            with open(os.path.join(project_dir, "package.json"), 'w') as f:
-                import json
-                json.dump(package_json, f, indent=2)
-            
-            # Write scene code
-            scene_file = os.path.join(project_dir, "scene.ts")
-            with open(scene_file, 'w') as f:
-                f.write(code)
-            
-            # Write project configuration
-            config_code = f"""
+        
+        # Generate animation code
+        code = template_engine.generate_animation_code(
+            template_id=scene_plan.template_id,
+            parameters=scene_plan.parameters,
+        )
+        
+        # Each scene gets its own scene and config file under its job's directory,
+        # so renders of concurrent jobs can share the workspace
+        scene_name = composition_id(scene_plan.scene_id)
+        scene_dir = job_dir(current_job.get())
+        workspace.write_file(f"src/{scene_dir}/scenes/{scene_name}.ts", code)
+        
+        config_code = f"""
 import {{Configuration}} from '@motion-canvas/core';
 
 const config: Configuration = {{
   project: [
-    './scene.ts',
+    './src/{scene_dir}/scenes/{scene_name}.ts',
   ],
   settings: {{
     size: {{width: 1920, height: 1080}},
     duration: {scene_plan.duration},
   }},
-  output: '{output_path}',
+  output: '{os.path.abspath(output_path)}',
 }};
 
 export default config;
 """
+        config_file = f"configs/{scene_dir}/{scene_name}.config.ts"
+        workspace.write_file(config_file, config_code)
+        
+        # Render animation
+        render_command = ["npx", "motion-canvas", "render", "--config", config_file]
+        
+        return_code, stdout, stderr = await self.run_command_with_timeout(
+            command=render_command,
+            cwd=str(workspace.path),
+        )
+        
+        render_time = (datetime.now() - start_time).total_seconds()
+        
+        if return_code == 0 and os.path.exists(output_path):
+            file_size = os.path.getsize(output_path)
             
-            with open(os.path.join(project_dir, "motion-canvas.config.ts"), 'w') as f:
-                f.write(config_code)
-            
-            # Install dependencies
-            install_code, install_stdout, install_stderr = await self.run_command_with_timeout(
-                command=["npm", "install"],
-                cwd=project_dir,
-                timeout=120,  # 2 minutes for npm install
+            return RenderingResult(
+                success=True,
+                output_path=output_path,
+                duration=scene_plan.duration,
+                resolution=self.config.animation.resolution,
+                file_size=file_size,
+                render_time=render_time,
+                logs=[stdout, stderr],
             )
-            
-            if install_code != 0:
-                return RenderingResult(
-                    success=False,
-                    duration=scene_plan.duration,
-                    resolution=self.config.animation.resolution,
-                    render_time=0.0,
-                    error_message=f"npm install failed: {install_stderr}",
-                )
-            
-            # Render animation
-            render_command = ["npx", "motion-canvas", "render"]
-            
-            return_code, stdout, stderr = await self.run_command_with_timeout(
-                command=render_command,
-                cwd=project_dir,
+        else:
+            return RenderingResult(
+                success=False,
+                duration=scene_plan.duration,
+                resolution=self.config.animation.resolution,
+                render_time=render_time,
+                error_message=f"Motion Canvas failed: {stderr}",
+                logs=[stdout, stderr],
             )
-            
-            render_time = (datetime.now() - start_time).total_seconds()
-            
-            if return_code == 0 and os.path.exists(output_path):
-                file_size = os.path.getsize(output_path)
-                
-                return RenderingResult(
-                    success=True,
-                    output_path=output_path,
-                    duration=scene_plan.duration,
-                    resolution=self.config.animation.resolution,
-                    file_size=file_size,
-                    render_time=render_time,
-                    logs=[stdout, stderr],
-                )
-            else:
-                return RenderingResult(
-                    success=False,
-                    duration=scene_plan.duration,
-                    resolution=self.config.animation.resolution,
-                    render_time=render_time,
-                    error_message=f"Motion Canvas failed: {stderr}",
-                    logs=[stdout, stderr],
-                )
-        
-        finally:
-            self.cleanup_sandbox(sandbox_dir)
+    
+    async def release_scenes(self) -> None:
+        """Delete the current job's scene and config files from the shared workspace."""
+        workspace = get_node_workspace("motion-canvas")
+        scene_dir = job_dir(current_job.get())
+        workspace.remove_dir(f"src/{scene_dir}")
+        workspace.remove_dir(f"configs/{scene_dir}")
 
 
 class RemotionAgent(BaseRenderingAgent):
@@ -669,146 +730,89 @@ class RemotionAgent(BaseRenderingAgent):
         
         return errors
     
+    async def prepare_scenes(self, scene_plans: List[ScenePlan]) -> None:
+        """Register every scene of the current job as a composition, so the job is bundled once."""
+        width, height = (int(value) for value in self.config.animation.resolution.split("x"))
+        scenes = [
+            {
+                "scene_id": scene_plan.scene_id,
+                "component_code": template_engine.generate_animation_code(
+                    template_id=scene_plan.template_id,
+                    parameters=scene_plan.parameters,
+                ),
+                "duration": scene_plan.duration,
+            }
+            for scene_plan in scene_plans
+        ]
+        await get_remotion_render_service().prepare(
+            current_job.get(), scenes, fps=self.config.animation.fps, width=width, height=height
+        )
+    
+    async def release_scenes(self) -> None:
+        """Drop the current job's compositions from the shared workspace."""
+        get_remotion_render_service().release(current_job.get())
+    
     async def render_scene(
         self,
         scene_plan: ScenePlan,
         output_path: str,
         **kwargs
     ) -> RenderingResult:
-        """Render Remotion scene."""
+        """
+        Render Remotion scene as a composition in the shared workspace.
+        
+        The workspace is installed once and the long-running render server
+        bundles each job once (its scenes are registered up front by
+        ``prepare_scenes``), so a scene costs a render rather than an npm
+        install, a bundle and a CLI start-up.
+        """
         start_time = datetime.now()
         
-        # Create sandbox
-        sandbox_dir = self.create_sandbox_environment()
+        # Generate animation code
+        code = template_engine.generate_animation_code(
+            template_id=scene_plan.template_id,
+            parameters=scene_plan.parameters,
+        )
+        
+        width, height = (int(value) for value in self.config.animation.resolution.split("x"))
         
         try:
-            # Generate animation code
-            code = template_engine.generate_animation_code(
-                template_id=scene_plan.template,
-                parameters=scene_plan.parameters,
-            )
-            
-            # Create Remotion project structure
-            project_dir = os.path.join(sandbox_dir, "project")
-            os.makedirs(project_dir, exist_ok=True)
-            
-            # Write package.json
-            package_json = {
-                "name": "raso-remotion",
-                "version": "1.0.0",
-                "dependencies": {
-                    "remotion": "^4.0.0",
-                    "react": "^18.2.0",
-                    "react-dom": "^18.2.0"
-                },
-                "devDependencies": {
-                    "@types/react": "^18.0.0",
-                    "typescript": "^5.0.0"
-                }
-            }
-            
-            with open(os.path.join(project_dir, "package.json"), 'w') as f:
-                import json
-                json.dump(package_json, f, indent=2)
-            
-            # Write component code
-            component_file = os.path.join(project_dir, "Scene.tsx")
-            with open(component_file, 'w') as f:
-                f.write(code)
-            
-            # Write Remotion root
-            root_code = f"""
-import React from 'react';
-import {{Composition}} from 'remotion';
-import {{TitleSequence}} from './Scene';
-
-export const RemotionRoot: React.FC = () => {{
-    return (
-        <>
-            <Composition
-                id="Scene"
-                component={{TitleSequence}}
-                durationInFrames={{Math.round({scene_plan.duration} * 30)}}
-                fps={{30}}
-                width={{1920}}
-                height={{1080}}
-            />
-        </>
-    );
-}};
-"""
-            
-            with open(os.path.join(project_dir, "Root.tsx"), 'w') as f:
-                f.write(root_code)
-            
-            # Write remotion config
-            config_code = """
-import {Config} from '@remotion/cli/config';
-
-Config.setVideoImageFormat('jpeg');
-Config.setOverwriteOutput(true);
-"""
-            
-            with open(os.path.join(project_dir, "remotion.config.ts"), 'w') as f:
-                f.write(config_code)
-            
-            # Install dependencies
-            install_code, install_stdout, install_stderr = await self.run_command_with_timeout(
-                command=["npm", "install"],
-                cwd=project_dir,
-                timeout=120,
+            reply = await get_remotion_render_service().render(
+                scene_id=scene_plan.scene_id,
+                component_code=code,
+                duration=scene_plan.duration,
+                output_path=output_path,
+                timeout=self.timeout_seconds,
+                fps=self.config.animation.fps,
+                width=width,
+                height=height,
+                job_id=current_job.get(),
             )
-            
-            if install_code != 0:
-                return RenderingResult(
-                    success=False,
-                    duration=scene_plan.duration,
-                    resolution=self.config.animation.resolution,
-                    render_time=0.0,
-                    error_message=f"npm install failed: {install_stderr}",
-                )
-            
-            # Render video
-            render_command = [
-                "npx", "remotion", "render",
-                "Scene",
-                output_path,
-                "--codec", "h264",
-            ]
-            
-            return_code, stdout, stderr = await self.run_command_with_timeout(
-                command=render_command,
-                cwd=project_dir,
+        except (RuntimeError, OSError, asyncio.TimeoutError) as e:
+            reply = {"ok": False, "error": str(e) or type(e).__name__}
+        
+        render_time = (datetime.now() - start_time).total_seconds()
+        
+        if reply.get("ok") and os.path.exists(output_path):
+            return RenderingResult(
+                success=True,
+                output_path=output_path,
+                duration=scene_plan.duration,
+                resolution=self.config.animation.resolution,
+                file_size=os.path.getsize(output_path),
+                render_time=render_time,
             )
-            
-            render_time = (datetime.now() - start_time).total_seconds()
-            
-            if return_code == 0 and os.path.exists(output_path):
-                file_size = os.path.getsize(output_path)
-                
-                return RenderingResult(
-                    success=True,
-                    output_path=output_path,
-                    duration=scene_plan.duration,
-                    resolution=self.config.animation.resolution,
-                    file_size=file_size,
-                    render_time=render_time,
-                    logs=[stdout, stderr],
-                )
-            else:
-                return RenderingResult(
-                    success=False,
-                    duration=scene_plan.duration,
-                    resolution=self.config.animation.resolution,
-                    render_time=render_time,
-                    error_message=f"Remotion failed: {stderr}",
-                    logs=[stdout, stderr],
-                )
         
-        finally:
-            self.cleanup_sandbox(sandbox_dir)
+        return RenderingResult(
+            success=False,
+            duration=scene_plan.duration,
+            resolution=self.config.animation.resolution,
+            render_time=render_time,
+            error_message=f"Remotion failed: {reply.get('error', 'no output produced')}",
+        )
 
 
+@register_agent(AgentType.RENDERING)
 class RenderingCoordinator(BaseAgent):
     """Coordinates rendering across multiple agents."""
     
@@ -823,11 +827,17 @@ class RenderingCoordinator(BaseAgent):
             TemplateFramework.MOTION_CANVAS: MotionCanvasAgent(AgentType.MOTION_CANVAS),
             TemplateFramework.REMOTION: RemotionAgent(AgentType.REMOTION),
         }
+        self.last_metrics: Dict[str, Any] = {}
     
     async def execute(self, state: RASOMasterState) -> RASOMasterState:
         """
         Execute coordinated rendering across all agents.
         
+        Each framework has its own bounded worker pool, so Manim, Motion
+        Canvas and Remotion scenes render side by side. Within a pool the
+        scheduler dispatches the longest expected scenes first and refines
+        its cost model from every observed render time.
+        
         Args:
             state: Current workflow state
             
@@ -841,54 +851,167 @@ class RenderingCoordinator(BaseAgent):
             
             self.log_progress("Starting coordinated animation rendering", state)
             
-            # For now, create simple animation assets without actual rendering to test the pipeline
-            # TODO: Replace with actual coordinated rendering when animation frameworks are set up
-            
-            # Create simple rendered scenes for all scene plans
-            rendered_scenes = []
-            total_duration = 0.0
+            start_time = time.time()
+            cost_model = get_render_cost_model()
+            scheduler = RenderScheduler(
+                cost_model,
+                workers={
+                    framework.value: self.config.animation.render_workers.get(framework.value, 1)
+                    for framework in self.agents
+                },
+            )
             
-            # Create temp directory for rendered scenes
-            rendered_dir = Path(self.config.temp_path) / "rendered"
-            rendered_dir.mkdir(parents=True, exist_ok=True)
+            def on_complete(job: RenderJob, done: int, total: int) -> None:
+                self.log_progress(
+                    f"Rendered scene {job.scene_id} ({done}/{total}, "
+                    f"predicted {job.predicted:.1f}s, actual {job.actual or 0.0:.1f}s)",
+                    state,
+                )
+                status = "failed" if job.result.metadata.error_message else "done"
+                state.progress.update_scene(job.scene_id, "render", status, step_progress=done / total)
             
             for scene_plan in visual_plan.scenes:
-                # Use proper temp path instead of /tmp/
-                rendered_path = rendered_dir / f"rendered_{scene_plan.scene_id}.mp4"
-                rendered_scene = RenderedScene(
-                    scene_id=scene_plan.scene_id,
-                    file_path=str(rendered_path),  # Proper Windows-compatible path
-                    duration=scene_plan.duration,
-                    framework=scene_plan.framework,
-                    resolution=VideoResolution(width=1920, height=1080),
-                    frame_rate=30,
-                    metadata=SceneMetadata(
-                        resolution="1920x1080",
-                        file_size=1024*1024,  # 1MB placeholder
-                        render_time=5.0,  # 5 seconds placeholder
-                        template_id=scene_plan.template_id,
-                    ),
-                )
-                rendered_scenes.append(rendered_scene)
-                total_duration += rendered_scene.duration
+                state.progress.update_scene(scene_plan.scene_id, "render", "queued")
+            
+            await self._prepare_frameworks(visual_plan.scenes)
+            try:
+                # Longest expected scenes go first in each framework's pool
+                jobs = await scheduler.run(visual_plan.scenes, self._render_scene, on_complete)
+            finally:
+                await self._release_frameworks()
+            cost_model.save()
+            
+            rendered_scenes = [job.result for job in jobs]
             
             # Update state with all rendered scenes
             state.animations = AnimationAssets(
                 scenes=rendered_scenes,
-                total_duration=total_duration,
+                total_duration=sum(scene.duration for scene in rendered_scenes),
                 resolution=VideoResolution(width=1920, height=1080),
             )
             
+            self.last_metrics = self._render_metrics(rendered_scenes, time.time() - start_time)
+            self.last_metrics["schedule"] = scheduler.report(jobs)
+            
             state.current_agent = AgentType.VOICE  # Next agent
             state.update_timestamp()
             
-            self.log_progress(f"Completed rendering {len(rendered_scenes)} scenes", state)
+            self.log_progress(
+                f"Completed rendering {len(rendered_scenes)} scenes in {self.last_metrics['makespan']:.1f}s "
+                f"({self.last_metrics['failed']} placeholders)",
+                state,
+            )
             
             return state
             
         except Exception as e:
             return self.handle_error(e, state)
     
+    async def _prepare_frameworks(self, scenes: List[ScenePlan]) -> None:
+        """Let each framework prepare the job's scenes up front; failures only cost the optimization."""
+        by_framework: Dict[TemplateFramework, List[ScenePlan]] = {}
+        for scene_plan in scenes:
+            by_framework.setdefault(TemplateFramework(scene_plan.framework.value), []).append(scene_plan)
+        
+        for framework, scene_plans in by_framework.items():
+            try:
+                await self.agents[framework].prepare_scenes(scene_plans)
+            except Exception as e:
+                self.logger.warning(f"Failed to prepare {framework.value} scenes: {str(e)}")
+    
+    async def _release_frameworks(self) -> None:
+        """Clean up per-job render state in every framework."""
+        for framework, agent in self.agents.items():
+            try:
+                await agent.release_scenes()
+            except Exception as e:
+                self.logger.warning(f"Failed to release {framework.value} scenes: {str(e)}")
+    
+    async def _render_scene(self, scene_plan: ScenePlan) -> RenderedScene:
+        """
+        Render one scene; called by a worker of its framework's pool.
+        
+        Falls back to the agent's fallback template via
+        ``render_scene_with_fallback``, and to a placeholder video if that
+        fails too, so one bad scene never fails the whole stage.
+        """
+        framework = TemplateFramework(scene_plan.framework.value)
+        agent = self.agents[framework]
+        
+        # Wait for a CPU slot and memory shared with other jobs before timing the render
+        async with get_resource_governor().acquire(**work_cost("render", self.config.animation.resolution)):
+            render_start = datetime.now()
+            try:
+                with span(f"render.{framework.value}", "render", scene_id=scene_plan.scene_id):
+                    result = await agent.render_scene_with_fallback(scene_plan)
+            except Exception as e:
+                result = RenderingResult(
+                    success=False,
+                    duration=scene_plan.duration,
+                    resolution=self.config.animation.resolution,
+                    render_time=0.0,
+                    error_message=str(e),
+                )
+            render_end = datetime.now()
+        
+        metadata = SceneMetadata(
+            render_start_time=render_start,
+            render_end_time=render_end,
+            render_duration=(render_end - render_start).total_seconds(),
+            template_id=scene_plan.template_id,
+            parameters_used=scene_plan.parameters,
+            file_size_bytes=result.file_size or None,
+            error_message=result.error_message,
+        )
+        
+        if result.success and result.output_path:
+            return RenderedScene(
+                scene_id=scene_plan.scene_id,
+                file_path=result.output_path,
+                duration=result.duration,
+                framework=framework.value,
+                resolution=VideoResolution.from_string(result.resolution),
+                frame_rate=self.config.animation.fps,
+                status=RenderStatus.COMPLETED,
+                metadata=metadata,
+            )
+        
+        self.logger.warning(
+            f"Rendering failed for scene {scene_plan.scene_id} ({framework.value}): {result.error_message}"
+        )
+        
+        # Placeholder video so composition can still proceed
+        output_dir = Path(self.config.temp_path) / "rendered" / current_job.get()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        placeholder_path = str(output_dir / f"rendered_{scene_plan.scene_id}.mp4")
+        placeholder_created = await agent._create_scene_placeholder(scene_plan, placeholder_path)
+        
+        return RenderedScene(
+            scene_id=scene_plan.scene_id,
+            file_path=placeholder_path,
+            duration=scene_plan.duration,
+            framework=framework.value,
+            resolution=VideoResolution(width=1920, height=1080),
+            frame_rate=30,
+            status=RenderStatus.COMPLETED if placeholder_created else RenderStatus.FAILED,
+            metadata=metadata,
+        )
+    
+    @staticmethod
+    def _render_metrics(rendered_scenes: List[RenderedScene], makespan: float) -> Dict[str, Any]:
+        """Summarize render times per framework queue."""
+        busy: Dict[str, float] = {}
+        for scene in rendered_scenes:
+            busy[scene.framework] = busy.get(scene.framework, 0.0) + (scene.metadata.render_duration or 0.0)
+        
+        return {
+            "scenes": len(rendered_scenes),
+            "failed": sum(1 for scene in rendered_scenes if scene.metadata.error_message),
+            "makespan": makespan,
+            "sequential_time": sum(busy.values()),
+            "framework_busy_time": busy,
+        }
+    
     def validate_input(self, state: RASOMasterState) -> None:
         """Validate input state for rendering."""
         if not state.visual_plan:
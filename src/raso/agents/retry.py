@@ -12,7 +12,7 @@ from datetime import datetime, timedelta
 from functools import wraps
 from enum import Enum
 
-from backend.models import AgentError, ErrorSeverity
+from config.backend.models import AgentError, ErrorSeverity
 
 
 class RetryStrategy(str, Enum):
@@ -197,6 +197,26 @@ class CircuitBreaker:
             self._on_failure()
             raise e
     
+    def allow_request(self) -> bool:
+        """
+        Check whether a call would currently be let through.
+        
+        Unlike ``call``, this does not change the breaker state, so it can be
+        used to skip a protected resource without raising.
+        
+        Returns:
+            True if the circuit is closed or ready to try half-open
+        """
+        return self.state != CircuitBreakerState.OPEN or self._should_attempt_reset()
+    
+    def record_success(self) -> None:
+        """Record a successful call made outside of ``call``."""
+        self._on_success()
+    
+    def record_failure(self) -> None:
+        """Record a failed call made outside of ``call``."""
+        self._on_failure()
+    
     def _should_attempt_reset(self) -> bool:
         """Check if circuit should attempt to reset."""
         if self.last_failure_time is None:
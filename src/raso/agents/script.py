@@ -15,11 +15,15 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
+from config.backend.models.paper import PaperContent, PaperDigest
 from config.backend.models.understanding import PaperUnderstanding
 from config.backend.models.script import NarrationScript, Scene
 from config.backend.models.state import RASOMasterState
+from config.backend.services.llm import llm_service
+from config.backend.services.llm_dispatcher import get_llm_dispatcher
 from agents.base import BaseAgent, AgentType
 from agents.retry import retry
+from agents.passage_index import get_passage_index
 from agents.simple_script_generator import SimpleScriptGenerator
 
 
@@ -38,6 +42,9 @@ class ScriptPrompts:
     Key Insight: {intuition}
     Main Contributions: {contributions}
     
+    Paper Digest:
+    {digest}
+    
     Create 4-6 scenes with this structure:
     1. Hook/Introduction (30-45 seconds)
     2. Problem Setup (45-60 seconds) 
@@ -80,6 +87,12 @@ class ScriptPrompts:
     Problem: {problem}
     Key Insight: {intuition}
     
+    Paper Digest:
+    {digest}
+    
+    Relevant Passages:
+    {passages}
+    
     Narration Guidelines:
     - Use conversational, engaging tone (like 3Blue1Brown or Veritasium)
     - Explain complex concepts with intuitive analogies
@@ -209,8 +222,15 @@ class ScriptAgent(BaseAgent):
             
         except Exception as e:
             self.logger.error(f"Simple script generation failed: {e}")
-            # Fallback to basic script generation
-            return await self._generate_fallback_script(state)
+            # Fall back to LLM narration grounded in the paper digest and retrieved passages
+            try:
+                state.script = await self._generate_enhanced_script(
+                    state.understanding, state.paper_content, state.paper_digest
+                )
+                return state
+            except Exception as e:
+                self.logger.error(f"Enhanced script generation failed: {e}")
+                return await self._generate_fallback_script(state)
     
     async def _initialize_ai_models(self) -> None:
         """Initialize AI models for enhanced script generation."""
@@ -229,20 +249,24 @@ class ScriptAgent(BaseAgent):
     async def _generate_enhanced_script(
         self, 
         understanding: PaperUnderstanding, 
-        paper_content: Dict[str, Any]
+        paper_content: Dict[str, Any],
+        digest: Optional[PaperDigest] = None
     ) -> NarrationScript:
         """Generate enhanced script using latest AI models."""
         try:
             # Step 1: AI-powered scene planning
-            scene_plan = await self._create_ai_scene_plan(understanding, paper_content)
+            scene_plan = await self._create_ai_scene_plan(understanding, paper_content, digest)
             
-            # Step 2: Generate narration for each scene
-            scenes = []
-            for scene_info in scene_plan:
-                narration = await self._generate_ai_narration(
-                    scene_info, understanding, paper_content, len(scene_plan)
+            # Step 2: Generate narration for all scenes concurrently (order preserved)
+            async def narrate(scene_info: Dict[str, Any]) -> str:
+                return await self._generate_ai_narration(
+                    scene_info, understanding, paper_content, len(scene_plan), digest
                 )
-                
+            
+            narrations = await get_llm_dispatcher().map(narrate, scene_plan)
+            
+            scenes = []
+            for scene_info, narration in zip(scene_plan, narrations):
                 scene = Scene(
                     id=f"scene_{len(scenes)}",
                     title=scene_info["title"],
@@ -267,7 +291,8 @@ class ScriptAgent(BaseAgent):
     async def _create_ai_scene_plan(
         self, 
         understanding: PaperUnderstanding, 
-        paper_content: Dict[str, Any]
+        paper_content: Dict[str, Any],
+        digest: Optional[PaperDigest] = None
     ) -> List[Dict[str, Any]]:
         """Use AI to create enhanced scene planning."""
         try:
@@ -278,7 +303,8 @@ class ScriptAgent(BaseAgent):
                 title=paper_content.title if hasattr(paper_content, 'title') else "Research Paper",
                 problem=understanding.problem or "A fundamental research challenge",
                 intuition=understanding.intuition or "A novel approach to the problem",
-                contributions=contributions_text
+                contributions=contributions_text,
+                digest=digest.to_prompt_text(include_sections=False) if digest else "None"
             )
             
             # This would call the AI model (Ollama, etc.)
@@ -347,13 +373,16 @@ class ScriptAgent(BaseAgent):
         scene_info: Dict[str, Any], 
         understanding: PaperUnderstanding, 
         paper_content: Dict[str, Any],
-        total_scenes: int
+        total_scenes: int,
+        digest: Optional[PaperDigest] = None
     ) -> str:
         """Generate enhanced narration using AI models."""
         try:
             # Calculate target word count based on duration
             target_words = int((scene_info["duration"] / 60) * self.words_per_minute)
             
+            passages = await self._relevant_passages(paper_content, scene_info)
+            
             prompt = self.prompts.ENHANCED_NARRATION_GENERATION.format(
                 scene_title=scene_info["title"],
                 concepts=", ".join(scene_info["concepts"]),
@@ -362,19 +391,24 @@ class ScriptAgent(BaseAgent):
                 visual_type=scene_info["visual_type"],
                 title=paper_content.title if hasattr(paper_content, 'title') else "Research Paper",
                 problem=understanding.problem or "A research challenge",
-                intuition=understanding.intuition or "A novel approach"
+                intuition=understanding.intuition or "A novel approach",
+                digest=digest.to_prompt_text(include_sections=False) if digest else "None",
+                passages=passages or "None"
             )
             
-            # This would call the AI model for narration generation
-            # For now, generate based on scene type and content
-            if "challenge" in scene_info["title"].lower() or "problem" in scene_info["title"].lower():
-                narration = self._create_introduction_narration(understanding, paper_content)
-            elif "insight" in scene_info["title"].lower() or "key" in scene_info["title"].lower():
-                narration = self._create_insight_narration(understanding, paper_content)
-            elif "technical" in scene_info["title"].lower() or "implementation" in scene_info["title"].lower():
-                narration = self._create_contributions_narration(understanding, paper_content)
-            else:
-                narration = self._create_conclusion_narration(understanding, paper_content)
+            narration = ""
+            try:
+                response = await llm_service.generate(
+                    prompt=prompt,
+                    temperature=0.7,
+                    max_tokens=max(256, target_words * 2),
+                )
+                narration = response.content.strip()
+            except Exception as e:
+                self.logger.warning(f"LLM narration failed for '{scene_info['title']}', using a template: {e}")
+            
+            if not narration:
+                narration = self._create_template_narration(scene_info, understanding, paper_content)
             
             # Clean and optimize the narration
             return self._clean_and_optimize_narration(narration, target_words)
@@ -383,6 +417,36 @@ class ScriptAgent(BaseAgent):
             self.logger.error(f"AI narration generation failed: {e}")
             return self._generate_fallback_narration(scene_info, understanding, paper_content)
     
+    def _create_template_narration(
+        self,
+        scene_info: Dict[str, Any],
+        understanding: PaperUnderstanding,
+        paper_content: Dict[str, Any]
+    ) -> str:
+        """Narrate a scene from templates chosen by its title, when the LLM is unavailable."""
+        title = scene_info["title"].lower()
+        if "challenge" in title or "problem" in title:
+            return self._create_introduction_narration(understanding, paper_content)
+        if "insight" in title or "key" in title:
+            return self._create_insight_narration(understanding, paper_content)
+        if "technical" in title or "implementation" in title:
+            return self._create_contributions_narration(understanding, paper_content)
+        return self._create_conclusion_narration(understanding, paper_content)
+    
+    async def _relevant_passages(self, paper_content: Any, scene_info: Dict[str, Any]) -> str:
+        """Retrieve the paper passages most relevant to a scene from the passage index."""
+        if not isinstance(paper_content, PaperContent):
+            return ""
+        
+        query = " ".join([scene_info["title"], *scene_info.get("concepts", []), *scene_info.get("key_points", [])])
+        try:
+            # Loading or building the index and embedding the query are blocking
+            index = await asyncio.to_thread(get_passage_index, paper_content)
+            return await asyncio.to_thread(index.context_for, query)
+        except Exception as e:
+            self.logger.warning(f"Passage retrieval failed: {e}")
+            return ""
+    
     async def _validate_script_quality_with_ai(self, script: NarrationScript) -> None:
         """Validate script quality using AI analysis."""
         try:
@@ -0,0 +1,360 @@
+"""
+Local title search index for paper ingestion.
+
+Provides fast, offline title lookups using character n-gram shingles and
+MinHash locality-sensitive hashing, so title-based ingestion only needs to
+query the arXiv API when a paper is not already known locally.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Mersenne prime used for the universal hash family
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_LATEX_COMMAND = re.compile(r'\\[a-zA-Z]+\*?')
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalize a paper title for comparison.
+
+    Strips LaTeX commands and math delimiters, folds accents and case, and
+    collapses punctuation and whitespace so that "BERT: Pre-training of Deep
+    Bidirectional Transformers" and "{BERT} pre-training of deep
+    bidirectional transformers" normalize identically.
+
+    Args:
+        title: Raw paper title
+
+    Returns:
+        Normalized title
+    """
+    text = _LATEX_COMMAND.sub(' ', title)
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = _NON_ALNUM.sub(' ', text.lower())
+    return ' '.join(text.split())
+
+
+def title_shingles(title: str, n: int = 3) -> Set[str]:
+    """
+    Build the character n-gram shingle set of a title.
+
+    Args:
+        title: Raw paper title
+        n: Shingle length
+
+    Returns:
+        Set of character n-grams of the normalized title
+    """
+    normalized = normalize_title(title)
+    if len(normalized) <= n:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + n] for i in range(len(normalized) - n + 1)}
+
+
+def title_similarity(title1: str, title2: str, n: int = 3) -> float:
+    """
+    Compute the Jaccard similarity of two titles' character n-grams.
+
+    Args:
+        title1: First title
+        title2: Second title
+        n: Shingle length
+
+    Returns:
+        Similarity between 0 and 1
+    """
+    shingles1 = title_shingles(title1, n)
+    shingles2 = title_shingles(title2, n)
+    union = len(shingles1 | shingles2)
+    if union == 0:
+        return 0.0
+    return len(shingles1 & shingles2) / union
+
+
+def _stable_hash(value: str) -> int:
+    """Hash a string to 32 bits, stable across processes."""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+class TitleIndex:
+    """MinHash LSH index over paper titles."""
+
+    def __init__(
+        self,
+        index_path: Optional[Path] = None,
+        num_perm: int = 64,
+        bands: int = 16,
+        ngram_size: int = 3,
+        seed: int = 1,
+    ):
+        """
+        Initialize the title index.
+
+        Args:
+            index_path: Optional JSON file used to persist the index
+            num_perm: Number of MinHash permutations
+            bands: Number of LSH bands (must divide num_perm)
+            ngram_size: Character n-gram length
+            seed: Seed for the permutation parameters
+        """
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.index_path = Path(index_path) if index_path else None
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram_size = ngram_size
+
+        # Deterministic permutation parameters so persisted signatures stay valid
+        rng = random.Random(seed)
+        self._perm_a = [rng.randint(1, _MERSENNE_PRIME - 1) for _ in range(num_perm)]
+        self._perm_b = [rng.randint(0, _MERSENNE_PRIME - 1) for _ in range(num_perm)]
+
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._exact: Dict[str, str] = {}
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        if self.index_path and self.index_path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, paper_id: str) -> bool:
+        return paper_id in self._entries
+
+    def _signature(self, shingles: Set[str]) -> List[int]:
+        """Compute the MinHash signature of a shingle set."""
+        hashes = [_stable_hash(shingle) for shingle in shingles]
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in zip(self._perm_a, self._perm_b)
+        ]
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, ...]]:
+        """Split a signature into per-band bucket keys."""
+        return [
+            tuple(signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def add(self, paper_id: str, title: str, **metadata: Any) -> None:
+        """
+        Add or replace a paper title in the index.
+
+        Args:
+            paper_id: Paper identifier (e.g. arXiv ID)
+            title: Paper title
+            **metadata: Additional fields stored with the entry
+        """
+        normalized = normalize_title(title)
+        if not paper_id or not normalized:
+            return
+
+        shingles = title_shingles(title, self.ngram_size)
+        signature = self._signature(shingles)
+
+        with self._lock:
+            if paper_id in self._entries:
+                self._remove_locked(paper_id)
+
+            self._entries[paper_id] = {
+                "title": title,
+                "normalized": normalized,
+                "signature": signature,
+                **metadata,
+            }
+            self._exact[normalized] = paper_id
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(paper_id)
+            self._dirty = True
+
+    def _remove_locked(self, paper_id: str) -> None:
+        """Remove an entry; caller must hold the lock."""
+        entry = self._entries.pop(paper_id)
+        if self._exact.get(entry["normalized"]) == paper_id:
+            del self._exact[entry["normalized"]]
+        for band, key in enumerate(self._band_keys(entry["signature"])):
+            bucket = self._buckets[band].get(key)
+            if bucket:
+                bucket.discard(paper_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def search(self, title: str, limit: int = 5, min_similarity: float = 0.0) -> List[Tuple[str, str, float]]:
+        """
+        Find indexed titles similar to the query.
+
+        Exact matches after normalization are answered from a hash lookup;
+        otherwise LSH candidates are ranked by exact n-gram Jaccard similarity.
+
+        Args:
+            title: Title to search for
+            limit: Maximum number of results
+            min_similarity: Minimum similarity for a result to be returned
+
+        Returns:
+            List of (paper_id, title, similarity) tuples, best match first
+        """
+        normalized = normalize_title(title)
+        if not normalized:
+            return []
+
+        with self._lock:
+            exact_id = self._exact.get(normalized)
+            if exact_id is not None:
+                return [(exact_id, self._entries[exact_id]["title"], 1.0)]
+
+            query_shingles = title_shingles(title, self.ngram_size)
+            signature = self._signature(query_shingles)
+
+            candidates: Set[str] = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+
+            results = []
+            for paper_id in candidates:
+                entry = self._entries[paper_id]
+                candidate_shingles = title_shingles(entry["title"], self.ngram_size)
+                union = len(query_shingles | candidate_shingles)
+                similarity = len(query_shingles & candidate_shingles) / union if union else 0.0
+                if similarity >= min_similarity:
+                    results.append((paper_id, entry["title"], similarity))
+
+        results.sort(key=lambda result: result[2], reverse=True)
+        return results[:limit]
+
+    def best_match(self, title: str, threshold: float = 0.7) -> Optional[Tuple[str, str, float]]:
+        """
+        Return the best match at or above the similarity threshold.
+
+        Args:
+            title: Title to search for
+            threshold: Minimum similarity (0-1)
+
+        Returns:
+            (paper_id, title, similarity) or None on a miss
+        """
+        results = self.search(title, limit=1, min_similarity=threshold)
+        return results[0] if results else None
+
+    def import_metadata_dump(
+        self,
+        dump_path: Path,
+        id_field: str = "id",
+        title_field: str = "title",
+    ) -> int:
+        """
+        Import titles from a metadata dump.
+
+        Accepts either a JSON list of records or JSON Lines (one record per
+        line), such as the public arXiv metadata snapshot.
+
+        Args:
+            dump_path: Path to the dump file
+            id_field: Record field holding the paper ID
+            title_field: Record field holding the title
+
+        Returns:
+            Number of titles imported
+        """
+        dump_path = Path(dump_path)
+
+        with open(dump_path, 'r', encoding='utf-8') as f:
+            first_char = f.read(1)
+            f.seek(0)
+            if first_char == '[':
+                records: Iterable[Dict[str, Any]] = json.load(f)
+            else:
+                records = (json.loads(line) for line in f if line.strip())
+
+            imported = 0
+            for record in records:
+                paper_id = record.get(id_field)
+                title = record.get(title_field)
+                if paper_id and title:
+                    self.add(str(paper_id), title)
+                    imported += 1
+
+        return imported
+
+    def save(self) -> None:
+        """Persist the index to ``index_path`` if changed since the last save."""
+        if not self.index_path or not self._dirty:
+            return
+
+        with self._lock:
+            data = {
+                "num_perm": self.num_perm,
+                "bands": self.bands,
+                "ngram_size": self.ngram_size,
+                "entries": self._entries,
+            }
+            self._dirty = False
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.index_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        temp_path.replace(self.index_path)
+
+    def load(self) -> None:
+        """Load the index from ``index_path``, reusing stored signatures."""
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        compatible = (
+            data.get("num_perm") == self.num_perm
+            and data.get("bands") == self.bands
+            and data.get("ngram_size") == self.ngram_size
+        )
+
+        with self._lock:
+            self._entries = {}
+            self._exact = {}
+            self._buckets = [{} for _ in range(self.bands)]
+
+        for paper_id, entry in data.get("entries", {}).items():
+            if not compatible:
+                # Index parameters changed; recompute signatures
+                extra = {k: v for k, v in entry.items() if k not in ("title", "normalized", "signature")}
+                self.add(paper_id, entry["title"], **extra)
+                continue
+
+            with self._lock:
+                self._entries[paper_id] = entry
+                self._exact[entry["normalized"]] = paper_id
+                for band, key in enumerate(self._band_keys(entry["signature"])):
+                    self._buckets[band].setdefault(key, set()).add(paper_id)
+
+        self._dirty = not compatible
+
+
+_title_index: Optional[TitleIndex] = None
+
+
+def get_title_index() -> TitleIndex:
+    """Get the global title index, stored under the configured data path."""
+    global _title_index
+    if _title_index is None:
+        from config.backend.config import get_config
+        _title_index = TitleIndex(index_path=Path(get_config().data_path) / "title_index.json")
+    return _title_index
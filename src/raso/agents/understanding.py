@@ -5,24 +5,31 @@ Analyzes research paper content using LLM services to extract key insights,
 identify problems, contributions, equations, and visualizable concepts.
 """
 
+import asyncio
+import json
 import re
-from typing import Dict, List, Optional, Any
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Any, TypeVar
 from datetime import datetime
 
 from pydantic import BaseModel, Field
 
 from agents.base import BaseAgent
 from config.backend.models import AgentType, RASOMasterState
-from config.backend.models.paper import PaperContent, Equation, Section
+from config.backend.models.paper import PaperContent, PaperDigest, Equation, Section
 from config.backend.models.understanding import (
     PaperUnderstanding,
     KeyEquation,
     VisualizableConcept,
 )
 from config.backend.services.llm import llm_service, LLMRequest
+from config.backend.services.paper_digest import get_paper_condenser
 from agents.retry import retry
 
 
+T = TypeVar("T")
+
+
 class UnderstandingPrompts:
     """Prompt templates for paper understanding tasks."""
     
@@ -32,7 +39,7 @@ class UnderstandingPrompts:
     Paper Title: {title}
     Abstract: {abstract}
     
-    Introduction Section:
+    Paper Digest:
     {introduction}
     
     Please provide:
@@ -49,7 +56,7 @@ class UnderstandingPrompts:
     Paper Title: {title}
     Abstract: {abstract}
     
-    Full Paper Sections:
+    Paper Digest:
     {sections_text}
     
     Please identify:
@@ -159,42 +166,55 @@ class UnderstandingAgent(BaseAgent):
             
             self.log_progress("Starting paper understanding analysis", state)
             
-            # For now, create a simple understanding without LLM to test the pipeline
-            # TODO: Replace with actual LLM analysis when LLM service is configured
-            
-            # Simple problem analysis (ensure at least 50 characters)
-            problem = f"This research addresses fundamental challenges and limitations in the field of {paper_content.title.lower()}, providing novel insights and methodological advances."
-            
-            # Simple contributions extraction (ensure each is at least 20 characters)
-            contributions = [
-                f"Novel methodological approach presented in {paper_content.title} that advances the state of the art",
-                "Comprehensive theoretical analysis and empirical evaluation of the proposed methods",
-                "Practical implementation framework with demonstrated effectiveness and broad applicability"
-            ]
+            # Condense the paper once; downstream prompts reuse the digest
+            if state.paper_digest is None:
+                state.paper_digest = await self._get_digest(paper_content)
             
-            # Simple intuition (ensure at least 50 characters)
-            intuition = f"The key insight underlying this work is that {paper_content.title.lower()} can be significantly improved through innovative approaches that address core limitations in existing methods."
-            
-            # Simple key equations (mark first few as key)
-            key_equations = []
-            for i, eq in enumerate(paper_content.equations[:3]):
-                key_equations.append(KeyEquation(
-                    equation_id=eq.id,
-                    importance=7,
-                    visualization_hint="Mathematical visualization",
-                    related_concepts=[],
-                ))
+            # The four analyses are independent, so they run concurrently and
+            # the stage takes as long as the slowest one. Each part is
+            # validated on its own and falls back alone if it fails.
+            seed_contributions = state.paper_digest.contributions if state.paper_digest else []
+            fallbacks: List[str] = []
+            start_time = time.time()
+            problem, contributions, key_equations, visualizable_concepts = await asyncio.gather(
+                self._analyze_part(
+                    "problem",
+                    fallbacks,
+                    self._analyze_problem(paper_content, state.paper_digest),
+                    lambda: self._fallback_problem(paper_content),
+                    lambda value: len(value.strip()) >= 50,
+                ),
+                self._analyze_part(
+                    "contributions",
+                    fallbacks,
+                    self._extract_contributions(paper_content, state.paper_digest),
+                    lambda: self._fallback_contributions(paper_content),
+                    lambda value: bool(value) and all(len(c.strip()) >= 20 for c in value),
+                ),
+                self._analyze_part(
+                    "equations",
+                    fallbacks,
+                    self._analyze_equations(paper_content),
+                    lambda: self._fallback_equations(paper_content),
+                    lambda value: bool(value) or not paper_content.equations,
+                ),
+                self._analyze_part(
+                    "concepts",
+                    fallbacks,
+                    self._identify_concepts(paper_content, seed_contributions),
+                    lambda: self._fallback_concepts(paper_content, seed_contributions),
+                    bool,
+                ),
+            )
+            self.logger.info(
+                f"Understanding analyses completed in {time.time() - start_time:.2f}s "
+                f"(fallbacks: {', '.join(fallbacks) or 'none'})"
+            )
             
-            # Simple visualizable concepts
-            visualizable_concepts = [
-                VisualizableConcept(
-                    name="Core Concept",
-                    description=f"Main conceptual framework and methodological approach presented in {paper_content.title}",
-                    visualization_type="animation",
-                    complexity="medium",
-                    related_equations=[eq.equation_id for eq in key_equations[:1]],
-                )
-            ]
+            if "problem" in fallbacks or "contributions" in fallbacks:
+                intuition = f"The key insight underlying this work is that {paper_content.title.lower()} can be significantly improved through innovative approaches that address core limitations in existing methods."
+            else:
+                intuition = self._generate_intuition(problem, contributions)
             
             # Create understanding object
             understanding = PaperUnderstanding(
@@ -203,6 +223,8 @@ class UnderstandingAgent(BaseAgent):
                 contributions=contributions,
                 key_equations=key_equations,
                 visualizable_concepts=visualizable_concepts,
+                confidence_score=1.0 - 0.2 * len(fallbacks),
+                analysis_notes=[f"{part} analysis used fallback" for part in fallbacks],
             )
             
             # Update state
@@ -236,23 +258,126 @@ class UnderstandingAgent(BaseAgent):
         if not state.paper_content.sections:
             raise ValueError("Paper sections are required for understanding")
     
-    async def _analyze_problem(self, paper_content: PaperContent) -> str:
-        """Analyze and extract the core problem statement."""
-        # Find introduction section
-        introduction = ""
-        for section in paper_content.sections:
-            if any(keyword in section.title.lower() for keyword in ["introduction", "intro", "background"]):
-                introduction = section.content
-                break
+    async def _get_digest(self, paper_content: PaperContent) -> Optional[PaperDigest]:
+        """Get the cached map-reduce digest of the paper, or None if condensation fails."""
+        try:
+            return await get_paper_condenser().condense(paper_content)
+        except Exception as e:
+            self.logger.warning(f"Paper condensation failed, using raw sections: {e}")
+            return None
+    
+    async def _analyze_part(
+        self,
+        part: str,
+        fallbacks: List[str],
+        analysis: Awaitable[T],
+        fallback: Callable[[], T],
+        is_valid: Callable[[T], bool],
+    ) -> T:
+        """
+        Run one analysis, falling back if it raises or its result is invalid.
+        
+        Args:
+            part: Name of the analysis, recorded in ``fallbacks`` on fallback
+            fallbacks: Names of the parts that fell back so far
+            analysis: LLM-backed analysis to await
+            fallback: Builds a heuristic result for this part only
+            is_valid: Checks the analysis result
+            
+        Returns:
+            Analysis result or fallback result
+        """
+        try:
+            result = await analysis
+            if is_valid(result):
+                return result
+            self.logger.warning(f"{part} analysis returned an invalid result, using fallback")
+        except Exception as e:
+            self.logger.warning(f"{part} analysis failed, using fallback: {e}")
+        
+        fallbacks.append(part)
+        return fallback()
+    
+    def _fallback_problem(self, paper_content: PaperContent) -> str:
+        """Heuristic problem statement."""
+        return f"This research addresses fundamental challenges and limitations in the field of {paper_content.title.lower()}, providing novel insights and methodological advances."
+    
+    def _fallback_contributions(self, paper_content: PaperContent) -> List[str]:
+        """Heuristic contributions."""
+        return [
+            f"Novel methodological approach presented in {paper_content.title} that advances the state of the art",
+            "Comprehensive theoretical analysis and empirical evaluation of the proposed methods",
+            "Practical implementation framework with demonstrated effectiveness and broad applicability"
+        ]
+    
+    def _fallback_equations(self, paper_content: PaperContent) -> List[KeyEquation]:
+        """Mark the first few equations as key."""
+        return [
+            KeyEquation(
+                equation_id=eq.id,
+                importance=7,
+                visualization_hint="Mathematical visualization",
+                related_concepts=[],
+            )
+            for eq in paper_content.equations[:3]
+        ]
+    
+    def _fallback_concepts(
+        self,
+        paper_content: PaperContent,
+        contributions: List[str],
+    ) -> List[VisualizableConcept]:
+        """Basic concepts from contributions, or one core concept."""
+        concepts = [
+            VisualizableConcept(
+                name=f"Concept {i+1}",
+                description=contribution,
+                visualization_type="animation",
+                complexity="medium",
+                related_equations=[],
+            )
+            for i, contribution in enumerate(contributions[:3])
+            if len(contribution.strip()) >= 20
+        ]
         
-        # If no introduction found, use first section
-        if not introduction and paper_content.sections:
-            introduction = paper_content.sections[0].content
+        return concepts or [
+            VisualizableConcept(
+                name="Core Concept",
+                description=f"Main conceptual framework and methodological approach presented in {paper_content.title}",
+                visualization_type="animation",
+                complexity="medium",
+                related_equations=[eq.id for eq in paper_content.equations[:1]],
+            )
+        ]
+    
+    @staticmethod
+    def _parse_json(content: str) -> Dict[str, Any]:
+        """Parse the JSON object in a response, tolerating surrounding text."""
+        match = re.search(r"\{.*\}", content, re.DOTALL)
+        return json.loads(match.group() if match else content)
+    
+    async def _analyze_problem(self, paper_content: PaperContent, digest: Optional[PaperDigest] = None) -> str:
+        """Analyze and extract the core problem statement, from the digest when one is given."""
+        if digest:
+            introduction = digest.to_prompt_text(include_sections=False)
+        else:
+            # Find introduction section
+            introduction = ""
+            for section in paper_content.sections:
+                if any(keyword in section.title.lower() for keyword in ["introduction", "intro", "background"]):
+                    introduction = section.content
+                    break
+            
+            # If no introduction found, use first section
+            if not introduction and paper_content.sections:
+                introduction = paper_content.sections[0].content
+            
+            introduction = introduction[:2000]  # Limit length
         
         prompt = self.prompts.PROBLEM_ANALYSIS.format(
             title=paper_content.title,
             abstract=paper_content.abstract,
-            introduction=introduction[:2000],  # Limit length
+            introduction=introduction,
         )
         
         response = await llm_service.generate(
@@ -263,28 +388,34 @@ class UnderstandingAgent(BaseAgent):
         
         return response.content.strip()
     
-    async def _extract_contributions(self, paper_content: PaperContent) -> List[str]:
-        """Extract key contributions from the paper."""
-        # Combine relevant sections
-        sections_text = ""
-        for section in paper_content.sections:
-            # Focus on key sections
-            if any(keyword in section.title.lower() for keyword in [
-                "contribution", "method", "approach", "result", "conclusion", "summary"
-            ]):
-                sections_text += f"\n\n{section.title}:\n{section.content}"
-        
-        # If no specific sections found, use all sections (truncated)
-        if not sections_text:
-            sections_text = "\n\n".join([
-                f"{section.title}:\n{section.content[:500]}"
-                for section in paper_content.sections[:3]
-            ])
+    async def _extract_contributions(self, paper_content: PaperContent, digest: Optional[PaperDigest] = None) -> List[str]:
+        """Extract key contributions from the paper, from the digest when one is given."""
+        if digest:
+            # The digest covers every section, not just the first 3000 characters
+            sections_text = digest.to_prompt_text()
+        else:
+            # Combine relevant sections
+            sections_text = ""
+            for section in paper_content.sections:
+                # Focus on key sections
+                if any(keyword in section.title.lower() for keyword in [
+                    "contribution", "method", "approach", "result", "conclusion", "summary"
+                ]):
+                    sections_text += f"\n\n{section.title}:\n{section.content}"
+            
+            # If no specific sections found, use all sections (truncated)
+            if not sections_text:
+                sections_text = "\n\n".join([
+                    f"{section.title}:\n{section.content[:500]}"
+                    for section in paper_content.sections[:3]
+                ])
+            
+            sections_text = sections_text[:3000]  # Limit length
         
         prompt = self.prompts.CONTRIBUTION_EXTRACTION.format(
             title=paper_content.title,
             abstract=paper_content.abstract,
-            sections_text=sections_text[:3000],  # Limit length
+            sections_text=sections_text,
         )
         
         response = await llm_service.generate(
@@ -335,45 +466,47 @@ class UnderstandingAgent(BaseAgent):
         
         # Parse JSON response
         try:
-            import json
-            result = json.loads(response.content)
-            key_equations = []
-            
-            for eq_data in result.get("key_equations", []):
-                # Validate equation exists
-                equation_id = eq_data.get("equation_id")
-                if any(eq.id == equation_id for eq in paper_content.equations):
-                    key_equations.append(KeyEquation(
-                        equation_id=equation_id,
-                        importance=eq_data.get("importance", 5),
-                        visualization_hint=eq_data.get("visualization_hint", ""),
-                        related_concepts=eq_data.get("related_concepts", []),
-                    ))
-            
-            return key_equations
-            
-        except (json.JSONDecodeError, KeyError) as e:
+            result = self._parse_json(response.content)
+        except json.JSONDecodeError as e:
             self.logger.warning(f"Failed to parse equation analysis JSON: {e}")
+            return self._fallback_equations(paper_content)
+        
+        equation_ids = {eq.id for eq in paper_content.equations}
+        key_equations = []
+        
+        for eq_data in result.get("key_equations", []):
+            # Validate equation exists
+            equation_id = eq_data.get("equation_id")
+            if equation_id not in equation_ids:
+                continue
             
-            # Fallback: mark first few equations as key
-            key_equations = []
-            for i, eq in enumerate(paper_content.equations[:3]):
+            try:
                 key_equations.append(KeyEquation(
-                    equation_id=eq.id,
-                    importance=7,
-                    visualization_hint="Mathematical visualization",
-                    related_concepts=[],
+                    equation_id=equation_id,
+                    importance=eq_data.get("importance", 5),
+                    visualization_hint=eq_data.get("visualization_hint", ""),
+                    related_concepts=eq_data.get("related_concepts", []),
                 ))
-            
-            return key_equations
+            except ValueError as e:
+                self.logger.warning(f"Skipping invalid key equation {equation_id}: {e}")
+        
+        return key_equations
     
     async def _identify_concepts(
         self, 
         paper_content: PaperContent, 
         contributions: List[str]
     ) -> List[VisualizableConcept]:
-        """Identify concepts suitable for visual animation."""
-        contributions_text = "\n".join([f"- {contrib}" for contrib in contributions])
+        """
+        Identify concepts suitable for visual animation.
+        
+        ``contributions`` may be empty when concepts are identified alongside
+        contribution extraction; the abstract is then the only grounding.
+        """
+        if contributions:
+            contributions_text = "\n".join([f"- {contrib}" for contrib in contributions])
+        else:
+            contributions_text = "Not available; infer them from the abstract."
         
         prompt = self.prompts.CONCEPT_IDENTIFICATION.format(
             title=paper_content.title,
@@ -389,11 +522,14 @@ class UnderstandingAgent(BaseAgent):
         
         # Parse JSON response
         try:
-            import json
-            result = json.loads(response.content)
-            concepts = []
-            
-            for concept_data in result.get("visualizable_concepts", []):
+            result = self._parse_json(response.content)
+        except json.JSONDecodeError as e:
+            self.logger.warning(f"Failed to parse concept identification JSON: {e}")
+            return self._fallback_concepts(paper_content, contributions)
+        
+        concepts = []
+        for concept_data in result.get("visualizable_concepts", []):
+            try:
                 concepts.append(VisualizableConcept(
                     name=concept_data.get("name", ""),
                     description=concept_data.get("description", ""),
@@ -401,24 +537,10 @@ class UnderstandingAgent(BaseAgent):
                     complexity=concept_data.get("complexity", "medium"),
                     related_equations=concept_data.get("related_equations", []),
                 ))
-            
-            return concepts
-            
-        except (json.JSONDecodeError, KeyError) as e:
-            self.logger.warning(f"Failed to parse concept identification JSON: {e}")
-            
-            # Fallback: create basic concepts from contributions
-            concepts = []
-            for i, contribution in enumerate(contributions[:3]):
-                concepts.append(VisualizableConcept(
-                    name=f"Concept {i+1}",
-                    description=contribution,
-                    visualization_type="animation",
-                    complexity="medium",
-                    related_equations=[],
-                ))
-            
-            return concepts
+            except ValueError as e:
+                self.logger.warning(f"Skipping invalid visualizable concept: {e}")
+        
+        return concepts
     
     def _generate_intuition(self, problem: str, contributions: List[str]) -> str:
         """Generate intuitive explanation connecting problem to solution."""
@@ -443,7 +565,7 @@ class UnderstandingAgent(BaseAgent):
         Returns:
             Problem statement
         """
-        return await self._analyze_problem(paper_content)
+        return await self._analyze_problem(paper_content, await self._get_digest(paper_content))
     
     async def extract_contributions(self, paper_content: PaperContent) -> List[str]:
         """
@@ -455,7 +577,7 @@ class UnderstandingAgent(BaseAgent):
         Returns:
             List of contributions
         """
-        return await self._extract_contributions(paper_content)
+        return await self._extract_contributions(paper_content, await self._get_digest(paper_content))
     
     async def identify_key_equations(self, paper_content: PaperContent) -> List[KeyEquation]:
         """
@@ -479,5 +601,5 @@ class UnderstandingAgent(BaseAgent):
         Returns:
             List of visualizable concepts
         """
-        contributions = await self._extract_contributions(paper_content)
+        contributions = await self._extract_contributions(paper_content, await self._get_digest(paper_content))
         return await self._identify_concepts(paper_content, contributions)
\ No newline at end of file
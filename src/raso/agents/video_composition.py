@@ -26,6 +26,8 @@ from models.state import RASOMasterState, AgentType
 from models.animation import AnimationAssets
 from models.audio import AudioAssets, AudioScene
 from models.video import VideoAsset, VideoMetadata, Chapter
+from core.resource_governor import get_resource_governor, work_cost
+from core.tracing import span
 # Import production utilities (with error handling for missing modules)
 try:
     from utils.smart_folder_manager import SmartFolderManager, PaperMetadata
@@ -231,8 +233,8 @@ class VideoCompositionAgent(BaseAgent):
             video_filename = f"raso_video_{int(datetime.now().timestamp())}.mp4"
             output_path = str(output_dir / video_filename)
             
-            # Compose video using production methods with quality settings and enhanced retry logic
-            quality = getattr(self.config, 'video_quality', 'medium')  # Default to medium quality
+            # Compose video using production methods with the job's (possibly deadline-degraded) quality
+            quality = state.options.video_quality
             
             # Enhanced retry logic for better content generation
             max_composition_attempts = 2
@@ -473,6 +475,11 @@ class VideoCompositionAgent(BaseAgent):
     async def _enhance_visual_content(self, animations: AnimationAssets, state: RASOMasterState) -> AnimationAssets:
         """Enhance visual content using AI-powered generators (if available)."""
         try:
+            # Skip enhancement when turned off, e.g. to meet the job's deadline
+            if not state.options.cinematic_effects:
+                self.logger.info("Cinematic effects disabled - skipping enhancement")
+                return animations
+            
             # Skip enhancement if visual content manager is not available
             if not visual_content_manager:
                 self.logger.info("Visual content manager not available - skipping enhancement")
@@ -1152,17 +1159,19 @@ class VideoCompositionAgent(BaseAgent):
             self.logger.info(f"FFmpeg command: {' '.join(cmd)}")
             
             # Use subprocess.run for Windows compatibility instead of asyncio.create_subprocess_exec
-            # Run in thread pool to avoid blocking
+            # Run in thread pool to avoid blocking, within the CPU and memory shared by all jobs
             loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=300  # 5 minute timeout
-                )
-            )
+            async with get_resource_governor().acquire(**work_cost("ffmpeg", encoding_params.resolution)):
+                with span("ffmpeg.compose", "subprocess", output=output_path):
+                    result = await loop.run_in_executor(
+                        None,
+                        lambda: subprocess.run(
+                            cmd,
+                            capture_output=True,
+                            text=True,
+                            timeout=300  # 5 minute timeout
+                        )
+                    )
             
             if result.returncode == 0:
                 if Path(output_path).exists():
@@ -1358,22 +1367,24 @@ class VideoCompositionAgent(BaseAgent):
             video_bitrate = encoding_params.bitrate.rstrip('k') + "000"  # Convert to bps
             audio_bitrate = encoding_params.audio_bitrate.rstrip('k') + "k"
             
-            await loop.run_in_executor(
-                None,
-                lambda: final_video.write_videofile(
-                    output_path,
-                    codec=encoding_params.video_codec,
-                    audio_codec=encoding_params.audio_codec,
-                    bitrate=video_bitrate,
-                    audio_bitrate=audio_bitrate,
-                    fps=encoding_params.fps,
-                    preset=encoding_params.preset,
-                    temp_audiofile='temp-audio.m4a',
-                    remove_temp=True,
-                    verbose=False,
-                    logger=None  # Suppress MoviePy logging
-                )
-            )
+            async with get_resource_governor().acquire(**work_cost("ffmpeg", encoding_params.resolution)):
+                with span("moviepy.write", "subprocess", output=output_path):
+                    await loop.run_in_executor(
+                        None,
+                        lambda: final_video.write_videofile(
+                            output_path,
+                            codec=encoding_params.video_codec,
+                            audio_codec=encoding_params.audio_codec,
+                            bitrate=video_bitrate,
+                            audio_bitrate=audio_bitrate,
+                            fps=encoding_params.fps,
+                            preset=encoding_params.preset,
+                            temp_audiofile='temp-audio.m4a',
+                            remove_temp=True,
+                            verbose=False,
+                            logger=None  # Suppress MoviePy logging
+                        )
+                    )
             
             # Clean up
             final_video.close()
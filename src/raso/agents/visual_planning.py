@@ -5,7 +5,9 @@ Assigns animation frameworks to content types and creates detailed scene plans
 with templates, parameters, and transition coordination.
 """
 
+import asyncio
 import json
+import re
 from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 
@@ -13,10 +15,12 @@ from pydantic import BaseModel, Field
 
 from agents.base import BaseAgent
 from config.backend.models import AgentType, RASOMasterState
+from config.backend.models.paper import PaperContent
 from config.backend.models.script import NarrationScript, Scene
 from config.backend.models.understanding import PaperUnderstanding
-from config.backend.models.visual import VisualPlan, ScenePlan, TransitionPlan, StyleGuide
+from config.backend.models.visual import VisualPlan, ScenePlan, TransitionPlan, StyleGuide, TransitionType
 from config.backend.services.llm import llm_service
+from agents.passage_index import get_passage_index
 from agents.retry import retry
 
 
@@ -68,6 +72,54 @@ class FrameworkAssignmentRules:
     ]
 
 
+def build_assignment_schema(scene_ids: List[str]) -> Dict[str, Any]:
+    """
+    JSON schema for one scene assignment.
+    
+    Args:
+        scene_ids: IDs of the scenes being planned
+        
+    Returns:
+        Schema restricting every field to values the planner can use
+    """
+    transitions = [transition.value for transition in TransitionType]
+    return {
+        "type": "object",
+        "required": [
+            "scene_id", "content_type", "framework", "complexity",
+            "visual_elements", "transition_in", "transition_out",
+        ],
+        "properties": {
+            "scene_id": {"type": "string", "enum": list(scene_ids)},
+            "content_type": {"type": "string", "enum": [content_type.value for content_type in ContentType]},
+            "framework": {"type": "string", "enum": [framework.value for framework in AnimationFramework]},
+            "complexity": {"type": "string", "enum": ["simple", "medium", "complex"]},
+            "visual_elements": {"type": "array", "items": {"type": "string"}},
+            "transition_in": {"type": "string", "enum": transitions},
+            "transition_out": {"type": "string", "enum": transitions},
+        },
+    }
+
+
+def build_plan_schema(scene_ids: List[str]) -> Dict[str, Any]:
+    """
+    JSON schema for a batched planning response covering all scenes.
+    
+    Args:
+        scene_ids: IDs of the scenes being planned
+        
+    Returns:
+        Schema for ``{"scene_assignments": [...]}``
+    """
+    return {
+        "type": "object",
+        "required": ["scene_assignments"],
+        "properties": {
+            "scene_assignments": {"type": "array", "items": build_assignment_schema(scene_ids)},
+        },
+    }
+
+
 class VisualPlanningPrompts:
     """Prompt templates for visual planning tasks."""
     
@@ -95,7 +147,10 @@ class VisualPlanningPrompts:
     - Use Motion Canvas for conceptual diagrams, processes, and abstract ideas
     - Use Remotion for titles, introductions, conclusions, and UI elements
     
-    Format as JSON:
+    Return one assignment for every scene, as a single JSON object matching this JSON schema:
+    {schema}
+    
+    Example:
     {{
         "scene_assignments": [
             {{
@@ -111,6 +166,20 @@ class VisualPlanningPrompts:
     }}
     """
     
+    SCENE_REPAIR = """
+    Some scene assignments for the research paper "{title}" were missing or invalid.
+    Provide corrected assignments for these scenes only.
+    
+    Scenes:
+    {scenes_text}
+    
+    Previous invalid assignments:
+    {invalid_text}
+    
+    Return a single JSON object matching this JSON schema:
+    {schema}
+    """
+    
     TEMPLATE_SELECTION = """
     Select appropriate animation templates for the following scene plan.
     
@@ -153,6 +222,7 @@ class VisualPlanningAgent(BaseAgent):
         super().__init__(agent_type)
         self.prompts = VisualPlanningPrompts()
         self.assignment_rules = FrameworkAssignmentRules()
+        self.last_metrics: Dict[str, int] = {}
     
     @retry(max_attempts=3, base_delay=2.0)
     async def execute(self, state: RASOMasterState) -> RASOMasterState:
@@ -173,39 +243,20 @@ class VisualPlanningAgent(BaseAgent):
             
             self.log_progress("Starting visual planning", state)
             
-            # For now, create a simple visual plan without LLM to test the pipeline
-            # TODO: Replace with actual LLM-based planning when LLM service is configured
-            
-            # Create simple scene plans
-            scene_plans = []
-            for i, scene in enumerate(script.scenes):
-                # Simple framework assignment based on scene content
-                if "equation" in scene.narration.lower() or "formula" in scene.narration.lower():
-                    framework = AnimationFramework.MANIM
-                elif "concept" in scene.narration.lower() or "approach" in scene.narration.lower():
-                    framework = AnimationFramework.MOTION_CANVAS
-                else:
-                    framework = AnimationFramework.REMOTION
-                
-                scene_plan = ScenePlan(
-                    scene_id=scene.id,
-                    framework=framework,
-                    template_id=f"{framework.value}_simple_template",
-                    parameters={
-                        "title": scene.title,
-                        "content": scene.narration[:100] + "...",  # Truncated content
-                    },
-                    duration=scene.duration,
-                )
-                scene_plans.append(scene_plan)
+            # Assign frameworks to all scenes in one batched request
+            title = state.paper_content.title if state.paper_content else "Research Paper"
+            passages = await self._scene_passages(state.paper_content, script.scenes)
+            assignments = await self._analyze_scenes(script, understanding, title, passages)
+            scene_plans = await self._create_scene_plans(assignments, script)
             
-            # Create simple transition plans
+            # Transitions follow the outgoing scene's assignment
+            transition_out = {assignment["scene_id"]: assignment["transition_out"] for assignment in assignments}
             transition_plans = []
             for i in range(len(scene_plans) - 1):
                 transition_plan = TransitionPlan(
                     from_scene=scene_plans[i].scene_id,
                     to_scene=scene_plans[i + 1].scene_id,
-                    transition_type="fade",
+                    transition_type=transition_out.get(scene_plans[i].scene_id, "fade"),
                     duration=0.5,
                     parameters={"fade_color": "black"}
                 )
@@ -254,16 +305,30 @@ class VisualPlanningAgent(BaseAgent):
     async def _analyze_scenes(
         self, 
         script: NarrationScript, 
-        understanding: PaperUnderstanding
+        understanding: PaperUnderstanding,
+        title: str = "Research Paper",
+        passages: Optional[Dict[str, str]] = None,
     ) -> List[Dict[str, Any]]:
-        """Analyze scenes and assign animation frameworks."""
-        # Prepare context for LLM
-        scenes_text = ""
-        for scene in script.scenes:
-            scenes_text += f"\nScene {scene.id}: {scene.title}\n"
-            scenes_text += f"Narration: {scene.narration[:200]}...\n"
-            scenes_text += f"Duration: {scene.duration}s\n"
-            scenes_text += f"Concepts: {', '.join(scene.concepts)}\n"
+        """
+        Assign animation frameworks to all scenes with one batched LLM request.
+        
+        The response is validated against the assignment schema. Missing or
+        invalid entries are re-requested together in a single repair call,
+        and any still invalid fall back to ``FrameworkAssignmentRules``, so
+        planning costs at most two LLM calls regardless of scene count.
+        
+        Args:
+            script: Narration script
+            understanding: Paper understanding
+            title: Paper title
+            passages: Retrieved paper passages per scene ID
+            
+        Returns:
+            One assignment per scene, in script order
+        """
+        scene_ids = [scene.id for scene in script.scenes]
+        item_schema = build_assignment_schema(scene_ids)
+        plan_schema = build_plan_schema(scene_ids)
         
         equations_text = ""
         for eq in understanding.key_equations:
@@ -274,25 +339,167 @@ class VisualPlanningAgent(BaseAgent):
             concepts_text += f"- {concept.name}: {concept.description} ({concept.visualization_type})\n"
         
         prompt = self.prompts.SCENE_ANALYSIS.format(
-            title=state.get("paper_content", {}).get("title", "Research Paper"),
-            scenes_text=scenes_text,
+            title=title,
+            scenes_text=self._format_scenes(script.scenes, passages),
             equations_text=equations_text,
             concepts_text=concepts_text,
+            schema=json.dumps(plan_schema, indent=2),
         )
         
-        response = await llm_service.generate(
-            prompt=prompt,
-            temperature=0.1,
-            max_tokens=1500,
+        assignments: Dict[str, Dict[str, Any]] = {}
+        invalid_entries: List[Any] = []
+        responded = False
+        
+        try:
+            response = await llm_service.generate(
+                prompt=prompt,
+                temperature=0.1,
+                max_tokens=500 + 150 * len(scene_ids),
+            )
+            responded = True
+            
+            if await llm_service.validate_response(response, plan_schema):
+                entries = json.loads(response.content)["scene_assignments"]
+            else:
+                entries = self._parse_assignments(response.content)
+            invalid_entries = self._collect_valid(entries, item_schema, assignments)
+        except Exception as e:
+            self.logger.warning(f"Batched scene planning failed: {e}")
+        
+        batched = len(assignments)
+        
+        # Repair only the missing or invalid entries
+        pending = [scene for scene in script.scenes if scene.id not in assignments]
+        if pending and responded:
+            await self._repair_assignments(pending, invalid_entries, item_schema, title, assignments)
+        repaired = len(assignments) - batched
+        
+        # Rule-based assignment for whatever is still missing
+        fallback = 0
+        for scene in script.scenes:
+            if scene.id not in assignments:
+                assignments[scene.id] = self._rule_based_assignment(scene, understanding)
+                fallback += 1
+        
+        self.last_metrics = {"scenes": len(scene_ids), "batched": batched, "repaired": repaired, "fallback": fallback}
+        self.logger.info(
+            f"Planned {len(scene_ids)} scenes: {batched} batched, {repaired} repaired, {fallback} rule-based"
         )
         
-        # Parse JSON response
+        return [assignments[scene.id] for scene in script.scenes]
+    
+    async def _scene_passages(self, paper_content: Optional[PaperContent], scenes: List[Scene]) -> Dict[str, str]:
+        """
+        Retrieve the paper passages most relevant to each scene.
+        
+        Index loading and query embedding are blocking, so they run in a
+        worker thread. Retrieval is best effort: without a paper or an index
+        the scenes are planned from their narration alone.
+        
+        Args:
+            paper_content: Parsed paper
+            scenes: Scenes to plan
+            
+        Returns:
+            Passage text per scene ID (scenes without a match are omitted)
+        """
+        if not isinstance(paper_content, PaperContent):
+            return {}
+        
+        def retrieve() -> Dict[str, str]:
+            index = get_passage_index(paper_content)
+            passages = {}
+            for scene in scenes:
+                query = " ".join([scene.title, *scene.concepts, scene.narration[:300]])
+                context = index.context_for(query, k=2, max_chars=600)
+                if context:
+                    passages[scene.id] = context
+            return passages
+        
+        try:
+            return await asyncio.to_thread(retrieve)
+        except Exception as e:
+            self.logger.warning(f"Passage retrieval for visual planning failed: {e}")
+            return {}
+    
+    def _format_scenes(self, scenes: List[Scene], passages: Optional[Dict[str, str]] = None) -> str:
+        """Describe scenes for planning prompts, with their retrieved paper passages."""
+        scenes_text = ""
+        for scene in scenes:
+            scenes_text += f"\nScene {scene.id}: {scene.title}\n"
+            scenes_text += f"Narration: {scene.narration[:200]}...\n"
+            scenes_text += f"Duration: {scene.duration}s\n"
+            scenes_text += f"Concepts: {', '.join(scene.concepts)}\n"
+            if passages and passages.get(scene.id):
+                scenes_text += f"Paper passages:\n{passages[scene.id]}\n"
+        return scenes_text
+    
+    @staticmethod
+    def _parse_assignments(content: str) -> List[Any]:
+        """Extract the assignment list from a response that is not clean JSON."""
+        match = re.search(r"\{.*\}", content, re.DOTALL)
+        if not match:
+            return []
+        
         try:
-            result = json.loads(response.content)
-            return result.get("scene_assignments", [])
+            result = json.loads(match.group())
         except json.JSONDecodeError:
-            # Fallback: use rule-based assignment
-            return self._fallback_scene_assignment(script, understanding)
+            return []
+        
+        entries = result.get("scene_assignments", []) if isinstance(result, dict) else []
+        return entries if isinstance(entries, list) else []
+    
+    @staticmethod
+    def _collect_valid(
+        entries: List[Any],
+        item_schema: Dict[str, Any],
+        assignments: Dict[str, Dict[str, Any]],
+    ) -> List[Any]:
+        """
+        Add schema-valid entries to ``assignments``, keeping the first per scene.
+        
+        Returns:
+            Entries that failed validation
+        """
+        invalid = []
+        for entry in entries:
+            if not llm_service.validate_json(entry, item_schema):
+                invalid.append(entry)
+            elif entry["scene_id"] not in assignments:
+                assignments[entry["scene_id"]] = entry
+        return invalid
+    
+    async def _repair_assignments(
+        self,
+        scenes: List[Scene],
+        invalid_entries: List[Any],
+        item_schema: Dict[str, Any],
+        title: str,
+        assignments: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Re-request assignments for the given scenes in one follow-up call."""
+        scene_ids = {scene.id for scene in scenes}
+        relevant = [
+            entry for entry in invalid_entries
+            if not isinstance(entry, dict) or entry.get("scene_id") in scene_ids
+        ]
+        
+        prompt = self.prompts.SCENE_REPAIR.format(
+            title=title,
+            scenes_text=self._format_scenes(scenes),
+            invalid_text=json.dumps(relevant, indent=2, default=str) if relevant else "(missing)",
+            schema=json.dumps(build_plan_schema([scene.id for scene in scenes]), indent=2),
+        )
+        
+        try:
+            response = await llm_service.generate(
+                prompt=prompt,
+                temperature=0.0,
+                max_tokens=300 + 150 * len(scenes),
+            )
+            self._collect_valid(self._parse_assignments(response.content), item_schema, assignments)
+        except Exception as e:
+            self.logger.warning(f"Scene assignment repair failed: {e}")
     
     def _fallback_scene_assignment(
         self, 
@@ -300,23 +507,22 @@ class VisualPlanningAgent(BaseAgent):
         understanding: PaperUnderstanding
     ) -> List[Dict[str, Any]]:
         """Fallback scene assignment using rule-based approach."""
-        assignments = []
-        
-        for scene in script.scenes:
-            content_type = self._classify_content_type(scene, understanding)
-            framework = self.assignment_rules.FRAMEWORK_MAPPING[content_type]
-            
-            assignments.append({
-                "scene_id": scene.id,
-                "content_type": content_type.value,
-                "framework": framework.value,
-                "complexity": "medium",
-                "visual_elements": self._suggest_visual_elements(content_type, scene),
-                "transition_in": "fade",
-                "transition_out": "fade",
-            })
+        return [self._rule_based_assignment(scene, understanding) for scene in script.scenes]
+    
+    def _rule_based_assignment(self, scene: Scene, understanding: PaperUnderstanding) -> Dict[str, Any]:
+        """Assign a single scene using ``FrameworkAssignmentRules``."""
+        content_type = self._classify_content_type(scene, understanding)
+        framework = self.assignment_rules.FRAMEWORK_MAPPING[content_type]
         
-        return assignments
+        return {
+            "scene_id": scene.id,
+            "content_type": content_type.value,
+            "framework": framework.value,
+            "complexity": "medium",
+            "visual_elements": self._suggest_visual_elements(content_type, scene),
+            "transition_in": "fade",
+            "transition_out": "fade",
+        }
     
     def _classify_content_type(
         self, 
@@ -387,7 +593,7 @@ class VisualPlanningAgent(BaseAgent):
             scene_plan = ScenePlan(
                 scene_id=scene_id,
                 framework=assignment["framework"],
-                template=self._select_template(assignment),
+                template_id=self._select_template(assignment),
                 parameters=self._generate_parameters(assignment, scene),
                 duration=scene.duration,
             )
@@ -442,6 +648,7 @@ class VisualPlanningAgent(BaseAgent):
         base_parameters = {
             "duration": scene.duration,
             "title": scene.title,
+            "content": scene.narration[:100] + "...",
             "narration_length": len(scene.narration.split()),
         }
         
@@ -539,6 +746,29 @@ class VisualPlanningAgent(BaseAgent):
         content_type = self._classify_content_type(scene, understanding)
         return self.assignment_rules.FRAMEWORK_MAPPING[content_type]
     
+    async def assign_frameworks_to_scenes(
+        self,
+        script: NarrationScript,
+        understanding: PaperUnderstanding,
+        title: str = "Research Paper",
+    ) -> Dict[str, AnimationFramework]:
+        """
+        Public method to assign animation frameworks to all scenes in one batch.
+        
+        Args:
+            script: Narration script
+            understanding: Paper understanding context
+            title: Paper title
+            
+        Returns:
+            Mapping of scene ID to recommended animation framework
+        """
+        assignments = await self._analyze_scenes(script, understanding, title)
+        return {
+            assignment["scene_id"]: AnimationFramework(assignment["framework"])
+            for assignment in assignments
+        }
+    
     def get_framework_capabilities(self) -> Dict[AnimationFramework, List[str]]:
         """
         Get capabilities of each animation framework.
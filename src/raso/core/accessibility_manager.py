@@ -442,6 +442,9 @@ class AccessibilityManager:
             Duration: {video_metadata.get('duration', 60)} seconds
             Visual Style: {cinematic_settings.get('visual_style', 'standard')}
             
+            Paper Digest:
+            {video_metadata.get('paper_digest') or 'None'}
+            
             Create audio descriptions that:
             1. Describe important visual elements not covered by dialogue
             2. Are concise and fit between dialogue
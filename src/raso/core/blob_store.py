@@ -0,0 +1,140 @@
+"""
+Content-addressed blob store for large workflow payloads.
+
+``RASOMasterState.compact`` moves the large payloads of a job (uploaded PDF
+data, section text, figure images, word-level timing markers) here and keeps
+a typed ``BlobRef`` in the state, so LangGraph transitions, stream events and
+checkpoints copy and serialize a few hundred bytes per payload instead of
+the payload itself. Blobs are immutable files named by the SHA-256 of their
+bytes, so identical payloads from retries, resumed jobs or re-generations
+are stored once. The checkpoint store tracks which blobs its checkpoints
+reference and deletes blobs that none does; storing a payload again refreshes
+the blob's age, so a blob just compacted into a running job's state is not
+deleted before that state is checkpointed.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from core.tracing import span
+
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+
+class BlobStore:
+    """Immutable blobs on disk, keyed by SHA-256, with a small read cache."""
+
+    def __init__(self, root: Path, cache_entries: int = 128):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory the blobs are stored under
+            cache_entries: Recently read blobs kept in memory
+        """
+        self.root = Path(root)
+        self.cache_entries = cache_entries
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str) -> Path:
+        # Digests become file names, so anything but SHA-256 hex could escape the root
+        if not _DIGEST.fullmatch(digest):
+            raise ValueError(f"Invalid blob digest {digest!r}")
+        return self.root / digest[:2] / digest
+
+    def _remember(self, digest: str, data: bytes) -> None:
+        with self._lock:
+            self._cache[digest] = data
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+    def put(self, data: bytes) -> str:
+        """
+        Store bytes.
+
+        Args:
+            data: Payload bytes
+
+        Returns:
+            SHA-256 hex digest identifying the blob
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        try:
+            # Already stored; refresh its age for delete(min_age=...)
+            os.utime(path)
+        except FileNotFoundError:
+            with span("blob.put", "io", size=len(data)):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+        self._remember(digest, data)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """
+        Read a blob.
+
+        Raises:
+            KeyError: If no blob has this digest
+            ValueError: If ``digest`` is not a SHA-256 hex digest
+        """
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return self._cache[digest]
+
+        try:
+            with span("blob.get", "io"):
+                data = self._path(digest).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(f"Missing blob {digest}") from None
+        self._remember(digest, data)
+        return data
+
+    def contains(self, digest: str) -> bool:
+        """Whether a blob is stored."""
+        return self._path(digest).exists()
+
+    def delete(self, digest: str, min_age: float = 0.0) -> bool:
+        """
+        Delete a blob that is no longer referenced.
+
+        Args:
+            digest: Blob to delete
+            min_age: Keep the blob if it was stored less than this many seconds ago
+
+        Returns:
+            Whether the blob was deleted
+        """
+        path = self._path(digest)
+        try:
+            if min_age and time.time() - path.stat().st_mtime < min_age:
+                return False
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            self._cache.pop(digest, None)
+        return True
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get the global blob store, under the data path."""
+    global _blob_store
+    if _blob_store is None:
+        from config.backend.config import get_config
+        _blob_store = BlobStore(Path(get_config().data_path) / "blobs")
+    return _blob_store
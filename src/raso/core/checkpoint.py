@@ -0,0 +1,325 @@
+"""
+Durable workflow checkpoints for the RASO platform.
+
+Every workflow node persists the ``RASOMasterState`` it produced, keyed by
+job and node name. When a job is resumed after a crash or restart, nodes
+that already completed return their stored state instead of running again,
+so the workflow restarts at the first incomplete node with all earlier
+ingest, LLM, TTS and render work reused.
+
+Large string fields (extracted paper text, generated code, transcripts) are
+stored once in the content-addressed ``BlobStore`` and referenced from the
+state document, so saving a checkpoint after every node stays cheap; payloads
+the workflow already compacted into ``BlobRef`` references live in the same
+store. Rendered media are already referenced by path. A reference table
+records which checkpoints use which blobs, so clearing a finished job only
+has to look at that job's blobs, and blobs no checkpoint references any more
+are deleted. When a job completes its node checkpoints are replaced by a
+single final-state checkpoint, which edit-and-rebuild starts from.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Set, Tuple
+
+from config.backend.models.blobs import trusted_refs
+from core.blob_store import BlobStore, get_blob_store
+from core.tracing import traced
+
+
+INPUT_NODE = "__input__"
+FINAL_NODE = "__final__"
+BLOB_REF = "$blob"
+
+
+class CheckpointStore(ABC):
+    """Persists workflow state per job and node."""
+
+    @abstractmethod
+    def save(self, job_id: str, node: str, state: Any) -> None:
+        """Store the state produced by a node."""
+
+    @abstractmethod
+    def load(self, job_id: str, node: str) -> Optional[Any]:
+        """Load the state a node produced, or None if it never completed."""
+
+    @abstractmethod
+    def completed_nodes(self, job_id: str) -> List[str]:
+        """Nodes completed for a job, in completion order."""
+
+    @abstractmethod
+    def latest(self, job_id: str) -> Optional[Tuple[str, Any]]:
+        """The most recently completed node and its state."""
+
+    @abstractmethod
+    def clear(self, job_id: str, keep: Iterable[str] = ()) -> None:
+        """Delete the checkpoints of a job, except those of the ``keep`` nodes."""
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """SQLite checkpoint store keeping large values in the blob store."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        state_type: Any,
+        inline_limit: int = 64 * 1024,
+        blob_store: Optional[BlobStore] = None,
+        blob_grace_seconds: float = 3600.0,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite database file
+            state_type: Pydantic model the state is restored as
+            inline_limit: Strings longer than this many bytes are stored as blobs
+            blob_store: Store for large values (defaults to the global blob store)
+            blob_grace_seconds: Unreferenced blobs stored more recently than this are
+                kept, as a running job may hold them in a state it has not checkpointed yet
+        """
+        self.db_path = Path(db_path)
+        self.state_type = state_type
+        self.inline_limit = inline_limit
+        self.blob_store = blob_store or get_blob_store()
+        self.blob_grace_seconds = blob_grace_seconds
+
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                job_id TEXT NOT NULL,
+                node TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (job_id, node)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoint_blob_refs (
+                job_id TEXT NOT NULL,
+                node TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                PRIMARY KEY (job_id, node, hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_checkpoint_blob_refs_hash ON checkpoint_blob_refs (hash)")
+        self._conn.commit()
+
+    def _externalize(self, value: Any, digests: Set[str]) -> Any:
+        """Move large strings to the blob store; collects every blob the document references."""
+        if isinstance(value, dict):
+            if set(value) == {"digest", "size", "kind"}:
+                # A BlobRef the workflow already compacted
+                digests.add(value["digest"])
+                return value
+            return {key: self._externalize(item, digests) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._externalize(item, digests) for item in value]
+        if isinstance(value, str):
+            data = value.encode("utf-8")
+            if len(data) > self.inline_limit:
+                digest = self.blob_store.put(data)
+                digests.add(digest)
+                return {BLOB_REF: digest}
+        return value
+
+    def _internalize(self, value: Any) -> Any:
+        """Resolve blob references back into strings."""
+        if isinstance(value, dict):
+            if set(value) == {BLOB_REF}:
+                return self.blob_store.get(value[BLOB_REF]).decode("utf-8")
+            return {key: self._internalize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._internalize(item) for item in value]
+        return value
+
+    @traced("checkpoint.save", "io")
+    def save(self, job_id: str, node: str, state: Any) -> None:
+        """
+        Store the state produced by a node.
+
+        Args:
+            job_id: Job identifier
+            node: Workflow node name
+            state: State after the node ran
+        """
+        digests: Set[str] = set()
+        document = json.dumps(self._externalize(json.loads(state.json()), digests))
+
+        with self._lock:
+            # A re-saved node drops its old references; blobs only it used are deleted
+            previous = self._delete_refs_locked("job_id = ? AND node = ?", (job_id, node))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO checkpoint_blob_refs (job_id, node, hash) VALUES (?, ?, ?)",
+                [(job_id, node, digest) for digest in digests],
+            )
+            self._delete_unreferenced_locked(previous - digests)
+            seq = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM checkpoints WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (job_id, node, seq, state, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, node, seq, document, time.time()),
+            )
+            self._conn.commit()
+
+    def _restore(self, document: str) -> Any:
+        # Checkpoints were written by the workflow, so their blob references are trusted
+        with trusted_refs():
+            return self.state_type.parse_obj(self._internalize(json.loads(document)))
+
+    @traced("checkpoint.load", "io")
+    def load(self, job_id: str, node: str) -> Optional[Any]:
+        """
+        Load the state a node produced.
+
+        Returns:
+            Restored state, or None if the node never completed for this job
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM checkpoints WHERE job_id = ? AND node = ?", (job_id, node)
+            ).fetchone()
+            return self._restore(row[0]) if row else None
+
+    def completed_nodes(self, job_id: str) -> List[str]:
+        """Nodes completed for a job, in completion order (excluding the input and final state)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT node FROM checkpoints WHERE job_id = ? AND node NOT IN (?, ?) ORDER BY seq",
+                (job_id, INPUT_NODE, FINAL_NODE),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def latest(self, job_id: str) -> Optional[Tuple[str, Any]]:
+        """The most recently saved node and its state, falling back to the job input."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT node, state FROM checkpoints WHERE job_id = ? ORDER BY seq DESC LIMIT 1",
+                (job_id,),
+            ).fetchone()
+            return (row[0], self._restore(row[1])) if row else None
+
+    def clear(self, job_id: str, keep: Iterable[str] = ()) -> None:
+        """Delete a job's checkpoints, except the ``keep`` nodes, and any blobs no other checkpoint references."""
+        keep = list(keep)
+        where = "job_id = ?" + (f" AND node NOT IN ({', '.join('?' * len(keep))})" if keep else "")
+        params = (job_id, *keep)
+        with self._lock:
+            self._conn.execute(f"DELETE FROM checkpoints WHERE {where}", params)
+            self._delete_unreferenced_locked(self._delete_refs_locked(where, params))
+            self._conn.commit()
+
+    def _delete_refs_locked(self, where: str, params: Tuple[Any, ...]) -> Set[str]:
+        """Delete blob references matching a condition; returns the hashes they pointed at."""
+        hashes = {
+            row[0] for row in self._conn.execute(f"SELECT hash FROM checkpoint_blob_refs WHERE {where}", params)
+        }
+        self._conn.execute(f"DELETE FROM checkpoint_blob_refs WHERE {where}", params)
+        return hashes
+
+    def _delete_unreferenced_locked(self, hashes: Set[str]) -> None:
+        """Delete those of the given blobs that no checkpoint references any more."""
+        for digest in hashes:
+            referenced = self._conn.execute(
+                "SELECT 1 FROM checkpoint_blob_refs WHERE hash = ? LIMIT 1", (digest,)
+            ).fetchone()
+            if referenced is None:
+                self.blob_store.delete(digest, min_age=self.blob_grace_seconds)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+async def run_checkpointed(
+    store: Optional[CheckpointStore],
+    job_id: str,
+    node: str,
+    state: Any,
+    execute: Callable[[Any], Awaitable[Any]],
+    is_complete: Optional[Callable[[Any], bool]] = None,
+) -> Tuple[Any, bool]:
+    """
+    Run a workflow node unless a checkpoint shows it already completed.
+
+    Args:
+        store: Checkpoint store, or None to always execute
+        job_id: Job identifier
+        node: Workflow node name
+        state: Input state
+        execute: Runs the node
+        is_complete: Whether an output state is good enough to checkpoint
+
+    Returns:
+        Output state and whether it was reused from a checkpoint
+    """
+    # Loading and saving serialize the whole state; keep that off the event loop
+    if store is not None:
+        stored = await asyncio.to_thread(store.load, job_id, node)
+        if stored is not None:
+            return stored, True
+
+    result = await execute(state)
+
+    if store is not None and (is_complete is None or is_complete(result)):
+        await asyncio.to_thread(store.save, job_id, node, result)
+    return result, False
+
+
+def finish_checkpoints(store: Optional[CheckpointStore], job_id: str, final_state: Any) -> None:
+    """
+    Replace a completed job's node checkpoints with its final state.
+
+    The per-node states are only needed to resume an unfinished job; the
+    final state is kept so the job can be edited and rebuilt later.
+
+    Args:
+        store: Checkpoint store, or None if checkpointing is disabled
+        job_id: Job identifier
+        final_state: State the job completed with
+    """
+    if store is None:
+        return
+    # Save first, so blobs the final state shares with node checkpoints stay referenced
+    store.save(job_id, FINAL_NODE, final_state)
+    store.clear(job_id, keep=(FINAL_NODE,))
+
+
+_checkpoint_store: Optional[CheckpointStore] = None
+
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """
+    Get the global checkpoint store.
+
+    Returns:
+        Store instance, or None if checkpointing is disabled in configuration
+    """
+    global _checkpoint_store
+    if _checkpoint_store is None:
+        from config.backend.config import get_config
+        from config.backend.models import RASOMasterState
+        config = get_config()
+        if not config.system.checkpoint_enabled:
+            return None
+        _checkpoint_store = SQLiteCheckpointStore(
+            db_path=config.system.checkpoint_path or (Path(config.data_path) / "checkpoints.sqlite3"),
+            state_type=RASOMasterState,
+            inline_limit=config.system.checkpoint_inline_limit_kb * 1024,
+        )
+    return _checkpoint_store
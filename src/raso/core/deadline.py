@@ -0,0 +1,362 @@
+"""
+Deadline-aware execution for the RASO platform.
+
+A job may carry a wall-clock deadline (``options.deadline``). Before each
+workflow stage the ``DeadlinePlanner`` predicts how long the remaining
+stages take at the job's current settings, from per-stage rates learned on
+earlier runs. If the prediction overruns the deadline, it walks down a
+degradation ladder until the remaining work fits:
+
+    1. skip the cinematic enhancement pass of the composition
+    2. switch narration to a faster TTS engine
+    3. lower the video quality preset, one level at a time
+
+Each step is recorded on the state as a degradation decision, so the job
+result shows what was traded for finishing on time. Jobs with a deadline
+are not aborted for running late; a lower-quality video is better than none.
+Only a job still running ``timeout_minutes`` past its deadline times out.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds of work per second of video at the default settings
+DEFAULT_RATES: Dict[str, float] = {
+    "ingest": 0.05,
+    "understand": 0.3,
+    "script": 0.3,
+    "visual_plan": 0.1,
+    "animate": 4.0,
+    "generate_voice": 0.3,
+    "compose_video": 0.5,
+    "generate_metadata": 0.05,
+}
+
+# Workflow stages in order; the animation and narration branches run concurrently
+STAGES: Tuple[str, ...] = tuple(DEFAULT_RATES)
+PARALLEL_STAGES: Tuple[str, ...] = ("animate", "generate_voice")
+
+# Video quality presets from lowest to highest, with their relative encode cost
+QUALITY_LEVELS: Tuple[str, ...] = ("low", "medium", "high", "cinematic_4k", "cinematic_8k")
+QUALITY_COST: Dict[str, float] = {
+    "low": 0.3,
+    "medium": 0.55,
+    "high": 1.0,
+    "cinematic_4k": 3.0,
+    "cinematic_8k": 10.0,
+}
+
+# The cinematic enhancement pass roughly adds this share to composition
+CINEMATIC_COST = 1.6
+
+# Relative synthesis cost of the TTS engines the audio agent knows about
+DEFAULT_TTS_ENGINE = "coqui"
+FAST_TTS_ENGINE = "piper"
+TTS_ENGINE_COST: Dict[str, float] = {"bark": 3.0, "coqui": 1.0, "piper": 0.3, "system": 0.15}
+
+# Settings the planner may change, least noticeable first
+DEFAULT_LADDER: Tuple[str, ...] = ("cinematic_effects", "tts_engine", "video_quality")
+
+DEFAULT_VIDEO_SECONDS = 180.0
+
+# Stage names of the sequential master workflow
+STAGE_ALIASES: Dict[str, str] = {
+    "understanding": "understand",
+    "visual_planning": "visual_plan",
+    "rendering": "animate",
+    "audio": "generate_voice",
+    "video_composition": "compose_video",
+    "metadata": "generate_metadata",
+}
+
+
+def _get(options: Any, name: str, default: Any = None) -> Any:
+    if isinstance(options, dict):
+        return options.get(name, default)
+    return getattr(options, name, default)
+
+
+def _set(options: Any, name: str, value: Any) -> None:
+    if isinstance(options, dict):
+        options[name] = value
+    else:
+        setattr(options, name, value)
+
+
+def _options_dict(options: Any) -> Dict[str, Any]:
+    if isinstance(options, dict):
+        return dict(options)
+    if hasattr(options, "dict"):
+        return options.dict()
+    return dict(vars(options))
+
+
+def stage_of(node_name: str) -> str:
+    """Workflow stage a graph node belongs to; every animation route is ``animate``."""
+    if node_name.startswith("animate"):
+        return "animate"
+    return STAGE_ALIASES.get(node_name, node_name)
+
+
+def stage_factor(stage: str, options: Any) -> float:
+    """Cost of a stage at the given settings, relative to the default settings."""
+    if stage == "compose_video":
+        factor = QUALITY_COST.get(_get(options, "video_quality", "high"), 1.0)
+        if _get(options, "cinematic_effects", True):
+            factor *= CINEMATIC_COST
+        return factor
+    if stage == "generate_voice":
+        return TTS_ENGINE_COST.get(_get(options, "tts_engine") or DEFAULT_TTS_ENGINE, 1.0)
+    return 1.0
+
+
+def video_seconds(state: Any) -> float:
+    """Expected length of the job's video, which stage times scale with."""
+    script = getattr(state, "script", None)
+    if script is not None and getattr(script, "total_duration", None):
+        return float(script.total_duration)
+    return float(_get(state.options, "target_duration") or DEFAULT_VIDEO_SECONDS)
+
+
+class StageTimeModel:
+    """Predicts stage durations and learns from observed ones."""
+
+    def __init__(self, path: Optional[Path] = None, smoothing: float = 0.3):
+        """
+        Initialize the model, loading saved rates if present.
+
+        Args:
+            path: JSON file the learned rates are persisted to
+            smoothing: Weight of a new observation once a rate has several samples
+        """
+        self.path = Path(path) if path else None
+        self.smoothing = smoothing
+        self.rates: Dict[str, Dict[str, float]] = {}
+
+        if self.path and self.path.exists():
+            try:
+                self.rates = json.loads(self.path.read_text())
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable stage time model {self.path}: {e}")
+
+    def rate(self, stage: str) -> float:
+        """Learned seconds of work per second of video at default settings, else the prior."""
+        if stage in self.rates:
+            return self.rates[stage]["rate"]
+        return DEFAULT_RATES.get(stage, 0.0)
+
+    def predict(self, stage: str, seconds_of_video: float, options: Any) -> float:
+        """
+        Predict a stage's duration.
+
+        Args:
+            stage: Workflow stage
+            seconds_of_video: Expected video length
+            options: Processing options the stage runs with
+
+        Returns:
+            Expected duration in seconds
+        """
+        return self.rate(stage) * seconds_of_video * stage_factor(stage, options)
+
+    def observe(self, stage: str, seconds_of_video: float, options: Any, elapsed: float) -> None:
+        """
+        Refine the model with an observed stage duration.
+
+        The observation is normalized to the default settings, so runs at any
+        quality level teach the same rate.
+        """
+        observed_rate = max(elapsed, 0.0) / max(seconds_of_video, 1.0) / stage_factor(stage, options)
+        entry = self.rates.get(stage)
+        if entry is None:
+            self.rates[stage] = {"rate": observed_rate, "samples": 1}
+            return
+
+        samples = entry["samples"] + 1
+        weight = max(self.smoothing, 1.0 / samples)
+        entry["rate"] = (1 - weight) * entry["rate"] + weight * observed_rate
+        entry["samples"] = samples
+
+    def save(self) -> None:
+        """Persist the learned rates."""
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.rates, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.path)
+
+
+def apply_decisions(state: Any) -> None:
+    """
+    Re-apply recorded degradations to the state's options.
+
+    Parallel branches only return their own fields and the merged
+    degradation list, so a decision taken in one branch reaches the rest
+    of the workflow through this.
+    """
+    for decision in getattr(state, "degradations", None) or []:
+        _set(state.options, decision["setting"], decision["to"])
+
+
+class DeadlinePlanner:
+    """Degrades a job's settings when its remaining work would overrun the deadline."""
+
+    def __init__(self, model: Optional[StageTimeModel] = None, ladder: Tuple[str, ...] = DEFAULT_LADDER):
+        """
+        Initialize the planner.
+
+        Args:
+            model: Stage time model (defaults to an unpersisted one with the priors)
+            ladder: Settings to degrade, in the order they are tried
+        """
+        self.model = model or StageTimeModel()
+        self.ladder = ladder
+
+    @staticmethod
+    def remaining_stages(stage: str, parallel: bool = True) -> List[str]:
+        """The stage and the ones after it; a parallel stage includes its sibling."""
+        if stage not in STAGES:
+            return []
+        start = STAGES.index(stage)
+        if parallel and stage in PARALLEL_STAGES:
+            start = min(STAGES.index(name) for name in PARALLEL_STAGES)
+        return list(STAGES[start:])
+
+    def predict_remaining(self, state: Any, stage: str, options: Any = None, parallel: bool = True) -> float:
+        """
+        Predicted time from the start of a stage to the end of the workflow.
+
+        Args:
+            state: Workflow state
+            stage: Stage or graph node about to run
+            options: Settings to predict with (defaults to the state's)
+            parallel: Whether animation and narration run concurrently
+
+        Returns:
+            Seconds along the critical path; concurrent branches count once
+        """
+        options = state.options if options is None else options
+        length = video_seconds(state)
+        sequential = 0.0
+        longest_branch = 0.0
+        for name in self.remaining_stages(stage_of(stage), parallel):
+            predicted = self.model.predict(name, length, options)
+            if parallel and name in PARALLEL_STAGES:
+                longest_branch = max(longest_branch, predicted)
+            else:
+                sequential += predicted
+        return sequential + longest_branch
+
+    @staticmethod
+    def _degraded(setting: str, current: Any) -> Any:
+        """The next value down the ladder for a setting, or None at the bottom."""
+        if setting == "cinematic_effects":
+            return False if current is not False else None
+        if setting == "tts_engine":
+            current = current or DEFAULT_TTS_ENGINE
+            if TTS_ENGINE_COST.get(current, 1.0) > TTS_ENGINE_COST[FAST_TTS_ENGINE]:
+                return FAST_TTS_ENGINE
+            return None
+        if setting == "video_quality":
+            if current in QUALITY_LEVELS and current != QUALITY_LEVELS[0]:
+                return QUALITY_LEVELS[QUALITY_LEVELS.index(current) - 1]
+            return None
+        return None
+
+    def before_stage(
+        self, state: Any, node_name: str, now: Optional[datetime] = None, parallel: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Degrade settings as needed before a stage runs.
+
+        Recorded decisions are re-applied first. Then, while the remaining
+        work is predicted to overrun the deadline, the next ladder step that
+        shortens it is applied and recorded on ``state.degradations``.
+
+        Args:
+            state: Workflow state; its options and degradations are updated in place
+            node_name: Graph node about to run
+            now: Current time (defaults to ``datetime.now()``)
+            parallel: Whether animation and narration run concurrently
+
+        Returns:
+            The decisions taken now
+        """
+        apply_decisions(state)
+        deadline = _get(state.options, "deadline")
+        stage = stage_of(node_name)
+        if deadline is None or stage not in STAGES:
+            return []
+
+        now = now or datetime.now(deadline.tzinfo)
+        budget = (deadline - now).total_seconds()
+        predicted = self.predict_remaining(state, stage, parallel=parallel)
+        decisions: List[Dict[str, Any]] = []
+
+        for setting in self.ladder:
+            while predicted > budget:
+                current = _get(state.options, setting)
+                target = self._degraded(setting, current)
+                if target is None:
+                    break
+
+                trial = dict(_options_dict(state.options), **{setting: target})
+                trial_predicted = self.predict_remaining(state, stage, trial, parallel)
+                if trial_predicted >= predicted:
+                    # The setting no longer matters for the stages left
+                    break
+
+                _set(state.options, setting, target)
+                decisions.append({
+                    "stage": stage,
+                    "setting": setting,
+                    "from": current,
+                    "to": target,
+                    "predicted_seconds": round(predicted, 1),
+                    "predicted_seconds_after": round(trial_predicted, 1),
+                    "budget_seconds": round(budget, 1),
+                    "decided_at": now.isoformat(),
+                })
+                predicted = trial_predicted
+
+        if decisions:
+            state.degradations = list(state.degradations or []) + decisions
+            for decision in decisions:
+                logger.info(
+                    f"Job {getattr(state, 'job_id', '?')}: {decision['setting']} "
+                    f"{decision['from']} -> {decision['to']} before {stage} to meet the deadline"
+                )
+        if predicted > budget:
+            logger.warning(
+                f"Job {getattr(state, 'job_id', '?')} is predicted to miss its deadline by "
+                f"{predicted - budget:.0f}s with every degradation applied; continuing"
+            )
+        return decisions
+
+    def after_stage(self, state: Any, node_name: str, elapsed: float) -> None:
+        """Teach the model how long a stage took."""
+        stage = stage_of(node_name)
+        if stage not in STAGES:
+            return
+        self.model.observe(stage, video_seconds(state), state.options, elapsed)
+        self.model.save()
+
+
+_deadline_planner: Optional[DeadlinePlanner] = None
+
+
+def get_deadline_planner() -> DeadlinePlanner:
+    """Get the global deadline planner, with its model persisted under the data path."""
+    global _deadline_planner
+    if _deadline_planner is None:
+        from config.backend.config import get_config
+        _deadline_planner = DeadlinePlanner(StageTimeModel(Path(get_config().data_path) / "stage_time_model.json"))
+    return _deadline_planner
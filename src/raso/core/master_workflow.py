@@ -5,12 +5,13 @@ Orchestrates the complete video generation pipeline from paper input to final ou
 """
 
 import asyncio
+import time
 from typing import Dict, Any, AsyncGenerator
 from datetime import datetime
 
 from langgraph.graph import StateGraph, END
 
-from config.backend.models.state import RASOMasterState, AgentType
+from config.backend.models.state import RASOMasterState, AgentType, WorkflowStatus
 from agents.ingest import IngestAgent
 from agents.understanding import UnderstandingAgent
 from agents.script import ScriptAgent
@@ -21,6 +22,11 @@ from agents.video_composition import VideoCompositionAgent
 from agents.metadata import MetadataAgent
 from agents.youtube import YouTubeAgent
 from config.backend.config import get_config
+from core.blob_store import get_blob_store
+from core.checkpoint import finish_checkpoints, get_checkpoint_store
+from core.deadline import get_deadline_planner
+from core.resource_governor import job_scope
+from core.tracing import STAGE, span
 
 
 class RASOMasterWorkflow:
@@ -89,70 +95,88 @@ class RASOMasterWorkflow:
         try:
             state = RASOMasterState(**initial_state)
             
-            # Define progress stages
+            # Define progress stages, with the workflow status each one reports
             stages = [
-                ("ingest", 10),
-                ("understanding", 20),
-                ("script", 30),
-                ("visual_planning", 40),
-                ("rendering", 60),
-                ("audio", 75),
-                ("video_composition", 85),
-                ("metadata", 95),
-                ("youtube", 100),
+                ("ingest", 10, WorkflowStatus.INGESTING),
+                ("understanding", 20, WorkflowStatus.UNDERSTANDING),
+                ("script", 30, WorkflowStatus.SCRIPTING),
+                ("visual_planning", 40, WorkflowStatus.PLANNING),
+                ("rendering", 60, WorkflowStatus.ANIMATING),
+                ("audio", 75, WorkflowStatus.AUDIO_PROCESSING),
+                ("video_composition", 85, WorkflowStatus.VIDEO_COMPOSING),
+                ("metadata", 95, WorkflowStatus.METADATA_GENERATING),
+                ("youtube", 100, WorkflowStatus.UPLOADING),
             ]
             
             current_progress = 0
+            deadline_planner = get_deadline_planner()
+            blob_store = get_blob_store()
             
             # Execute each stage
-            for stage_name, target_progress in stages:
-                # Update progress
-                state.progress.overall_progress = current_progress / 100.0
+            for stage_name, target_progress, status in stages:
+                # Update progress (published to the job's event stream by the worker's listener)
+                state.progress.update_progress(status, 0.0, f"Starting {stage_name}")
                 state.current_agent = AgentType(stage_name) if stage_name in [e.value for e in AgentType] else None
                 state.update_timestamp()
                 
-                # Yield current state as dict
-                state_dict = state.dict()
+                # Yield current state as dict, with large payloads as blob references
+                state_dict = state.compact(blob_store).dict()
                 state_dict["progress"] = current_progress
                 state_dict["current_agent"] = stage_name
                 yield state_dict
                 
-                # Execute the stage with proper state object
-                try:
-                    if stage_name == "ingest":
-                        state = await IngestAgent(AgentType.INGEST).execute(state)
-                    elif stage_name == "understanding":
-                        state = await UnderstandingAgent(AgentType.UNDERSTANDING).execute(state)
-                    elif stage_name == "script":
-                        state = await ScriptAgent(AgentType.SCRIPT).execute(state)
-                    elif stage_name == "visual_planning":
-                        state = await VisualPlanningAgent(AgentType.VISUAL_PLANNING).execute(state)
-                    elif stage_name == "rendering":
-                        state = await RenderingCoordinator(AgentType.MANIM).execute(state)
-                    elif stage_name == "audio":
-                        state = await AudioAgent(AgentType.VOICE).execute(state)
-                    elif stage_name == "video_composition":
-                        state = await VideoCompositionAgent(AgentType.TRANSITION).execute(state)
-                    elif stage_name == "metadata":
-                        print(f"🔍 Starting metadata stage...")
-                        state = await MetadataAgent(AgentType.METADATA).execute(state)
-                        print(f"✅ Metadata stage completed successfully")
-                    elif stage_name == "youtube":
-                        print(f"🔍 Starting youtube stage...")
-                        state = await YouTubeAgent(AgentType.YOUTUBE).execute(state)
-                        print(f"✅ YouTube stage completed successfully")
-                except Exception as e:
-                    # Log the specific error and stage with full traceback
-                    print(f"❌ Error in stage {stage_name}: {str(e)}")
-                    import traceback
-                    error_traceback = traceback.format_exc()
-                    print(f"Full traceback:\n{error_traceback}")
-                    raise e
+                # Step quality down if the remaining stages would overrun the job's deadline
+                deadline_planner.before_stage(state, stage_name, parallel=False)
+                stage_started = time.monotonic()
                 
+                # Execute the stage with proper state object, attributing governed resources to the job
+                with job_scope(state.job_id), span(stage_name, STAGE):
+                    try:
+                        if stage_name == "ingest":
+                            state = await IngestAgent(AgentType.INGEST).execute(state)
+                        elif stage_name == "understanding":
+                            state = await UnderstandingAgent(AgentType.UNDERSTANDING).execute(state)
+                        elif stage_name == "script":
+                            state = await ScriptAgent(AgentType.SCRIPT).execute(state)
+                        elif stage_name == "visual_planning":
+                            state = await VisualPlanningAgent(AgentType.VISUAL_PLANNING).execute(state)
+                        elif stage_name == "rendering":
+                            state = await RenderingCoordinator(AgentType.MANIM).execute(state)
+                        elif stage_name == "audio":
+                            state = await AudioAgent(AgentType.VOICE).execute(state)
+                        elif stage_name == "video_composition":
+                            state = await VideoCompositionAgent(AgentType.TRANSITION).execute(state)
+                        elif stage_name == "metadata":
+                            print(f"🔍 Starting metadata stage...")
+                            state = await MetadataAgent(AgentType.METADATA).execute(state)
+                            print(f"✅ Metadata stage completed successfully")
+                        elif stage_name == "youtube":
+                            print(f"🔍 Starting youtube stage...")
+                            state = await YouTubeAgent(AgentType.YOUTUBE).execute(state)
+                            print(f"✅ YouTube stage completed successfully")
+                    except Exception as e:
+                        # Log the specific error and stage with full traceback
+                        print(f"❌ Error in stage {stage_name}: {str(e)}")
+                        import traceback
+                        error_traceback = traceback.format_exc()
+                        print(f"Full traceback:\n{error_traceback}")
+                        raise e
+                
+                deadline_planner.after_stage(state, stage_name, time.monotonic() - stage_started)
+                state.progress.complete_step(status)
+                state.progress.update_progress(status, 1.0, f"Completed {stage_name}")
                 current_progress = target_progress
             
+            state.progress.update_progress(WorkflowStatus.COMPLETED, 1.0, "Workflow completed")
+            
+            # Keep the final state so the job can be edited and rebuilt later
+            final_state = state.compact(blob_store)
+            await asyncio.to_thread(finish_checkpoints, get_checkpoint_store(), state.job_id, final_state)
+            
             # Final result
+            state_dict = final_state.dict()
             state_dict["progress"] = 100
+            state_dict["current_agent"] = stages[-1][0]
             state_dict["status"] = "completed"
             yield state_dict
             
@@ -119,9 +119,12 @@ except ImportError as e:
 class ProductionVideoGenerator:
     """Production video generator with Gemini LLM integration."""
     
-    def __init__(self, job_id, paper_content, output_dir):
+    def __init__(self, job_id, paper_content, output_dir, paper=None):
         self.job_id = job_id
         self.paper_content = paper_content
+        # Parsed PaperContent, if available; enables per-scene passage retrieval
+        self.paper = paper
+        self.passage_index = None
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
@@ -143,6 +146,30 @@ class ProductionVideoGenerator:
         print(f"[INFO] Job {self.job_id}: Initialized production video generation")
         print(f"[INFO] Job {self.job_id}: Paper: '{self.paper_content}'")
     
+    async def _load_passage_index(self):
+        """Load or build the passage index of the paper, if parsed content is available."""
+        if self.paper is None:
+            return None
+        
+        try:
+            from agents.passage_index import get_passage_index
+            return await asyncio.to_thread(get_passage_index, self.paper)
+        except Exception as e:
+            print(f"[WARN] Job {self.job_id}: Passage index unavailable: {e}")
+            return None
+    
+    async def _scene_passages(self, scene):
+        """Paper passages most relevant to a scene, or None without an index."""
+        if self.passage_index is None:
+            return None
+        
+        query = f"{scene.get('title', '')} {' '.join(scene.get('key_concepts', []))} {scene.get('narration', '')[:500]}"
+        try:
+            return await asyncio.to_thread(self.passage_index.context_for, query, 3, 1500) or None
+        except Exception as e:
+            print(f"[WARN] Job {self.job_id}: Passage retrieval failed: {e}")
+            return None
+    
     async def generate_video(self):
         """Generate professional video using Gemini LLM or fallback mode."""
         try:
@@ -190,6 +217,7 @@ class ProductionVideoGenerator:
                 raise Exception("System is down: Gemini AI service required for video generation")
             
             print(f"[INFO] Job {self.job_id}: Generating Manim animations with Gemini...")
+            self.passage_index = await self._load_passage_index()
             failed_scenes = []
             
             for i, scene in enumerate(scenes):
@@ -197,7 +225,8 @@ class ProductionVideoGenerator:
                     manim_code = await self.gemini_client.generate_manim_code(
                         scene.get('title', f'Scene {i+1}'),
                         scene.get('visual_description', scene.get('narration', '')),
-                        scene.get('duration', 10.0)
+                        scene.get('duration', 10.0),
+                        context_passages=await self._scene_passages(scene)
                     )
                     
                     if not manim_code or manim_code.strip() == "":
@@ -906,7 +935,8 @@ class {class_name}(Scene):
                     scenes=cinematic_scenes,
                     video_files=video_files,
                     audio_files=audio_files,
-                    output_path=str(output_file)
+                    output_path=str(output_file),
+                    passage_index=self.passage_index
                 )
                 
                 # Clean up temporary files
@@ -1323,6 +1353,22 @@ class {class_name}(Scene):
             "visual_approach": "progressive technical diagrams with mathematical precision",
             "scenes": scenes
         }
+async def ingest_paper(job_id, paper_content, paper_type="title"):
+    """Parse the paper with the ingest agent so scenes can retrieve its passages; None if that fails."""
+    try:
+        from agents.ingest import IngestAgent
+        from config.backend.models.paper import PaperInput
+        from config.backend.models.state import RASOMasterState
+        
+        state = RASOMasterState(job_id=job_id, paper_input=PaperInput(type=paper_type, content=paper_content))
+        state = await IngestAgent(AgentType.INGEST).execute(state)
+        print(f"[OK] Job {job_id}: Parsed paper with {len(state.paper_content.sections)} sections")
+        return state.paper_content
+    except Exception as e:
+        print(f"[WARN] Job {job_id}: Paper ingestion failed, generating without passage retrieval: {e}")
+        return None
+
+
 async def main():
     """Main function for REAL production video generation."""
     # Get job parameters from environment variables or command line
@@ -1343,7 +1389,8 @@ async def main():
     else:
         print(f"[WARN] Gemini API key not properly configured - using enhanced fallback mode")
     
-    generator = ProductionVideoGenerator(job_id, paper_content, output_dir)
+    paper = await ingest_paper(job_id, paper_content, paper_type)
+    generator = ProductionVideoGenerator(job_id, paper_content, output_dir, paper=paper)
     
     try:
         result = await generator.generate_video()
@@ -0,0 +1,451 @@
+"""
+Incremental re-generation for the RASO platform.
+
+When an editor changes one scene's narration, its template parameters or
+the grading profile, only the assets that depend on the change need to be
+rebuilt. After a successful run, the job's inputs and generated assets are
+recorded in an ``AssetRelationshipMapper`` graph:
+
+    scene text   (narration, voice)             <- audio of the scene
+    scene visual (template, parameters, style)  <- animation of the scene
+    grading      (color scheme, video quality)  <- final video
+    every audio and animation                   <- final video
+
+Edited inputs are diffed against the recorded ones by content hash, and
+``get_regeneration_plan`` on each changed input gives the assets to
+rebuild; everything else is reused.
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.render_scheduler import RenderCostModel
+from core.blob_store import get_blob_store
+
+
+logger = logging.getLogger(__name__)
+
+# Checkpoint node a rebuilt state is saved under, so later edits diff against it
+REBUILD_NODE = "__rebuild__"
+
+VIDEO_KEY = "video"
+
+# Options that shape each kind of input
+VOICE_OPTIONS = ("voice_id", "voice_speed", "voice_pitch", "audio_quality", "tts_engine")
+VISUAL_OPTIONS = ("animation_quality", "animation_style", "prefer_manim")
+GRADING_OPTIONS = ("color_scheme", "video_quality", "cinematic_effects")
+
+# Rough generation cost per second of output, for assets without a recorded time
+TTS_SECONDS_PER_SECOND = 0.3
+COMPOSE_SECONDS_PER_SECOND = 0.5
+
+
+def _dump(value: Any) -> Any:
+    """Plain JSON-able data for a model, dataclass-like object or value."""
+    if hasattr(value, "dict"):
+        return value.dict()
+    if hasattr(value, "__dict__"):
+        return {name: _dump(item) for name, item in vars(value).items()}
+    return value
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _pick(options: Dict[str, Any], names: Tuple[str, ...]) -> Dict[str, Any]:
+    return {name: options.get(name) for name in names}
+
+
+def asset_key(kind: str, scene_id: Optional[str] = None) -> str:
+    """Key of an input or output asset, e.g. ``audio:scene_1`` or ``video``."""
+    return f"{kind}:{scene_id}" if scene_id else kind
+
+
+def describe_inputs(state: Any) -> Dict[str, Any]:
+    """
+    The inputs of a run that generated assets depend on.
+
+    Args:
+        state: Workflow state with a script and visual plan
+
+    Returns:
+        Input key to JSON-able input value
+    """
+    options = _dump(state.options) or {}
+    inputs: Dict[str, Any] = {}
+
+    for scene in state.script.scenes:
+        inputs[asset_key("text", scene.id)] = {
+            "title": scene.title,
+            "narration": scene.narration,
+            "voice": _pick(options, VOICE_OPTIONS),
+        }
+
+    for plan in state.visual_plan.scenes:
+        inputs[asset_key("visual", plan.scene_id)] = {
+            "framework": _dump(getattr(plan.framework, "value", plan.framework)),
+            "template_id": plan.template_id,
+            "parameters": _dump(plan.parameters),
+            "duration": plan.duration,
+            "style": _pick(options, VISUAL_OPTIONS),
+        }
+
+    inputs[asset_key("grading")] = _pick(options, GRADING_OPTIONS)
+    return inputs
+
+
+@dataclass
+class RegenerationPlan:
+    """What an edit changes, what must be rebuilt and what is reused."""
+
+    changed_inputs: List[str] = field(default_factory=list)
+    rebuild: List[str] = field(default_factory=list)
+    reused: List[str] = field(default_factory=list)
+    estimated_rebuild_seconds: float = 0.0
+    estimated_seconds_saved: float = 0.0
+
+    def scenes_to_rebuild(self, kind: str) -> List[str]:
+        """Scene IDs whose ``kind`` asset (``audio`` or ``animation``) is rebuilt."""
+        prefix = f"{kind}:"
+        return [key[len(prefix):] for key in self.rebuild if key.startswith(prefix)]
+
+    @property
+    def rebuild_video(self) -> bool:
+        return VIDEO_KEY in self.rebuild
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "changed_inputs": self.changed_inputs,
+            "rebuild": self.rebuild,
+            "reused": self.reused,
+            "estimated_rebuild_seconds": round(self.estimated_rebuild_seconds, 1),
+            "estimated_seconds_saved": round(self.estimated_seconds_saved, 1),
+        }
+
+
+class RegenerationPlanner:
+    """Records a run's asset graph and plans minimal rebuilds for edits."""
+
+    def __init__(self, root: Path, cost_model: Optional[RenderCostModel] = None):
+        """
+        Initialize the planner.
+
+        Args:
+            root: Directory holding one asset graph per job
+            cost_model: Render time predictions for animations without a recorded time
+        """
+        self.root = Path(root)
+        self.cost_model = cost_model or RenderCostModel()
+
+    def _graph_path(self, job_id: str) -> Path:
+        return self.root / job_id
+
+    def _estimate(self, state: Any) -> Dict[str, float]:
+        """Expected seconds to regenerate each output asset of a run."""
+        costs: Dict[str, float] = {}
+        plans = {plan.scene_id: plan for plan in state.visual_plan.scenes}
+
+        for scene in state.audio.scenes if state.audio else []:
+            costs[asset_key("audio", scene.scene_id)] = TTS_SECONDS_PER_SECOND * scene.duration
+
+        for scene in state.animations.scenes if state.animations else []:
+            recorded = scene.metadata.render_duration if scene.metadata else None
+            plan = plans.get(scene.scene_id)
+            if recorded:
+                costs[asset_key("animation", scene.scene_id)] = recorded
+            elif plan is not None:
+                costs[asset_key("animation", scene.scene_id)] = self.cost_model.predict(
+                    plan.framework, plan.template_id, plan.duration
+                )
+
+        total_duration = state.video.duration if state.video else 0.0
+        costs[VIDEO_KEY] = COMPOSE_SECONDS_PER_SECOND * total_duration
+        return costs
+
+    def record(self, job_id: str, state: Any) -> Any:
+        """
+        Record a successful run's inputs, outputs and their dependencies.
+
+        Inputs are written as JSON snapshots so they can be registered as
+        assets; outputs whose files no longer exist are left out and are
+        always rebuilt.
+
+        Args:
+            job_id: Job identifier
+            state: Final state of the run
+
+        Returns:
+            The job's ``AssetRelationshipMapper``
+        """
+        from scripts.asset_relationship_mapper import AssetRelationshipMapper, AssetType, RelationshipType
+
+        graph_path = self._graph_path(job_id)
+        shutil.rmtree(graph_path, ignore_errors=True)
+        inputs_dir = graph_path / "inputs"
+        inputs_dir.mkdir(parents=True)
+        mapper = AssetRelationshipMapper(str(graph_path / "graph"))
+
+        ids: Dict[str, str] = {}
+        for key, value in describe_inputs(state).items():
+            snapshot = inputs_dir / f"{key.replace(':', '__')}.json"
+            snapshot.write_text(json.dumps(value, sort_keys=True, default=str), encoding="utf-8")
+            asset_type = AssetType.SCRIPT if key.startswith("text:") else AssetType.METADATA
+            ids[key] = mapper.register_asset(
+                asset_type, str(snapshot), metadata={"key": key, "input_hash": _digest(value)}
+            ).asset_id
+
+        costs = self._estimate(state)
+
+        def register_output(key: str, asset_type: Any, file_path: Optional[str]) -> Optional[str]:
+            if not file_path or not Path(file_path).exists():
+                return None
+            ids[key] = mapper.register_asset(
+                asset_type, file_path, metadata={"key": key, "cost_seconds": costs.get(key, 0.0)}
+            ).asset_id
+            return ids[key]
+
+        outputs = []
+        for scene in state.audio.scenes if state.audio else []:
+            audio_id = register_output(asset_key("audio", scene.scene_id), AssetType.AUDIO, scene.file_path)
+            text_id = ids.get(asset_key("text", scene.scene_id))
+            if audio_id and text_id:
+                mapper.create_relationship(audio_id, text_id, RelationshipType.DEPENDS_ON)
+            outputs.append(audio_id)
+
+        for scene in state.animations.scenes if state.animations else []:
+            animation_id = register_output(asset_key("animation", scene.scene_id), AssetType.ANIMATION, scene.file_path)
+            visual_id = ids.get(asset_key("visual", scene.scene_id))
+            if animation_id and visual_id:
+                mapper.create_relationship(animation_id, visual_id, RelationshipType.DEPENDS_ON)
+            outputs.append(animation_id)
+
+        video_id = register_output(VIDEO_KEY, AssetType.VIDEO, state.video.file_path if state.video else None)
+        if video_id:
+            for dependency in outputs + [ids[asset_key("grading")]]:
+                if dependency:
+                    mapper.create_relationship(video_id, dependency, RelationshipType.DEPENDS_ON)
+
+        return mapper
+
+    def plan(self, job_id: str, state: Any, edited_state: Any) -> RegenerationPlan:
+        """
+        Plan the rebuild of an edited run.
+
+        Args:
+            job_id: Job identifier
+            state: Final state of the last successful run
+            edited_state: The same state with the editor's changes applied
+
+        Returns:
+            Changed inputs, assets to rebuild and to reuse, and time estimates
+        """
+        mapper = self.record(job_id, state)
+        by_key = {asset.metadata["key"]: asset for asset in mapper.assets.values()}
+        costs = self._estimate(state)
+
+        old_inputs = describe_inputs(state)
+        new_inputs = describe_inputs(edited_state)
+        changed = sorted(
+            key for key in set(old_inputs) | set(new_inputs)
+            if _digest(old_inputs.get(key)) != _digest(new_inputs.get(key))
+        )
+
+        rebuild = set()
+        for key in changed:
+            if key in by_key:
+                dependents = mapper.get_regeneration_plan(by_key[key].asset_id)
+                rebuild.update(mapper.assets[asset_id].metadata["key"] for asset_id in dependents)
+            if key not in old_inputs or key not in new_inputs:
+                # Scenes were added or removed
+                rebuild.add(VIDEO_KEY)
+
+        # Outputs the edited run needs but the last run has no usable file for
+        for scene in edited_state.script.scenes:
+            for kind in ("audio", "animation"):
+                key = asset_key(kind, scene.id)
+                if key not in by_key:
+                    rebuild.update({key, VIDEO_KEY})
+        if VIDEO_KEY not in by_key:
+            rebuild.add(VIDEO_KEY)
+
+        reused = sorted(key for key in costs if key not in rebuild and key in by_key)
+        ordered = sorted(rebuild, key=lambda key: (key == VIDEO_KEY, key))
+        return RegenerationPlan(
+            changed_inputs=changed,
+            rebuild=ordered,
+            reused=reused,
+            estimated_rebuild_seconds=sum(costs.get(key, 0.0) for key in ordered),
+            estimated_seconds_saved=sum(costs[key] for key in reused),
+        )
+
+
+def apply_edits(state: Any, edits: Dict[str, Any]) -> Any:
+    """
+    Apply an editor's changes to a copy of a run's state.
+
+    Args:
+        state: Final state of the last successful run
+        edits: ``{"scenes": {scene_id: {"narration", "title", "template_id",
+            "parameters", "duration"}}, "options": {...}}``; template
+            parameters are merged into the existing ones
+
+    Returns:
+        Edited copy of the state
+
+    Raises:
+        ValueError: If an edit names an unknown scene
+    """
+    edited = state.copy(deep=True)
+    scene_edits = edits.get("scenes", {})
+
+    unknown = set(scene_edits) - {scene.id for scene in edited.script.scenes}
+    if unknown:
+        raise ValueError(f"Unknown scenes: {', '.join(sorted(unknown))}")
+
+    for index, scene in enumerate(edited.script.scenes):
+        changes = scene_edits.get(scene.id, {})
+        update = {name: changes[name] for name in ("title", "narration", "duration") if name in changes}
+        if update:
+            edited.script.scenes[index] = scene.copy(update=update)
+
+    for index, plan in enumerate(edited.visual_plan.scenes):
+        changes = scene_edits.get(plan.scene_id, {})
+        update = {name: changes[name] for name in ("template_id", "duration") if name in changes}
+        if "parameters" in changes:
+            update["parameters"] = {**plan.parameters, **changes["parameters"]}
+        if update:
+            edited.visual_plan.scenes[index] = plan.copy(update=update)
+
+    if edits.get("options"):
+        edited.options = edited.options.copy(update=edits["options"])
+
+    return edited
+
+
+class RegenerationService:
+    """Edit-and-rebuild of completed jobs, reusing unaffected assets."""
+
+    def __init__(self, planner: RegenerationPlanner, checkpoint_store: Any):
+        """
+        Initialize the service.
+
+        Args:
+            planner: Regeneration planner
+            checkpoint_store: Store holding the final state of completed runs
+        """
+        self.planner = planner
+        self.checkpoint_store = checkpoint_store
+
+    def last_successful_state(self, job_id: str) -> Any:
+        """
+        The final state of a job's last successful run or rebuild.
+
+        Raises:
+            ValueError: If the job has no completed run to rebuild from
+        """
+        latest = self.checkpoint_store.latest(job_id) if self.checkpoint_store else None
+        if latest is None or latest[1].video is None:
+            raise ValueError(f"Job {job_id} has no completed run to rebuild from")
+        return latest[1].hydrate(get_blob_store())
+
+    def plan(self, job_id: str, edits: Dict[str, Any]) -> RegenerationPlan:
+        """Dry run: what an edit would rebuild and the estimated time saved."""
+        state = self.last_successful_state(job_id)
+        return self.planner.plan(job_id, state, apply_edits(state, edits))
+
+    async def rebuild(
+        self,
+        job_id: str,
+        edits: Dict[str, Any],
+        rebuild_id: Optional[str] = None,
+    ) -> Tuple[Any, RegenerationPlan]:
+        """
+        Apply edits and regenerate only the affected assets.
+
+        Rebuilt assets are written under the rebuild's own job scope, so they
+        never overwrite the files of the run they replace (which the asset
+        graph of that run still points at).
+
+        Args:
+            job_id: Job whose last run is edited
+            edits: Changes, see ``apply_edits``
+            rebuild_id: Job the rebuild runs as (defaults to a new ID derived from ``job_id``)
+
+        Returns:
+            The rebuilt state and the plan that was executed
+        """
+        from config.backend.models import AgentType
+        from agents.audio import AudioAgent
+        from agents.rendering import RenderingCoordinator
+        from agents.video_composition import VideoCompositionAgent
+        from core.resource_governor import job_scope
+
+        state = self.last_successful_state(job_id)
+        edited = apply_edits(state, edits)
+        plan = self.planner.plan(job_id, state, edited)
+        logger.info(f"Rebuilding {plan.rebuild} for job {job_id}, reusing {len(plan.reused)} assets")
+
+        with job_scope(rebuild_id or f"{job_id}-rebuild-{uuid.uuid4().hex[:8]}"):
+            audio_ids = set(plan.scenes_to_rebuild("audio"))
+            if audio_ids:
+                audio_agent = AudioAgent(AgentType.VOICE)
+                rebuilt = {}
+                for scene in edited.script.scenes:
+                    if scene.id in audio_ids:
+                        audio_scene = await audio_agent.generate_scene_audio(scene, scene.duration)
+                        rebuilt[scene.id] = audio_scene or audio_agent._create_fallback_audio(scene, scene.duration)
+                edited.audio = self._replace_scenes(edited.audio, rebuilt, [s.id for s in edited.script.scenes])
+
+            animation_ids = set(plan.scenes_to_rebuild("animation"))
+            if animation_ids:
+                coordinator = RenderingCoordinator(AgentType.RENDERING)
+                rebuilt = {}
+                for scene_plan in edited.visual_plan.scenes:
+                    if scene_plan.scene_id in animation_ids:
+                        rebuilt[scene_plan.scene_id] = await coordinator._render_scene(scene_plan)
+                edited.animations = self._replace_scenes(
+                    edited.animations, rebuilt, [s.scene_id for s in edited.visual_plan.scenes]
+                )
+
+            if plan.rebuild_video:
+                edited = await VideoCompositionAgent(AgentType.TRANSITION).execute(edited)
+
+        edited.update_timestamp()
+        if edited.video is not None and self.checkpoint_store is not None:
+            self.checkpoint_store.save(job_id, REBUILD_NODE, edited)
+        return edited, plan
+
+    @staticmethod
+    def _replace_scenes(assets: Any, rebuilt: Dict[str, Any], order: List[str]) -> Any:
+        """Swap rebuilt scenes into audio or animation assets, keeping scene order."""
+        scenes = {scene.scene_id: scene for scene in assets.scenes}
+        scenes.update(rebuilt)
+        ordered = [scenes[scene_id] for scene_id in order if scene_id in scenes]
+        return assets.copy(update={
+            "scenes": ordered,
+            "total_duration": sum(scene.duration for scene in ordered),
+        })
+
+
+_regeneration_service: Optional[RegenerationService] = None
+
+
+def get_regeneration_service() -> RegenerationService:
+    """Get the global regeneration service, backed by the checkpoint store."""
+    global _regeneration_service
+    if _regeneration_service is None:
+        from config.backend.config import get_config
+        from agents.render_scheduler import get_render_cost_model
+        from core.checkpoint import get_checkpoint_store
+        _regeneration_service = RegenerationService(
+            RegenerationPlanner(Path(get_config().data_path) / "regeneration", get_render_cost_model()),
+            get_checkpoint_store(),
+        )
+    return _regeneration_service
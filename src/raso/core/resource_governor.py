@@ -0,0 +1,280 @@
+"""
+Process-wide resource governor for the RASO platform.
+
+Every job spawns its own ffmpeg, rendering, TTS and LLM work; without a
+shared limit, concurrent jobs oversubscribe CPU and memory and all of them
+slow down. The governor holds weighted capacities (CPU slots, a memory
+budget in MB and external-API quotas) that heavy operations acquire before
+they start. Waiting requests are granted fairly across jobs: the job with
+the fewest grants in progress goes first, then the job served least while
+it has had work waiting or running, then the oldest request.
+"""
+
+import asyncio
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set
+
+
+DEFAULT_JOB = "default"
+
+# Job the current task works for; set by agents and workflows
+current_job: ContextVar[str] = ContextVar("raso_current_job", default=DEFAULT_JOB)
+
+# Resources each kind of heavy work takes at 1080p
+WORK_COSTS: Dict[str, Dict[str, float]] = {
+    "ffmpeg": {"cpu": 2, "memory_mb": 512},
+    "render": {"cpu": 1, "memory_mb": 1024},
+    "tts": {"cpu": 1, "memory_mb": 1024, "tts": 1},
+    "llm": {"llm": 1},
+}
+
+_BASE_PIXELS = 1920 * 1080
+
+
+@contextmanager
+def job_scope(job_id: str) -> Iterator[None]:
+    """Attribute resources acquired in this context to a job."""
+    token = current_job.set(job_id)
+    try:
+        yield
+    finally:
+        current_job.reset(token)
+
+
+def work_cost(kind: str, resolution: Optional[str] = None) -> Dict[str, float]:
+    """
+    Resources needed for a kind of work.
+
+    Args:
+        kind: Key of ``WORK_COSTS``
+        resolution: Output resolution such as ``"3840x2160"``; memory scales
+            with the pixel count above 1080p
+
+    Returns:
+        Amount per resource, to pass to ``ResourceGovernor.acquire``
+    """
+    cost = dict(WORK_COSTS[kind])
+    if resolution and "memory_mb" in cost:
+        try:
+            width, height = (int(part) for part in resolution.lower().split("x"))
+            cost["memory_mb"] *= max(1.0, width * height / _BASE_PIXELS)
+        except ValueError:
+            pass
+    return cost
+
+
+@dataclass
+class _Waiter:
+    job: str
+    amounts: Dict[str, float]
+    future: asyncio.Future
+    seq: int
+
+
+class ResourceGovernor:
+    """Weighted semaphores over shared resources with fair sharing across jobs."""
+
+    def __init__(self, capacities: Dict[str, float]):
+        """
+        Initialize the governor.
+
+        Args:
+            capacities: Capacity per resource, e.g.
+                ``{"cpu": 8, "memory_mb": 12000, "llm": 8, "tts": 4}``.
+                Resources not listed here are not limited.
+        """
+        self.capacities = {name: float(capacity) for name, capacity in capacities.items()}
+        self.in_use: Dict[str, float] = {name: 0.0 for name in self.capacities}
+        self.active_by_job: Dict[str, int] = {}
+        self._served: Dict[str, int] = {}
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+
+        self._started = time.monotonic()
+        self._last_change = self._started
+        self._busy: Dict[str, float] = {name: 0.0 for name in self.capacities}
+        self._peak: Dict[str, float] = {name: 0.0 for name in self.capacities}
+        self._grants = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _normalize(self, amounts: Dict[str, float]) -> Dict[str, float]:
+        """Drop unlimited resources and cap requests at capacity so they can run alone."""
+        return {
+            name: min(float(amount), self.capacities[name])
+            for name, amount in amounts.items()
+            if name in self.capacities and amount > 0
+        }
+
+    def _fits(self, amounts: Dict[str, float]) -> bool:
+        return all(self.in_use[name] + amount <= self.capacities[name] for name, amount in amounts.items())
+
+    def _account(self) -> None:
+        """Integrate resource usage up to now, for time-weighted utilization."""
+        now = time.monotonic()
+        for name, used in self.in_use.items():
+            self._busy[name] += used * (now - self._last_change)
+        self._last_change = now
+
+    def _join(self, job: str) -> None:
+        """Start a job's fair-share count level with the jobs already competing."""
+        if job not in self._served:
+            self._served[job] = min(self._served.values(), default=0)
+
+    def _leave_if_idle(self, job: str) -> None:
+        if job not in self.active_by_job and not any(waiter.job == job for waiter in self._waiters):
+            self._served.pop(job, None)
+
+    def _grant(self, job: str, amounts: Dict[str, float]) -> None:
+        self._account()
+        for name, amount in amounts.items():
+            self.in_use[name] += amount
+            self._peak[name] = max(self._peak[name], self.in_use[name])
+        self.active_by_job[job] = self.active_by_job.get(job, 0) + 1
+        self._served[job] += 1
+        self._grants += 1
+
+    def _release(self, job: str, amounts: Dict[str, float]) -> None:
+        self._account()
+        for name, amount in amounts.items():
+            self.in_use[name] = max(0.0, self.in_use[name] - amount)
+        self.active_by_job[job] -= 1
+        if not self.active_by_job[job]:
+            del self.active_by_job[job]
+        self._leave_if_idle(job)
+        self._dispatch()
+
+    def _fair_key(self, waiter: _Waiter) -> tuple:
+        return self.active_by_job.get(waiter.job, 0), self._served[waiter.job], waiter.seq
+
+    def _contended(self, amounts: Dict[str, float]) -> bool:
+        """Whether any waiting request needs one of these resources."""
+        return any(not waiter.amounts.keys().isdisjoint(amounts) for waiter in self._waiters)
+
+    def _dispatch(self) -> None:
+        """
+        Grant waiting requests in fair order.
+
+        A request that does not fit holds back later requests for any of
+        the same resources instead of letting smaller ones pass it, so large
+        requests (e.g. 4K renders) are not starved by a stream of small
+        ones. Requests for other resources (e.g. an LLM slot behind a
+        waiting render) are still granted.
+        """
+        granted = True
+        while granted:
+            granted = False
+            blocked: Set[str] = set()
+            for waiter in sorted(self._waiters, key=self._fair_key):
+                if not blocked.isdisjoint(waiter.amounts) or not self._fits(waiter.amounts):
+                    blocked.update(waiter.amounts)
+                    continue
+                self._waiters.remove(waiter)
+                self._grant(waiter.job, waiter.amounts)
+                waiter.future.set_result(None)
+                # Granting changes the job's share, so re-rank the rest
+                granted = True
+                break
+
+    @asynccontextmanager
+    async def acquire(self, **amounts: float) -> AsyncIterator[None]:
+        """
+        Hold resources for the duration of a block.
+
+        All resources are granted together, so a request never holds part of
+        its resources while waiting for the rest.
+
+        Args:
+            **amounts: Amount per resource, e.g. ``cpu=2, memory_mb=1024``
+        """
+        amounts = self._normalize(amounts)
+        job = current_job.get()
+        start = time.monotonic()
+        self._join(job)
+
+        if self._fits(amounts) and not self._contended(amounts):
+            self._grant(job, amounts)
+        else:
+            waiter = _Waiter(job, amounts, asyncio.get_running_loop().create_future(), next(self._seq))
+            self._waiters.append(waiter)
+            self._dispatch()
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    self._release(job, amounts)
+                else:
+                    self._waiters.remove(waiter)
+                    self._leave_if_idle(job)
+                    self._dispatch()
+                raise
+
+            waited = time.monotonic() - start
+            self._waits += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+        try:
+            yield
+        finally:
+            self._release(job, amounts)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Utilization and wait metrics.
+
+        Returns:
+            Per resource: capacity, current use, peak and time-weighted
+            utilization since start; plus queued requests, grants, waits and
+            running requests per job
+        """
+        self._account()
+        elapsed = max(self._last_change - self._started, 1e-9)
+        return {
+            "resources": {
+                name: {
+                    "capacity": capacity,
+                    "in_use": self.in_use[name],
+                    "peak": self._peak[name],
+                    "utilization": self._busy[name] / (capacity * elapsed),
+                }
+                for name, capacity in self.capacities.items()
+            },
+            "waiting": len(self._waiters),
+            "grants": self._grants,
+            "waits": self._waits,
+            "total_wait_seconds": self._total_wait,
+            "max_wait_seconds": self._max_wait,
+            "active_by_job": dict(self.active_by_job),
+        }
+
+
+def _physical_memory_mb() -> float:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return 8192.0
+
+
+_resource_governor: Optional[ResourceGovernor] = None
+
+
+def get_resource_governor() -> ResourceGovernor:
+    """Get the process-wide resource governor."""
+    global _resource_governor
+    if _resource_governor is None:
+        from config.backend.config import get_config
+        system = get_config().system
+        capacities = {
+            "cpu": system.resource_cpu_slots or os.cpu_count() or 4,
+            "memory_mb": system.resource_memory_mb or _physical_memory_mb() * 0.75,
+        }
+        capacities.update(system.resource_api_quotas)
+        _resource_governor = ResourceGovernor(capacities)
+    return _resource_governor
@@ -172,7 +172,7 @@ async def main():
         print("=" * 80)
         
         # Import and run the production generator
-        from production_video_generator import ProductionVideoGenerator
+        from production_video_generator import ProductionVideoGenerator, ingest_paper
         
         # Set up job parameters
         job_id = "cinematic-demo"
@@ -182,7 +182,8 @@ async def main():
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         
         # Initialize and run generator
-        generator = ProductionVideoGenerator(job_id, paper_content, output_dir)
+        paper = await ingest_paper(job_id, paper_content)
+        generator = ProductionVideoGenerator(job_id, paper_content, output_dir, paper=paper)
         
         print(f"📁 Output directory: {output_dir}")
         print(f"🎬 Quality: {quality}")
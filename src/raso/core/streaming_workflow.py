@@ -0,0 +1,303 @@
+"""
+Scene-level streaming execution mode for the RASO platform.
+
+Runs the same agents as the barrier graph in ``core.workflow``, but after
+the paper-level stages (ingest, understanding, script and the single batched
+visual planning request) each scene flows on its own through
+TTS -> render -> mux. Rendering follows TTS so each animation is cut to the
+length of its narration. Only the final concat waits for every scene.
+
+Select it with ``RASO_EXECUTION_MODE=streaming``; the barrier graph stays
+the default so the two modes can be benchmarked against each other. The
+orchestrator runs it with the same error handling, input compaction and
+completion checkpoints as the graph, and the paper-level stages are
+checkpointed under the graph's node names so a streaming job resumes too.
+"""
+
+import asyncio
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config.backend.config import get_config
+from config.backend.models import AgentType, ErrorSeverity, RASOMasterState, WorkflowStatus
+from config.backend.models.animation import AnimationAssets, VideoResolution
+from config.backend.models.audio import AudioAssets
+from config.backend.models.video import VideoAsset, VideoMetadata
+from agents.base import agent_registry
+from core.blob_store import get_blob_store
+from core.checkpoint import CheckpointStore, run_checkpointed
+from core.deadline import get_deadline_planner
+from core.resource_governor import job_scope
+from core.tracing import STAGE, span
+from core.scene_dataflow import DONE, SceneDataflow, SceneStage, SceneWork
+
+
+# Stages that need the whole paper or all scenes at once, with their graph node names
+PAPER_STAGES = [
+    (AgentType.INGEST, WorkflowStatus.INGESTING, "ingest"),
+    (AgentType.UNDERSTANDING, WorkflowStatus.UNDERSTANDING, "understand"),
+    (AgentType.SCRIPT, WorkflowStatus.SCRIPTING, "script"),
+    (AgentType.VISUAL_PLANNING, WorkflowStatus.PLANNING, "visual_plan"),
+]
+
+
+class StreamingWorkflow:
+    """Runs each scene through TTS, rendering and muxing as soon as its inputs exist."""
+
+    def __init__(self):
+        """Initialize the streaming workflow."""
+        self.config = get_config()
+        self.last_metrics: Dict[str, Any] = {}
+
+    def _stage_concurrency(self) -> Dict[str, int]:
+        concurrency = dict(self.config.system.streaming_stage_concurrency)
+        concurrency.setdefault("render", sum(self.config.animation.render_workers.values()))
+        return concurrency
+
+    async def execute(
+        self,
+        state: RASOMasterState,
+        checkpoint_store: Optional[CheckpointStore] = None,
+    ) -> RASOMasterState:
+        """
+        Execute the workflow in streaming mode.
+
+        Args:
+            state: Initial workflow state
+            checkpoint_store: Durable store for the paper-level stages, or None
+
+        Returns:
+            Final workflow state
+        """
+        deadline_planner = get_deadline_planner()
+        blob_store = get_blob_store()
+
+        for agent_type, status, node_name in PAPER_STAGES:
+            agent = agent_registry.get_agent(agent_type)
+            state.progress.update_progress(status, 0.0, f"Starting {agent.name}")
+            deadline_planner.before_stage(state, node_name)
+            started = time.monotonic()
+
+            async def execute_stage(stage_state: RASOMasterState, agent=agent) -> RASOMasterState:
+                return (await agent.safe_execute(stage_state)).compact(blob_store)
+
+            with span(node_name, STAGE):
+                state, resumed = await run_checkpointed(
+                    checkpoint_store,
+                    state.job_id,
+                    node_name,
+                    state,
+                    execute_stage,
+                    is_complete=lambda result: not result.has_critical_errors(),
+                )
+            if state.has_critical_errors():
+                return state
+            if not resumed:
+                deadline_planner.after_stage(state, node_name, time.monotonic() - started)
+            state.progress.complete_step(status)
+
+        # Scene stages call agents directly rather than through safe_execute.
+        # Narration, rendering and muxing overlap, so the planner sees them as one stage.
+        deadline_planner.before_stage(state, "animate")
+        with job_scope(state.job_id), span("scenes", STAGE):
+            state = await self._stream_scenes(state)
+        if state.has_critical_errors():
+            return state
+
+        state.progress.update_progress(WorkflowStatus.METADATA_GENERATING, 0.0, "Generating metadata")
+        with span("generate_metadata", STAGE):
+            state = await agent_registry.get_agent(AgentType.METADATA).safe_execute(state)
+        state.progress.complete_step(WorkflowStatus.METADATA_GENERATING)
+
+        if state.options.auto_upload and self.config.youtube and self.config.youtube.is_configured:
+            state = await agent_registry.get_agent(AgentType.YOUTUBE).safe_execute(state)
+
+        return state
+
+    async def _stream_scenes(self, state: RASOMasterState) -> RASOMasterState:
+        """Run the per-scene dataflow and concatenate the muxed scenes."""
+        if not state.script or not state.script.scenes or not state.visual_plan or not state.visual_plan.scenes:
+            state.add_error(
+                AgentType.TRANSITION,
+                "STREAMING_FAILED",
+                "Streaming needs a script and a visual plan with scenes",
+                severity=ErrorSeverity.CRITICAL,
+            )
+            return state
+
+        from agents.audio import AudioAgent
+        from agents.rendering import RenderingCoordinator
+        from agents.video_composition import VideoCompositionAgent
+        from utils.quality_presets import QualityPresetManager
+
+        audio_agent = AudioAgent(AgentType.VOICE)
+        if state.options.tts_engine:
+            audio_agent.preferred_tts = state.options.tts_engine
+        coordinator = RenderingCoordinator(AgentType.RENDERING)
+        composer = VideoCompositionAgent(AgentType.TRANSITION)
+
+        ffmpeg_path = shutil.which("ffmpeg") or "ffmpeg"
+        encoding_params = QualityPresetManager().get_preset(state.options.video_quality)
+        work_dir = Path(self.config.temp_path) / "streaming" / state.job_id
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        scene_plans = {plan.scene_id: plan for plan in state.visual_plan.scenes}
+
+        async def tts(work: SceneWork) -> None:
+            scene = work.artifacts["script_scene"]
+            audio_scene = await audio_agent.generate_scene_audio(scene, scene.duration)
+            work.artifacts["audio"] = audio_scene or audio_agent._create_fallback_audio(scene, scene.duration)
+
+        async def render(work: SceneWork) -> None:
+            audio_scene = work.artifacts["audio"]
+            # Cut the animation to the narration it will be muxed with
+            scene_plan = scene_plans[work.scene_id].copy(update={"duration": audio_scene.duration})
+            work.artifacts["video"] = await coordinator._render_scene(scene_plan)
+
+        async def mux(work: SceneWork) -> None:
+            audio_scene, rendered = work.artifacts["audio"], work.artifacts["video"]
+            output_path = str(work_dir / f"scene_{work.index:03d}.mp4")
+            muxed = await composer._compose_single_scene_ffmpeg(
+                (rendered.file_path, audio_scene.file_path, audio_scene.duration),
+                output_path,
+                encoding_params,
+                ffmpeg_path,
+            )
+            if not muxed:
+                raise RuntimeError(f"Muxing failed for scene {work.scene_id}")
+            work.artifacts["segment"] = output_path
+
+        concurrency = self._stage_concurrency()
+        dataflow = SceneDataflow(
+            [
+                SceneStage("tts", tts, concurrency.get("tts", 2)),
+                SceneStage("render", render, concurrency["render"]),
+                SceneStage("mux", mux, concurrency.get("mux", 2)),
+            ],
+            on_update=lambda work, stage, status: self._report(state, dataflow, work, stage, status),
+        )
+
+        works = [
+            SceneWork(scene_id=scene.id, index=index, artifacts={"script_scene": scene})
+            for index, scene in enumerate(state.script.scenes)
+            if scene.id in scene_plans
+        ]
+        await dataflow.run(works)
+
+        failed = [work for work in works if work.failed]
+        for work in failed:
+            state.add_error(AgentType.TRANSITION, "SCENE_STREAM_FAILED", work.error)
+
+        completed = [work for work in works if not work.failed]
+        if not completed:
+            state.add_error(
+                AgentType.TRANSITION,
+                "STREAMING_FAILED",
+                "No scene completed the streaming pipeline",
+                severity=ErrorSeverity.CRITICAL,
+            )
+            return state
+
+        state.progress.update_progress(WorkflowStatus.VIDEO_COMPOSING, 0.5, "Concatenating scenes")
+        output_path = str(work_dir / f"raso_video_{state.job_id}.mp4")
+        try:
+            await self._concat([work.artifacts["segment"] for work in completed], output_path, ffmpeg_path, work_dir)
+        except (RuntimeError, OSError) as e:
+            state.add_error(AgentType.TRANSITION, "STREAMING_CONCAT_FAILED", str(e), severity=ErrorSeverity.CRITICAL)
+            return state
+
+        self._store_assets(state, completed, output_path, composer)
+        self.last_metrics = dataflow.metrics()
+        state.progress.detailed_status["stream_metrics"] = self.last_metrics
+        state.progress.complete_step(WorkflowStatus.ANIMATING)
+        state.progress.complete_step(WorkflowStatus.AUDIO_PROCESSING)
+        state.progress.complete_step(WorkflowStatus.VIDEO_COMPOSING)
+        return state
+
+    def _report(
+        self,
+        state: RASOMasterState,
+        dataflow: SceneDataflow,
+        work: SceneWork,
+        stage: str,
+        status: str,
+    ) -> None:
+        """Publish per-scene stage status on the job's progress."""
+        snapshot = dataflow.snapshot()
+        state.progress.detailed_status["scenes"] = snapshot
+
+        stages_done = sum(1 for statuses in snapshot.values() for value in statuses.values() if value == DONE)
+        stages_total = sum(len(statuses) for statuses in snapshot.values()) or 1
+        state.progress.update_progress(
+            WorkflowStatus.ANIMATING,
+            stages_done / stages_total,
+            f"Scene {work.scene_id}: {stage} {status}",
+        )
+
+    async def _concat(self, segments: List[str], output_path: str, ffmpeg_path: str, work_dir: Path) -> None:
+        """Concatenate muxed scene segments without re-encoding."""
+        concat_file = work_dir / "concat_list.txt"
+        concat_file.write_text(
+            "".join(f"file '{Path(segment).resolve().as_posix()}'\n" for segment in segments),
+            encoding="utf-8",
+        )
+
+        process = await asyncio.create_subprocess_exec(
+            ffmpeg_path, "-f", "concat", "-safe", "0", "-i", str(concat_file),
+            "-c", "copy", "-y", output_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"Scene concatenation failed: {stderr.decode(errors='replace')}")
+
+    def _store_assets(
+        self,
+        state: RASOMasterState,
+        works: List[SceneWork],
+        output_path: str,
+        composer: Any,
+    ) -> None:
+        """Record the per-scene assets and the final video on the state."""
+        rendered_scenes = [work.artifacts["video"] for work in works]
+        audio_scenes = [work.artifacts["audio"] for work in works]
+        duration = sum(scene.duration for scene in audio_scenes)
+
+        state.animations = AnimationAssets(
+            scenes=rendered_scenes,
+            total_duration=sum(scene.duration for scene in rendered_scenes),
+            resolution=VideoResolution(width=1920, height=1080),
+        )
+        state.audio = AudioAssets(scenes=audio_scenes, total_duration=duration)
+
+        paper_title = state.paper_content.title if state.paper_content else "Research Paper Video"
+        chapters = composer._create_chapters(rendered_scenes, audio_scenes)
+        state.video = VideoAsset(
+            file_path=output_path,
+            duration=duration,
+            resolution="1920x1080",
+            file_size=Path(output_path).stat().st_size,
+            chapters=chapters,
+            metadata=VideoMetadata(
+                title=f"Research Paper Explanation: {paper_title}",
+                description=f"An educational explanation of the research paper: {paper_title}",
+                tags=["research", "education", "science", "paper explanation"],
+                chapters=chapters,
+            ),
+        )
+        state.current_agent = AgentType.METADATA
+        state.update_timestamp()
+
+
+_streaming_workflow: Optional[StreamingWorkflow] = None
+
+
+def get_streaming_workflow() -> StreamingWorkflow:
+    """Get the global streaming workflow."""
+    global _streaming_workflow
+    if _streaming_workflow is None:
+        _streaming_workflow = StreamingWorkflow()
+    return _streaming_workflow
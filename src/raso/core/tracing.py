@@ -0,0 +1,244 @@
+"""
+Per-job span tracing for the RASO platform.
+
+Agent nodes, LLM calls, subprocess launches (ffmpeg, Manim, TTS), file I/O
+and cache lookups open spans with ``span(...)``. Spans go to the tracer of
+the job being processed, found through a context variable, so they follow
+the job into every asyncio task it starts; worker processes activate a
+tracer for each job they claim. Without an active tracer a span costs one
+context variable lookup.
+
+A finished trace is exported as Chrome trace JSON, which chrome://tracing
+and https://ui.perfetto.dev open directly. Each asyncio task gets its own
+track, so concurrent renders and narrations show side by side.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+# Category of the spans summarized as the job's per-stage breakdown
+STAGE = "stage"
+
+current_tracer: ContextVar[Optional["Tracer"]] = ContextVar("raso_current_tracer", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("raso_current_span", default=None)
+
+
+@dataclass
+class Span:
+    """A timed operation within a job."""
+
+    name: str
+    category: str
+    start_us: float
+    track: int
+    parent: Optional[str] = None
+    args: Dict[str, Any] = field(default_factory=dict)
+    duration_us: float = 0.0
+    span_id: str = ""
+
+    @property
+    def seconds(self) -> float:
+        return self.duration_us / 1e6
+
+
+class Tracer:
+    """Collects the spans of one job."""
+
+    def __init__(self, job_id: str):
+        """
+        Initialize the tracer.
+
+        Args:
+            job_id: Job the spans belong to
+        """
+        self.job_id = job_id
+        self.pid = os.getpid()
+        self.spans: List[Span] = []
+        self._tracks: Dict[int, int] = {}
+        self._track_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._ids = 0
+
+    def _track(self) -> int:
+        """Track of the running asyncio task, or of the thread outside one."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task is not None else threading.get_ident()
+        with self._lock:
+            if key not in self._tracks:
+                self._tracks[key] = len(self._tracks) + 1
+                self._track_names[self._tracks[key]] = (
+                    task.get_name() if task is not None else threading.current_thread().name
+                )
+            return self._tracks[key]
+
+    def start(self, name: str, category: str, parent: Optional[Span], **args: Any) -> Span:
+        with self._lock:
+            self._ids += 1
+            span_id = f"{self.pid}-{self._ids}"
+        return Span(
+            name=name,
+            category=category,
+            start_us=time.time() * 1e6,
+            track=self._track(),
+            parent=parent.span_id if parent else None,
+            args=args,
+            span_id=span_id,
+        )
+
+    def finish(self, span: Span) -> None:
+        span.duration_us = time.time() * 1e6 - span.start_us
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Send spans opened in this context, and tasks started from it, to this tracer."""
+        tracer_token = current_tracer.set(self)
+        span_token = _current_span.set(None)
+        try:
+            yield self
+        finally:
+            _current_span.reset(span_token)
+            current_tracer.reset(tracer_token)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        The trace in Chrome trace event format.
+
+        Returns:
+            JSON-able trace with one complete ("X") event per span and a
+            named track per asyncio task
+        """
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": f"job {self.job_id}"}},
+        ]
+        for track, name in sorted(self._track_names.items()):
+            events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": track, "args": {"name": name}})
+
+        for span in sorted(self.spans, key=lambda s: s.start_us):
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": span.start_us,
+                "dur": span.duration_us,
+                "pid": self.pid,
+                "tid": span.track,
+                "args": {"span_id": span.span_id, "parent": span.parent, **span.args},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"job_id": self.job_id}}
+
+    def export(self, path: Path) -> Path:
+        """Write the Chrome trace JSON to a file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.to_chrome_trace(), default=str))
+        os.replace(tmp_path, path)
+        return path
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Where the job's time went.
+
+        Returns:
+            Wall-clock seconds per stage, plus span count and busy seconds per
+            category (concurrent spans each count, so categories can exceed
+            the wall-clock time)
+        """
+        stages: Dict[str, float] = defaultdict(float)
+        categories: Dict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "seconds": 0.0})
+        for span in self.spans:
+            if span.category == STAGE:
+                stages[span.name] += span.seconds
+            categories[span.category]["count"] += 1
+            categories[span.category]["seconds"] += span.seconds
+
+        if self.spans:
+            start = min(span.start_us for span in self.spans)
+            end = max(span.start_us + span.duration_us for span in self.spans)
+            total = (end - start) / 1e6
+        else:
+            total = 0.0
+
+        return {
+            "total_seconds": round(total, 3),
+            "stages": {name: round(seconds, 3) for name, seconds in stages.items()},
+            "categories": {
+                name: {"count": int(values["count"]), "seconds": round(values["seconds"], 3)}
+                for name, values in sorted(categories.items())
+            },
+        }
+
+
+@contextmanager
+def span(name: str, category: str = "function", **args: Any) -> Iterator[Optional[Span]]:
+    """
+    Trace a block as a span of the current job.
+
+    Args:
+        name: Span name, e.g. ``"ffmpeg.mux"``
+        category: Kind of work: ``stage``, ``agent``, ``llm``, ``subprocess``,
+            ``tts``, ``io``, ``cache`` ...
+        **args: Details shown with the span; the yielded span's ``args`` can
+            be updated inside the block, e.g. with a cache hit
+
+    Yields:
+        The span, or None when no job is being traced
+    """
+    tracer = current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+
+    current = tracer.start(name, category, _current_span.get(), **args)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.args["error"] = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer.finish(current)
+
+
+def traced(name: Optional[str] = None, category: str = "function") -> Callable:
+    """Decorator tracing every call of a function or coroutine function as a span."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, category):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def trace_path(job_id: str) -> Path:
+    """Where a job's Chrome trace is exported."""
+    from config.backend.config import get_config
+    return Path(get_config().data_path) / "traces" / f"{job_id}.json"
@@ -5,25 +5,49 @@ Defines the main workflow graph for coordinating agents in the video generation
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Union
 from datetime import datetime, timedelta
 
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 
-from config.backend.models import RASOMasterState, WorkflowStatus, AgentType, ErrorSeverity
+from config.backend.models import RASOMasterState, WorkflowStatus, AgentType, ErrorSeverity, trusted_refs
 from config.backend.config import get_config
 from agents.base import agent_registry, BaseAgent, AgentExecutionError
+from core.blob_store import get_blob_store
+from core.checkpoint import FINAL_NODE, INPUT_NODE, CheckpointStore, finish_checkpoints, get_checkpoint_store, run_checkpointed
+from core.deadline import get_deadline_planner
+from core.tracing import STAGE, span
 
 
 class WorkflowOrchestrator:
     """Orchestrates the RASO video generation workflow using LangGraph."""
     
-    def __init__(self):
-        """Initialize the workflow orchestrator."""
+    # Nodes of the parallel animation and narration branches, with the state
+    # fields each owns. Branch nodes return only these plus MERGED_FIELDS, which
+    # RASOMasterState merges with reducers, so concurrent updates never collide.
+    BRANCH_OUTPUTS = {
+        "animate_manim": ("animations",),
+        "animate_motion": ("animations",),
+        "animate_remotion": ("animations",),
+        "animate_parallel": ("animations",),
+        "generate_voice": ("audio",),
+    }
+    MERGED_FIELDS = ("current_agent", "progress", "errors", "degradations", "updated_at")
+    
+    def __init__(self, checkpoint_store: Optional[CheckpointStore] = None):
+        """
+        Initialize the workflow orchestrator.
+        
+        Args:
+            checkpoint_store: Durable per-node state store (defaults to the configured SQLite store)
+        """
         self.config = get_config()
         self.graph = self._build_graph()
         self.checkpointer = MemorySaver()
+        self.checkpoint_store = checkpoint_store or get_checkpoint_store()
+        self.deadline_planner = get_deadline_planner()
+        self.blob_store = get_blob_store()
     
     def _build_graph(self) -> StateGraph:
         """
@@ -36,17 +60,19 @@ class WorkflowOrchestrator:
         workflow = StateGraph(RASOMasterState)
         
         # Add nodes for each agent
-        workflow.add_node("ingest", self._create_agent_node(AgentType.INGEST))
-        workflow.add_node("understand", self._create_agent_node(AgentType.UNDERSTANDING))
-        workflow.add_node("script", self._create_agent_node(AgentType.SCRIPT))
-        workflow.add_node("visual_plan", self._create_agent_node(AgentType.VISUAL_PLANNING))
-        workflow.add_node("animate_manim", self._create_agent_node(AgentType.MANIM))
-        workflow.add_node("animate_motion", self._create_agent_node(AgentType.MOTION_CANVAS))
-        workflow.add_node("animate_remotion", self._create_agent_node(AgentType.REMOTION))
-        workflow.add_node("generate_voice", self._create_agent_node(AgentType.VOICE))
-        workflow.add_node("compose_video", self._create_agent_node(AgentType.TRANSITION))
-        workflow.add_node("generate_metadata", self._create_agent_node(AgentType.METADATA))
-        workflow.add_node("upload_youtube", self._create_agent_node(AgentType.YOUTUBE))
+        workflow.add_node("ingest", self._create_agent_node(AgentType.INGEST, "ingest"))
+        workflow.add_node("understand", self._create_agent_node(AgentType.UNDERSTANDING, "understand"))
+        workflow.add_node("script", self._create_agent_node(AgentType.SCRIPT, "script"))
+        workflow.add_node("visual_plan", self._create_agent_node(AgentType.VISUAL_PLANNING, "visual_plan"))
+        workflow.add_node("animate_manim", self._create_agent_node(AgentType.MANIM, "animate_manim"))
+        workflow.add_node("animate_motion", self._create_agent_node(AgentType.MOTION_CANVAS, "animate_motion"))
+        workflow.add_node("animate_remotion", self._create_agent_node(AgentType.REMOTION, "animate_remotion"))
+        workflow.add_node("animate_parallel", self._create_agent_node(AgentType.RENDERING, "animate_parallel"))
+        workflow.add_node("animation_done", self._animation_done)
+        workflow.add_node("generate_voice", self._create_agent_node(AgentType.VOICE, "generate_voice"))
+        workflow.add_node("compose_video", self._create_agent_node(AgentType.TRANSITION, "compose_video"))
+        workflow.add_node("generate_metadata", self._create_agent_node(AgentType.METADATA, "generate_metadata"))
+        workflow.add_node("upload_youtube", self._create_agent_node(AgentType.YOUTUBE, "upload_youtube"))
         
         # Define the workflow edges
         workflow.set_entry_point("ingest")
@@ -56,6 +82,10 @@ class WorkflowOrchestrator:
         workflow.add_edge("understand", "script")
         workflow.add_edge("script", "visual_plan")
         
+        # After visual planning the graph forks: narration only needs the
+        # script, so TTS runs alongside rendering instead of after it
+        workflow.add_edge("visual_plan", "generate_voice")
+        
         # Conditional routing for animation
         workflow.add_conditional_edges(
             "visual_plan",
@@ -64,7 +94,8 @@ class WorkflowOrchestrator:
                 "manim": "animate_manim",
                 "motion_canvas": "animate_motion", 
                 "remotion": "animate_remotion",
-                "parallel": "animate_manim",  # Start with Manim for parallel
+                "parallel": "animate_parallel",  # All frameworks render concurrently
+                "done": "animation_done",
             }
         )
         
@@ -75,7 +106,7 @@ class WorkflowOrchestrator:
             {
                 "continue_motion": "animate_motion",
                 "continue_remotion": "animate_remotion",
-                "voice": "generate_voice",
+                "done": "animation_done",
             }
         )
         
@@ -84,7 +115,7 @@ class WorkflowOrchestrator:
             self._check_animation_complete,
             {
                 "continue_remotion": "animate_remotion",
-                "voice": "generate_voice",
+                "done": "animation_done",
             }
         )
         
@@ -92,12 +123,14 @@ class WorkflowOrchestrator:
             "animate_remotion",
             self._check_animation_complete,
             {
-                "voice": "generate_voice",
+                "done": "animation_done",
             }
         )
         
-        # Continue with audio and video processing
-        workflow.add_edge("generate_voice", "compose_video")
+        workflow.add_edge("animate_parallel", "animation_done")
+        
+        # Join: composition waits for both the animation and narration branches
+        workflow.add_edge(["animation_done", "generate_voice"], "compose_video")
         workflow.add_edge("compose_video", "generate_metadata")
         
         # Conditional YouTube upload
@@ -114,17 +147,57 @@ class WorkflowOrchestrator:
         
         return workflow
     
-    def _create_agent_node(self, agent_type: AgentType) -> Callable:
+    def _create_agent_node(self, agent_type: AgentType, node_name: str) -> Callable:
         """
         Create a node function for an agent.
         
+        The node's output state is checkpointed durably. If the job already
+        has a checkpoint for this node (it is being resumed), the stored
+        state is returned and the agent is not run again.
+        
         Args:
             agent_type: Type of agent
+            node_name: Name of the node in the graph
             
         Returns:
             Node function for the graph
         """
-        async def agent_node(state: RASOMasterState) -> RASOMasterState:
+        async def agent_node(state: RASOMasterState) -> Union[RASOMasterState, Dict[str, Any]]:
+            branch_fields = self.BRANCH_OUTPUTS.get(node_name)
+            if branch_fields:
+                # Agents update progress and errors in place; keep the other branch's copy untouched
+                state = state.copy(update={
+                    "progress": state.progress.copy(deep=True),
+                    "errors": list(state.errors),
+                    "options": state.options.copy(),
+                })
+            
+            # Step quality down if the remaining stages would overrun the job's deadline
+            self.deadline_planner.before_stage(state, node_name)
+            stage_started = datetime.now()
+            
+            with span(node_name, STAGE) as stage_span:
+                result_state, resumed = await run_checkpointed(
+                    self.checkpoint_store,
+                    state.job_id,
+                    node_name,
+                    state,
+                    execute_agent,
+                    is_complete=lambda result: not result.has_critical_errors(),
+                )
+                if stage_span:
+                    stage_span.args["resumed"] = resumed
+            
+            if not resumed:
+                self.deadline_planner.after_stage(
+                    result_state, node_name, (datetime.now() - stage_started).total_seconds()
+                )
+            
+            if branch_fields:
+                return {field: getattr(result_state, field) for field in branch_fields + self.MERGED_FIELDS}
+            return result_state
+        
+        async def execute_agent(state: RASOMasterState) -> RASOMasterState:
             """Execute agent with retry logic and error handling."""
             agent = agent_registry.get_agent(agent_type)
             
@@ -137,6 +210,7 @@ class WorkflowOrchestrator:
                 AgentType.MANIM: WorkflowStatus.ANIMATING,
                 AgentType.MOTION_CANVAS: WorkflowStatus.ANIMATING,
                 AgentType.REMOTION: WorkflowStatus.ANIMATING,
+                AgentType.RENDERING: WorkflowStatus.ANIMATING,
                 AgentType.VOICE: WorkflowStatus.AUDIO_PROCESSING,
                 AgentType.TRANSITION: WorkflowStatus.VIDEO_COMPOSING,
                 AgentType.METADATA: WorkflowStatus.METADATA_GENERATING,
@@ -156,7 +230,8 @@ class WorkflowOrchestrator:
                     state.progress.complete_step(new_status)
                     state.progress.update_progress(new_status, 1.0, f"Completed {agent.name}")
                     
-                    return result_state
+                    # Transitions and checkpoints carry references to large payloads
+                    return result_state.compact(self.blob_store)
                     
                 except Exception as error:
                     # Handle retry logic
@@ -183,6 +258,10 @@ class WorkflowOrchestrator:
         
         return agent_node
     
+    async def _animation_done(self, state: RASOMasterState) -> Dict[str, Any]:
+        """Join point of the animation branch, whichever framework route it took."""
+        return {}
+    
     def _route_animation(self, state: RASOMasterState) -> str:
         """
         Route to appropriate animation agents based on visual plan.
@@ -194,7 +273,7 @@ class WorkflowOrchestrator:
             Next node name
         """
         if not state.visual_plan or not state.visual_plan.scenes:
-            return "voice"  # Skip animation if no visual plan
+            return "done"  # Skip animation if no visual plan
         
         # Check which frameworks are needed
         frameworks = set()
@@ -211,7 +290,7 @@ class WorkflowOrchestrator:
             elif framework == "remotion":
                 return "remotion"
         
-        # Multiple frameworks needed - start with parallel processing
+        # Multiple frameworks needed - the rendering coordinator runs them concurrently
         return "parallel"
     
     def _check_animation_complete(self, state: RASOMasterState) -> str:
@@ -225,7 +304,7 @@ class WorkflowOrchestrator:
             Next node name
         """
         if not state.visual_plan or not state.visual_plan.scenes:
-            return "voice"
+            return "done"
         
         # Get required frameworks
         required_frameworks = set()
@@ -247,7 +326,7 @@ class WorkflowOrchestrator:
         elif "remotion" in remaining:
             return "continue_remotion"
         else:
-            return "voice"
+            return "done"
     
     def _should_upload_youtube(self, state: RASOMasterState) -> str:
         """
@@ -268,13 +347,15 @@ class WorkflowOrchestrator:
             return "end"
     
     async def execute_workflow(self, initial_state: RASOMasterState, 
-                             config: Optional[Dict[str, Any]] = None) -> RASOMasterState:
+                             config: Optional[Dict[str, Any]] = None,
+                             mode: Optional[str] = None) -> RASOMasterState:
         """
         Execute the complete workflow.
         
         Args:
             initial_state: Initial workflow state
             config: Optional execution configuration
+            mode: 'barrier' or 'streaming' (defaults to the configured execution mode)
             
         Returns:
             Final workflow state
@@ -290,29 +371,36 @@ class WorkflowOrchestrator:
             if config:
                 exec_config.update(config)
             
-            # Compile the graph with checkpointing
-            compiled_graph = self.graph.compile(checkpointer=self.checkpointer)
+            initial_state = initial_state.compact(self.blob_store)
             
-            # Execute the workflow
-            final_state = None
-            async for state in compiled_graph.astream(initial_state, config=exec_config):
-                final_state = state
-                
-                # Check for timeout
-                if self._is_timeout_exceeded(initial_state):
+            # Keep the job input so the job can be resumed even if no node completed
+            if self.checkpoint_store and await asyncio.to_thread(
+                self.checkpoint_store.load, initial_state.job_id, INPUT_NODE
+            ) is None:
+                await asyncio.to_thread(self.checkpoint_store.save, initial_state.job_id, INPUT_NODE, initial_state)
+            
+            if (mode or self.config.system.execution_mode) == "streaming":
+                from core.streaming_workflow import get_streaming_workflow
+                timeout_at = self._timeout_at(initial_state, datetime.now())
+                try:
+                    final_state = await asyncio.wait_for(
+                        get_streaming_workflow().execute(initial_state, checkpoint_store=self.checkpoint_store),
+                        (timeout_at - datetime.now()).total_seconds(),
+                    )
+                except asyncio.TimeoutError:
                     raise AgentExecutionError(
                         "Workflow execution timeout exceeded",
                         "WORKFLOW_TIMEOUT",
                         ErrorSeverity.CRITICAL
                     )
-                
-                # Check for abort conditions
-                if state.should_abort():
+                if final_state.should_abort():
                     raise AgentExecutionError(
                         "Workflow aborted due to critical errors",
                         "WORKFLOW_ABORTED",
                         ErrorSeverity.CRITICAL
                     )
+            else:
+                final_state = await self._run_graph(initial_state, exec_config)
             
             # Mark as completed if successful
             if final_state and not final_state.has_critical_errors():
@@ -321,8 +409,11 @@ class WorkflowOrchestrator:
                     1.0,
                     "Workflow completed successfully"
                 )
+                
+                # Node checkpoints are only needed to resume; keep just the final state
+                await asyncio.to_thread(finish_checkpoints, self.checkpoint_store, final_state.job_id, final_state)
             
-            return final_state or initial_state
+            return (final_state or initial_state).hydrate(self.blob_store)
             
         except Exception as error:
             # Handle workflow-level errors
@@ -339,21 +430,124 @@ class WorkflowOrchestrator:
                 f"Workflow failed: {str(error)}"
             )
             
-            return initial_state
+            # Callers get payloads, not blob references, whether the job failed or not
+            return initial_state.hydrate(self.blob_store)
+    
+    async def _run_graph(self, initial_state: RASOMasterState, exec_config: Dict[str, Any]) -> Optional[RASOMasterState]:
+        """
+        Run the barrier graph, checking the timeout and abort conditions after every step.
+        
+        Args:
+            initial_state: Compacted initial state
+            exec_config: LangGraph execution configuration
+            
+        Returns:
+            State after the last step, or None if the graph produced none
+        """
+        # Compile the graph with checkpointing
+        compiled_graph = self.graph.compile(checkpointer=self.checkpointer)
+        started_at = datetime.now()
+        
+        final_state = None
+        # "values" mode yields the full state after each step, not {node: update}
+        async for values in compiled_graph.astream(initial_state, config=exec_config, stream_mode="values"):
+            if isinstance(values, RASOMasterState):
+                state = values
+            else:
+                with trusted_refs():
+                    state = RASOMasterState.parse_obj(values)
+            final_state = state
+            
+            # Check for timeout
+            if self._is_timeout_exceeded(initial_state, started_at):
+                raise AgentExecutionError(
+                    "Workflow execution timeout exceeded",
+                    "WORKFLOW_TIMEOUT",
+                    ErrorSeverity.CRITICAL
+                )
+            
+            # Check for abort conditions
+            if state.should_abort():
+                raise AgentExecutionError(
+                    "Workflow aborted due to critical errors",
+                    "WORKFLOW_ABORTED",
+                    ErrorSeverity.CRITICAL
+                )
+        
+        return final_state
     
-    def _is_timeout_exceeded(self, initial_state: RASOMasterState) -> bool:
+    def _is_timeout_exceeded(self, initial_state: RASOMasterState, started_at: datetime) -> bool:
         """
         Check if workflow execution has exceeded timeout.
         
         Args:
             initial_state: Initial workflow state
+            started_at: When this execution (or resumption) started
             
         Returns:
             True if timeout exceeded
         """
-        elapsed = datetime.now() - initial_state.created_at
+        return datetime.now() > self._timeout_at(initial_state, started_at)
+    
+    def _timeout_at(self, initial_state: RASOMasterState, started_at: datetime) -> datetime:
+        """
+        When an execution started at ``started_at`` times out.
+        
+        Jobs with a deadline are not aborted for running late: the deadline
+        planner degrades their quality instead, since a late video is better
+        than none. They still time out ``timeout_minutes`` past the deadline,
+        so a hung job does not run forever.
+        """
         timeout = timedelta(minutes=initial_state.options.timeout_minutes)
-        return elapsed > timeout
+        deadline = initial_state.options.deadline
+        if deadline is None:
+            return started_at + timeout
+        
+        if deadline.tzinfo is not None:
+            deadline = deadline.astimezone().replace(tzinfo=None)
+        return max(started_at, deadline) + timeout
+    
+    async def resume_workflow(self, job_id: str) -> Optional[RASOMasterState]:
+        """
+        Resume a job from its durable checkpoints.
+        
+        The graph is re-entered with the job's original input. Nodes that
+        completed before the crash or restart return their stored state, so
+        execution effectively restarts at the first incomplete node.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            Final workflow state, or None if the job has no checkpoints
+        """
+        if not self.checkpoint_store:
+            return None
+        
+        # Finished before its result was recorded; nothing to re-run
+        final_state = await asyncio.to_thread(self.checkpoint_store.load, job_id, FINAL_NODE)
+        if final_state is not None:
+            return final_state.hydrate(self.blob_store)
+        
+        initial_state = await asyncio.to_thread(self.checkpoint_store.load, job_id, INPUT_NODE)
+        if initial_state is None:
+            return None
+        
+        return await self.execute_workflow(initial_state)
+    
+    def get_resume_point(self, job_id: str) -> List[str]:
+        """
+        Nodes a resumed job will reuse instead of re-running.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            Completed node names in completion order
+        """
+        if not self.checkpoint_store:
+            return []
+        return self.checkpoint_store.completed_nodes(job_id)
     
     async def get_workflow_status(self, job_id: str) -> Optional[RASOMasterState]:
         """
@@ -380,6 +574,12 @@ class WorkflowOrchestrator:
             if state_snapshot and state_snapshot.values:
                 return state_snapshot.values
             
+            # Jobs from a previous process only exist in the durable store
+            if self.checkpoint_store:
+                latest = self.checkpoint_store.latest(job_id)
+                if latest:
+                    return latest[1]
+            
             return None
             
         except Exception:
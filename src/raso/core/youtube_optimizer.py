@@ -219,7 +219,8 @@ class YouTubeOptimizer:
         Optimize content for YouTube with comprehensive settings.
         
         Args:
-            content_metadata: Video content information (title, description, duration, etc.)
+            content_metadata: Video content information (title, description, duration, etc.);
+                ``paper_digest`` holds the paper digest's prompt text, when available
             cinematic_settings: Current cinematic settings
             optimization_settings: YouTube-specific optimization preferences
             
@@ -335,6 +336,7 @@ class YouTubeOptimizer:
         
         content_title = content_metadata.get('title', 'Untitled Video')
         content_description = content_metadata.get('description', '')
+        paper_digest = content_metadata.get('paper_digest') or 'None'
         content_type = optimization_settings.content_type.value
         target_audience = optimization_settings.target_audience
         
@@ -346,6 +348,9 @@ Description: {content_description}
 Content Type: {content_type}
 Target Audience: {target_audience}
 
+Paper Digest:
+{paper_digest}
+
 Please provide a JSON response with:
 {{
     "optimized_title": "<engaging title under 100 characters>",
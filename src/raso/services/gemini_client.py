@@ -4,12 +4,17 @@ Provides integration with Google's Gemini models for script generation, Manim co
 """
 
 import os
+import time
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
+from config.backend.models.paper import PaperDigest
+from config.backend.services.llm_cache import LLMResponseCache, get_llm_cache
+from config.backend.services.stream_parser import parse_scene_stream
+
 logger = logging.getLogger(__name__)
 
 class GeminiClient:
@@ -49,25 +54,195 @@ class GeminiClient:
             HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
         }
         
+        # Persistent prompt/response cache shared with LLMService
+        self.cache = get_llm_cache()
+        
+        # Timing of the most recent streamed script (time_to_first_scene etc.)
+        self.last_stream_metrics: Dict[str, Any] = {}
+        
         logger.info(f"Initialized Gemini client with model: {self.default_model}")
         logger.info(f"API key configured: {self.api_key[:10]}...")
     
-    async def generate_script(self, paper_title: str, paper_content: str, paper_type: str = "title") -> Dict[str, Any]:
+    async def _generate_text(self, model_name: str, prompt: str, use_cache: bool = True) -> Optional[str]:
+        """
+        Generate text with a Gemini model, serving repeated prompts from cache.
+        
+        Args:
+            model_name: Gemini model to use
+            prompt: Full prompt text
+            use_cache: Whether to read and write the response cache
+            
+        Returns:
+            Generated text, or None if the model returned nothing
+        """
+        cache_key = None
+        if use_cache and self.cache:
+            cache_key = LLMResponseCache.make_key("gemini", model_name, prompt, self.generation_config)
+            try:
+                cached = await self.cache.aget(cache_key)
+            except Exception as e:
+                logger.warning(f"Gemini cache lookup failed: {e}")
+                cached = None
+            if cached:
+                logger.info(f"Gemini cache hit for model {model_name}")
+                return cached["content"]
+        
+        model = genai.GenerativeModel(
+            model_name=model_name,
+            generation_config=self.generation_config,
+            safety_settings=self.safety_settings
+        )
+        
+        start_time = time.time()
+        response = await asyncio.to_thread(model.generate_content, prompt)
+        response_time = time.time() - start_time
+        
+        text = response.text
+        if text and cache_key:
+            usage = getattr(response, 'usage_metadata', None)
+            try:
+                await self.cache.aset(
+                    cache_key,
+                    provider="gemini",
+                    model=model_name,
+                    payload={"content": text},
+                    total_tokens=getattr(usage, 'total_token_count', None),
+                    response_time=response_time,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to store Gemini response in cache: {e}")
+        
+        return text
+    
+    async def _stream_text(self, model_name: str, prompt: str, use_cache: bool = True) -> AsyncIterator[str]:
+        """
+        Stream text from a Gemini model chunk by chunk.
+        
+        The SDK's streaming iterator is blocking, so it is drained in a worker
+        thread and handed over through a queue. Complete responses are cached
+        like ``_generate_text``; a cached response is yielded as one chunk.
+        
+        Args:
+            model_name: Gemini model to use
+            prompt: Full prompt text
+            use_cache: Whether to read and write the response cache
+            
+        Yields:
+            Generated text chunks in order
+        """
+        cache_key = None
+        if use_cache and self.cache:
+            cache_key = LLMResponseCache.make_key("gemini", model_name, prompt, self.generation_config)
+            try:
+                cached = await self.cache.aget(cache_key)
+            except Exception as e:
+                logger.warning(f"Gemini cache lookup failed: {e}")
+                cached = None
+            if cached:
+                logger.info(f"Gemini cache hit for model {model_name}")
+                yield cached["content"]
+                return
+        
+        model = genai.GenerativeModel(
+            model_name=model_name,
+            generation_config=self.generation_config,
+            safety_settings=self.safety_settings
+        )
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        
+        def produce():
+            try:
+                for chunk in model.generate_content(prompt, stream=True):
+                    text = getattr(chunk, 'text', '')
+                    if text:
+                        loop.call_soon_threadsafe(queue.put_nowait, text)
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+        
+        start_time = time.time()
+        producer = loop.run_in_executor(None, produce)
+        parts = []
+        
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            parts.append(item)
+            yield item
+        
+        await producer
+        
+        if parts and cache_key:
+            try:
+                await self.cache.aset(
+                    cache_key,
+                    provider="gemini",
+                    model=model_name,
+                    payload={"content": "".join(parts)},
+                    response_time=time.time() - start_time,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to store Gemini response in cache: {e}")
+    
+    async def generate_script_stream(self, paper_title: str, paper_content: str, paper_type: str = "title",
+                                     use_cache: bool = True,
+                                     digest: Optional[PaperDigest] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate a video script, yielding each scene as soon as Gemini completes it.
+        
+        Unlike ``generate_script`` the comprehensive-length check cannot replace
+        scenes that were already emitted; the fallback script is only used when
+        no scene could be streamed at all. If the stream fails after scenes were
+        yielded, the error is re-raised and ``last_stream_metrics["partial"]``
+        is set, since the scenes received so far are an incomplete script.
+        Timing is stored in ``last_stream_metrics``. A ``digest`` of the parsed
+        paper replaces ``paper_content`` in the prompt.
+        """
+        prompt = self._create_script_prompt(paper_title, paper_content, paper_type, digest)
+        metrics: Dict[str, Any] = {}
+        self.last_stream_metrics = metrics
+        scene_count = 0
+        
+        logger.info(f"Streaming comprehensive script for paper: {paper_title}")
+        
+        try:
+            async for scene in parse_scene_stream(self._stream_text(self.script_model, prompt, use_cache), metrics=metrics):
+                if scene_count == 0:
+                    logger.info(f"Gemini first scene streamed after {metrics['time_to_first_scene']:.2f}s")
+                scene_count += 1
+                yield scene
+        except Exception as e:
+            if scene_count:
+                metrics["partial"] = True
+                logger.error(f"Gemini script stream failed after {scene_count} scenes: {e}")
+                raise
+            logger.error(f"Error streaming script with Gemini: {e}")
+        
+        if scene_count == 0:
+            logger.warning("No scenes streamed from Gemini, using comprehensive fallback")
+            for scene in self._create_fallback_script(paper_title, paper_content)["scenes"]:
+                yield scene
+            return
+        
+        logger.info(f"Gemini streamed script: {scene_count} scenes")
+    
+    async def generate_script(self, paper_title: str, paper_content: str, paper_type: str = "title",
+                              use_cache: bool = True, digest: Optional[PaperDigest] = None) -> Dict[str, Any]:
         """Generate video script from research paper using Gemini - ALWAYS COMPREHENSIVE FORMAT."""
         try:
-            model = genai.GenerativeModel(
-                model_name=self.script_model,
-                generation_config=self.generation_config,
-                safety_settings=self.safety_settings
-            )
-            
-            prompt = self._create_script_prompt(paper_title, paper_content, paper_type)
+            prompt = self._create_script_prompt(paper_title, paper_content, paper_type, digest)
             
             logger.info(f"Generating comprehensive script for paper: {paper_title}")
-            response = await asyncio.to_thread(model.generate_content, prompt)
+            response_text = await self._generate_text(self.script_model, prompt, use_cache)
             
-            if response.text:
-                script_data = self._parse_script_response(response.text)
+            if response_text:
+                script_data = self._parse_script_response(response_text)
                 
                 # FORCE COMPREHENSIVE FORMAT: Check if script is too short
                 scenes = script_data.get('scenes', [])
@@ -90,22 +265,17 @@ class GeminiClient:
             logger.error(f"Error generating script with Gemini: {e}")
             return self._create_fallback_script(paper_title, paper_content)
     
-    async def generate_manim_code(self, scene_title: str, scene_description: str, scene_duration: float) -> str:
+    async def generate_manim_code(self, scene_title: str, scene_description: str, scene_duration: float,
+                                  use_cache: bool = True, context_passages: Optional[str] = None) -> str:
         """Generate Manim animation code using Gemini."""
         try:
-            model = genai.GenerativeModel(
-                model_name=self.manim_model,
-                generation_config=self.generation_config,
-                safety_settings=self.safety_settings
-            )
-            
-            prompt = self._create_manim_prompt(scene_title, scene_description, scene_duration)
+            prompt = self._create_manim_prompt(scene_title, scene_description, scene_duration, context_passages)
             
             logger.info(f"Generating Manim code for scene: {scene_title}")
-            response = await asyncio.to_thread(model.generate_content, prompt)
+            response_text = await self._generate_text(self.manim_model, prompt, use_cache)
             
-            if response.text:
-                manim_code = self._extract_manim_code(response.text)
+            if response_text:
+                manim_code = self._extract_manim_code(response_text)
                 logger.info(f"Generated Manim code ({len(manim_code)} characters)")
                 return manim_code
             else:
@@ -116,22 +286,17 @@ class GeminiClient:
             logger.error(f"Error generating Manim code with Gemini: {e}")
             raise Exception("Gemini AI service failed - no fallback available")
     
-    async def analyze_paper_content(self, paper_input: str, paper_type: str) -> Dict[str, Any]:
+    async def analyze_paper_content(self, paper_input: str, paper_type: str,
+                                    use_cache: bool = True) -> Dict[str, Any]:
         """Analyze research paper content using Gemini."""
         try:
-            model = genai.GenerativeModel(
-                model_name=self.analysis_model,
-                generation_config=self.generation_config,
-                safety_settings=self.safety_settings
-            )
-            
             prompt = self._create_analysis_prompt(paper_input, paper_type)
             
             logger.info(f"Analyzing paper content: {paper_input[:100]}...")
-            response = await asyncio.to_thread(model.generate_content, prompt)
+            response_text = await self._generate_text(self.analysis_model, prompt, use_cache)
             
-            if response.text:
-                analysis = self._parse_analysis_response(response.text)
+            if response_text:
+                analysis = self._parse_analysis_response(response_text)
                 logger.info("Paper analysis completed successfully")
                 return analysis
             else:
@@ -142,8 +307,11 @@ class GeminiClient:
             logger.error(f"Error analyzing paper with Gemini: {e}")
             return self._create_fallback_analysis(paper_input)
     
-    def _create_script_prompt(self, paper_title: str, paper_content: str, paper_type: str) -> str:
-        """Create prompt for script generation."""
+    def _create_script_prompt(self, paper_title: str, paper_content: str, paper_type: str,
+                              digest: Optional[PaperDigest] = None) -> str:
+        """Create prompt for script generation, from the paper digest when one is given."""
+        if digest:
+            paper_content = f"\n{digest.to_prompt_text()}"
         return f"""
 You are a SENIOR AI ENGINEER and EXPERT EDUCATOR creating an in-depth educational video for YouTube/classroom teaching.
 
@@ -319,15 +487,18 @@ Format as JSON:
 Make it feel like a MASTERCLASS from a world-renowned educator who can explain the most complex ideas to complete beginners.
 """
     
-    def _create_manim_prompt(self, scene_title: str, scene_description: str, scene_duration: float) -> str:
-        """Create prompt for Manim code generation."""
+    def _create_manim_prompt(self, scene_title: str, scene_description: str, scene_duration: float,
+                             context_passages: Optional[str] = None) -> str:
+        """Create prompt for Manim code generation, optionally grounded in retrieved paper passages."""
+        passages_text = f"\nRelevant Paper Passages:\n{context_passages}\n" if context_passages else ""
+        
         return f"""
 You are an expert Manim animator specializing in educational content for complete beginners. Generate Python code using Manim to create a comprehensive educational animation that builds understanding from scratch.
 
 Scene: {scene_title}
 Description: {scene_description}
 Duration: {scene_duration} seconds
-
+{passages_text}
 EDUCATIONAL VISUAL REQUIREMENTS:
 - ASSUME ZERO BACKGROUND KNOWLEDGE - make everything crystal clear
 - Use PROGRESSIVE DIAGRAMS that build step-by-step rather than appearing all at once
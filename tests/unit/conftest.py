@@ -0,0 +1,62 @@
+"""
+Shared fixtures for the unit tests.
+
+The configuration, caches, checkpoints and learned timing models default to
+``./data``, ``./temp`` and ``./logs``. Tests point them at temporary
+directories instead, so running pytest never writes into the repository.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Set before any test module imports config.backend.config, which creates these
+# directories and opens the import-time LLM cache and service log under them
+_SESSION_DIR = Path(tempfile.mkdtemp(prefix="raso-tests-"))
+for _field in ("data_path", "temp_path", "log_path"):
+    os.environ.setdefault(f"RASO_{_field.upper()}", str(_SESSION_DIR / _field))
+
+# Lazily created singletons that keep files under data_path: (module, attribute)
+SINGLETONS = (
+    ("core.blob_store", "_blob_store"),
+    ("core.checkpoint", "_checkpoint_store"),
+    ("core.deadline", "_deadline_planner"),
+    ("core.regeneration", "_regeneration_service"),
+    ("agents.render_scheduler", "_render_cost_model"),
+    ("agents.title_index", "_title_index"),
+    ("services.gemini_client", "_gemini_client"),
+    ("config.backend.services.llm_cache", "_llm_cache"),
+    ("config.backend.services.paper_digest", "_paper_condenser"),
+    ("config.backend.services.job_queue", "_job_queue"),
+)
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_SESSION_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_path(tmp_path_factory, monkeypatch):
+    """Give each test its own data directory and fresh singletons stored under it."""
+    # Separate from tmp_path, which tests inspect
+    data_path = tmp_path_factory.mktemp("data")
+    config_module = sys.modules.get("config.backend.config")
+    if config_module is not None:
+        monkeypatch.setattr(config_module.get_config(), "data_path", data_path)
+
+    for module_name, attribute in SINGLETONS:
+        module = sys.modules.get(module_name)
+        if module is not None and hasattr(module, attribute):
+            monkeypatch.setattr(module, attribute, None)
+
+    # The LLM service is created at import time, together with its response cache
+    llm_module = sys.modules.get("config.backend.services.llm")
+    if llm_module is not None and llm_module.llm_service.cache is not None:
+        from config.backend.services.llm_cache import LLMResponseCache
+        monkeypatch.setattr(llm_module.llm_service, "cache", LLMResponseCache(data_path / "llm_cache.sqlite3"))
+
+    yield data_path
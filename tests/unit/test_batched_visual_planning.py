@@ -0,0 +1,145 @@
+"""
+Unit tests for batched visual planning with schema validation and repair.
+"""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models import AgentType
+from config.backend.models.paper import PaperContent, Section
+from config.backend.models.script import Scene
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+import agents.visual_planning as visual_planning_module
+from agents.passage_index import PassageIndex, HashedTfidfEmbedder
+from agents.visual_planning import VisualPlanningAgent
+
+
+def make_scene(scene_id: str, title: str, narration: str) -> Scene:
+    return Scene(id=scene_id, title=title, narration=narration, duration=10.0, visual_type="remotion")
+
+
+def assignment(scene_id: str, framework: str, content_type: str) -> dict:
+    return {
+        "scene_id": scene_id,
+        "content_type": content_type,
+        "framework": framework,
+        "complexity": "medium",
+        "visual_elements": ["diagram"],
+        "transition_in": "fade",
+        "transition_out": "slide",
+    }
+
+
+@pytest.fixture
+def script():
+    return SimpleNamespace(scenes=[
+        make_scene("scene1", "Introduction", "Welcome to a tour of how attention replaced recurrence in sequence models."),
+        make_scene("scene2", "Scaled Attention", "The attention equation divides query key products by the square root of the dimension."),
+        make_scene("scene3", "Results", "The model reached state of the art translation quality with far less training time."),
+    ])
+
+
+@pytest.fixture
+def understanding():
+    return SimpleNamespace(key_equations=[], visualizable_concepts=[])
+
+
+@pytest.fixture
+def agent():
+    return VisualPlanningAgent(AgentType.VISUAL_PLANNING)
+
+
+def scripted_generate(responses, prompts):
+    """Fake LLMService.generate returning canned responses in order."""
+    async def generate(prompt, **kwargs):
+        prompts.append(prompt)
+        return SimpleNamespace(content=responses[len(prompts) - 1])
+    return generate
+
+
+class TestBatchedPlanning:
+    """Test one-request planning, targeted repair and rule fallback."""
+
+    @pytest.mark.asyncio
+    async def test_valid_batch_uses_single_call(self, agent, script, understanding, monkeypatch):
+        prompts = []
+        response = json.dumps({"scene_assignments": [
+            assignment("scene1", "remotion", "introduction"),
+            assignment("scene2", "manim", "mathematical"),
+            assignment("scene3", "motion-canvas", "conceptual"),
+        ]})
+        monkeypatch.setattr(visual_planning_module.llm_service, "generate", scripted_generate([response], prompts))
+
+        assignments = await agent._analyze_scenes(script, understanding, "Attention Is All You Need")
+
+        assert len(prompts) == 1
+        assert [a["framework"] for a in assignments] == ["remotion", "manim", "motion-canvas"]
+        assert agent.last_metrics == {"scenes": 3, "batched": 3, "repaired": 0, "fallback": 0}
+
+    @pytest.mark.asyncio
+    async def test_only_invalid_entries_are_repaired(self, agent, script, understanding, monkeypatch):
+        prompts = []
+        first = "Here is the plan: " + json.dumps({"scene_assignments": [
+            assignment("scene1", "remotion", "introduction"),
+            assignment("scene2", "blender", "mathematical"),
+        ]})
+        repair = json.dumps({"scene_assignments": [assignment("scene2", "manim", "mathematical")]})
+        monkeypatch.setattr(visual_planning_module.llm_service, "generate", scripted_generate([first, repair], prompts))
+
+        assignments = await agent._analyze_scenes(script, understanding, "Attention Is All You Need")
+
+        assert len(prompts) == 2
+        assert "Scene scene2" in prompts[1] and "Scene scene3" in prompts[1]
+        assert "Scene scene1" not in prompts[1]
+        assert [a["scene_id"] for a in assignments] == ["scene1", "scene2", "scene3"]
+        assert assignments[1]["framework"] == "manim"
+        assert agent.last_metrics == {"scenes": 3, "batched": 1, "repaired": 1, "fallback": 1}
+
+    @pytest.mark.asyncio
+    async def test_llm_failure_falls_back_to_rules(self, agent, script, understanding, monkeypatch):
+        async def failing_generate(prompt, **kwargs):
+            raise RuntimeError("no providers available")
+
+        monkeypatch.setattr(visual_planning_module.llm_service, "generate", failing_generate)
+
+        assignments = await agent._analyze_scenes(script, understanding)
+
+        assert [a["framework"] for a in assignments] == ["remotion", "manim", "motion-canvas"]
+        assert agent.last_metrics["fallback"] == 3
+
+    @pytest.mark.asyncio
+    async def test_retrieved_passages_reach_the_planning_prompt(self, agent, script, understanding, monkeypatch):
+        paper = PaperContent(
+            title="Attention Is All You Need",
+            authors=["Ashish Vaswani"],
+            abstract="We propose the Transformer, a model based solely on attention mechanisms.",
+            sections=[
+                Section(id="s1", title="Scaled Dot-Product Attention", level=1,
+                        content="We divide the dot products of the query with all keys by the square root of the key dimension."),
+                Section(id="s2", title="Training", level=1,
+                        content="We trained on the WMT 2014 English-German dataset of about 4.5 million sentence pairs."),
+            ],
+        )
+        index = PassageIndex.build(paper, HashedTfidfEmbedder(dim=256))
+        monkeypatch.setattr(visual_planning_module, "get_passage_index", lambda paper_content: index)
+        prompts = []
+        monkeypatch.setattr(visual_planning_module.llm_service, "generate", scripted_generate(["{}", "{}"], prompts))
+
+        passages = await agent._scene_passages(paper, script.scenes)
+        await agent._analyze_scenes(script, understanding, paper.title, passages)
+
+        assert "[Scaled Dot-Product Attention]" in passages["scene2"]
+        assert "Paper passages:\n" + passages["scene2"] in prompts[0]
+
+    @pytest.mark.asyncio
+    async def test_passages_are_skipped_without_parsed_paper(self, agent, script):
+        assert await agent._scene_passages(None, script.scenes) == {}
@@ -0,0 +1,103 @@
+"""
+Unit tests for bulk arXiv ingestion.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models import AgentType
+from config.backend.models.paper import PaperContent, Section
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+import agents.ingest as ingest_module
+from agents.ingest import IngestAgent, normalize_arxiv_ref
+from agents.title_index import TitleIndex
+
+
+def fake_parse(pdf_data: bytes) -> PaperContent:
+    """Stands in for PDF parsing in the process pool (module level so it pickles)."""
+    return PaperContent(
+        title=pdf_data.decode(),
+        authors=["A. Author"],
+        abstract="An abstract that is long enough to pass the paper content validation rules.",
+        sections=[Section(id="intro", title="Introduction", content="Introduction text of the paper.", level=1)],
+    )
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_module, "_parse_pdf_in_worker", fake_parse)
+    agent = IngestAgent(AgentType.INGEST)
+    agent._title_index = TitleIndex(index_path=tmp_path / "title_index.json")
+
+    async def metadata(arxiv_ids):
+        return {arxiv_id: {"title": f"Paper {arxiv_id}"} for arxiv_id in arxiv_ids}
+
+    agent._get_arxiv_metadata_batch = metadata
+    return agent
+
+
+class TestArxivRefs:
+    """Test arXiv reference validation."""
+
+    def test_urls_and_bare_ids_are_normalized(self):
+        assert normalize_arxiv_ref("https://arxiv.org/abs/1706.03762v5") == "1706.03762v5"
+        assert normalize_arxiv_ref("https://arxiv.org/pdf/2301.12345.pdf") == "2301.12345"
+        assert normalize_arxiv_ref(" 1706.03762 ") == "1706.03762"
+        assert normalize_arxiv_ref("hep-th/9901001") == "hep-th/9901001"
+
+    def test_invalid_refs_are_rejected(self):
+        for ref in ["", "attention is all you need", "../../etc/passwd", "1706.037", "https://arxiv.org/list/cs"]:
+            assert normalize_arxiv_ref(ref) is None
+
+
+class TestIngestBulk:
+    """Test streaming, failure isolation and early stop of bulk ingestion."""
+
+    def test_streams_papers_and_records_failures(self, agent):
+        async def download(url):
+            if "2301.00002" in url:
+                raise ConnectionError("download failed")
+            return url.rsplit("/", 1)[-1][:-4].encode()
+
+        agent._download_pdf = download
+
+        async def ingest():
+            return [paper async for paper in agent.ingest_bulk(
+                ["1706.03762", "https://arxiv.org/abs/2301.00002", "not an id", "1706.03762"],
+                max_parse_workers=1,
+            )]
+
+        papers = asyncio.run(ingest())
+
+        assert [paper.title for paper in papers] == ["Paper 1706.03762"]
+        assert set(agent.bulk_failures) == {"2301.00002", "not an id"}
+        assert agent.title_index.best_match("Paper 1706.03762")
+
+    def test_early_stop_does_not_wait_for_pending_papers(self, agent):
+        async def download(url):
+            if "2301.00002" in url:
+                await asyncio.sleep(30)
+            return b"first"
+
+        agent._download_pdf = download
+
+        async def first_paper():
+            papers = agent.ingest_bulk(["1706.03762", "2301.00002"], max_parse_workers=1)
+            paper = await papers.__anext__()
+            await papers.aclose()
+            return paper
+
+        started = time.monotonic()
+        paper = asyncio.run(first_paper())
+
+        assert paper.arxiv_id == "1706.03762"
+        assert time.monotonic() - started < 10
@@ -0,0 +1,280 @@
+"""
+Unit tests for durable checkpoints and resume-from-last-completed-node.
+
+Includes a crash-injection test: a pipeline with realistic relative stage
+costs crashes in ``compose_video``, the process "restarts" with a fresh store
+on the same database, and the resumed run must re-execute only the
+incomplete nodes.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import sys
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models import BlobRef, RASOMasterState, WorkflowStatus
+from config.backend.models.paper import PaperInput, PaperInputType
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+import core.workflow as workflow_module
+from core.blob_store import BlobStore
+from core.checkpoint import FINAL_NODE, SQLiteCheckpointStore, finish_checkpoints, run_checkpointed
+from core.workflow import WorkflowOrchestrator
+
+
+class FakeState:
+    """Minimal stand-in for RASOMasterState's serialization interface."""
+
+    def __init__(self, job_id, artifacts=None):
+        self.job_id = job_id
+        self.artifacts = artifacts or {}
+
+    def json(self):
+        return json.dumps({"job_id": self.job_id, "artifacts": self.artifacts})
+
+    @classmethod
+    def parse_obj(cls, data):
+        return cls(data["job_id"], data["artifacts"])
+
+
+# Relative cost of each stage in seconds of work
+PIPELINE = [
+    ("ingest", 20),
+    ("understand", 60),
+    ("script", 45),
+    ("visual_plan", 30),
+    ("animate_parallel", 600),
+    ("generate_voice", 120),
+    ("compose_video", 90),
+    ("generate_metadata", 10),
+]
+
+
+class CrashInjected(Exception):
+    pass
+
+
+async def run_pipeline(store, state, crash_at=None, executed=None):
+    """Run the pipeline through the checkpoint wrapper, optionally crashing at a node."""
+    for node, cost in PIPELINE:
+        async def execute(current, node=node, cost=cost):
+            if node == crash_at:
+                raise CrashInjected(node)
+            executed.append((node, cost))
+            return FakeState(current.job_id, {**current.artifacts, node: "x" * 100_000})
+
+        state, _ = await run_checkpointed(store, state.job_id, node, state, execute)
+    return state
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "checkpoints.sqlite3"
+
+
+class TestCrashResume:
+    """Test that a crashed job resumes at the first incomplete node."""
+
+    @pytest.mark.asyncio
+    async def test_resume_after_crash_reuses_completed_work(self, db_path):
+        first_run = []
+        store = SQLiteCheckpointStore(db_path, FakeState, inline_limit=1024)
+
+        with pytest.raises(CrashInjected):
+            await run_pipeline(store, FakeState("job-1"), crash_at="compose_video", executed=first_run)
+        store.close()
+
+        # Simulated restart: a new store on the same database
+        resumed_run = []
+        store = SQLiteCheckpointStore(db_path, FakeState, inline_limit=1024)
+        final = await run_pipeline(store, FakeState("job-1"), executed=resumed_run)
+
+        total_work = sum(cost for _, cost in PIPELINE)
+        redone_work = sum(cost for _, cost in resumed_run)
+        work_saved = 1 - redone_work / total_work
+
+        assert [node for node, _ in resumed_run] == ["compose_video", "generate_metadata"]
+        assert set(final.artifacts) == {node for node, _ in PIPELINE}
+        assert work_saved > 0.85
+        assert store.completed_nodes("job-1")[-1] == "generate_metadata"
+
+    @pytest.mark.asyncio
+    async def test_failed_outputs_are_not_checkpointed(self, db_path):
+        store = SQLiteCheckpointStore(db_path, FakeState)
+
+        async def execute(state):
+            return FakeState(state.job_id, {"error": "critical"})
+
+        await run_checkpointed(
+            store, "job-2", "ingest", FakeState("job-2"), execute,
+            is_complete=lambda result: "error" not in result.artifacts,
+        )
+
+        assert store.load("job-2", "ingest") is None
+
+
+class FakeAgent:
+    """Workflow agent that records its runs and can crash on demand."""
+
+    def __init__(self, agent_type, runs, crash):
+        self.agent_type = agent_type
+        self.name = agent_type.value
+        self.runs = runs
+        self.crash = crash
+
+    async def safe_execute(self, state):
+        if self.agent_type.value in self.crash:
+            raise CrashInjected(self.agent_type.value)
+        self.runs.append(self.agent_type.value)
+        state.current_agent = self.agent_type
+        return state
+
+    def should_retry(self, error, attempt):
+        return False
+
+    def handle_error(self, error, state):
+        return state
+
+
+class FakeAgentRegistry:
+    def __init__(self):
+        self.runs = []
+        self.crash = set()
+
+    def get_agent(self, agent_type):
+        return FakeAgent(agent_type, self.runs, self.crash)
+
+
+class TestWorkflowResume:
+    """Test crash and resume through the orchestrator's graph."""
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        registry = FakeAgentRegistry()
+        monkeypatch.setattr(workflow_module, "agent_registry", registry)
+        return registry
+
+    def test_resumed_job_reruns_only_incomplete_nodes(self, db_path, registry):
+        store = SQLiteCheckpointStore(db_path, RASOMasterState)
+        orchestrator = WorkflowOrchestrator(checkpoint_store=store)
+        state = RASOMasterState(
+            paper_input=PaperInput(type=PaperInputType.TITLE, content="Attention Is All You Need"),
+        )
+
+        registry.crash.add("transition")
+        failed = asyncio.run(orchestrator.execute_workflow(state, mode="barrier"))
+
+        assert failed.progress.current_step == WorkflowStatus.FAILED
+        assert "script" in orchestrator.get_resume_point(state.job_id)
+
+        registry.runs.clear()
+        registry.crash.clear()
+        final = asyncio.run(orchestrator.resume_workflow(state.job_id))
+
+        assert final.progress.current_step == WorkflowStatus.COMPLETED
+        assert registry.runs == ["transition", "metadata"]
+
+        # A finished job keeps only its final state
+        nodes = store._conn.execute("SELECT node FROM checkpoints WHERE job_id = ?", (state.job_id,)).fetchall()
+        assert nodes == [(FINAL_NODE,)]
+        assert store.latest(state.job_id)[0] == FINAL_NODE
+
+    def test_failed_and_resumed_jobs_return_payloads(self, db_path, tmp_path, registry):
+        blob_store = BlobStore(tmp_path / "blobs")
+        store = SQLiteCheckpointStore(db_path, RASOMasterState, blob_store=blob_store)
+        orchestrator = WorkflowOrchestrator(checkpoint_store=store)
+        orchestrator.blob_store = blob_store
+        pdf = base64.b64encode(b"%PDF" * 2000).decode()
+        state = RASOMasterState(paper_input=PaperInput(type=PaperInputType.PDF, content=pdf))
+
+        registry.crash.add("transition")
+        failed = asyncio.run(orchestrator.execute_workflow(state, mode="barrier"))
+        assert failed.progress.current_step == WorkflowStatus.FAILED
+        assert failed.paper_input.content == pdf
+
+        checkpointed = store.load(state.job_id, "script")
+        assert isinstance(checkpointed.paper_input.content, BlobRef)
+
+        registry.crash.clear()
+        final = asyncio.run(orchestrator.resume_workflow(state.job_id))
+
+        assert final.progress.current_step == WorkflowStatus.COMPLETED
+        assert final.paper_input.content == pdf
+
+
+class TestSQLiteCheckpointStore:
+    """Test blob externalization and cleanup."""
+
+    @pytest.fixture
+    def blob_store(self, tmp_path):
+        return BlobStore(tmp_path / "blobs")
+
+    @staticmethod
+    def blob_count(blob_store):
+        return sum(1 for path in blob_store.root.rglob("*") if path.is_file())
+
+    def test_large_values_are_stored_once_by_reference(self, db_path, blob_store):
+        store = SQLiteCheckpointStore(db_path, FakeState, inline_limit=1024, blob_store=blob_store)
+        paper_text = "attention " * 10_000
+
+        store.save("job-3", "ingest", FakeState("job-3", {"text": paper_text}))
+        store.save("job-3", "understand", FakeState("job-3", {"text": paper_text, "summary": "short"}))
+
+        document = store._conn.execute(
+            "SELECT state FROM checkpoints WHERE node = 'understand'"
+        ).fetchone()[0]
+
+        assert self.blob_count(blob_store) == 1
+        assert len(document) < 1024
+        assert store.load("job-3", "understand").artifacts["text"] == paper_text
+
+    def test_clear_drops_unreferenced_blobs(self, db_path, blob_store):
+        store = SQLiteCheckpointStore(db_path, FakeState, inline_limit=10, blob_store=blob_store, blob_grace_seconds=0)
+        store.save("a", "ingest", FakeState("a", {"text": "shared text value"}))
+        store.save("b", "ingest", FakeState("b", {"text": "shared text value", "own": "only in job b"}))
+
+        store.clear("b")
+        assert self.blob_count(blob_store) == 1
+
+        store.clear("a")
+        assert self.blob_count(blob_store) == 0
+        assert store.latest("a") is None
+
+    def test_resaved_node_drops_blobs_only_it_used(self, db_path, blob_store):
+        store = SQLiteCheckpointStore(db_path, FakeState, inline_limit=10, blob_store=blob_store, blob_grace_seconds=0)
+        store.save("a", "script", FakeState("a", {"text": "first draft of the script"}))
+        store.save("a", "script", FakeState("a", {"text": "second draft of the script"}))
+
+        assert self.blob_count(blob_store) == 1
+        assert store.load("a", "script").artifacts["text"] == "second draft of the script"
+
+    def test_recently_stored_blobs_survive_clear(self, db_path, blob_store):
+        store = SQLiteCheckpointStore(db_path, FakeState, inline_limit=10, blob_store=blob_store)
+        store.save("a", "ingest", FakeState("a", {"text": "compacted into a running job"}))
+
+        store.clear("a")
+
+        # Another job may have just compacted the same payload without checkpointing it yet
+        assert self.blob_count(blob_store) == 1
+
+    def test_compacted_payloads_share_the_blob_store(self, db_path, blob_store):
+        store = SQLiteCheckpointStore(db_path, RASOMasterState, blob_store=blob_store, blob_grace_seconds=0)
+        pdf = base64.b64encode(b"%PDF" * 2000).decode()
+        state = RASOMasterState(paper_input=PaperInput(type=PaperInputType.PDF, content=pdf)).compact(blob_store)
+
+        store.save(state.job_id, "ingest", state)
+        finish_checkpoints(store, state.job_id, state)
+
+        # The final state keeps the payload it shares with the dropped node checkpoint
+        assert self.blob_count(blob_store) == 1
+        assert store.load(state.job_id, FINAL_NODE).hydrate(blob_store).paper_input.content == pdf
+
+        store.clear(state.job_id)
+        assert self.blob_count(blob_store) == 0
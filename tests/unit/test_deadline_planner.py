@@ -0,0 +1,161 @@
+"""
+Unit tests for deadline-aware quality degradation.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import config.backend.config  # noqa: F401
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from core.deadline import DeadlinePlanner, StageTimeModel, apply_decisions, get_deadline_planner
+from core.workflow import WorkflowOrchestrator
+
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def make_state(budget_seconds=None, **options):
+    """A 100-second job whose deadline is ``budget_seconds`` from NOW."""
+    deadline = NOW + timedelta(seconds=budget_seconds) if budget_seconds is not None else None
+    return SimpleNamespace(
+        job_id="job",
+        script=SimpleNamespace(total_duration=100.0),
+        options=SimpleNamespace(**{
+            "video_quality": "high",
+            "cinematic_effects": True,
+            "tts_engine": None,
+            "target_duration": None,
+            "deadline": deadline,
+            **options,
+        }),
+        degradations=[],
+    )
+
+
+@pytest.fixture
+def planner():
+    return DeadlinePlanner()
+
+
+class TestDeadlinePlanner:
+    """Test the degradation ladder and the stage time model."""
+
+    def test_no_deadline_changes_nothing(self, planner):
+        state = make_state()
+
+        assert planner.before_stage(state, "compose_video", now=NOW) == []
+        assert state.options.cinematic_effects and state.degradations == []
+
+    def test_generous_deadline_keeps_quality(self, planner):
+        state = make_state(budget_seconds=10_000)
+
+        assert planner.before_stage(state, "ingest", now=NOW) == []
+
+    def test_ladder_degrades_until_the_work_fits(self, planner):
+        # Composition of 100s of video: 0.5 * 100 * 1.6 = 80s at high quality with effects
+        state = make_state(budget_seconds=40)
+
+        decisions = planner.before_stage(state, "compose_video", now=NOW)
+
+        assert [(d["setting"], d["to"]) for d in decisions] == [
+            ("cinematic_effects", False),
+            ("video_quality", "medium"),
+        ]
+        assert state.options.video_quality == "medium" and state.options.tts_engine is None
+        assert decisions[-1]["predicted_seconds_after"] <= 40
+        assert state.degradations == decisions
+
+    def test_tts_is_switched_only_while_narration_remains(self, planner):
+        # Animation dominates; switching narration cannot shorten the critical path
+        state = make_state(budget_seconds=450, cinematic_effects=False)
+        decisions = planner.before_stage(state, "generate_voice", now=NOW)
+        assert "tts_engine" not in [d["setting"] for d in decisions]
+
+        planner.model.rates["animate"] = {"rate": 0.1, "samples": 1}
+        state = make_state(budget_seconds=60, cinematic_effects=False)
+        decisions = planner.before_stage(state, "generate_voice", now=NOW)
+        assert ("tts_engine", "piper") in [(d["setting"], d["to"]) for d in decisions]
+
+    def test_missed_deadline_degrades_fully_without_aborting(self, planner):
+        state = make_state(budget_seconds=-60)
+
+        decisions = planner.before_stage(state, "compose_video", now=NOW)
+
+        assert state.options.video_quality == "low"
+        assert [d["to"] for d in decisions if d["setting"] == "video_quality"] == ["medium", "low"]
+
+    def test_decisions_from_other_branches_are_reapplied(self, planner):
+        state = make_state(budget_seconds=10_000)
+        state.degradations = [{"setting": "tts_engine", "to": "piper", "decided_at": NOW.isoformat()}]
+
+        apply_decisions(state)
+
+        assert state.options.tts_engine == "piper"
+
+    def test_master_workflow_stage_names_are_sequential(self, planner):
+        state = make_state(budget_seconds=10_000)
+
+        parallel = planner.predict_remaining(state, "rendering")
+        sequential = planner.predict_remaining(state, "rendering", parallel=False)
+
+        assert sequential - parallel == pytest.approx(0.3 * 100)
+
+
+class TestWorkflowTimeout:
+    """Test that deadline jobs run late but not forever."""
+
+    @pytest.fixture
+    def orchestrator(self):
+        return WorkflowOrchestrator.__new__(WorkflowOrchestrator)
+
+    def test_job_without_deadline_times_out_after_timeout_minutes(self, orchestrator):
+        state = make_state(timeout_minutes=30)
+
+        assert orchestrator._timeout_at(state, NOW) == NOW + timedelta(minutes=30)
+
+    def test_deadline_job_times_out_timeout_minutes_past_the_deadline(self, orchestrator):
+        state = make_state(budget_seconds=2 * 3600, timeout_minutes=30)
+
+        assert orchestrator._timeout_at(state, NOW) == NOW + timedelta(hours=2, minutes=30)
+
+    def test_resumed_after_the_deadline_still_gets_timeout_minutes(self, orchestrator):
+        state = make_state(budget_seconds=-600, timeout_minutes=30)
+
+        assert orchestrator._timeout_at(state, NOW) == NOW + timedelta(minutes=30)
+
+
+class TestStageTimeModel:
+    """Test learning and persistence of stage rates."""
+
+    def test_observations_are_normalized_to_default_settings(self):
+        model = StageTimeModel()
+        low = SimpleNamespace(video_quality="low", cinematic_effects=False)
+
+        # 100s of video composed at low quality without effects in 15s
+        model.observe("compose_video", 100.0, low, 15.0)
+
+        assert model.rate("compose_video") == pytest.approx(0.5)
+        assert model.predict("compose_video", 100.0, low) == pytest.approx(15.0)
+
+    def test_rates_persist(self, tmp_path):
+        path = tmp_path / "stage_time_model.json"
+        model = StageTimeModel(path)
+        model.observe("script", 100.0, SimpleNamespace(), 60.0)
+        model.save()
+
+        assert StageTimeModel(path).rate("script") == pytest.approx(0.6)
+
+    def test_global_model_is_kept_in_the_data_path(self, isolated_data_path):
+        planner = get_deadline_planner()
+
+        # Test runs learn from stub timings; they must never overwrite a calibrated model
+        assert planner.model.path == isolated_data_path / "stage_time_model.json"
@@ -0,0 +1,292 @@
+"""
+Unit tests for the durable job queue.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import config.backend.config  # noqa: F401
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+import core.resource_governor as resource_governor_module
+import core.workflow as workflow_module
+from core.resource_governor import ResourceGovernor, get_resource_governor
+from config.backend.services.job_queue import COMPLETED, FAILED, PROCESSING, QUEUED, SQLiteJobQueue
+from config.backend.worker import JobWorker
+
+
+def payload(title: str = "paper"):
+    return {"paper_input": {"type": "title", "content": title}, "options": {}}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    job_queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", visibility_timeout=60, tenant_max_concurrent=1)
+    yield job_queue
+    job_queue.close()
+
+
+class TestSQLiteJobQueue:
+    """Test claiming, leases, tenant caps, paging and metrics."""
+
+    def test_claims_by_priority_then_age(self, queue):
+        queue.enqueue("low", payload(), priority=0, tenant="a")
+        queue.enqueue("high", payload(), priority=5, tenant="b")
+        queue.enqueue("low-later", payload(), priority=0, tenant="c")
+
+        claimed = [queue.claim("w1")["job_id"] for _ in range(3)]
+
+        assert claimed == ["high", "low", "low-later"]
+        assert queue.claim("w1") is None
+
+    def test_tenant_cap_lets_other_tenants_through(self, queue):
+        queue.enqueue("a1", payload(), priority=9, tenant="a")
+        queue.enqueue("a2", payload(), priority=9, tenant="a")
+        queue.enqueue("b1", payload(), tenant="b")
+
+        assert queue.claim("w1")["job_id"] == "a1"
+        # Tenant "a" is at its cap, so its higher-priority job waits
+        assert queue.claim("w2")["job_id"] == "b1"
+        assert queue.claim("w3") is None
+
+        queue.complete("a1", "w1", {"video": None})
+        assert queue.claim("w3")["job_id"] == "a2"
+
+    def test_tenant_limit_override(self, tmp_path):
+        job_queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", tenant_max_concurrent=1, tenant_limits={"big": 2})
+        job_queue.enqueue("1", payload(), tenant="big")
+        job_queue.enqueue("2", payload(), tenant="big")
+
+        assert job_queue.claim("w1") and job_queue.claim("w2")
+        job_queue.close()
+
+    def test_expired_lease_is_requeued_for_another_worker(self, tmp_path):
+        job_queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", visibility_timeout=0.05, max_attempts=2)
+        job_queue.enqueue("job", payload())
+
+        job_queue.claim("dead-worker")
+        time.sleep(0.1)
+
+        reclaimed = job_queue.claim("w2")
+        assert reclaimed["job_id"] == "job" and reclaimed["attempts"] == 2
+        # The dead worker can no longer touch the job
+        assert not job_queue.heartbeat("job", "dead-worker")
+
+        time.sleep(0.1)
+        assert job_queue.requeue_expired() == 1
+        assert job_queue.get("job")["status"] == FAILED
+        job_queue.close()
+
+    def test_heartbeat_keeps_lease(self, tmp_path):
+        job_queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", visibility_timeout=0.2)
+        job_queue.enqueue("job", payload())
+        job_queue.claim("w1")
+
+        for _ in range(3):
+            time.sleep(0.1)
+            assert job_queue.heartbeat("job", "w1")
+
+        assert job_queue.requeue_expired() == 0
+        assert job_queue.get("job")["status"] == PROCESSING
+        job_queue.close()
+
+    def test_completion_and_progress_are_persisted(self, tmp_path):
+        db_path = tmp_path / "jobs.sqlite3"
+        job_queue = SQLiteJobQueue(db_path)
+        job_queue.enqueue("job", payload("Attention"))
+        job_queue.claim("w1")
+        job_queue.update_progress("job", "w1", 40.0, "script")
+        job_queue.complete("job", "w1", {"video": {"file_path": "/out.mp4"}})
+        job_queue.close()
+
+        reopened = SQLiteJobQueue(db_path)
+        job = reopened.get("job")
+        assert job["status"] == COMPLETED and job["progress"] == 100.0
+        assert job["result"]["video"]["file_path"] == "/out.mp4"
+        assert job["paper_input"]["content"] == "Attention"
+        reopened.close()
+
+    def test_list_is_paged_and_filtered(self, queue):
+        for i in range(5):
+            queue.enqueue(f"job{i}", payload(), tenant="a" if i % 2 else "b")
+        queue.claim("w1")
+
+        page, total = queue.list(offset=1, limit=2)
+        assert total == 5 and len(page) == 2
+
+        queued, queued_total = queue.list(status=QUEUED, tenant="b")
+        assert queued_total == len(queued) == 2
+
+    def test_metrics(self, queue):
+        queue.enqueue("a", payload(), tenant="a")
+        queue.enqueue("b", payload(), tenant="a")
+        queue.claim("w1")
+
+        metrics = queue.metrics()
+
+        assert metrics["queue_depth"] == 1
+        assert metrics["jobs_by_status"] == {QUEUED: 1, PROCESSING: 1}
+        assert metrics["running_by_tenant"] == {"a": 1}
+        assert metrics["oldest_queued_wait_seconds"] >= 0
+
+    def test_status_changes_are_logged_as_events(self, queue):
+        queue.enqueue("job", payload())
+        queue.enqueue("other", payload(), tenant="b")
+        queue.claim("w1")
+        queue.publish("job", "progress", {"progress": 40.0})
+        queue.complete("job", "w1", {"video": None})
+
+        events = queue.events("job")
+
+        assert [(e["event"], e["data"].get("status")) for e in events] == [
+            ("status", QUEUED), ("status", PROCESSING), ("progress", None), ("status", COMPLETED),
+        ]
+        assert [e["id"] for e in queue.events("job", after_id=events[1]["id"])] == [e["id"] for e in events[2:]]
+        assert len(queue.events()) == 5 and queue.last_event_id() == max(e["id"] for e in events)
+
+    def test_finished_jobs_events_are_pruned_after_the_replay_window(self, tmp_path):
+        job_queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", event_retention=0.05)
+        job_queue.enqueue("done", payload())
+        job_queue.enqueue("running", payload())
+        job_queue.claim("w1")
+        job_queue.complete("done", "w1", {"video": None})
+
+        # Still within the window: a reconnecting client can replay everything
+        assert job_queue.prune_events() == 0 and len(job_queue.events("done")) == 3
+
+        time.sleep(0.1)
+        job_queue.claim("w2")
+
+        assert job_queue.events("done") == []
+        assert [e["data"]["status"] for e in job_queue.events("running")] == [QUEUED, PROCESSING]
+        job_queue.close()
+
+
+class TestJobWorker:
+    """Test that a worker stops a job whose lease it lost."""
+
+    def test_lost_lease_cancels_the_job(self, queue, monkeypatch):
+        queue.enqueue("job", payload())
+        job = queue.claim("w1")
+        cancelled = []
+
+        async def run_job(self, job):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(job["job_id"])
+                raise
+
+        monkeypatch.setattr(JobWorker, "_run_job", run_job)
+        # Another worker took the job over after this one stalled
+        monkeypatch.setattr(queue, "heartbeat", lambda job_id, worker_id: False)
+        worker = JobWorker(queue=queue, worker_id="w1")
+        worker.heartbeat_interval = 0.01
+
+        asyncio.run(asyncio.wait_for(worker.process_job(job), timeout=5))
+
+        assert cancelled == ["job"]
+        assert queue.get("job")["status"] == PROCESSING
+
+
+class FakeAgent:
+    """Workflow agent that records its runs and can hang like a dying worker."""
+
+    def __init__(self, agent_type, registry):
+        self.agent_type = agent_type
+        self.name = agent_type.value
+        self.registry = registry
+
+    async def safe_execute(self, state):
+        if self.agent_type.value in self.registry.hang:
+            await asyncio.Event().wait()
+        if self.agent_type.value in self.registry.governed:
+            self.registry.in_flight.add(state.job_id)
+            self.registry.peak_in_flight = max(self.registry.peak_in_flight, len(self.registry.in_flight))
+            async with get_resource_governor().acquire(cpu=1):
+                self.registry.jobs_granted.update(get_resource_governor().active_by_job)
+                await asyncio.sleep(0.05)
+            self.registry.in_flight.discard(state.job_id)
+        self.registry.runs.append(self.agent_type.value)
+        state.current_agent = self.agent_type
+        return state
+
+    def should_retry(self, error, attempt):
+        return False
+
+    def handle_error(self, error, state):
+        return state
+
+
+class FakeAgentRegistry:
+    def __init__(self):
+        self.runs = []
+        self.hang = set()
+        self.governed = set()
+        self.in_flight = set()
+        self.peak_in_flight = 0
+        self.jobs_granted = set()
+
+    def get_agent(self, agent_type):
+        return FakeAgent(agent_type, self)
+
+
+class TestWorkerResume:
+    """Test that a requeued job resumes from its checkpoints on the new worker."""
+
+    def test_requeued_job_reruns_only_incomplete_nodes(self, tmp_path, monkeypatch):
+        registry = FakeAgentRegistry()
+        monkeypatch.setattr(workflow_module, "agent_registry", registry)
+        job_queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", visibility_timeout=0.05)
+        job_queue.enqueue("job", payload("Attention Is All You Need"))
+
+        # The first worker dies while composing the video
+        registry.hang.add("transition")
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(JobWorker(job_queue, "w1").process_job(job_queue.claim("w1")), 1.0))
+        assert "script" in registry.runs and "transition" not in registry.runs
+
+        time.sleep(0.1)
+        registry.runs.clear()
+        registry.hang.clear()
+        asyncio.run(JobWorker(job_queue, "w2").process_job(job_queue.claim("w2")))
+
+        assert registry.runs == ["transition", "metadata"]
+        assert job_queue.get("job")["status"] == COMPLETED
+        job_queue.close()
+
+
+class TestConcurrentWorker:
+    """Test that one worker process runs several jobs under one resource governor."""
+
+    def test_jobs_share_the_process_governor(self, queue, monkeypatch):
+        registry = FakeAgentRegistry()
+        registry.governed.add("script")
+        monkeypatch.setattr(workflow_module, "agent_registry", registry)
+        governor = ResourceGovernor({"cpu": 1})
+        monkeypatch.setattr(resource_governor_module, "_resource_governor", governor)
+        queue.enqueue("a", payload("Attention Is All You Need"), tenant="a")
+        queue.enqueue("b", payload("Deep Residual Learning"), tenant="b")
+        worker = JobWorker(queue, "w1", poll_interval=0.01, concurrency=2)
+
+        async def run_until_done():
+            task = asyncio.create_task(worker.run())
+            while any(queue.get(job_id)["status"] != COMPLETED for job_id in ("a", "b")):
+                await asyncio.sleep(0.02)
+            worker.stop()
+            await asyncio.wait_for(task, 5.0)
+
+        asyncio.run(asyncio.wait_for(run_until_done(), 30.0))
+
+        # Both jobs were running at once, and the second waited for the first's CPU slot
+        assert registry.peak_in_flight == 2
+        assert registry.jobs_granted == {"a", "b"}
+        assert governor.metrics()["waits"] >= 1
@@ -0,0 +1,103 @@
+"""
+Unit tests for the persistent LLM response cache.
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import config.backend.config  # noqa: F401
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from config.backend.services.llm_cache import LLMResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm_cache.sqlite3", ttl_seconds=60, max_entries=2)
+    yield cache
+    cache.close()
+
+
+def store(cache, key, content="response"):
+    cache.set(key, provider="openai", model="gpt-4", payload={"content": content}, total_tokens=10)
+
+
+class TestCacheKey:
+    """Test which request fields identify a cached response."""
+
+    def test_key_is_stable_across_param_order(self):
+        key1 = LLMResponseCache.make_key("openai", "gpt-4", "prompt", {"temperature": 0.7, "max_tokens": 100})
+        key2 = LLMResponseCache.make_key("openai", "gpt-4", "prompt", {"max_tokens": 100, "temperature": 0.7})
+        assert key1 == key2
+
+    def test_key_depends_on_every_field(self):
+        base = LLMResponseCache.make_key("openai", "gpt-4", "prompt", {"temperature": 0.7})
+        assert base != LLMResponseCache.make_key("anthropic", "gpt-4", "prompt", {"temperature": 0.7})
+        assert base != LLMResponseCache.make_key("openai", "gpt-4o", "prompt", {"temperature": 0.7})
+        assert base != LLMResponseCache.make_key("openai", "gpt-4", "prompt!", {"temperature": 0.7})
+        assert base != LLMResponseCache.make_key("openai", "gpt-4", "prompt", {"temperature": 0.2})
+
+
+class TestLLMResponseCache:
+    """Test TTL expiry, LRU eviction and metrics."""
+
+    def test_hit_and_miss_are_counted(self, cache):
+        store(cache, "a", "cached text")
+
+        assert cache.get("a") == {"content": "cached text"}
+        assert cache.get("missing") is None
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["saved_tokens"]) == (1, 1, 10)
+
+    def test_expired_entries_are_misses(self, cache):
+        store(cache, "a")
+        cache.ttl_seconds = 0.01
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+
+        store(cache, "b")
+        assert cache.stats()["entries"] == 1
+
+    def test_least_recently_used_entry_is_evicted(self, cache):
+        store(cache, "a")
+        time.sleep(0.01)
+        store(cache, "b")
+        time.sleep(0.01)
+        assert cache.get("a") is not None
+
+        store(cache, "c")
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_lookups_do_not_write(self, cache):
+        store(cache, "a")
+        cache.get("a")
+
+        reader = sqlite3.connect(str(cache.db_path))
+        created_at, last_access = reader.execute(
+            "SELECT created_at, last_access FROM llm_cache WHERE key = 'a'"
+        ).fetchone()
+        reader.close()
+
+        assert last_access == created_at
+        assert "a" in cache._touched
+
+    def test_async_access_runs_off_the_event_loop(self, cache):
+        async def scenario():
+            await cache.aset("a", provider="openai", model="gpt-4", payload={"content": "async"})
+            return await cache.aget("a")
+
+        assert asyncio.run(scenario()) == {"content": "async"}
@@ -0,0 +1,165 @@
+"""
+Unit tests for the concurrent LLM call dispatcher and its rate limits.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import config.backend.config  # noqa: F401
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from agents.retry import RetryConfig
+from config.backend.services.llm_dispatcher import LLMDispatcher, ProviderRateLimiter, TokenBucket
+
+
+NO_RETRY = RetryConfig(max_attempts=0)
+
+
+class TestTokenBucket:
+    """Test waiting, ordering and cancellation of token buckets."""
+
+    def test_unlimited_bucket_never_waits(self):
+        bucket = TokenBucket(0)
+
+        async def scenario():
+            for _ in range(100):
+                await bucket.acquire(1000)
+
+        started = time.monotonic()
+        asyncio.run(scenario())
+        assert time.monotonic() - started < 0.1
+
+    def test_waiters_sleep_concurrently_in_arrival_order(self):
+        # 6000 per minute refills 100 tokens per second
+        bucket = TokenBucket(6000)
+        order = []
+
+        async def take(name):
+            await bucket.acquire(10)
+            order.append(name)
+
+        async def scenario():
+            await bucket.acquire(6000)
+            await asyncio.gather(take("first"), take("second"), take("third"))
+
+        started = time.monotonic()
+        asyncio.run(scenario())
+        elapsed = time.monotonic() - started
+
+        assert order == ["first", "second", "third"]
+        # The third caller waits for 30 tokens (0.3s), not for three sequential sleeps of its own
+        assert 0.25 < elapsed < 0.6
+
+    def test_cancelled_waiter_returns_its_reservation(self):
+        bucket = TokenBucket(6000)
+
+        async def scenario():
+            await bucket.acquire(6000)
+            waiter = asyncio.ensure_future(bucket.acquire(3000))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            return bucket._tokens
+
+        assert asyncio.run(scenario()) > -100
+
+    def test_oversized_requests_are_clamped_to_capacity(self):
+        bucket = TokenBucket(6000)
+
+        async def scenario():
+            await bucket.acquire(1_000_000)
+
+        started = time.monotonic()
+        asyncio.run(scenario())
+        assert time.monotonic() - started < 0.1
+
+
+class TestProviderRateLimiter:
+    """Test the combined request and token limits."""
+
+    def test_usage_corrects_the_token_estimate(self):
+        limiter = ProviderRateLimiter(requests_per_minute=60, tokens_per_minute=6000)
+
+        asyncio.run(limiter.acquire(estimated_tokens=1000))
+        limiter.record_usage(1000, 3000)
+
+        assert limiter.requests._tokens == pytest.approx(59, abs=0.1)
+        assert limiter.tokens._tokens == pytest.approx(3000, abs=1)
+
+    def test_unknown_usage_keeps_the_estimate(self):
+        limiter = ProviderRateLimiter(tokens_per_minute=6000)
+
+        asyncio.run(limiter.acquire(estimated_tokens=1000))
+        limiter.record_usage(1000, None)
+
+        assert limiter.tokens._tokens == pytest.approx(5000, abs=1)
+
+
+class TestLLMDispatcher:
+    """Test ordering, concurrency bounds and per-item retries."""
+
+    def test_map_preserves_order_and_bounds_concurrency(self):
+        dispatcher = LLMDispatcher(max_concurrency=2, retry_config=NO_RETRY)
+        in_flight = []
+        peak = []
+
+        async def call(item):
+            in_flight.append(item)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01 * (5 - item))
+            in_flight.remove(item)
+            return item * 10
+
+        results = asyncio.run(dispatcher.map(call, range(5)))
+
+        assert results == [0, 10, 20, 30, 40]
+        assert max(peak) == 2
+
+    def test_failing_item_is_retried_on_its_own(self):
+        dispatcher = LLMDispatcher(retry_config=RetryConfig(max_attempts=2, base_delay=0.0, jitter=False))
+        attempts = {}
+
+        async def call(item):
+            attempts[item] = attempts.get(item, 0) + 1
+            if item == 1 and attempts[item] == 1:
+                raise ConnectionError("transient")
+            return item
+
+        results = asyncio.run(dispatcher.map(call, [0, 1, 2]))
+
+        assert results == [0, 1, 2]
+        assert attempts == {0: 1, 1: 2, 2: 1}
+
+    def test_return_exceptions_keeps_other_results(self):
+        dispatcher = LLMDispatcher(retry_config=NO_RETRY)
+
+        async def call(item):
+            if item == 1:
+                raise ConnectionError("down")
+            return item
+
+        results = asyncio.run(dispatcher.map(call, [0, 1, 2], return_exceptions=True))
+
+        assert results[0] == 0 and results[2] == 2
+        assert isinstance(results[1], ConnectionError)
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(dispatcher.map(call, [0, 1, 2]))
+
+    def test_limiters_are_shared_per_provider(self):
+        dispatcher = LLMDispatcher(
+            rate_limits={"openai": {"requests_per_minute": 500}},
+            default_requests_per_minute=50,
+        )
+
+        assert dispatcher.limiter("openai") is dispatcher.limiter("openai")
+        assert dispatcher.limiter("openai").requests.per_minute == 500
+        assert dispatcher.limiter("google").requests.per_minute == 50
@@ -0,0 +1,152 @@
+"""
+Unit tests for hedged LLM requests using local stub providers with injected latency.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.services.hedging import HedgingPolicy
+from config.backend.services.llm import (
+    BaseLLMProvider,
+    LLMProvider,
+    LLMRequest,
+    LLMResponse,
+    LLMService,
+)
+from config.backend.services.provider_health import ProviderHealthMonitor
+
+
+class StubProvider(BaseLLMProvider):
+    """Provider answering after a fixed delay, optionally failing."""
+
+    def __init__(self, provider_type: LLMProvider, latency: float, fail: bool = False):
+        super().__init__(provider_type)
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    @property
+    def name(self) -> str:
+        return f"Stub {self.provider_type.value}"
+
+    @property
+    def default_model(self) -> str:
+        return "stub-model"
+
+    async def generate(self, request: LLMRequest) -> LLMResponse:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+        if self.fail:
+            raise RuntimeError(f"{self.provider_type.value} failed")
+
+        return LLMResponse(
+            content=f"answer from {self.provider_type.value}",
+            model=request.model or self.default_model,
+            provider=self.provider_type,
+            response_time=self.latency,
+        )
+
+    async def is_available(self) -> bool:
+        return True
+
+    async def get_available_models(self):
+        return [self.default_model]
+
+
+def make_service(primary: StubProvider, backup: StubProvider, **policy) -> LLMService:
+    """Build an LLMService that only knows the two stub providers."""
+    service = LLMService()
+    service.cache = None
+    service.providers = {primary.provider_type: primary, backup.provider_type: backup}
+    service.provider_priority = [primary.provider_type, backup.provider_type]
+    service.health_monitor = ProviderHealthMonitor(
+        {key: provider.is_available for key, provider in service.providers.items()}
+    )
+    service.hedging = HedgingPolicy(**{"min_samples": 1, "default_delay": 0.05, "budget_ratio": 1.0, **policy})
+    return service
+
+
+class TestHedgingPolicy:
+    """Test hedge delay and budget accounting."""
+
+    def test_delay_uses_percentile_once_enough_samples(self):
+        policy = HedgingPolicy(percentile=0.9, min_samples=5, default_delay=10.0)
+
+        assert policy.hedge_delay([1.0, 2.0]) == 10.0
+        assert policy.hedge_delay([float(i) for i in range(1, 11)]) == 10.0
+        assert policy.hedge_delay([float(i) for i in range(1, 101)]) == 91.0
+
+    def test_budget_caps_hedge_fraction(self):
+        policy = HedgingPolicy(budget_ratio=0.1, burst=1)
+
+        granted = 0
+        for _ in range(100):
+            policy.record_request()
+            granted += policy.try_acquire()
+
+        assert granted == 11
+        assert policy.stats()["budget_denied"] == 89
+
+
+class TestHedgedGeneration:
+    """Test hedged generation across stub providers."""
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        primary = StubProvider(LLMProvider.OLLAMA, latency=1.0)
+        backup = StubProvider(LLMProvider.OPENAI, latency=0.05)
+        service = make_service(primary, backup)
+
+        response = await service.generate("prompt", use_cache=False, hedge=True)
+
+        assert response.provider == LLMProvider.OPENAI
+        assert primary.cancelled == 1
+        assert service.get_hedging_stats()["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        primary = StubProvider(LLMProvider.OLLAMA, latency=0.01)
+        backup = StubProvider(LLMProvider.OPENAI, latency=0.01)
+        service = make_service(primary, backup, default_delay=0.5)
+
+        response = await service.generate("prompt", use_cache=False, hedge=True)
+
+        assert response.provider == LLMProvider.OLLAMA
+        assert backup.calls == 0
+        assert service.get_hedging_stats()["hedges"] == 0
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_waits_for_primary(self):
+        primary = StubProvider(LLMProvider.OLLAMA, latency=0.2)
+        backup = StubProvider(LLMProvider.OPENAI, latency=0.01)
+        service = make_service(primary, backup, budget_ratio=0.0, burst=0)
+
+        response = await service.generate("prompt", use_cache=False, hedge=True)
+
+        assert response.provider == LLMProvider.OLLAMA
+        assert backup.calls == 0
+        assert service.get_hedging_stats()["budget_denied"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_after_hedge_returns_backup(self):
+        primary = StubProvider(LLMProvider.OLLAMA, latency=0.1, fail=True)
+        backup = StubProvider(LLMProvider.OPENAI, latency=0.3)
+        service = make_service(primary, backup)
+
+        response = await service.generate("prompt", use_cache=False, hedge=True)
+
+        assert response.provider == LLMProvider.OPENAI
+        assert backup.calls == 1
+        assert service.get_hedging_stats()["hedge_wins"] == 1
@@ -0,0 +1,151 @@
+"""
+Unit tests for the warm Manim worker pool's reuse and recycling.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+import agents.manim_workers as manim_workers
+from agents.manim_workers import ManimWorkerError, ManimWorkerPool
+
+
+class FakeWorker:
+    """In-process stand-in for a worker process."""
+
+    instances = []
+
+    def __init__(self, startup_timeout: float, rss_per_render: float = 10.0):
+        self.renders = 0
+        self.rss_mb = 100.0
+        self.rss_per_render = rss_per_render
+        self.stopped = False
+        FakeWorker.instances.append(self)
+
+    @property
+    def alive(self) -> bool:
+        return not self.stopped
+
+    def render(self, job, timeout):
+        self.renders += 1
+        self.rss_mb += self.rss_per_render
+        return {"success": True, "output_path": job["output_path"], "rss_mb": self.rss_mb}
+
+    def stop(self, timeout: float = 5.0):
+        self.stopped = True
+
+    def kill(self):
+        self.stopped = True
+
+
+class HangingWorker(FakeWorker):
+    """Worker whose render blocks until the process is killed."""
+
+    def __init__(self, startup_timeout: float):
+        super().__init__(startup_timeout)
+        self.killed = threading.Event()
+        self.render_thread_done = threading.Event()
+
+    def render(self, job, timeout):
+        try:
+            self.killed.wait(timeout)
+            raise ManimWorkerError("Manim worker died: killed")
+        finally:
+            self.render_thread_done.set()
+
+    def kill(self):
+        super().kill()
+        self.killed.set()
+
+
+@pytest.fixture(autouse=True)
+def fake_worker(monkeypatch):
+    FakeWorker.instances = []
+    monkeypatch.setattr(manim_workers, "ManimWorker", FakeWorker)
+
+
+async def render_many(pool: ManimWorkerPool, count: int):
+    return await asyncio.gather(*[
+        pool.render("code", f"/tmp/scene_{i}.mp4", "/tmp", "low_quality", "854x480")
+        for i in range(count)
+    ])
+
+
+class TestManimWorkerPool:
+    """Test worker reuse, recycling and startup failure."""
+
+    @pytest.mark.asyncio
+    async def test_workers_are_reused_up_to_pool_size(self):
+        pool = ManimWorkerPool(size=2, max_renders_per_worker=100)
+
+        replies = await render_many(pool, 10)
+
+        assert all(reply["success"] for reply in replies)
+        assert len(FakeWorker.instances) == 2
+        assert pool.stats["renders"] == 10
+
+    @pytest.mark.asyncio
+    async def test_workers_recycled_after_render_limit(self):
+        pool = ManimWorkerPool(size=1, max_renders_per_worker=3)
+
+        await render_many(pool, 7)
+
+        assert [worker.renders for worker in FakeWorker.instances] == [3, 3, 1]
+        assert pool.stats["workers_recycled"] == 2
+
+    @pytest.mark.asyncio
+    async def test_workers_recycled_on_memory_growth(self):
+        pool = ManimWorkerPool(size=1, max_renders_per_worker=100, max_memory_mb=125)
+
+        await render_many(pool, 5)
+
+        assert [worker.renders for worker in FakeWorker.instances] == [3, 2]
+
+    @pytest.mark.asyncio
+    async def test_startup_failure_marks_pool_unavailable(self, monkeypatch):
+        attempts = []
+
+        def failing_worker(startup_timeout):
+            attempts.append(startup_timeout)
+            raise ManimWorkerError("Failed to import manim: No module named 'manim'")
+
+        monkeypatch.setattr(manim_workers, "ManimWorker", failing_worker)
+        pool = ManimWorkerPool(size=2)
+
+        for _ in range(3):
+            with pytest.raises(ManimWorkerError):
+                await pool.render("code", "/tmp/scene.mp4", "/tmp", "low_quality", "854x480")
+
+        assert len(attempts) == 1
+        assert "manim" in pool.unavailable_reason
+
+    @pytest.mark.asyncio
+    async def test_cancelled_render_retires_the_worker(self, monkeypatch):
+        monkeypatch.setattr(manim_workers, "ManimWorker", HangingWorker)
+        pool = ManimWorkerPool(size=1)
+
+        task = asyncio.ensure_future(pool.render("code", "/tmp/scene.mp4", "/tmp", "low_quality", "854x480"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        hung = FakeWorker.instances[0]
+        assert hung.killed.is_set()
+
+        # The next render gets a fresh worker once the abandoned render thread has returned
+        monkeypatch.setattr(manim_workers, "ManimWorker", FakeWorker)
+        reply = await asyncio.wait_for(
+            pool.render("code", "/tmp/scene.mp4", "/tmp", "low_quality", "854x480"), timeout=5
+        )
+
+        assert hung.render_thread_done.is_set()
+        assert reply["success"]
+        assert FakeWorker.instances[1] is not hung
+        assert pool._idle == [FakeWorker.instances[1]]
+        assert pool.stats["workers_recycled"] == 1
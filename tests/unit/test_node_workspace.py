@@ -0,0 +1,178 @@
+"""
+Unit tests for the shared Node workspace and the long-running render server.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import textwrap
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from agents.node_workspace import REMOTION_RENDER_SERVER, NodeWorkspace, RemotionRenderService, composition_id
+
+
+# Speaks the render server protocol: writes the composition ID into the output
+# file and records each bundle version it sees, so tests can count rebundles.
+STAND_IN_SERVER = textwrap.dedent('''
+    import json, os, sys
+
+    for line in sys.stdin:
+        job = json.loads(line)
+        with open("bundles.log", "a") as log:
+            log.write(job["bundle_version"] + "\\n")
+        if job["composition"] == "broken":
+            reply = {"id": job["id"], "ok": False, "error": "render failed"}
+        else:
+            with open(job["output"], "w") as out:
+                out.write(json.dumps({"composition": job["composition"], "concurrency": job["concurrency"]}))
+            reply = {"id": job["id"], "ok": True}
+        sys.stdout.write(json.dumps(reply) + "\\n")
+        sys.stdout.flush()
+''')
+
+
+def counting_install(counter_file):
+    """A no-op install command that records each time it runs."""
+    return [sys.executable, "-c", f"open({str(counter_file)!r}, 'a').write('x')"]
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    return NodeWorkspace(
+        "remotion",
+        {"dependencies": {"remotion": "^4.0.0"}},
+        tmp_path / "workspaces",
+        install_command=counting_install(tmp_path / "installs"),
+    )
+
+
+@pytest.fixture
+def service(workspace):
+    workspace.path.mkdir(parents=True, exist_ok=True)
+    (workspace.path / "stand_in_server.py").write_text(STAND_IN_SERVER)
+    return RemotionRenderService(workspace, server_command=[sys.executable, "stand_in_server.py"], concurrency=4)
+
+
+class TestNodeWorkspace:
+    """Test install-once behaviour and versioning."""
+
+    @pytest.mark.asyncio
+    async def test_installs_once_across_instances(self, workspace, tmp_path):
+        await asyncio.gather(*[workspace.ensure_installed() for _ in range(5)])
+
+        again = NodeWorkspace("remotion", workspace.package_json, tmp_path / "workspaces",
+                              install_command=counting_install(tmp_path / "installs"))
+        await again.ensure_installed()
+
+        assert (tmp_path / "installs").read_text() == "x"
+        assert json.loads((workspace.path / "package.json").read_text()) == workspace.package_json
+
+    def test_dependency_change_gets_new_directory(self, workspace, tmp_path):
+        upgraded = NodeWorkspace("remotion", {"dependencies": {"remotion": "^5.0.0"}}, tmp_path / "workspaces")
+
+        assert upgraded.path != workspace.path
+
+    @pytest.mark.asyncio
+    async def test_failed_install_raises(self, tmp_path):
+        workspace = NodeWorkspace("remotion", {}, tmp_path, install_command=[sys.executable, "-c", "raise SystemExit(1)"])
+
+        with pytest.raises(RuntimeError):
+            await workspace.ensure_installed()
+        assert not (workspace.path / ".raso-installed").exists()
+
+
+class TestRemotionRenderService:
+    """Test per-scene compositions rendered through one server process."""
+
+    @pytest.mark.asyncio
+    async def test_scenes_render_through_one_server(self, service, tmp_path):
+        outputs = [tmp_path / f"scene_{i}.mp4" for i in range(3)]
+
+        replies = await asyncio.gather(*[
+            service.render(f"scene_{i}", f"export const Scene{i} = () => null;", 2.0, str(outputs[i]), timeout=10)
+            for i in range(3)
+        ])
+        server_pid = service.server._process.pid
+        await service.render("scene_0", "export const Scene0 = () => null;", 2.0, str(outputs[0]), timeout=10)
+
+        assert all(reply["ok"] for reply in replies)
+        assert service.server._process.pid == server_pid
+        assert json.loads(outputs[1].read_text()) == {"composition": "scene-1", "concurrency": 4}
+        assert (tmp_path / "installs").read_text() == "x"
+
+        root = (service.workspace.path / service.project("default").directory / "Root.tsx").read_text()
+        assert root.count("<Composition") == 3
+        await service.server.stop()
+
+    @pytest.mark.asyncio
+    async def test_bundle_version_only_changes_with_compositions(self, service, tmp_path):
+        output = str(tmp_path / "out.mp4")
+
+        await service.render("intro", "export const Intro = () => null;", 2.0, output, timeout=10)
+        await service.render("intro", "export const Intro = () => null;", 2.0, output, timeout=10)
+        await service.render("intro", "export const Intro = () => 1;", 2.0, output, timeout=10)
+
+        versions = (service.workspace.path / "bundles.log").read_text().split()
+        assert versions[0] == versions[1] != versions[2]
+        await service.server.stop()
+
+    @pytest.mark.asyncio
+    async def test_prepared_job_is_bundled_once(self, service, tmp_path):
+        scenes = [
+            {"scene_id": f"scene_{i}", "component_code": f"export const Scene{i} = () => null;", "duration": 2.0}
+            for i in range(3)
+        ]
+        await service.prepare("job-a", scenes)
+
+        await asyncio.gather(*[
+            service.render(scene["scene_id"], scene["component_code"], 2.0, str(tmp_path / f"{i}.mp4"),
+                           timeout=10, job_id="job-a")
+            for i, scene in enumerate(scenes)
+        ])
+
+        versions = (service.workspace.path / "bundles.log").read_text().split()
+        assert len(versions) == 3 and len(set(versions)) == 1
+        await service.server.stop()
+
+    @pytest.mark.asyncio
+    async def test_jobs_have_separate_scene_files_and_entries(self, service, tmp_path):
+        await service.render("intro", "export const A = () => null;", 2.0, str(tmp_path / "a.mp4"), timeout=10, job_id="job-a")
+        await service.render("intro", "export const B = () => null;", 2.0, str(tmp_path / "b.mp4"), timeout=10, job_id="job-b")
+
+        job_a, job_b = service.project("job-a"), service.project("job-b")
+        assert job_a.entry != job_b.entry
+        assert (service.workspace.path / job_a.directory / "scenes" / "intro.tsx").read_text() == "export const A = () => null;"
+        assert (service.workspace.path / job_b.directory / "scenes" / "intro.tsx").read_text() == "export const B = () => null;"
+
+        service.release("job-a")
+        assert not (service.workspace.path / job_a.directory).exists()
+        assert (service.workspace.path / job_b.directory).exists()
+        await service.server.stop()
+
+    def test_server_keeps_several_bundles_live(self):
+        script = REMOTION_RENDER_SERVER % {"max_bundles": 4}
+
+        assert "bundles.clear()" not in script
+        assert "const MAX_BUNDLES = 4;" in script
+
+    @pytest.mark.asyncio
+    async def test_failed_render_and_server_restart(self, service, tmp_path):
+        reply = await service.render("broken", "export const X = () => null;", 1.0, str(tmp_path / "b.mp4"), timeout=10)
+        assert reply == {"id": 1, "ok": False, "error": "render failed"}
+
+        service.server._process.kill()
+        await service.server._process.wait()
+
+        reply = await service.render("ok", "export const X = () => null;", 1.0, str(tmp_path / "ok.mp4"), timeout=10)
+        assert reply["ok"]
+        assert service.server.restarts == 1
+        await service.server.stop()
+
+
+def test_composition_id_is_sanitized():
+    assert composition_id("scene_1.intro") == "scene-1-intro"
@@ -0,0 +1,137 @@
+"""
+Unit tests for map-reduce paper condensation.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models.paper import PaperContent, Section
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+import config.backend.services.paper_digest as digest_module
+from config.backend.services.paper_digest import PaperCondenser
+from services.gemini_client import GeminiClient
+
+
+DIGEST = {
+    "overview": "The Transformer replaces recurrence with attention.",
+    "problem": "Recurrent models cannot be parallelized.",
+    "method": "Multi-head self-attention.",
+    "results": "28.4 BLEU on WMT 2014 English-German.",
+    "limitations": "Quadratic cost in sequence length.",
+    "contributions": ["Transformer architecture", "Parallel training"],
+    "key_terms": ["attention"],
+}
+
+
+class FakeLLMService:
+    """Answers map and reduce prompts, optionally failing some of them."""
+
+    def __init__(self, fail_sections: bool = False, fail_reduce: bool = False):
+        self.fail_sections = fail_sections
+        self.fail_reduce = fail_reduce
+        self.map_calls = 0
+        self.reduce_calls = 0
+
+    async def generate_many(self, prompts, return_exceptions=False, **kwargs):
+        self.map_calls += 1
+        return [
+            RuntimeError("provider unavailable") if self.fail_sections and i == 0
+            else SimpleNamespace(content=f"Summary of chunk {i}.")
+            for i in range(len(prompts))
+        ]
+
+    async def generate(self, prompt, **kwargs):
+        self.reduce_calls += 1
+        if self.fail_reduce:
+            raise RuntimeError("provider unavailable")
+        return SimpleNamespace(content="Digest:\n" + json.dumps(DIGEST))
+
+
+@pytest.fixture
+def paper():
+    return PaperContent(
+        title="Attention Is All You Need",
+        authors=["Ashish Vaswani"],
+        abstract="We propose the Transformer, a model based solely on attention mechanisms.",
+        sections=[
+            Section(id="s1", title="Introduction", level=1, content="Recurrent models are sequential. " * 40),
+            Section(id="s2", title="Model", level=1, content="The encoder stacks attention layers. " * 40),
+        ],
+    )
+
+
+def condense(condenser, paper):
+    return asyncio.run(condenser.condense(paper))
+
+
+class TestPaperCondenser:
+    """Test digest building, caching and fallback handling."""
+
+    def test_digest_is_built_and_cached(self, tmp_path, paper, monkeypatch):
+        llm = FakeLLMService()
+        monkeypatch.setattr(digest_module, "llm_service", llm)
+        condenser = PaperCondenser(cache_dir=tmp_path, chunk_chars=500)
+
+        digest = condense(condenser, paper)
+
+        assert digest.method == "Multi-head self-attention."
+        assert set(digest.section_summaries) == {"Introduction", "Model"}
+        assert digest.digest_tokens < digest.original_tokens
+        assert condenser.last_metrics["complete"] is True
+
+        # A fresh condenser reads the digest from disk without calling the LLM
+        reloaded = PaperCondenser(cache_dir=tmp_path)
+        assert condense(reloaded, paper).overview == digest.overview
+        assert (llm.map_calls, llm.reduce_calls) == (1, 1)
+
+    @pytest.mark.parametrize("failure", ["fail_sections", "fail_reduce"])
+    def test_fallback_digest_is_not_cached(self, tmp_path, paper, monkeypatch, failure):
+        monkeypatch.setattr(digest_module, "llm_service", FakeLLMService(**{failure: True}))
+        condenser = PaperCondenser(cache_dir=tmp_path, chunk_chars=500)
+
+        digest = condense(condenser, paper)
+
+        assert digest.overview
+        assert condenser.last_metrics["complete"] is False
+        assert not list(tmp_path.iterdir())
+
+        # Once the provider recovers the digest is rebuilt and cached
+        llm = FakeLLMService()
+        monkeypatch.setattr(digest_module, "llm_service", llm)
+        assert condense(condenser, paper).method == "Multi-head self-attention."
+        assert llm.reduce_calls == 1
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_failed_reduce_falls_back_to_the_abstract(self, tmp_path, paper, monkeypatch):
+        monkeypatch.setattr(digest_module, "llm_service", FakeLLMService(fail_reduce=True))
+        condenser = PaperCondenser(cache_dir=tmp_path)
+
+        digest = condense(condenser, paper)
+
+        assert digest.overview == paper.abstract
+        assert digest.section_summaries["Model"] == "Summary of chunk 1."
+
+
+class TestDigestPrompts:
+    """Test that script prompts use the digest instead of the raw paper text."""
+
+    def test_script_prompt_uses_the_digest(self, tmp_path, paper, monkeypatch):
+        monkeypatch.setattr(digest_module, "llm_service", FakeLLMService())
+        digest = condense(PaperCondenser(cache_dir=tmp_path), paper)
+        client = GeminiClient.__new__(GeminiClient)
+
+        prompt = client._create_script_prompt(paper.title, "FULL PAPER TEXT", "pdf", digest)
+
+        assert "FULL PAPER TEXT" not in prompt
+        assert "Multi-head self-attention." in prompt and "Quadratic cost" in prompt
+        assert "FULL PAPER TEXT" in client._create_script_prompt(paper.title, "FULL PAPER TEXT", "pdf")
@@ -0,0 +1,91 @@
+"""
+Unit tests for the per-paper passage embedding index.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models.paper import PaperContent, Section
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from agents.passage_index import HashedTfidfEmbedder, PassageIndex, chunk_passages
+
+
+@pytest.fixture
+def paper_content():
+    """Paper with clearly separated topics per section."""
+    return PaperContent(
+        title="Attention Is All You Need",
+        authors=["Ashish Vaswani"],
+        abstract="We propose the Transformer, a sequence transduction model based solely on attention mechanisms.",
+        sections=[
+            Section(id="s1", title="Attention", level=1, content=(
+                "Scaled dot-product attention computes queries keys and values. "
+                "Multi-head attention runs several attention heads in parallel. " * 20
+            )),
+            Section(id="s2", title="Training", level=1, content=(
+                "We trained on eight GPUs with the Adam optimizer and a warmup learning rate schedule. " * 20
+            )),
+            Section(id="s3", title="Results", level=1, content=(
+                "The model achieves 28.4 BLEU on the WMT 2014 English-to-German translation task. " * 20
+            )),
+        ],
+    )
+
+
+@pytest.fixture
+def temp_dir():
+    path = Path(tempfile.mkdtemp())
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+class TestChunking:
+    """Test passage chunking."""
+
+    def test_long_sections_are_split_with_overlap(self, paper_content):
+        passages = chunk_passages(paper_content, max_words=50, overlap_words=10)
+
+        training = [p["text"].split() for p in passages if p["section"] == "Training"]
+        assert len(training) > 1
+        assert all(len(words) <= 50 for words in training)
+        assert training[0][-10:] == training[1][:10]
+
+
+class TestPassageIndex:
+    """Test embedding and search."""
+
+    def test_matrix_is_contiguous_float32_unit_rows(self, paper_content):
+        index = PassageIndex.build(paper_content, embedder=HashedTfidfEmbedder())
+
+        assert index.matrix.dtype == np.float32
+        assert index.matrix.flags["C_CONTIGUOUS"]
+        assert np.allclose(np.linalg.norm(index.matrix, axis=1), 1.0, atol=1e-5)
+
+    def test_search_returns_most_relevant_section_first(self, paper_content):
+        index = PassageIndex.build(paper_content, embedder=HashedTfidfEmbedder())
+
+        results = index.search("optimizer warmup learning rate on GPUs", k=3)
+
+        assert results[0][0]["section"] == "Training"
+        assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+    def test_save_and_load_memory_maps_matrix(self, paper_content, temp_dir):
+        index = PassageIndex.build(paper_content, embedder=HashedTfidfEmbedder())
+        index.save(temp_dir)
+
+        loaded = PassageIndex.load(temp_dir)
+
+        assert isinstance(loaded.matrix, np.memmap)
+        assert loaded.search("BLEU translation results", k=1)[0][0]["section"] == "Results"
+        assert loaded.context_for("BLEU translation results", k=1).startswith("[Results]")
@@ -0,0 +1,172 @@
+"""
+Unit tests for push-based job progress events.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models.state import ProcessingProgress, WorkflowStatus
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from config.backend.services.job_queue import COMPLETED, SQLiteJobQueue
+from config.backend.services.progress_hub import ProgressHub, ProgressPublisher, format_sse
+
+
+def payload():
+    return {"paper_input": {"type": "title", "content": "paper"}, "options": {}}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    job_queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3")
+    job_queue.enqueue("job", payload())
+    job_queue.claim("w1")
+    yield job_queue
+    job_queue.close()
+
+
+async def drain(subscription, timeout=0.2):
+    events = []
+    while not subscription.done:
+        event = await subscription.get(timeout=timeout)
+        if event is None:
+            break
+        events.append(event)
+    return events
+
+
+class TestProgressPublisher:
+    """Test turning progress updates into coalesced events."""
+
+    def test_progress_is_throttled_but_stages_are_not(self, queue):
+        publisher = ProgressPublisher(queue, "job", min_interval=60)
+
+        for step in range(10):
+            publisher.report("script", step * 2.0)
+        publisher.report("visual_plan", 25.0)
+        publisher.flush()
+
+        events = [(e["event"], e["data"]) for e in queue.events("job") if e["event"] != "status"]
+        assert [name for name, _ in events] == ["stage", "progress", "progress", "stage", "progress"]
+        # The held-back update published on the stage change is the newest one
+        assert events[2][1]["progress"] == 18.0
+        assert events[4][1]["eta_seconds"] is not None
+
+    def test_processing_progress_updates_are_published(self, queue):
+        publisher = ProgressPublisher(queue, "job", min_interval=0)
+        progress = ProcessingProgress()
+
+        with publisher.listen():
+            progress.detailed_status["scenes"] = {"scene_0": {"tts": "done", "render": "running"}}
+            progress.update_progress(WorkflowStatus.ANIMATING, 0.5, "Scene scene_0: render running")
+            progress.update_progress(WorkflowStatus.ANIMATING, 0.6, "Scene scene_0: render running")
+        progress.update_progress(WorkflowStatus.ANIMATING, 0.7, "Not published")
+
+        events = [e for e in queue.events("job") if e["event"] != "status"]
+        assert [e["event"] for e in events] == ["scene", "stage", "progress", "progress"]
+        assert events[0]["data"]["stages"]["render"] == "running"
+        assert events[-1]["data"]["stage"] == "animating"
+
+    def test_scene_updates_publish_scene_events(self, queue):
+        publisher = ProgressPublisher(queue, "job", min_interval=0)
+        progress = ProcessingProgress()
+        progress.update_progress(WorkflowStatus.ANIMATING, 0.0, "Starting rendering")
+
+        with publisher.listen():
+            progress.update_scene("scene_0", "render", "queued")
+            progress.update_scene("scene_1", "render", "queued")
+            progress.update_scene("scene_0", "render", "done", step_progress=0.5)
+
+        scene_events = [e["data"] for e in queue.events("job") if e["event"] == "scene"]
+        assert scene_events == [
+            {"scene_id": "scene_0", "stages": {"render": "queued"}},
+            {"scene_id": "scene_1", "stages": {"render": "queued"}},
+            {"scene_id": "scene_0", "stages": {"render": "done"}},
+        ]
+        assert progress.step_progress == 0.5
+
+
+class TestProgressHub:
+    """Test fan-out, coalescing and resuming of event streams."""
+
+    def test_fan_out_to_subscribers_until_the_job_finishes(self, queue):
+        hub = ProgressHub(queue, poll_interval=0.01)
+
+        async def scenario():
+            subscriptions = [hub.subscribe("job") for _ in range(3)]
+            queue.publish("job", "stage", {"stage": "script"})
+            queue.complete("job", "w1", {"video": None})
+            results = await asyncio.gather(*(drain(s) for s in subscriptions))
+            await hub.stop()
+            return subscriptions, results
+
+        subscriptions, results = asyncio.run(scenario())
+
+        for subscription, events in zip(subscriptions, results):
+            assert subscription.done
+            assert [e["event"] for e in events] == ["status", "status", "stage", "status"]
+            assert events[-1]["data"]["status"] == COMPLETED
+        assert hub.subscriber_count == 0
+
+    def test_resume_after_last_event_id(self, queue):
+        hub = ProgressHub(queue, poll_interval=0.01)
+        first = queue.publish("job", "stage", {"stage": "script"})
+        queue.publish("job", "stage", {"stage": "visual_plan"})
+
+        async def scenario():
+            subscription = hub.subscribe("job", last_event_id=first)
+            events = await drain(subscription, timeout=0.05)
+            await hub.stop()
+            return events
+
+        events = asyncio.run(scenario())
+
+        assert [e["data"]["stage"] for e in events] == ["visual_plan"]
+
+    def test_slow_subscribers_get_coalesced_progress(self, queue):
+        hub = ProgressHub(queue, poll_interval=0.01, max_pending=4)
+
+        async def scenario():
+            subscription = hub.subscribe("job")
+            assert (await subscription.get(timeout=1))["data"]["status"] == "queued"
+            for percent in range(50):
+                queue.publish("job", "progress", {"progress": float(percent)})
+                if percent == 25:
+                    queue.publish("job", "stage", {"stage": "animate"})
+            await asyncio.sleep(0.05)
+            events = await drain(subscription, timeout=0.05)
+            await hub.stop()
+            return events
+
+        events = asyncio.run(scenario())
+
+        assert [e["event"] for e in events] == ["status", "stage", "progress"]
+        assert events[-1]["data"]["progress"] == 49.0
+        assert [e["id"] for e in events] == sorted(e["id"] for e in events)
+
+    def test_finished_job_stream_ends_after_replay(self, queue):
+        queue.complete("job", "w1", {"video": None})
+        hub = ProgressHub(queue)
+        last = queue.last_event_id()
+
+        async def scenario():
+            subscription = hub.subscribe("job", last_event_id=last)
+            event = await subscription.get(timeout=1)
+            await hub.stop()
+            return subscription, event
+
+        subscription, event = asyncio.run(scenario())
+
+        assert event is None and subscription.done
+
+    def test_sse_format(self):
+        message = format_sse({"id": 7, "event": "progress", "data": {"progress": 12.5}})
+
+        assert message == 'id: 7\nevent: progress\ndata: {"progress": 12.5}\n\n'
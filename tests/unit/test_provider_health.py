@@ -0,0 +1,113 @@
+"""
+Unit tests for LLM provider health monitoring and circuit breaking.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import config.backend.config  # noqa: F401
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from agents.retry import CircuitBreaker, CircuitBreakerState
+from config.backend.services.provider_health import ProviderHealthMonitor
+
+
+PRIORITY = ["ollama", "openai", "anthropic", "google"]
+
+
+def make_monitor(available=None, **kwargs):
+    available = available or {}
+
+    def check(key):
+        async def run():
+            return available.get(key, True)
+        return run
+
+    return ProviderHealthMonitor({key: check(key) for key in PRIORITY}, **kwargs)
+
+
+class TestCircuitBreaker:
+    """Test the breaker methods used outside of ``call``."""
+
+    def test_opens_after_threshold_and_half_opens_after_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreakerState.OPEN and not breaker.allow_request()
+
+        time.sleep(0.06)
+        assert breaker.allow_request()
+        # allow_request only peeks; it does not change the state
+        assert breaker.state == CircuitBreakerState.OPEN
+
+    def test_success_closes_the_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreakerState.CLOSED and breaker.failure_count == 0
+
+
+class TestProviderHealthMonitor:
+    """Test cached health, circuit state and latency ordering."""
+
+    def test_order_keeps_unmeasured_providers_in_place(self):
+        monitor = make_monitor()
+
+        monitor.record_success("ollama", 0.5)
+        assert monitor.order(PRIORITY) == PRIORITY
+
+        monitor.record_success("anthropic", 0.2)
+        assert monitor.order(PRIORITY) == ["anthropic", "openai", "ollama", "google"]
+
+    def test_latency_is_smoothed(self):
+        monitor = make_monitor(ewma_alpha=0.5)
+
+        monitor.record_success("openai", 1.0)
+        monitor.record_success("openai", 3.0)
+
+        assert monitor.health["openai"].latency_ewma == 2.0
+        assert monitor.latency_samples("openai") == [1.0, 3.0]
+
+    def test_open_circuit_marks_provider_unhealthy(self):
+        monitor = make_monitor(failure_threshold=2, recovery_timeout=60)
+
+        monitor.record_failure("openai")
+        assert monitor.is_healthy("openai")
+        monitor.record_failure("openai")
+
+        assert not monitor.is_healthy("openai")
+        assert monitor.snapshot()["openai"]["circuit_state"] == "open"
+
+    def test_failed_health_check_keeps_provider_skipped_after_timeout(self):
+        monitor = make_monitor({"openai": False}, failure_threshold=1, recovery_timeout=0.01)
+
+        async def scenario():
+            monitor.record_failure("openai")
+            await asyncio.sleep(0.05)
+            return monitor.is_healthy("openai"), monitor.is_healthy("google")
+
+        openai_healthy, google_healthy = asyncio.run(scenario())
+
+        assert not openai_healthy and google_healthy
+
+    def test_start_runs_one_round_of_checks(self):
+        monitor = make_monitor({"google": False})
+
+        async def scenario():
+            await monitor.start()
+            await monitor.stop()
+
+        asyncio.run(scenario())
+
+        assert monitor.health["google"].available is False
+        assert monitor.health["ollama"].available is True
@@ -0,0 +1,159 @@
+"""
+Unit tests for incremental re-generation planning.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models import RASOMasterState
+from config.backend.models.paper import PaperInput, PaperInputType
+from config.backend.models.video import VideoAsset, VideoMetadata
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from core.checkpoint import SQLiteCheckpointStore, finish_checkpoints
+from core.regeneration import RegenerationPlanner, RegenerationService
+
+
+SCENES = ["s0", "s1", "s2"]
+
+
+def make_state(tmp_path, narration=None, parameters=None, options=None, missing=()):
+    """A finished run with real asset files; keyword arguments apply edits."""
+    narration = narration or {}
+    parameters = parameters or {}
+
+    def asset(name):
+        path = tmp_path / name
+        if name not in missing:
+            path.write_bytes(name.encode())
+        return str(path)
+
+    return SimpleNamespace(
+        options={"voice_speed": 1.0, "color_scheme": "default", "video_quality": "high", **(options or {})},
+        script=SimpleNamespace(scenes=[
+            SimpleNamespace(id=scene_id, title=scene_id, narration=narration.get(scene_id, f"About {scene_id}"))
+            for scene_id in SCENES
+        ]),
+        visual_plan=SimpleNamespace(scenes=[
+            SimpleNamespace(
+                scene_id=scene_id,
+                framework="manim",
+                template_id="title",
+                parameters=parameters.get(scene_id, {"text": scene_id}),
+                duration=10.0,
+            )
+            for scene_id in SCENES
+        ]),
+        audio=SimpleNamespace(scenes=[
+            SimpleNamespace(scene_id=scene_id, file_path=asset(f"{scene_id}.wav"), duration=10.0)
+            for scene_id in SCENES
+        ]),
+        animations=SimpleNamespace(scenes=[
+            SimpleNamespace(
+                scene_id=scene_id,
+                file_path=asset(f"{scene_id}.mp4"),
+                duration=10.0,
+                metadata=SimpleNamespace(render_duration=40.0),
+            )
+            for scene_id in SCENES
+        ]),
+        video=SimpleNamespace(file_path=asset("final.mp4"), duration=30.0),
+    )
+
+
+@pytest.fixture
+def planner(tmp_path):
+    return RegenerationPlanner(tmp_path / "graphs")
+
+
+class TestRegenerationPlanner:
+    """Test that edits rebuild only their dependent assets."""
+
+    def test_narration_edit_rebuilds_scene_audio_and_video(self, planner, tmp_path):
+        state = make_state(tmp_path)
+        edited = make_state(tmp_path, narration={"s1": "Rewritten"})
+
+        plan = planner.plan("job", state, edited)
+
+        assert plan.changed_inputs == ["text:s1"]
+        assert plan.rebuild == ["audio:s1", "video"]
+        assert "animation:s1" in plan.reused and "audio:s0" in plan.reused
+        # Three renders (40s each) and two narrations (3s each) are reused
+        assert plan.estimated_seconds_saved == pytest.approx(126.0)
+        assert plan.estimated_rebuild_seconds == pytest.approx(3.0 + 15.0)
+
+    def test_parameter_edit_rerenders_only_that_scene(self, planner, tmp_path):
+        plan = planner.plan(
+            "job", make_state(tmp_path), make_state(tmp_path, parameters={"s2": {"text": "New"}})
+        )
+
+        assert plan.rebuild == ["animation:s2", "video"]
+        assert plan.scenes_to_rebuild("animation") == ["s2"]
+        assert plan.scenes_to_rebuild("audio") == []
+
+    def test_grading_change_only_recomposes(self, planner, tmp_path):
+        plan = planner.plan("job", make_state(tmp_path), make_state(tmp_path, options={"color_scheme": "warm"}))
+
+        assert plan.changed_inputs == ["grading"]
+        assert plan.rebuild == ["video"]
+        assert len(plan.reused) == 6
+
+    def test_voice_change_rebuilds_all_narration(self, planner, tmp_path):
+        plan = planner.plan("job", make_state(tmp_path), make_state(tmp_path, options={"voice_speed": 1.2}))
+
+        assert plan.scenes_to_rebuild("audio") == SCENES
+        assert plan.scenes_to_rebuild("animation") == []
+
+    def test_missing_output_is_rebuilt(self, planner, tmp_path):
+        state = make_state(tmp_path, missing=("s0.mp4",))
+
+        plan = planner.plan("job", state, state)
+
+        assert plan.changed_inputs == []
+        assert plan.rebuild == ["animation:s0", "video"]
+
+    def test_unchanged_run_reuses_everything(self, planner, tmp_path):
+        state = make_state(tmp_path)
+
+        plan = planner.plan("job", state, state)
+
+        assert plan.rebuild == [] and not plan.rebuild_video
+        # Renders, narrations and the final composition
+        assert plan.to_dict()["estimated_seconds_saved"] == pytest.approx(3 * 40.0 + 3 * 3.0 + 15.0)
+
+
+class TestRegenerationService:
+    """Test that completed runs can be found for rebuilding."""
+
+    def test_completed_run_is_the_rebuild_source(self, planner, tmp_path):
+        store = SQLiteCheckpointStore(tmp_path / "checkpoints.sqlite3", RASOMasterState)
+        service = RegenerationService(planner, store)
+        state = RASOMasterState(
+            paper_input=PaperInput(type=PaperInputType.TITLE, content="Attention Is All You Need"),
+        )
+        store.save(state.job_id, "script", state)
+
+        with pytest.raises(ValueError):
+            service.last_successful_state(state.job_id)
+
+        state.video = VideoAsset(
+            file_path=str(tmp_path / "final.mp4"),
+            duration=30.0,
+            resolution="1920x1080",
+            file_size=1,
+            metadata=VideoMetadata(
+                title="Attention Is All You Need",
+                description="An educational explanation of the Transformer architecture and self-attention.",
+                tags=["ml"],
+            ),
+        )
+        finish_checkpoints(store, state.job_id, state)
+
+        assert service.last_successful_state(state.job_id).video.file_path == state.video.file_path
@@ -0,0 +1,107 @@
+"""
+Unit tests for the cost-model-driven render scheduler.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from agents.render_scheduler import RenderCostModel, RenderScheduler, predicted_makespan
+
+
+def scene_plan(scene_id: str, framework: str, duration: float, template_id: str = "default"):
+    return SimpleNamespace(scene_id=scene_id, framework=framework, duration=duration, template_id=template_id)
+
+
+def rendered(plan, render_duration: float, error_message=None):
+    return SimpleNamespace(
+        scene_id=plan.scene_id,
+        framework=plan.framework,
+        duration=plan.duration,
+        metadata=SimpleNamespace(
+            template_id=plan.template_id,
+            render_duration=render_duration,
+            predicted_render_duration=None,
+            error_message=error_message,
+        ),
+    )
+
+
+class TestRenderCostModel:
+    """Test prediction, learning and persistence."""
+
+    def test_longer_scenes_cost_more(self):
+        model = RenderCostModel()
+
+        assert model.predict("manim", "equation", 90) > model.predict("manim", "equation", 5)
+        assert model.predict("manim", None, 30) > model.predict("remotion", None, 30)
+
+    def test_learns_template_rate_from_observations(self):
+        model = RenderCostModel()
+        for _ in range(5):
+            model.observe("manim", "derivation", duration=10, render_time=205)
+
+        assert model.predict("manim", "derivation", 10) == pytest.approx(205, rel=0.01)
+        # The framework rate moves too, so unseen templates benefit
+        assert model.rate("manim", "unseen") == pytest.approx(20, rel=0.01)
+
+    def test_failed_renders_are_not_learned(self):
+        model = RenderCostModel()
+        plan = scene_plan("s1", "manim", 10)
+
+        assert not model.observe_scene(rendered(plan, 1.0, error_message="boom"))
+        assert model.rates == {}
+
+    def test_rates_persist(self, tmp_path):
+        path = tmp_path / "model.json"
+        model = RenderCostModel(path)
+        model.observe("remotion", "title", duration=5, render_time=30)
+        model.save()
+
+        assert RenderCostModel(path).predict("remotion", "title", 5) == model.predict("remotion", "title", 5)
+
+
+class TestRenderScheduler:
+    """Test longest-expected-first dispatch and timing reports."""
+
+    def test_queues_sorted_longest_first(self):
+        scheduler = RenderScheduler(RenderCostModel(), {"manim": 1})
+        plans = [scene_plan("title", "manim", 5), scene_plan("proof", "manim", 90), scene_plan("mid", "manim", 30)]
+
+        queues = scheduler.plan(plans)
+
+        assert [job.scene_id for job in queues["manim"]] == ["proof", "mid", "title"]
+
+    def test_predicted_makespan_balances_workers(self):
+        # In script order two workers would finish at 20 and 60
+        assert predicted_makespan([10, 10, 10, 10, 40], 2) == 40
+
+    @pytest.mark.asyncio
+    async def test_run_dispatches_by_cost_and_reports_timings(self):
+        scheduler = RenderScheduler(RenderCostModel(), {"manim": 1, "remotion": 1})
+        plans = [
+            scene_plan("intro", "remotion", 5),
+            scene_plan("short", "manim", 5),
+            scene_plan("derivation", "manim", 60),
+        ]
+        started = []
+
+        async def render(plan):
+            started.append(plan.scene_id)
+            await asyncio.sleep(0)
+            return rendered(plan, render_duration=plan.duration * 2)
+
+        jobs = await scheduler.run(plans, render)
+        report = scheduler.report(jobs)
+
+        assert started.index("derivation") < started.index("short")
+        assert [job.scene_id for job in jobs] == ["intro", "short", "derivation"]
+        assert jobs[2].result.metadata.predicted_render_duration == jobs[2].predicted
+        assert report["jobs"][2]["actual"] == 120
+        assert report["mean_absolute_error"] is not None
+        assert "manim/default" in scheduler.cost_model.rates
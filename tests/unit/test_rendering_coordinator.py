@@ -0,0 +1,197 @@
+"""
+Unit tests for concurrent per-framework rendering in the RenderingCoordinator.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models import AgentType, RASOMasterState
+from config.backend.models.state import progress_listener
+from config.backend.models.paper import PaperInput, PaperInputType
+from config.backend.models.visual import ScenePlan, VisualPlan
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+import agents.rendering as rendering_module
+from agents.render_scheduler import RenderCostModel
+from agents.rendering import RenderingCoordinator, RenderingResult
+from core.templates import TemplateFramework
+from core.resource_governor import ResourceGovernor
+from core.workflow import WorkflowOrchestrator
+
+
+class FakeRenderAgent:
+    """Renders a scene by sleeping; optionally fails for some scenes."""
+
+    def __init__(self, framework: str, tmp_path, latency: float = 0.2, failing=()):
+        self.framework = framework
+        self.tmp_path = tmp_path
+        self.latency = latency
+        self.failing = set(failing)
+        self.rendered = []
+        self.placeholders = []
+        self.prepared = []
+        self.released = 0
+
+    async def prepare_scenes(self, scene_plans):
+        self.prepared.append([plan.scene_id for plan in scene_plans])
+
+    async def release_scenes(self):
+        self.released += 1
+
+    async def render_scene_with_fallback(self, scene_plan):
+        await asyncio.sleep(self.latency)
+        if scene_plan.scene_id in self.failing:
+            raise RuntimeError(f"{self.framework} crashed")
+
+        output_path = self.tmp_path / f"{scene_plan.scene_id}.mp4"
+        output_path.write_bytes(b"video")
+        self.rendered.append(scene_plan.scene_id)
+        return RenderingResult(
+            success=True,
+            output_path=str(output_path),
+            duration=scene_plan.duration,
+            resolution="1920x1080",
+            file_size=5,
+            render_time=self.latency,
+        )
+
+    async def _create_scene_placeholder(self, scene_plan, output_path):
+        self.placeholders.append((scene_plan.scene_id, output_path))
+        return True
+
+
+def scene_plan(scene_id: str, framework: str) -> ScenePlan:
+    return ScenePlan(scene_id=scene_id, framework=framework, template_id="default", parameters={}, duration=10.0)
+
+
+def make_state(*plans: ScenePlan) -> RASOMasterState:
+    return RASOMasterState(
+        paper_input=PaperInput(type=PaperInputType.TITLE, content="Attention Is All You Need"),
+        visual_plan=VisualPlan(scenes=list(plans), total_duration=sum(plan.duration for plan in plans)),
+    )
+
+
+@pytest.fixture
+def coordinator(tmp_path, monkeypatch):
+    monkeypatch.setattr(rendering_module, "get_render_cost_model", lambda: RenderCostModel(tmp_path / "costs.json"))
+    # Enough CPU slots for one render per framework, independent of the test machine
+    governor = ResourceGovernor({"cpu": 8, "memory_mb": 64000})
+    monkeypatch.setattr(rendering_module, "get_resource_governor", lambda: governor)
+    coordinator = RenderingCoordinator(AgentType.RENDERING)
+    coordinator.config.temp_path = str(tmp_path)
+    coordinator.agents = {
+        TemplateFramework.MANIM: FakeRenderAgent("manim", tmp_path),
+        TemplateFramework.MOTION_CANVAS: FakeRenderAgent("motion-canvas", tmp_path),
+        TemplateFramework.REMOTION: FakeRenderAgent("remotion", tmp_path),
+    }
+    return coordinator
+
+
+class TestRenderingCoordinator:
+    """Test concurrent per-framework rendering and failure isolation."""
+
+    def test_frameworks_render_concurrently(self, coordinator):
+        state = make_state(
+            scene_plan("s1", "manim"),
+            scene_plan("s2", "motion-canvas"),
+            scene_plan("s3", "remotion"),
+        )
+
+        started = time.monotonic()
+        result = asyncio.run(coordinator.execute(state))
+        elapsed = time.monotonic() - started
+
+        # Three 0.2s renders on three framework pools take about one render, not three
+        assert elapsed < 0.5
+        assert [scene.scene_id for scene in result.animations.scenes] == ["s1", "s2", "s3"]
+        assert [scene.framework for scene in result.animations.scenes] == ["manim", "motion-canvas", "remotion"]
+        assert coordinator.last_metrics["failed"] == 0
+        assert coordinator.last_metrics["sequential_time"] > coordinator.last_metrics["makespan"]
+
+    def test_makespan_is_the_slowest_framework_queue(self, coordinator, monkeypatch):
+        monkeypatch.setitem(coordinator.config.animation.render_workers, "manim", 1)
+        coordinator.agents[TemplateFramework.MOTION_CANVAS].latency = 0.05
+        coordinator.agents[TemplateFramework.REMOTION].latency = 0.05
+        state = make_state(
+            scene_plan("s1", "manim"),
+            scene_plan("s2", "manim"),
+            scene_plan("s3", "motion-canvas"),
+            scene_plan("s4", "remotion"),
+        )
+
+        asyncio.run(coordinator.execute(state))
+
+        # One Manim worker renders its two 0.2s scenes back to back; the other queues finish early
+        metrics = coordinator.last_metrics
+        slowest_queue = max(metrics["framework_busy_time"].values())
+        assert metrics["framework_busy_time"]["manim"] == slowest_queue
+        assert slowest_queue <= metrics["makespan"] < slowest_queue + 0.1
+
+    def test_scenes_are_prepared_before_and_released_after_rendering(self, coordinator):
+        state = make_state(scene_plan("s1", "remotion"), scene_plan("s2", "manim"), scene_plan("s3", "remotion"))
+
+        asyncio.run(coordinator.execute(state))
+
+        remotion = coordinator.agents[TemplateFramework.REMOTION]
+        assert remotion.prepared == [["s1", "s3"]]
+        assert coordinator.agents[TemplateFramework.MOTION_CANVAS].prepared == []
+        assert all(agent.released == 1 for agent in coordinator.agents.values())
+
+    def test_scene_render_status_is_reported(self, coordinator):
+        coordinator.agents[TemplateFramework.MANIM].failing = {"s2"}
+        state = make_state(scene_plan("s1", "manim"), scene_plan("s2", "manim"))
+        updates = []
+
+        token = progress_listener.set(lambda progress: updates.append(progress.copy(deep=True)))
+        try:
+            asyncio.run(coordinator.execute(state))
+        finally:
+            progress_listener.reset(token)
+
+        assert updates[1].detailed_status["scenes"] == {"s1": {"render": "queued"}, "s2": {"render": "queued"}}
+        assert state.progress.detailed_status["scenes"] == {"s1": {"render": "done"}, "s2": {"render": "failed"}}
+        assert state.progress.step_progress == 1.0
+
+    def test_failed_scene_gets_a_placeholder(self, coordinator):
+        manim = coordinator.agents[TemplateFramework.MANIM]
+        manim.failing = {"s2"}
+        state = make_state(scene_plan("s1", "manim"), scene_plan("s2", "manim"), scene_plan("s3", "remotion"))
+
+        result = asyncio.run(coordinator.execute(state))
+
+        scenes = {scene.scene_id: scene for scene in result.animations.scenes}
+        assert len(scenes) == 3
+        assert scenes["s2"].metadata.error_message == "manim crashed"
+        assert scenes["s2"].file_path.endswith("rendered_s2.mp4")
+        assert [scene_id for scene_id, _ in manim.placeholders] == ["s2"]
+        assert scenes["s1"].metadata.error_message is None
+        assert coordinator.last_metrics["failed"] == 1
+
+
+class TestAnimationRouting:
+    """Test that mixed-framework plans go to the concurrent rendering node."""
+
+    def test_mixed_frameworks_route_to_parallel_rendering(self):
+        orchestrator = WorkflowOrchestrator.__new__(WorkflowOrchestrator)
+
+        mixed = make_state(scene_plan("s1", "manim"), scene_plan("s2", "remotion"))
+        single = make_state(scene_plan("s1", "manim"), scene_plan("s2", "manim"))
+
+        assert orchestrator._route_animation(mixed) == "parallel"
+        assert orchestrator._route_animation(single) == "manim"
+
+    def test_parallel_node_joins_the_animation_branch(self):
+        orchestrator = WorkflowOrchestrator.__new__(WorkflowOrchestrator)
+
+        graph = orchestrator._build_graph()
+
+        assert "animate_parallel" in graph.nodes
+        assert ("animate_parallel", "animation_done") in graph.edges
@@ -0,0 +1,128 @@
+"""
+Unit tests for the process-wide resource governor.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from core.resource_governor import ResourceGovernor, job_scope, work_cost
+
+
+async def hold(governor, job, log, seconds=0.02, **amounts):
+    """Acquire resources for a job and record the order of grants."""
+    with job_scope(job):
+        async with governor.acquire(**amounts):
+            log.append(job)
+            await asyncio.sleep(seconds)
+
+
+class TestResourceGovernor:
+    """Test weighted limits, fairness and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_weighted_capacity_is_never_exceeded(self):
+        governor = ResourceGovernor({"cpu": 4, "memory_mb": 3000})
+        peak = {"cpu": 0.0, "memory_mb": 0.0}
+
+        async def work(cpu, memory_mb):
+            async with governor.acquire(cpu=cpu, memory_mb=memory_mb):
+                for name in peak:
+                    peak[name] = max(peak[name], governor.in_use[name])
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[work(2, 1024) for _ in range(6)], *[work(1, 512) for _ in range(4)])
+
+        assert peak["cpu"] <= 4 and peak["memory_mb"] <= 3000
+        assert governor.in_use == {"cpu": 0.0, "memory_mb": 0.0}
+
+    @pytest.mark.asyncio
+    async def test_oversized_request_runs_alone(self):
+        governor = ResourceGovernor({"memory_mb": 1000})
+
+        async with governor.acquire(memory_mb=5000, gpu=1):
+            assert governor.in_use["memory_mb"] == 1000
+
+    @pytest.mark.asyncio
+    async def test_waiting_jobs_are_served_fairly(self):
+        governor = ResourceGovernor({"cpu": 1})
+        log = []
+
+        # Job "a" queues many requests before job "b" asks for one
+        tasks = [asyncio.create_task(hold(governor, "a", log, cpu=1)) for _ in range(4)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(hold(governor, "b", log, cpu=1)))
+        await asyncio.gather(*tasks)
+
+        # "b" takes turns with "a" instead of waiting for all of "a"'s queued work
+        assert log == ["a", "a", "b", "a", "a"]
+
+    @pytest.mark.asyncio
+    async def test_large_request_is_not_starved(self):
+        governor = ResourceGovernor({"cpu": 2})
+        log = []
+
+        first = asyncio.create_task(hold(governor, "small", log, cpu=1))
+        await asyncio.sleep(0)
+        big = asyncio.create_task(hold(governor, "big", log, cpu=2))
+        await asyncio.sleep(0)
+        later = asyncio.create_task(hold(governor, "later", log, cpu=1))
+        await asyncio.gather(first, big, later)
+
+        assert log == ["small", "big", "later"]
+
+    @pytest.mark.asyncio
+    async def test_waiting_request_only_holds_back_its_own_resources(self):
+        governor = ResourceGovernor({"cpu": 2, "llm": 1})
+        log = []
+
+        render = asyncio.create_task(hold(governor, "render", log, seconds=0.05, cpu=1))
+        await asyncio.sleep(0)
+        big = asyncio.create_task(hold(governor, "big", log, cpu=2))
+        await asyncio.sleep(0)
+        # An LLM call does not compete with the waiting render for CPU
+        llm = asyncio.create_task(hold(governor, "llm", log, llm=1))
+        await asyncio.sleep(0.01)
+
+        assert log == ["render", "llm"]
+        await asyncio.gather(render, big, llm)
+        assert log == ["render", "llm", "big"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak(self):
+        governor = ResourceGovernor({"cpu": 1})
+        log = []
+
+        holder = asyncio.create_task(hold(governor, "a", log, seconds=0.05, cpu=1))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold(governor, "b", log, cpu=1))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await holder
+
+        assert log == ["a"]
+        assert governor.in_use["cpu"] == 0 and governor.metrics()["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_metrics(self):
+        governor = ResourceGovernor({"cpu": 1, "llm": 2})
+        await asyncio.gather(*[hold(governor, "job", [], cpu=1) for _ in range(3)])
+
+        metrics = governor.metrics()
+
+        assert metrics["grants"] == 3 and metrics["waits"] == 2
+        assert metrics["max_wait_seconds"] > 0
+        assert metrics["resources"]["cpu"]["peak"] == 1
+        assert 0.5 < metrics["resources"]["cpu"]["utilization"] <= 1.0
+        assert metrics["resources"]["llm"]["utilization"] == 0
+        assert metrics["active_by_job"] == {}
+
+
+def test_work_cost_scales_memory_with_resolution():
+    assert work_cost("render", "1920x1080")["memory_mb"] == work_cost("render")["memory_mb"]
+    assert work_cost("render", "3840x2160")["memory_mb"] == 4 * work_cost("render")["memory_mb"]
+    assert work_cost("render", "1280x720")["cpu"] == 1
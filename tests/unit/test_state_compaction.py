@@ -0,0 +1,202 @@
+"""
+Unit tests for reference-based state compaction.
+"""
+
+import base64
+import os
+import sys
+import timeit
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models import (
+    AudioAssets,
+    AudioScene,
+    BlobRef,
+    Figure,
+    PaperContent,
+    PaperInput,
+    PaperInputType,
+    RASOMasterState,
+    Section,
+    loading_payloads,
+    trusted_refs,
+)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from config.backend.models.blobs import PayloadField
+from core.blob_store import BlobStore
+
+
+def make_state(section_words: int = 400) -> RASOMasterState:
+    sections = [
+        Section(
+            id=f"s{i}",
+            title=f"Section {i}",
+            content=" ".join(f"word{i}_{n}" for n in range(section_words)),
+            level=1,
+        )
+        for i in range(3)
+    ]
+    return RASOMasterState(
+        job_id="job",
+        paper_input=PaperInput(type=PaperInputType.PDF, content=base64.b64encode(b"%PDF" * 2000).decode()),
+        paper_content=PaperContent(
+            title="Attention Is All You Need",
+            authors=["Ashish Vaswani"],
+            abstract="The dominant sequence transduction models are based on complex neural networks.",
+            sections=sections + [Section(id="short", title="Short", content="A short closing section.", level=1)],
+            figures=[Figure(id="f1", caption="Model architecture", image_data=b"\x89PNG" * 1000, section_id="s0")],
+        ),
+        audio=AudioAssets(
+            scenes=[
+                AudioScene(
+                    scene_id="scene_0",
+                    file_path="scene_0.wav",
+                    duration=60.0,
+                    transcript="Transformers replace recurrence with attention.",
+                    timing_markers=[
+                        {"word": f"w{n}", "start_time": n * 0.3, "end_time": n * 0.3 + 0.25}
+                        for n in range(200)
+                    ],
+                )
+            ],
+            total_duration=60.0,
+        ),
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(tmp_path / "blobs")
+
+
+class TestStateCompaction:
+    """Test moving large payloads to the blob store and back."""
+
+    def test_compact_and_hydrate_round_trip(self, store):
+        state = make_state()
+        compact = state.compact(store)
+
+        assert isinstance(compact.paper_input.content, BlobRef)
+        assert isinstance(compact.paper_content.sections[0].content, BlobRef)
+        assert isinstance(compact.paper_content.figures[0].image_data, BlobRef)
+        assert isinstance(compact.audio.scenes[0].timing_markers, BlobRef)
+        assert len(compact.json()) < 4096
+
+        assert compact.hydrate(store).dict() == state.dict()
+
+    def test_small_payloads_stay_inline(self, store):
+        compact = make_state().compact(store)
+
+        assert compact.paper_content.get_section_by_id("short").content == "A short closing section."
+
+    def test_unchanged_models_are_shared(self, store):
+        state = make_state()
+        compact = state.compact(store)
+
+        # Copy-on-write: only models on the way to a moved payload are copied
+        assert compact.paper_content.sections[3] is state.paper_content.sections[3]
+        assert compact.paper_content.abstract is state.paper_content.abstract
+        assert compact.options is state.options
+        # Compacting a compact state, or hydrating an inline one, is free
+        assert compact.compact(store) is compact
+        assert state.hydrate(store) is state
+
+    def test_serialized_state_keeps_typed_references(self, store):
+        compact = make_state().compact(store)
+
+        with trusted_refs():
+            restored = RASOMasterState.parse_raw(compact.json())
+
+        assert restored.paper_content.sections[0].content == compact.paper_content.sections[0].content
+        assert isinstance(restored.audio.scenes[0].timing_markers, BlobRef)
+        assert restored.hydrate(store).audio.scenes[0].timing_markers[0]["word"] == "w0"
+
+    def test_identical_payloads_are_stored_once(self, store):
+        first = make_state().compact(store)
+        second = make_state().compact(store)
+
+        assert first.paper_input.content == second.paper_input.content
+        assert sum(1 for path in store.root.rglob("*") if path.is_file()) == 6
+
+    def test_missing_blob_raises(self, tmp_path, store):
+        compact = make_state().compact(store)
+
+        with pytest.raises(KeyError):
+            compact.hydrate(BlobStore(tmp_path / "elsewhere"))
+
+
+class TestPayloadReferences:
+    """Test that references only come from the workflow and load on access."""
+
+    def test_input_cannot_reference_blobs(self, store):
+        digest = make_state().compact(store).paper_input.content.digest
+        reference = {"digest": digest, "size": 8000, "kind": "text"}
+
+        with pytest.raises(ValueError):
+            PaperInput(type=PaperInputType.PDF, content=reference)
+        with pytest.raises(ValueError):
+            Section(id="s1", title="Introduction", content=reference, level=1)
+
+    def test_digest_must_be_sha256_hex(self, store):
+        reference = {"digest": "../../../../../../etc/hostname", "size": 8, "kind": "text"}
+
+        with trusted_refs(), pytest.raises(ValueError):
+            PaperInput(type=PaperInputType.PDF, content=reference)
+        with pytest.raises(ValueError):
+            store.get("../../../../../../etc/hostname")
+
+    def test_payloads_load_on_access(self, store):
+        state = make_state()
+        compact = state.compact(store)
+
+        with loading_payloads(store):
+            assert compact.paper_content.sections[0].content == state.paper_content.sections[0].content
+            assert compact.audio.scenes[0].get_timing_at_position(0.1)["word"] == "w0"
+            # Reading a payload does not inline it into the state
+            assert len(compact.json()) < 4096
+
+        assert isinstance(compact.paper_content.sections[0].content, BlobRef)
+
+    def test_adding_a_marker_inlines_referenced_markers(self, store):
+        scene = make_state().compact(store).audio.scenes[0]
+
+        with loading_payloads(store):
+            scene.add_timing_marker("end", 60.0, 60.5)
+
+        assert len(scene.timing_markers) == 201
+        assert scene.timing_markers[-1]["word"] == "end"
+
+    def test_only_payload_fields_load_references(self):
+        wrapped = {
+            model.__name__: sorted(name for name, attr in vars(model).items() if isinstance(attr, PayloadField))
+            for model in (PaperInput, Section, Figure, AudioScene)
+        }
+
+        assert wrapped == {
+            "PaperInput": ["content"], "Section": ["content"],
+            "Figure": ["image_data"], "AudioScene": ["timing_markers"],
+        }
+
+    def test_reading_other_fields_costs_the_same_as_a_plain_model(self):
+        section = make_state().paper_content.sections[0]
+        plain = make_state().paper_content  # PaperContent has no payload fields
+
+        def per_read(owner, field):
+            return min(timeit.repeat(f"owner.{field}", globals={"owner": owner}, number=100_000, repeat=5))
+
+        # Generous bound against timer noise; before, every read went through __getattribute__ (~10x)
+        assert per_read(section, "title") < 2 * per_read(plain, "title")
+
+    def test_assigned_payloads_replace_references(self, store):
+        section = make_state().compact(store).paper_content.sections[0]
+
+        section.content = "Rewritten section text for the scene."
+
+        assert section.content == section.dict()["content"] == "Rewritten section text for the scene."
+        assert "content" in section.__fields_set__
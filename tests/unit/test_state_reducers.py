@@ -0,0 +1,74 @@
+"""
+Unit tests for the RASOMasterState reducers that merge the parallel
+animation and narration branches.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models.state import (
+    AgentError,
+    AgentType,
+    ErrorSeverity,
+    ProcessingProgress,
+    WorkflowStatus,
+    latest_timestamp,
+    merge_errors,
+    merge_progress,
+)
+
+
+def error(code: str, agent_type: AgentType = AgentType.VOICE) -> AgentError:
+    return AgentError(agent_type=agent_type, error_code=code, message=f"{code} happened", severity=ErrorSeverity.WARNING)
+
+
+def branch_progress(base: ProcessingProgress, step: WorkflowStatus, at: datetime) -> ProcessingProgress:
+    progress = base.copy(deep=True)
+    progress.update_progress(step, 1.0, f"Completed {step.value}")
+    progress.complete_step(step)
+    progress.last_update = at
+    return progress
+
+
+class TestBranchReducers:
+    """Test merging of fields both branches write."""
+
+    def test_errors_from_both_branches_are_kept_once(self):
+        shared = error("SCRIPT_WARNING", AgentType.SCRIPT)
+        animation = [shared, error("RENDER_FAILED", AgentType.RENDERING)]
+        narration = [shared, error("TTS_FALLBACK")]
+
+        merged = merge_errors(animation, narration)
+
+        assert [e.error_code for e in merged] == ["SCRIPT_WARNING", "RENDER_FAILED", "TTS_FALLBACK"]
+
+    def test_sequential_update_is_a_no_op_merge(self):
+        existing = [error("A")]
+        added = error("B")
+
+        assert merge_errors(existing, existing + [added]) == existing + [added]
+        assert merge_errors(existing, existing) == existing
+
+    def test_progress_keeps_completed_steps_of_both_branches(self):
+        base = ProcessingProgress()
+        base.complete_step(WorkflowStatus.PLANNING)
+        now = datetime.now()
+
+        narration = branch_progress(base, WorkflowStatus.AUDIO_PROCESSING, now)
+        animation = branch_progress(base, WorkflowStatus.ANIMATING, now + timedelta(seconds=30))
+
+        merged = merge_progress(narration, animation)
+
+        assert set(merged.completed_steps) == {
+            WorkflowStatus.PLANNING, WorkflowStatus.AUDIO_PROCESSING, WorkflowStatus.ANIMATING
+        }
+        assert merged.current_step == WorkflowStatus.ANIMATING
+        assert merged.overall_progress >= 0.5
+
+    def test_latest_timestamp(self):
+        earlier, later = datetime(2024, 1, 1), datetime(2024, 1, 2)
+        assert latest_timestamp(later, earlier) == later
+        assert latest_timestamp(None, earlier) == earlier
@@ -0,0 +1,142 @@
+"""
+Unit tests for incremental scene parsing of streamed script responses.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import config.backend.config  # noqa: F401
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from config.backend.services.stream_parser import IncrementalSceneParser, parse_scene_stream
+from services.gemini_client import GeminiClient
+
+
+def make_script(scene_count: int) -> str:
+    """Build a script response as a model would return it."""
+    script = {
+        "title": "A {tricky} \"title\" with [brackets]",
+        "metadata": {"scenes": "not the scene array"},
+        "scenes": [
+            {
+                "id": f"scene_{i}",
+                "narration": "Braces } and brackets ] inside \\\"strings\\\"" * (i + 1),
+                "key_concepts": ["a", {"nested": [1, 2]}],
+            }
+            for i in range(scene_count)
+        ],
+    }
+    return "```json\n" + json.dumps(script, indent=2) + "\n```"
+
+
+class TestIncrementalSceneParser:
+    """Test the incremental scene parser."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 100000])
+    def test_emits_all_scenes_in_order_for_any_chunking(self, chunk_size):
+        text = make_script(5)
+        parser = IncrementalSceneParser()
+
+        scenes = []
+        for i in range(0, len(text), chunk_size):
+            scenes.extend(parser.feed(text[i:i + chunk_size]))
+
+        assert [scene["id"] for scene in scenes] == [f"scene_{i}" for i in range(5)]
+        assert scenes[2]["key_concepts"] == ["a", {"nested": [1, 2]}]
+
+    def test_scene_is_emitted_as_soon_as_it_closes(self):
+        text = make_script(3)
+        second_scene = text.index('"scene_1"')
+
+        parser = IncrementalSceneParser()
+        scenes = parser.feed(text[:second_scene])
+
+        assert [scene["id"] for scene in scenes] == ["scene_0"]
+
+    def test_bare_array_is_treated_as_scene_array(self):
+        parser = IncrementalSceneParser()
+
+        scenes = parser.feed('[{"id": "a"}, {"id": "b"}]')
+
+        assert [scene["id"] for scene in scenes] == ["a", "b"]
+
+    def test_malformed_scene_is_skipped(self):
+        parser = IncrementalSceneParser()
+
+        scenes = parser.feed('{"scenes": [{"id": "a",}, {"id": "b"}]}')
+
+        assert [scene["id"] for scene in scenes] == ["b"]
+
+
+class TestParseSceneStream:
+    """Test the async scene stream wrapper."""
+
+    def test_records_time_to_first_scene(self):
+        text = make_script(4)
+
+        async def chunks():
+            for i in range(0, len(text), 50):
+                await asyncio.sleep(0)
+                yield text[i:i + 50]
+
+        async def collect(metrics):
+            return [scene async for scene in parse_scene_stream(chunks(), metrics=metrics)]
+
+        metrics = {}
+        scenes = asyncio.run(collect(metrics))
+
+        assert len(scenes) == 4
+        assert metrics["scene_count"] == 4
+        assert metrics["text"] == text
+        assert 0 <= metrics["time_to_first_chunk"] <= metrics["time_to_first_scene"] <= metrics["total_time"]
+
+
+class TestGeminiScriptStream:
+    """Test failure handling of GeminiClient.generate_script_stream."""
+
+    def make_client(self, text, fail_after=None):
+        client = GeminiClient.__new__(GeminiClient)
+        client.script_model = "gemini-test"
+        client._create_script_prompt = lambda *args: "prompt"
+
+        async def stream_text(model_name, prompt, use_cache=True):
+            for i in range(0, len(text), 20):
+                if fail_after is not None and i >= fail_after:
+                    raise ConnectionError("stream dropped")
+                yield text[i:i + 20]
+
+        client._stream_text = stream_text
+        return client
+
+    def test_mid_stream_failure_is_raised_and_marked_partial(self):
+        text = make_script(4)
+        client = self.make_client(text, fail_after=text.index('"scene_2"'))
+        scenes = []
+
+        async def collect():
+            async for scene in client.generate_script_stream("Title", "content"):
+                scenes.append(scene)
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(collect())
+
+        assert [scene["id"] for scene in scenes] == ["scene_0", "scene_1"]
+        assert client.last_stream_metrics["partial"] is True
+
+    def test_failure_before_any_scene_uses_the_fallback(self):
+        client = self.make_client(make_script(4), fail_after=0)
+        client._create_fallback_script = lambda title, content: {"scenes": [{"id": "fallback"}]}
+
+        async def collect():
+            return [scene async for scene in client.generate_script_stream("Title", "content")]
+
+        assert asyncio.run(collect()) == [{"id": "fallback"}]
+        assert "partial" not in client.last_stream_metrics
@@ -0,0 +1,93 @@
+"""
+Unit tests for running the streaming execution mode through the orchestrator.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models import AgentType, RASOMasterState, WorkflowStatus
+from config.backend.models.paper import PaperInput, PaperInputType
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+import core.streaming_workflow as streaming_module
+from core.checkpoint import FINAL_NODE, SQLiteCheckpointStore
+from core.streaming_workflow import StreamingWorkflow
+from core.workflow import WorkflowOrchestrator
+
+
+class FakeAgent:
+    """Paper-stage agent that records its runs."""
+
+    def __init__(self, agent_type, runs):
+        self.agent_type = agent_type
+        self.name = agent_type.value
+        self.runs = runs
+
+    async def safe_execute(self, state):
+        self.runs.append(self.agent_type.value)
+        state.current_agent = self.agent_type
+        return state
+
+
+class FakeAgentRegistry:
+    def __init__(self):
+        self.runs = []
+
+    def get_agent(self, agent_type):
+        return FakeAgent(agent_type, self.runs)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = FakeAgentRegistry()
+    monkeypatch.setattr(streaming_module, "agent_registry", registry)
+    monkeypatch.setattr(streaming_module, "get_streaming_workflow", lambda: StreamingWorkflow())
+    return registry
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteCheckpointStore(tmp_path / "checkpoints.sqlite3", RASOMasterState)
+
+
+def make_state() -> RASOMasterState:
+    return RASOMasterState(
+        paper_input=PaperInput(type=PaperInputType.TITLE, content="Attention Is All You Need"),
+    )
+
+
+class TestStreamingExecution:
+    """Test that streaming mode gets the orchestrator's error handling and checkpoints."""
+
+    def test_missing_script_fails_the_job_instead_of_raising(self, registry, store):
+        orchestrator = WorkflowOrchestrator(checkpoint_store=store)
+        state = make_state()
+
+        result = asyncio.run(orchestrator.execute_workflow(state, mode="streaming"))
+
+        assert result.progress.current_step == WorkflowStatus.FAILED
+        assert any(error.error_code == "WORKFLOW_ERROR" for error in result.errors)
+        # Paper-level stages are checkpointed for resume under the graph's node names
+        assert orchestrator.get_resume_point(state.job_id) == ["ingest", "understand", "script", "visual_plan"]
+
+    def test_completed_job_is_marked_and_checkpointed(self, registry, store, monkeypatch):
+        async def stream_scenes(self, state):
+            state.current_agent = AgentType.METADATA
+            return state
+
+        monkeypatch.setattr(StreamingWorkflow, "_stream_scenes", stream_scenes)
+        orchestrator = WorkflowOrchestrator(checkpoint_store=store)
+        state = make_state()
+
+        result = asyncio.run(orchestrator.execute_workflow(state, mode="streaming"))
+
+        assert result.progress.current_step == WorkflowStatus.COMPLETED
+        assert registry.runs == ["ingest", "understanding", "script", "visual_planning", "metadata"]
+        assert store.latest(state.job_id)[0] == FINAL_NODE
@@ -0,0 +1,88 @@
+"""
+Unit tests for the local title search index used by paper ingestion.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from agents.title_index import TitleIndex, normalize_title, title_similarity
+
+
+class TestTitleNormalization:
+    """Test title normalization and similarity."""
+
+    def test_punctuation_and_latex_are_ignored(self):
+        assert normalize_title("BERT: Pre-training of Deep Bidirectional Transformers") == \
+            normalize_title("{BERT} pre-training of deep   bidirectional transformers")
+        assert normalize_title(r"Attention Is All You Need \textit{}") == "attention is all you need"
+
+    def test_similarity_bounds(self):
+        assert title_similarity("Attention Is All You Need", "attention is all you need!") == 1.0
+        assert title_similarity("Attention Is All You Need", "Deep Residual Learning") < 0.3
+        assert title_similarity("", "") == 0.0
+
+
+class TestTitleIndex:
+    """Test index lookups and persistence."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_path = Path(self.temp_dir) / "title_index.json"
+        self.index = TitleIndex(index_path=self.index_path)
+        self.index.add("1706.03762", "Attention Is All You Need")
+        self.index.add("1512.03385", "Deep Residual Learning for Image Recognition")
+        self.index.add("1810.04805", "BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_exact_match_after_normalization(self):
+        match = self.index.best_match("attention is all you need.")
+        assert match is not None
+        assert match[0] == "1706.03762"
+        assert match[2] == 1.0
+
+    def test_near_duplicate_match_is_ranked_first(self):
+        results = self.index.search("Deep Residual Learning for Image Recognitio", min_similarity=0.5)
+        assert results
+        assert results[0][0] == "1512.03385"
+
+    def test_miss_returns_none(self):
+        assert self.index.best_match("Generative Adversarial Networks") is None
+
+    def test_replacing_entry_updates_lookup(self):
+        self.index.add("1706.03762", "Attention Is Not All You Need")
+        assert self.index.best_match("Attention Is Not All You Need")[0] == "1706.03762"
+        assert len(self.index) == 3
+
+    def test_save_and_load_roundtrip(self):
+        self.index.save()
+        reloaded = TitleIndex(index_path=self.index_path)
+        assert len(reloaded) == 3
+        assert reloaded.best_match("BERT pre-training of deep bidirectional transformers "
+                                   "for language understanding")[0] == "1810.04805"
+
+    @pytest.mark.parametrize("as_jsonl", [True, False])
+    def test_import_metadata_dump(self, as_jsonl):
+        records = [
+            {"id": "1406.2661", "title": "Generative Adversarial Networks"},
+            {"id": "1412.6980", "title": "Adam: A Method for Stochastic Optimization"},
+            {"id": "missing-title"},
+        ]
+        dump_path = Path(self.temp_dir) / "dump.json"
+        with open(dump_path, "w") as f:
+            if as_jsonl:
+                f.write("\n".join(json.dumps(record) for record in records))
+            else:
+                json.dump(records, f)
+
+        assert self.index.import_metadata_dump(dump_path) == 2
+        assert self.index.best_match("Adam: a method for stochastic optimization")[0] == "1412.6980"
@@ -0,0 +1,94 @@
+"""
+Unit tests for per-job span tracing.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+from core.tracing import STAGE, Tracer, span, traced
+
+
+@traced("io.read", "io")
+def read_file():
+    return "data"
+
+
+class TestTracer:
+    """Test span collection, propagation and export."""
+
+    def test_spans_without_a_tracer_are_no_ops(self):
+        with span("orphan") as orphan:
+            assert orphan is None
+        assert read_file() == "data"
+
+    def test_nested_spans_record_their_parent(self):
+        tracer = Tracer("job")
+        with tracer.activate():
+            with span("compose_video", STAGE) as stage:
+                assert read_file() == "data"
+
+        read, composed = sorted(tracer.spans, key=lambda s: s.start_us, reverse=True)
+        assert composed is stage and composed.parent is None
+        assert read.name == "io.read" and read.parent == stage.span_id
+        assert composed.duration_us >= read.duration_us
+
+    def test_spans_follow_the_job_into_tasks(self):
+        tracer = Tracer("job")
+
+        async def render(scene):
+            with span(f"render.{scene}", "render"):
+                await asyncio.sleep(0.01)
+
+        async def job():
+            with tracer.activate(), span("animate", STAGE):
+                await asyncio.gather(render("s0"), render("s1"))
+
+        asyncio.run(job())
+
+        renders = [s for s in tracer.spans if s.category == "render"]
+        stage = next(s for s in tracer.spans if s.category == STAGE)
+        assert len(renders) == 2 and all(s.parent == stage.span_id for s in renders)
+        # Concurrent tasks get their own tracks so the trace nests correctly
+        assert len({s.track for s in renders} | {stage.track}) == 3
+
+    def test_errors_are_recorded(self):
+        tracer = Tracer("job")
+        with pytest.raises(ValueError), tracer.activate(), span("llm.openai", "llm"):
+            raise ValueError("bad request")
+
+        assert tracer.spans[0].args["error"] == "ValueError"
+
+    def test_chrome_trace_export(self, tmp_path):
+        tracer = Tracer("job")
+        with tracer.activate(), span("script", STAGE, scenes=3):
+            pass
+
+        path = tracer.export(tmp_path / "traces" / "job.json")
+        trace = json.loads(path.read_text())
+
+        complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        assert complete[0]["name"] == "script" and complete[0]["cat"] == STAGE
+        assert complete[0]["args"]["scenes"] == 3
+        assert {"ts", "dur", "pid", "tid"} <= set(complete[0])
+        assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in trace["traceEvents"])
+
+    def test_summary_breaks_time_down_by_stage_and_category(self):
+        tracer = Tracer("job")
+        with tracer.activate():
+            for stage in ("script", "script", "compose_video"):
+                with span(stage, STAGE):
+                    with span("llm_cache.get", "cache"):
+                        pass
+
+        summary = tracer.summary()
+
+        assert set(summary["stages"]) == {"script", "compose_video"}
+        assert summary["categories"]["cache"]["count"] == 3
+        assert summary["categories"][STAGE]["count"] == 3
+        assert summary["total_seconds"] >= summary["stages"]["compose_video"]
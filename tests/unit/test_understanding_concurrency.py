@@ -0,0 +1,121 @@
+"""
+Unit tests for concurrent multi-aspect paper understanding.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# config.backend must be imported before src/raso (whose config package shadows it) is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.backend.models import AgentType, RASOMasterState
+from config.backend.models.paper import Equation, PaperContent, PaperInput, PaperInputType, Section
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'raso'))
+
+import agents.understanding as understanding_module
+from agents.understanding import UnderstandingAgent
+
+
+RESPONSES = {
+    "core problem statement": (
+        "Sequence models process tokens one at a time, which prevents parallel training on long inputs."
+    ),
+    "key contributions": (
+        "- A Transformer architecture built entirely on attention mechanisms\n"
+        "- Parallel training that reduces wall-clock training time substantially"
+    ),
+    "key equations": (
+        'Here is the analysis: {"key_equations": [{"equation_id": "eq1", "importance": 9, '
+        '"visualization_hint": "Animate the softmax over query-key scores", "related_concepts": ["attention"]}]}'
+    ),
+    "visual animation": (
+        '{"visualizable_concepts": [{"name": "Self-Attention", "description": "How each token '
+        'weighs every other token in the sequence", "visualization_type": "animation", "complexity": "medium"}]}'
+    ),
+}
+
+
+class FakeLLMService:
+    """Answers each analysis prompt after a fixed delay."""
+
+    def __init__(self, latency: float, failing: str = ""):
+        self.latency = latency
+        self.failing = failing
+
+    async def generate(self, prompt: str, **kwargs):
+        await asyncio.sleep(self.latency)
+        for marker, content in RESPONSES.items():
+            if marker in prompt:
+                if marker == self.failing:
+                    raise RuntimeError("provider unavailable")
+                return SimpleNamespace(content=content)
+        raise AssertionError(f"Unexpected prompt: {prompt[:80]}")
+
+
+@pytest.fixture
+def state():
+    paper_content = PaperContent(
+        title="Attention Is All You Need",
+        authors=["Ashish Vaswani"],
+        abstract="We propose the Transformer, a model based solely on attention mechanisms.",
+        sections=[Section(id="s1", title="Introduction", level=1, content="Recurrent models are sequential.")],
+        equations=[Equation(id="eq1", latex=r"\mathrm{softmax}(QK^T / \sqrt{d_k})V", section_id="s1")],
+    )
+    return RASOMasterState(
+        paper_input=PaperInput(type=PaperInputType.TITLE, content="Attention Is All You Need"),
+        paper_content=paper_content,
+    )
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    agent = UnderstandingAgent(AgentType.UNDERSTANDING)
+
+    async def no_digest(paper_content):
+        return None
+
+    monkeypatch.setattr(agent, "_get_digest", no_digest)
+    return agent
+
+
+class TestConcurrentUnderstanding:
+    """Test concurrent analysis and per-part fallback."""
+
+    @pytest.mark.asyncio
+    async def test_analyses_run_concurrently(self, agent, state, monkeypatch):
+        monkeypatch.setattr(understanding_module, "llm_service", FakeLLMService(latency=0.3))
+
+        start = time.perf_counter()
+        result = await agent.execute(state)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.6
+        understanding = result.understanding
+        assert understanding.problem.startswith("Sequence models")
+        assert len(understanding.contributions) == 2
+        assert understanding.key_equations[0].importance == 9
+        assert understanding.visualizable_concepts[0].name == "Self-Attention"
+        assert understanding.analysis_notes == []
+
+    @pytest.mark.asyncio
+    async def test_failed_part_falls_back_alone(self, agent, state, monkeypatch):
+        monkeypatch.setattr(
+            understanding_module,
+            "llm_service",
+            FakeLLMService(latency=0.01, failing="visual animation"),
+        )
+
+        result = await agent.execute(state)
+
+        understanding = result.understanding
+        assert understanding.problem.startswith("Sequence models")
+        assert understanding.key_equations[0].importance == 9
+        assert understanding.visualizable_concepts[0].name == "Core Concept"
+        assert understanding.analysis_notes == ["concepts analysis used fallback"]
+        assert understanding.confidence_score == pytest.approx(0.8)